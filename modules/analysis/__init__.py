@@ -4,5 +4,6 @@ Contains components for analyzing trades, market trends, and card values.
 """
 
 from .trade_analyzer import TradeAnalyzer
+from .trade_finder import TradeFinder, TradePackage, find_trades
 
-__all__ = ['TradeAnalyzer'] 
\ No newline at end of file
+__all__ = ['TradeAnalyzer', 'TradeFinder', 'TradePackage', 'find_trades'] 
\ No newline at end of file
@@ -4,25 +4,74 @@ Trade analyzer module for evaluating card trades.
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 
+from modules.core.lazy import lazy_import
+from modules.core.market_tables import GRADES, MarketTables, card_era, get_market_tables, normalize_grade
+
+sparse = lazy_import('scipy.sparse')
+
+# A trade as (indices of cards given, indices of cards received) into a card pool
+TradeIndices = Tuple[Sequence[int], Sequence[int]]
+
+# Value of each grade relative to PSA 10 until the market tables have learned premiums
+DEFAULT_CONDITION_MULTIPLIERS = {
+    'PSA 10': 1.0,   # PSA 10 is baseline for graded
+    'PSA 9': 0.5,    # PSA 9 typically half of PSA 10
+    'Raw': 0.3       # Raw cards typically 30% of PSA 10
+}
+
+
+@dataclass
+class CardArrays:
+    """Per-card trade attributes packed into aligned arrays."""
+    value: np.ndarray
+    risk: np.ndarray
+    trend: np.ndarray
+    volatility: np.ndarray
+    liquidity: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+
+def trade_matrices(trades: Sequence[TradeIndices], n_cards: int) -> Tuple[Any, Any]:
+    """
+    Sparse incidence matrices (trades x cards) for the giving and receiving sides.
+
+    Args:
+        trades: (giving indices, receiving indices) per trade
+        n_cards: Size of the card pool the indices refer to
+    """
+    matrices = []
+    for side in (0, 1):
+        rows = np.repeat(np.arange(len(trades)), [len(trade[side]) for trade in trades])
+        cols = np.fromiter((i for trade in trades for i in trade[side]), dtype=np.int64, count=len(rows))
+        matrices.append(sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(trades), n_cards)))
+    return matrices[0], matrices[1]
+
 class TradeAnalyzer:
     """Analyzes potential trades between sports cards."""
     
-    def __init__(self):
-        """Initialize the trade analyzer."""
+    def __init__(self, market_tables: Optional[MarketTables] = None):
+        """
+        Initialize the trade analyzer.
+        
+        Args:
+            market_tables: Grade premium tables (the process-wide tables by default)
+        """
         self.market_multipliers = {
             'hot': 1.2,      # Hot players/cards may command premium
             'stable': 1.0,   # Stable market value
             'cooling': 0.8   # Declining interest
         }
         
-        self.condition_multipliers = {
-            'PSA 10': 1.0,   # PSA 10 is baseline for graded
-            'PSA 9': 0.5,    # PSA 9 typically half of PSA 10
-            'Raw': 0.3       # Raw cards typically 30% of PSA 10
-        }
+        # Card values are quoted as PSA 10 prices, so each grade is scaled by
+        # its premium relative to PSA 10
+        self.market_tables = market_tables if market_tables is not None else get_market_tables()
+        self.condition_multipliers = {grade: self._condition_multiplier({'condition': grade}) for grade in GRADES}
     
     def analyze_trade(self, 
                      giving_cards: List[Dict[str, Any]], 
@@ -90,28 +139,158 @@ class TradeAnalyzer:
             'receiving_trend': receiving_metrics['avg_trend']
         }
     
+    def card_values(self, cards: List[Dict[str, Any]]) -> np.ndarray:
+        """Trade value of each card: market value scaled by condition and market trend (missing values count as 0)."""
+        market_values = pd.to_numeric(pd.Series([card.get('market_value') for card in cards], dtype=object),
+                                      errors='coerce').fillna(0.0).to_numpy(dtype=float)
+        return market_values * np.array([
+            self._condition_multiplier(card) *
+            self.market_multipliers.get(card.get('market_trend', 'stable'), 1.0)
+            for card in cards
+        ], dtype=float)
+
     def _calculate_total_value(self, cards: List[Dict[str, Any]]) -> float:
         """Calculate the total value of a set of cards."""
-        total_value = 0.0
-        
-        for card in cards:
-            # Get base market value
-            market_value = float(card.get('market_value', 0.0))
-            
-            # Apply condition multiplier
-            condition = card.get('condition', 'Raw')
-            condition_multiplier = self.condition_multipliers.get(condition, 1.0)
-            
-            # Apply market trend multiplier
-            trend = card.get('market_trend', 'stable')
-            trend_multiplier = self.market_multipliers.get(trend, 1.0)
-            
-            # Calculate final value
-            card_value = market_value * condition_multiplier * trend_multiplier
-            total_value += card_value
+        return float(self.card_values(cards).sum())
+    
+    def _condition_multiplier(self, card: Dict[str, Any]) -> float:
+        """
+        Grade premium relative to PSA 10 for the card's sport, set and era.
         
-        return total_value
+        Falls back to DEFAULT_CONDITION_MULTIPLIERS unless sales of both the grade
+        and PSA 10 were learned, and to 1.0 for unknown grades.
+        """
+        condition = normalize_grade(card.get('condition', 'Raw'))
+        if condition is None:
+            return 1.0
+        segment = (card.get('sport', ''), card.get('card_set', ''), card_era(card.get('year')))
+        premium = self.market_tables.learned_grade_premium(condition, *segment)
+        psa10_premium = self.market_tables.learned_grade_premium('PSA 10', *segment)
+        if premium is None or not psa10_premium:
+            return DEFAULT_CONDITION_MULTIPLIERS.get(condition, 1.0)
+        return premium / psa10_premium
     
+    def pack_cards(self, cards: Union[List[Dict[str, Any]], pd.DataFrame]) -> CardArrays:
+        """
+        Coerce every card attribute the trade metrics use into arrays, once.
+
+        Missing or unparseable numbers fall back to the same defaults as the
+        per-trade methods.
+        """
+        records = cards.to_dict('records') if isinstance(cards, pd.DataFrame) else list(cards)
+        frame = pd.DataFrame.from_records(records, index=range(len(records)))
+
+        def column(name: str, default: Union[float, pd.Series]) -> np.ndarray:
+            if name not in frame:
+                values = pd.Series(default, index=frame.index, dtype=float)
+            else:
+                values = pd.to_numeric(frame[name], errors='coerce')
+            return values.fillna(default).to_numpy(dtype=float)
+
+        market_value = column('market_value', 0.0)
+        market_trend = frame['market_trend'].fillna('stable') if 'market_trend' in frame else pd.Series('stable', index=frame.index)
+
+        # Condition premiums depend only on the segment, so look each one up once
+        premiums: Dict[tuple, float] = {}
+        condition = np.empty(len(records))
+        for i, card in enumerate(records):
+            key = (card.get('condition', 'Raw'), card.get('sport', ''), card.get('card_set', ''), card.get('year'))
+            if key not in premiums:
+                premiums[key] = self._condition_multiplier(card)
+            condition[i] = premiums[key]
+        value = market_value * condition * market_trend.map(self.market_multipliers).fillna(1.0).to_numpy(dtype=float)
+
+        volatility = column('price_volatility', 5.0)
+        liquidity = column('liquidity_score', 5.0)
+        trend_risk = np.select([market_trend == 'hot', market_trend == 'stable'], [10.0, 5.0], 8.0)
+        risk = volatility * 0.4 + (10 - liquidity) * 0.4 + trend_risk * 0.2
+
+        current = pd.Series(market_value, index=frame.index)
+        forecast_30d = column('30_day_forecast', current)
+        forecast_90d = column('90_day_forecast', current)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trend = np.where(market_value > 0,
+                             ((forecast_30d - market_value) / market_value * 100) * 0.7 +
+                             ((forecast_90d - market_value) / market_value * 100) * 0.3,
+                             0.0)
+
+        return CardArrays(value=value, risk=risk, trend=trend,
+                          volatility=column('volatility_score', 5.0), liquidity=liquidity)
+
+    def evaluate_trades(self,
+                        cards: Union[List[Dict[str, Any]], pd.DataFrame, CardArrays],
+                        trades: Union[Sequence[TradeIndices], Tuple[Any, Any]]) -> pd.DataFrame:
+        """
+        Evaluate many candidate trades drawn from one card pool in a single pass.
+
+        Each side's totals and averages are sparse matrix products of the
+        trades x cards incidence matrices with the packed card arrays.
+
+        Args:
+            cards: Card pool covering both sides (or its packed arrays)
+            trades: (giving indices, receiving indices) per trade, or a pair of
+                sparse incidence matrices as built by trade_matrices
+
+        Returns:
+            DataFrame with one row per trade and the same metrics analyze_trade
+            reports: values, value and percentage difference, fairness, risk,
+            average trend/volatility/liquidity per side, their differences and
+            the recommendation
+        """
+        packed = cards if isinstance(cards, CardArrays) else self.pack_cards(cards)
+        if isinstance(trades, tuple) and len(trades) == 2 and sparse.issparse(trades[0]):
+            giving_matrix, receiving_matrix = trades
+        else:
+            giving_matrix, receiving_matrix = trade_matrices(list(trades), len(packed))
+
+        result = {}
+        sides = {}
+        for side, matrix in (('giving', giving_matrix), ('receiving', receiving_matrix)):
+            counts = np.asarray(matrix.sum(axis=1)).ravel()
+            safe_counts = np.maximum(counts, 1)
+            metrics = np.column_stack([packed.value, packed.risk, packed.trend, packed.volatility, packed.liquidity])
+            totals = np.asarray(matrix @ metrics)
+            risk = np.where(counts > 0, np.round(np.clip(totals[:, 1] / safe_counts, 0, 10), 1), 0.0)
+            averages = np.where(counts[:, None] > 0, np.round(totals[:, 2:] / safe_counts[:, None], 1), 0.0)
+            sides[side] = averages
+            result[f'{side}_value'] = totals[:, 0]
+            result[f'{side}_risk'] = risk
+            result[f'{side}_cards'] = counts.astype(int)
+
+        giving_value, receiving_value = result['giving_value'], result['receiving_value']
+        value_difference = receiving_value - giving_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage_difference = np.where(giving_value > 0, value_difference / giving_value * 100, 0.0)
+            ratio = np.minimum(giving_value, receiving_value) / np.maximum(giving_value, receiving_value)
+            value_ratio = np.where(giving_value > 0, receiving_value / giving_value, 0.0)
+        fairness_score = np.where((giving_value == 0) | (receiving_value == 0), 0.0, np.round(ratio * 10, 1))
+
+        risk_difference = result['receiving_risk'] - result['giving_risk']
+        recommendation = np.select(
+            [(value_ratio >= 1.2) & (risk_difference <= 2),
+             (value_ratio >= 1.1) & (risk_difference <= 1),
+             (value_ratio >= 0.9) & (risk_difference <= 0),
+             (value_ratio >= 0.8) & (risk_difference <= -2),
+             value_ratio < 0.8,
+             risk_difference > 2],
+            ['Strong Accept', 'Accept', 'Consider', 'Consider', 'Decline', 'Decline'],
+            'Consider'
+        )
+
+        for i, metric in enumerate(('avg_trend', 'avg_volatility', 'avg_liquidity')):
+            result[f'giving_{metric}'] = sides['giving'][:, i]
+            result[f'receiving_{metric}'] = sides['receiving'][:, i]
+        result.update({
+            'value_difference': value_difference,
+            'percentage_difference': percentage_difference,
+            'fairness_score': fairness_score,
+            'trend_difference': sides['receiving'][:, 0] - sides['giving'][:, 0],
+            'volatility_difference': sides['receiving'][:, 1] - sides['giving'][:, 1],
+            'liquidity_difference': sides['receiving'][:, 2] - sides['giving'][:, 2],
+            'recommendation': recommendation
+        })
+        return pd.DataFrame(result)
+
     def _calculate_fairness_score(self, giving_value: float, receiving_value: float) -> float:
         """Calculate how fair the trade is on a scale of 0-10."""
         if giving_value == 0 or receiving_value == 0:
@@ -125,32 +304,31 @@ class TradeAnalyzer:
         
         return round(score, 1)
     
-    def _calculate_risk_score(self, cards: List[Dict[str, Any]]) -> float:
-        """Calculate the risk level of a set of cards on a scale of 0-10."""
-        if not cards:
-            return 0
-            
-        total_risk = 0
-        
+    def card_risks(self, cards: List[Dict[str, Any]]) -> np.ndarray:
+        """Risk of each card on a 0-10 scale from volatility, liquidity and market trend."""
+        risks = []
         for card in cards:
             # Factors that affect risk
             volatility = float(card.get('price_volatility', 5.0))
             liquidity = float(card.get('liquidity_score', 5.0))
             market_trend = card.get('market_trend', 'stable')
             
-            # Calculate risk score for this card
-            card_risk = (
+            risks.append(
                 volatility * 0.4 +                    # Higher volatility = higher risk
                 (10 - liquidity) * 0.4 +             # Lower liquidity = higher risk
                 (10 if market_trend == 'hot' else    # Hot market might be unstable
                  5 if market_trend == 'stable' else  # Stable market is lower risk
                  8) * 0.2                           # Cooling market has moderate risk
             )
-            
-            total_risk += card_risk
+        return np.array(risks, dtype=float)
+
+    def _calculate_risk_score(self, cards: List[Dict[str, Any]]) -> float:
+        """Calculate the risk level of a set of cards on a scale of 0-10."""
+        if not cards:
+            return 0
         
         # Average risk across all cards
-        avg_risk = total_risk / len(cards)
+        avg_risk = float(self.card_risks(cards).mean())
         
         return round(min(10, max(0, avg_risk)), 1)
     
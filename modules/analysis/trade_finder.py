@@ -0,0 +1,248 @@
+"""
+Trade finder module for searching two collections for fair trades.
+Every package of up to k cards from each side is reduced to a value sum; the
+two lists of sums are then matched by sorting one side and binary-searching it
+for each sum on the other (meet in the middle), instead of pairing every
+package with every other.
+"""
+
+from dataclasses import dataclass, field
+from math import comb
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from modules.analysis.trade_analyzer import TradeAnalyzer
+
+# Most packages enumerated per side; larger searches keep only the most valuable cards
+MAX_PACKAGES = 2_000_000
+
+# Candidate pairs kept per package on the giving side (nearest match below and above)
+_NEIGHBORS = 2
+
+
+@dataclass
+class TradePackage:
+    """A candidate trade: cards I give and cards I receive."""
+    giving: List[Dict[str, Any]]
+    receiving: List[Dict[str, Any]]
+    giving_value: float
+    receiving_value: float
+    giving_risk: float
+    receiving_risk: float
+    fairness_score: float
+    analysis: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def value_difference(self) -> float:
+        return self.receiving_value - self.giving_value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'giving': self.giving,
+            'receiving': self.receiving,
+            'giving_value': self.giving_value,
+            'receiving_value': self.receiving_value,
+            'value_difference': self.value_difference,
+            'giving_risk': self.giving_risk,
+            'receiving_risk': self.receiving_risk,
+            'fairness_score': self.fairness_score,
+            'analysis': self.analysis
+        }
+
+
+def _as_cards(cards: Union[List[Dict[str, Any]], pd.DataFrame, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Card dictionaries from a list, a DataFrame or a display case."""
+    if isinstance(cards, pd.DataFrame):
+        return cards.to_dict('records')
+    if isinstance(cards, dict):
+        return list(cards.get('cards', []))
+    return list(cards or [])
+
+
+def _with_market_value(card: Dict[str, Any]) -> Dict[str, Any]:
+    """Collection and display case cards carry current_value or value rather than market_value."""
+    if card.get('market_value') is not None:
+        return card
+    for key in ('current_value', 'value'):
+        try:
+            value = float(card.get(key) or 0)
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            return dict(card, market_value=value)
+    return card
+
+
+def combinations_array(n: int, k: int) -> np.ndarray:
+    """All k-combinations of range(n) as rows of an int array, in lexicographic order."""
+    if k <= 0 or k > n:
+        return np.empty((0, max(k, 0)), dtype=np.int32)
+    combos = np.arange(n, dtype=np.int32)[:, None]
+    for _ in range(k - 1):
+        last = combos[:, -1]
+        counts = n - 1 - last
+        total = int(counts.sum())
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        following = np.repeat(last, counts) + 1 + (np.arange(total) - starts)
+        combos = np.column_stack([np.repeat(combos, counts, axis=0), following.astype(np.int32)])
+    return combos
+
+
+def _package_count(n: int, k: int) -> int:
+    return sum(comb(n, size) for size in range(1, k + 1))
+
+
+class TradeFinder:
+    """Enumerates and ranks trade packages between two collections."""
+
+    def __init__(self, analyzer: Optional[TradeAnalyzer] = None, max_packages: int = MAX_PACKAGES):
+        """
+        Initialize the finder.
+
+        Args:
+            analyzer: Trade analyzer used for card values, risk and the final analysis
+            max_packages: Most packages enumerated per side
+        """
+        self.analyzer = analyzer if analyzer is not None else TradeAnalyzer()
+        self.max_packages = max_packages
+
+    def _packages(self, values: np.ndarray, risks: np.ndarray, max_cards: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Every package of 1..max_cards cards.
+
+        Returns:
+            (members, sums, risks): members padded with -1 to max_cards columns,
+            total value and average risk per package
+        """
+        n = len(values)
+        padded_values = np.append(values, 0.0)
+        padded_risks = np.append(risks, 0.0)
+        members = []
+        for size in range(1, min(max_cards, n) + 1):
+            combos = combinations_array(n, size)
+            members.append(np.pad(combos, ((0, 0), (0, max_cards - size)), constant_values=n))
+        members = np.concatenate(members) if members else np.empty((0, max_cards), dtype=np.int32)
+        sizes = (members < n).sum(axis=1)
+        sums = padded_values[members].sum(axis=1)
+        package_risks = padded_risks[members].sum(axis=1) / np.maximum(sizes, 1)
+        members[members == n] = -1
+        return members, sums, package_risks
+
+    def _shortlist(self, values: np.ndarray, max_cards: int) -> np.ndarray:
+        """Indices of the cards searched: all of them, or the most valuable ones that keep the search bounded."""
+        order = np.argsort(-values, kind='stable')
+        order = order[values[order] > 0]
+        n = len(order)
+        while n > max_cards and _package_count(n, max_cards) > self.max_packages:
+            n -= 1
+        if n < len(order):
+            print(f"Trade search limited to the {n} most valuable cards on one side")
+        return np.sort(order[:n])
+
+    def find_trades(self,
+                    my_cards: Union[List[Dict[str, Any]], pd.DataFrame, Dict[str, Any]],
+                    their_cards: Union[List[Dict[str, Any]], pd.DataFrame, Dict[str, Any]],
+                    value_tolerance: float = 0.1,
+                    max_cards_per_side: int = 3,
+                    risk_ceiling: Optional[float] = None,
+                    top_n: int = 10,
+                    min_value: float = 0.0,
+                    analyze: bool = True) -> List[TradePackage]:
+        """
+        Search for fair trades between my cards and a counterparty's.
+
+        Args:
+            my_cards: My collection (list of cards, DataFrame or display case)
+            their_cards: The counterparty's collection or display case
+            value_tolerance: Largest relative value gap allowed, as 1 - smaller side / larger side
+            max_cards_per_side: Most cards in each side of a trade
+            risk_ceiling: Highest average risk (0-10) accepted for the cards I receive
+            top_n: Number of trades returned
+            min_value: Smallest total value for the side I give
+            analyze: Whether to attach TradeAnalyzer.analyze_trade results to each trade
+
+        Returns:
+            Trades ranked by fairness, then by value gained, then by lower risk received
+        """
+        if not 0 <= value_tolerance < 1:
+            raise ValueError("value_tolerance must be between 0 and 1")
+        if max_cards_per_side < 1:
+            raise ValueError("max_cards_per_side must be at least 1")
+
+        mine = [_with_market_value(card) for card in _as_cards(my_cards)]
+        theirs = [_with_market_value(card) for card in _as_cards(their_cards)]
+        my_values, their_values = self.analyzer.card_values(mine), self.analyzer.card_values(theirs)
+        my_index = self._shortlist(my_values, max_cards_per_side)
+        their_index = self._shortlist(their_values, max_cards_per_side)
+        if len(my_index) == 0 or len(their_index) == 0:
+            return []
+
+        give_members, give_sums, give_risks = self._packages(
+            my_values[my_index], self.analyzer.card_risks([mine[i] for i in my_index]), max_cards_per_side)
+        get_members, get_sums, get_risks = self._packages(
+            their_values[their_index], self.analyzer.card_risks([theirs[i] for i in their_index]), max_cards_per_side)
+
+        # Prune packages that can't meet any package on the other side
+        floor = 1 - value_tolerance
+        keep = get_sums >= max(min_value, 1e-9) * floor
+        if risk_ceiling is not None:
+            keep &= get_risks <= risk_ceiling
+        get_members, get_sums, get_risks = get_members[keep], get_sums[keep], get_risks[keep]
+        if len(get_sums) == 0:
+            return []
+        keep = ((give_sums >= max(min_value, 1e-9)) &
+                (give_sums >= get_sums.min() * floor) & (give_sums <= get_sums.max() / floor))
+        give_members, give_sums, give_risks = give_members[keep], give_sums[keep], give_risks[keep]
+        if len(give_sums) == 0:
+            return []
+
+        # Meet in the middle: nearest receiving sums below and above each giving sum
+        order = np.argsort(get_sums, kind='stable')
+        sorted_sums = get_sums[order]
+        position = np.searchsorted(sorted_sums, give_sums)
+        candidates = np.stack([position - 1, position], axis=1)[:, :_NEIGHBORS]
+        valid = (candidates >= 0) & (candidates < len(sorted_sums))
+        give_index = np.repeat(np.arange(len(give_sums)), _NEIGHBORS)[valid.ravel()]
+        get_index = order[candidates[valid]]
+
+        giving, receiving = give_sums[give_index], get_sums[get_index]
+        ratio = np.minimum(giving, receiving) / np.maximum(giving, receiving)
+        fair = ratio >= floor
+        give_index, get_index, ratio = give_index[fair], get_index[fair], ratio[fair]
+        if len(ratio) == 0:
+            return []
+
+        # Rank a shortlist by fairness, then value gained, then lower received risk
+        gain = get_sums[get_index] - give_sums[give_index]
+        if len(ratio) > top_n * 20:
+            shortlist = np.argpartition(-ratio, top_n * 20)[:top_n * 20]
+        else:
+            shortlist = np.arange(len(ratio))
+        ranked = shortlist[np.lexsort((get_risks[get_index[shortlist]], -gain[shortlist], -np.round(ratio[shortlist], 4)))]
+
+        trades = []
+        for i in ranked[:top_n]:
+            g, r = give_index[i], get_index[i]
+            giving_cards = [mine[my_index[j]] for j in give_members[g] if j >= 0]
+            receiving_cards = [theirs[their_index[j]] for j in get_members[r] if j >= 0]
+            trade = TradePackage(
+                giving=giving_cards,
+                receiving=receiving_cards,
+                giving_value=float(give_sums[g]),
+                receiving_value=float(get_sums[r]),
+                giving_risk=round(float(give_risks[g]), 1),
+                receiving_risk=round(float(get_risks[r]), 1),
+                fairness_score=round(float(ratio[i]) * 10, 1)
+            )
+            if analyze:
+                trade.analysis = self.analyzer.analyze_trade(giving_cards, receiving_cards)
+            trades.append(trade)
+        return trades
+
+
+def find_trades(my_cards: Union[List[Dict[str, Any]], pd.DataFrame, Dict[str, Any]],
+                their_cards: Union[List[Dict[str, Any]], pd.DataFrame, Dict[str, Any]],
+                **options) -> List[TradePackage]:
+    """Rank fair trades between two collections; see TradeFinder.find_trades."""
+    return TradeFinder().find_trades(my_cards, their_cards, **options)
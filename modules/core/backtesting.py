@@ -0,0 +1,450 @@
+"""
+Backtesting module for Sports Card Analyzer Pro.
+Replays stored sales histories through PricePredictor with walk-forward time
+splits and compares the ensemble against a naive last-price forecast.
+
+Run as a benchmark with:
+    python -m modules.core.backtesting --synthetic 20
+    python -m modules.core.backtesting --archive data/sales_archive.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from modules.core.price_predictor import PricePredictor, FEATURE_COLUMNS
+from modules.core.sales_archive import SalesArchive, generate_synthetic_archive
+
+# Two-sided z-scores for the supported prediction interval levels
+Z_SCORES = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.9600}
+
+
+@dataclass
+class FoldResult:
+    """Forecasts of one model for one walk-forward fold of one card."""
+    card_key: str
+    fold: int
+    engine: str
+    model: str
+    actuals: List[float]
+    predictions: List[float]
+    lower: List[float]
+    upper: List[float]
+    fit_seconds: float
+    predict_seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class BacktestReport:
+    """Collected fold results with per-model and per-engine summaries."""
+    results: List[FoldResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Flatten fold results into one row per forecast point."""
+        rows = []
+        for result in self.results:
+            for step, (actual, pred, lo, hi) in enumerate(
+                    zip(result.actuals, result.predictions, result.lower, result.upper), start=1):
+                rows.append({
+                    'card_key': result.card_key,
+                    'fold': result.fold,
+                    'engine': result.engine,
+                    'model': result.model,
+                    'step': step,
+                    'actual': actual,
+                    'prediction': pred,
+                    'lower': lo,
+                    'upper': hi
+                })
+        return pd.DataFrame(rows)
+
+    def summary(self, by: str = 'model') -> Dict[str, Dict[str, float]]:
+        """
+        Summarize accuracy and latency.
+
+        Args:
+            by: 'model' for one row per engine/model pair, 'engine' for one row per engine
+
+        Returns:
+            Dict keyed by "engine/model" (or engine) with mape, coverage, latency and counts
+        """
+        groups: Dict[str, List[FoldResult]] = {}
+        for result in self.results:
+            key = result.engine if by == 'engine' else f"{result.engine}/{result.model}"
+            groups.setdefault(key, []).append(result)
+
+        summary = {}
+        for key, results in groups.items():
+            ok = [r for r in results if r.error is None]
+            actuals = np.concatenate([r.actuals for r in ok]) if ok else np.array([])
+            preds = np.concatenate([r.predictions for r in ok]) if ok else np.array([])
+            lower = np.concatenate([r.lower for r in ok]) if ok else np.array([])
+            upper = np.concatenate([r.upper for r in ok]) if ok else np.array([])
+            summary[key] = {
+                'mape': mean_absolute_percentage_error(actuals, preds),
+                'coverage': interval_coverage(actuals, lower, upper),
+                'mean_fit_seconds': float(np.mean([r.fit_seconds for r in ok])) if ok else 0.0,
+                'mean_predict_seconds': float(np.mean([r.predict_seconds for r in ok])) if ok else 0.0,
+                'folds': len(ok),
+                'failed_folds': len(results) - len(ok),
+                'points': int(actuals.size)
+            }
+        return summary
+
+
+def mean_absolute_percentage_error(actuals: np.ndarray, predictions: np.ndarray) -> float:
+    """MAPE in percent, ignoring points with a non-positive actual price."""
+    actuals = np.asarray(actuals, dtype=float)
+    predictions = np.asarray(predictions, dtype=float)
+    mask = actuals > 0
+    if not mask.any():
+        return float('nan')
+    return float(np.mean(np.abs(actuals[mask] - predictions[mask]) / actuals[mask]) * 100)
+
+
+def interval_coverage(actuals: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> float:
+    """Percentage of actual prices falling inside their prediction interval."""
+    actuals = np.asarray(actuals, dtype=float)
+    if actuals.size == 0:
+        return float('nan')
+    inside = (actuals >= np.asarray(lower, dtype=float)) & (actuals <= np.asarray(upper, dtype=float))
+    return float(np.mean(inside) * 100)
+
+
+def walk_forward_splits(n_points: int,
+                        min_train: int = 30,
+                        horizon: int = 7,
+                        step: int = 7,
+                        max_folds: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Compute expanding-window walk-forward splits.
+
+    Args:
+        n_points: Length of the history
+        min_train: Number of sales in the first training window
+        horizon: Number of sales forecast after each cutoff
+        step: Number of sales the cutoff advances between folds
+        max_folds: Keep only the most recent folds if set
+
+    Returns:
+        List of (train_end, test_end) index pairs; fold i trains on [0, train_end)
+        and is scored on [train_end, test_end)
+    """
+    splits = []
+    train_end = min_train
+    while train_end + horizon <= n_points:
+        splits.append((train_end, train_end + horizon))
+        train_end += step
+    if max_folds is not None:
+        splits = splits[-max_folds:]
+    return splits
+
+
+class NaiveEngine:
+    """Last observed price, with a random-walk interval that widens with the horizon."""
+
+    name = 'naive'
+
+    def __init__(self, interval_level: float = 0.9):
+        self.z = Z_SCORES.get(interval_level, 1.6449)
+        self.last_price = 0.0
+        self.sigma = 0.0
+
+    def fit(self, train_sales: List[Dict[str, Any]]) -> None:
+        prices = np.array([float(s['price']) for s in train_sales], dtype=float)
+        self.last_price = float(prices[-1])
+        log_returns = np.diff(np.log(prices[prices > 0]))
+        self.sigma = float(np.std(log_returns)) if log_returns.size > 1 else 0.0
+
+    def predict(self, target_dates: List[pd.Timestamp]) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, float]]:
+        start = time.perf_counter()
+        steps = np.arange(1, len(target_dates) + 1)
+        point = np.full(len(target_dates), self.last_price)
+        spread = self.z * self.sigma * np.sqrt(steps)
+        lower = self.last_price * np.exp(-spread)
+        upper = self.last_price * np.exp(spread)
+        return {'last_price': (point, lower, upper, time.perf_counter() - start)}
+
+
+class EnsembleEngine:
+    """
+    PricePredictor's RF/GB/XGB ensemble trained on the fold's history.
+
+    The last known feature row is carried forward with the seasonal and weekly
+    factors of each target date, so the backtest measures the models themselves
+    rather than the player/sentiment adjustments applied in predict_future_prices.
+    """
+
+    name = 'ensemble'
+
+    def __init__(self, n_estimators: int = 100, interval_level: float = 0.9, quiet: bool = True):
+        self.n_estimators = n_estimators
+        self.z = Z_SCORES.get(interval_level, 1.6449)
+        self.quiet = quiet
+        self.predictor = None
+        self.history = None
+        self.weights = {}
+        self.residual_std = {}
+
+    def fit(self, train_sales: List[Dict[str, Any]]) -> None:
+        self.predictor = PricePredictor(n_estimators=self.n_estimators)
+        output = io.StringIO() if self.quiet else None
+        with contextlib.redirect_stdout(output) if self.quiet else contextlib.nullcontext():
+            df = self.predictor.prepare_data(train_sales)
+            if df is None:
+                raise ValueError("Not enough usable sales to train the ensemble")
+            self.weights = self.predictor.train_models(df)
+
+        # Residual spread on the most recent 20%, the same rows train_models validates on
+        split_idx = int(len(df) * 0.8)
+        holdout = df.iloc[split_idx:]
+        features = self.predictor.scaler.transform(holdout[FEATURE_COLUMNS])
+        for model, estimator in self._models().items():
+            residuals = holdout['price'].values - estimator.predict(features)
+            self.residual_std[model] = float(np.std(residuals)) if len(residuals) > 1 else 0.0
+        ensemble_residuals = holdout['price'].values - self._combine(
+            {m: e.predict(features) for m, e in self._models().items()})
+        self.residual_std['ensemble'] = float(np.std(ensemble_residuals)) if len(ensemble_residuals) > 1 else 0.0
+        self.history = df
+
+    def _models(self) -> Dict[str, Any]:
+        return {
+            'rf': self.predictor.rf_model,
+            'gb': self.predictor.gb_model,
+            'xgb': self.predictor.xgb_model
+        }
+
+    def _combine(self, predictions: Dict[str, np.ndarray]) -> np.ndarray:
+        return sum(predictions[m] * self.weights.get(m, 0.0) for m in ('rf', 'gb', 'xgb'))
+
+    def _future_features(self, target_dates: List[pd.Timestamp]) -> np.ndarray:
+        future = self.predictor.prepare_features(pd.DataFrame({'date': target_dates}), history=self.history)
+        return self.predictor.scaler.transform(future[FEATURE_COLUMNS].astype(float))
+
+    def predict(self, target_dates: List[pd.Timestamp]) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, float]]:
+        features = self._future_features(target_dates)
+        outputs = {}
+        raw = {}
+        for model, estimator in self._models().items():
+            start = time.perf_counter()
+            point = np.asarray(estimator.predict(features), dtype=float)
+            elapsed = time.perf_counter() - start
+            raw[model] = point
+            spread = self.z * self.residual_std[model]
+            outputs[model] = (point, point - spread, point + spread, elapsed)
+
+        start = time.perf_counter()
+        point = np.asarray(self._combine(raw), dtype=float)
+        elapsed = time.perf_counter() - start + sum(o[3] for o in outputs.values())
+        spread = self.z * self.residual_std['ensemble']
+        outputs['ensemble'] = (point, point - spread, point + spread, elapsed)
+        return outputs
+
+
+def _build_engines(engine_names: List[str], n_estimators: int, interval_level: float) -> List[Any]:
+    engines = []
+    for name in engine_names:
+        if name == NaiveEngine.name:
+            engines.append(NaiveEngine(interval_level=interval_level))
+        elif name == EnsembleEngine.name:
+            engines.append(EnsembleEngine(n_estimators=n_estimators, interval_level=interval_level))
+        else:
+            raise ValueError(f"Unknown backtest engine: {name}")
+    return engines
+
+
+def _run_fold(task: Dict[str, Any]) -> List[FoldResult]:
+    """Run every engine on one fold. Module-level so it can be sent to worker processes."""
+    history = task['history']
+    train_end, test_end = task['split']
+    train_sales = history[:train_end]
+    test_sales = history[train_end:test_end]
+    actuals = [float(s['price']) for s in test_sales]
+    target_dates = [pd.Timestamp(s['date']) for s in test_sales]
+
+    results = []
+    for engine in _build_engines(task['engines'], task['n_estimators'], task['interval_level']):
+        try:
+            start = time.perf_counter()
+            engine.fit(train_sales)
+            fit_seconds = time.perf_counter() - start
+            outputs = engine.predict(target_dates)
+        except Exception as e:
+            results.append(FoldResult(
+                card_key=task['card_key'], fold=task['fold'], engine=engine.name, model=engine.name,
+                actuals=[], predictions=[], lower=[], upper=[],
+                fit_seconds=0.0, predict_seconds=0.0, error=str(e)
+            ))
+            continue
+
+        for model, (point, lower, upper, predict_seconds) in outputs.items():
+            results.append(FoldResult(
+                card_key=task['card_key'],
+                fold=task['fold'],
+                engine=engine.name,
+                model=model,
+                actuals=actuals,
+                predictions=[float(p) for p in point],
+                lower=[float(v) for v in lower],
+                upper=[float(v) for v in upper],
+                fit_seconds=fit_seconds,
+                predict_seconds=predict_seconds
+            ))
+    return results
+
+
+class WalkForwardBacktester:
+    """Runs walk-forward backtests over many card histories in a process pool."""
+
+    def __init__(self,
+                 engines: Optional[List[str]] = None,
+                 min_train: int = 30,
+                 horizon: int = 7,
+                 step: int = 7,
+                 max_folds: Optional[int] = None,
+                 n_estimators: int = 100,
+                 interval_level: float = 0.9,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the backtester.
+
+        Args:
+            engines: Engine names to compare (default: naive and ensemble)
+            min_train: Sales in the first training window
+            horizon: Sales forecast per fold
+            step: Sales the cutoff advances between folds
+            max_folds: Most recent folds kept per card
+            n_estimators: Trees per ensemble member (lower than production for speed)
+            interval_level: Nominal coverage of the prediction intervals (0.8, 0.9 or 0.95)
+            max_workers: Worker processes; 1 runs folds inline in this process
+        """
+        self.engines = engines or [NaiveEngine.name, EnsembleEngine.name]
+        self.min_train = min_train
+        self.horizon = horizon
+        self.step = step
+        self.max_folds = max_folds
+        self.n_estimators = n_estimators
+        self.interval_level = interval_level
+        self.max_workers = max_workers
+
+    def _tasks(self, histories: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        tasks = []
+        for card_key, history in histories.items():
+            history = sorted(history, key=lambda s: str(s['date']))
+            splits = walk_forward_splits(len(history), self.min_train, self.horizon, self.step, self.max_folds)
+            for fold, split in enumerate(splits):
+                tasks.append({
+                    'card_key': card_key,
+                    'fold': fold,
+                    'history': history[:split[1]],
+                    'split': split,
+                    'engines': self.engines,
+                    'n_estimators': self.n_estimators,
+                    'interval_level': self.interval_level
+                })
+        return tasks
+
+    def run(self, histories: Dict[str, List[Dict[str, Any]]]) -> BacktestReport:
+        """
+        Backtest every card history.
+
+        Args:
+            histories: Mapping of card key to sales list (title, price, date)
+
+        Returns:
+            BacktestReport with one FoldResult per card, fold, engine and model
+        """
+        start = time.perf_counter()
+        tasks = self._tasks(histories)
+        report = BacktestReport()
+
+        if self.max_workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                report.results.extend(_run_fold(task))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                for fold_results in executor.map(_run_fold, tasks):
+                    report.results.extend(fold_results)
+
+        report.wall_seconds = time.perf_counter() - start
+        return report
+
+    def run_archive(self, archive: SalesArchive) -> BacktestReport:
+        """Backtest every card stored in a sales archive."""
+        return self.run(dict(archive.items()))
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render a summary as a fixed-width table."""
+    header = f"{'model':<22}{'MAPE %':>10}{'coverage %':>12}{'fit s':>10}{'predict ms':>12}{'folds':>8}"
+    lines = [header, '-' * len(header)]
+    for key in sorted(summary):
+        row = summary[key]
+        lines.append(
+            f"{key:<22}{row['mape']:>10.2f}{row['coverage']:>12.1f}"
+            f"{row['mean_fit_seconds']:>10.3f}{row['mean_predict_seconds'] * 1000:>12.2f}{row['folds']:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line benchmark over synthetic or archived sales; never touches the network."""
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the price predictor")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--archive', help="Path to a sales archive JSON file")
+    source.add_argument('--synthetic', type=int, default=10, help="Number of synthetic cards to generate")
+    parser.add_argument('--points', type=int, default=120, help="Sales per synthetic card")
+    parser.add_argument('--min-train', type=int, default=30)
+    parser.add_argument('--horizon', type=int, default=7)
+    parser.add_argument('--step', type=int, default=7)
+    parser.add_argument('--max-folds', type=int, default=None)
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--interval-level', type=float, default=0.9, choices=sorted(Z_SCORES))
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--engines', default='naive,ensemble', help="Comma-separated engines to compare")
+    parser.add_argument('--json', dest='json_path', help="Write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.archive:
+        archive = SalesArchive(args.archive)
+    else:
+        archive = generate_synthetic_archive(n_cards=args.synthetic, n_points=args.points)
+
+    backtester = WalkForwardBacktester(
+        engines=[e.strip() for e in args.engines.split(',') if e.strip()],
+        min_train=args.min_train,
+        horizon=args.horizon,
+        step=args.step,
+        max_folds=args.max_folds,
+        n_estimators=args.n_estimators,
+        interval_level=args.interval_level,
+        max_workers=args.workers
+    )
+    report = backtester.run_archive(archive)
+
+    print(f"Backtested {len(archive)} cards in {report.wall_seconds:.2f}s")
+    print(format_summary(report.summary(by='model')))
+    print()
+    print(format_summary(report.summary(by='engine')))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({
+                'wall_seconds': report.wall_seconds,
+                'by_model': report.summary(by='model'),
+                'by_engine': report.summary(by='engine')
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+"""
+Batch price prediction module for Sports Card Analyzer Pro.
+Forecasts many cards at once, sharing feature state and a single global
+ensemble instead of training a model per card.
+"""
+
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from modules.core.feature_store import FEATURE_COLUMNS, FeatureStore, get_feature_store
+from modules.core.price_predictor import PricePredictor
+from modules.core.sales_archive import SalesArchive
+
+MIN_HISTORY = 7
+
+SalesLookup = Union[Dict[str, List[Dict[str, Any]]], Callable[[str], Optional[List[Dict[str, Any]]]]]
+
+_SEASONAL_COLUMN = FEATURE_COLUMNS.index('seasonal_factor')
+_WEEKLY_COLUMN = FEATURE_COLUMNS.index('weekly_factor')
+
+
+def _predict_card(task: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Train and predict one card. Module-level so it can be sent to worker processes."""
+    predictor = PricePredictor(n_estimators=task['n_estimators'], feature_store=FeatureStore(max_cards=1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = predictor.predict_future_prices(task['sales'], days_ahead=task['days_ahead'],
+                                                 card_key=task['card_key'])
+    return task['card_key'], result
+
+
+class BatchPricePredictor:
+    """Forecasts whole collections with shared features and a global model."""
+
+    def __init__(self,
+                 predictor: Optional[PricePredictor] = None,
+                 feature_store: Optional[FeatureStore] = None,
+                 archive: Optional[SalesArchive] = None,
+                 batch_size: int = 256,
+                 max_workers: Optional[int] = None,
+                 n_estimators: int = 200):
+        """
+        Initialize the batch predictor.
+
+        Args:
+            predictor: PricePredictor holding the shared model; a trained or loaded
+                one is used as-is, otherwise it is fit on the cards being predicted
+            feature_store: Store for per-card features (process-wide store by default)
+            archive: Sales archive consulted for cards with no sales supplied or stored
+            batch_size: Cards scored per vectorized model call
+            max_workers: Worker processes for per-card training; 1 trains inline
+            n_estimators: Trees per ensemble member when a model has to be trained
+        """
+        self.feature_store = feature_store if feature_store is not None else get_feature_store()
+        self.predictor = predictor or PricePredictor(n_estimators=n_estimators)
+        self.predictor.feature_store = self.feature_store
+        self.archive = archive
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.n_estimators = n_estimators
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.predictor.model_weights is not None
+
+    def _resolve_sales(self, card_key: str, sales_lookup: Optional[SalesLookup]) -> List[Dict[str, Any]]:
+        """Find sales for a card: the lookup first, then the feature store, then the archive."""
+        sales = None
+        if callable(sales_lookup):
+            sales = sales_lookup(card_key)
+        elif sales_lookup is not None:
+            sales = sales_lookup.get(card_key)
+        if not sales:
+            sales = self.feature_store.sales(card_key)
+        if not sales and self.archive is not None:
+            sales = self.archive.get_history(card_key)
+        return sales or []
+
+    def _frame(self, card_key: str, sales: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        self.feature_store.sync(card_key, sales)
+        return self.feature_store.frame(card_key, self.predictor.seasonal_factors, self.predictor.weekly_factors)
+
+    def fit_global(self, histories: Dict[str, List[Dict[str, Any]]]) -> Dict[str, float]:
+        """
+        Train one ensemble on the pooled feature rows of many cards.
+
+        Args:
+            histories: Mapping of card key to sales list (title, price, date)
+
+        Returns:
+            Model weights from PricePredictor.train_models
+        """
+        frames = []
+        for card_key, sales in histories.items():
+            df = self._frame(card_key, sales)
+            if df is not None and len(df) >= MIN_HISTORY:
+                frames.append(df)
+        if not frames:
+            raise ValueError("No card has enough sales history to train a global model")
+
+        pooled = pd.concat(frames, ignore_index=True).sort_values('date', kind='stable').reset_index(drop=True)
+        print(f"Training global model on {len(pooled)} rows from {len(frames)} cards")
+        return self.predictor.train_models(pooled)
+
+    def _future_block(self, df: pd.DataFrame, days_ahead: int) -> Tuple[List[pd.Timestamp], np.ndarray]:
+        """Future feature rows for one card: last known features with calendar factors per date."""
+        future_dates = pd.date_range(df['date'].max() + pd.Timedelta(days=1), periods=days_ahead)
+        block = np.tile(df[FEATURE_COLUMNS].iloc[-1].to_numpy(dtype=float), (days_ahead, 1))
+        block[:, _SEASONAL_COLUMN] = future_dates.month.map(self.predictor.seasonal_factors).to_numpy(dtype=float)
+        block[:, _WEEKLY_COLUMN] = future_dates.dayofweek.map(self.predictor.weekly_factors).to_numpy(dtype=float)
+        return list(future_dates), block
+
+    def _finalize(self, df: pd.DataFrame, sales: List[Dict[str, Any]], future_dates: List[pd.Timestamp],
+                  ensemble_pred: np.ndarray) -> Dict[str, Any]:
+        predictor = self.predictor
+        player_name = ' '.join(str(sales[0].get('title', '')).split()[0:2])
+        return predictor._finalize_prediction(
+            df, sales, future_dates, ensemble_pred, predictor.model_weights,
+            predictor.analyze_market_sentiment(sales), predictor.get_player_stats(player_name)
+        )
+
+    def _iter_global(self, cards: List[Tuple[str, List[Dict[str, Any]], pd.DataFrame]],
+                     days_ahead: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if not self.is_fitted:
+            self.fit_global({card_key: sales for card_key, sales, _ in cards})
+
+        for start in range(0, len(cards), self.batch_size):
+            chunk = cards[start:start + self.batch_size]
+            futures = [self._future_block(df, days_ahead) for _, _, df in chunk]
+            matrix = pd.DataFrame(np.vstack([block for _, block in futures]), columns=FEATURE_COLUMNS)
+            predictions = np.split(self.predictor.predict_ensemble(matrix), len(chunk))
+
+            for (card_key, sales, df), (future_dates, _), ensemble_pred in zip(chunk, futures, predictions):
+                try:
+                    yield card_key, self._finalize(df, sales, future_dates, ensemble_pred)
+                except Exception as e:
+                    print(f"Error finalizing prediction for {card_key}: {e}")
+                    yield card_key, self.predictor._trend_based_prediction(sales, days_ahead)
+
+    def _iter_per_card(self, cards: List[Tuple[str, List[Dict[str, Any]], pd.DataFrame]],
+                       days_ahead: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        tasks = [
+            {'card_key': card_key, 'sales': sales, 'days_ahead': days_ahead, 'n_estimators': self.n_estimators}
+            for card_key, sales, _ in cards
+        ]
+        if self.max_workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield _predict_card(task)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(_predict_card, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def iter_predictions(self,
+                         card_keys: List[str],
+                         sales_lookup: Optional[SalesLookup] = None,
+                         days_ahead: int = 90,
+                         mode: str = 'global') -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Forecast many cards, yielding each result as soon as it is ready.
+
+        Cards with fewer than seven usable sales get the trend-based projection
+        straight away; cards with no sales at all yield None.
+
+        Args:
+            card_keys: Keys from make_card_key
+            sales_lookup: Mapping or callable giving a card's sales; falls back to the
+                feature store and then the archive
+            days_ahead: Days to forecast (30 to 365)
+            mode: 'global' scores every card with one shared model in vectorized
+                batches; 'per_card' trains a model per card across worker processes
+
+        Returns:
+            Iterator of (card_key, prediction) pairs in the same format as
+            PricePredictor.predict_future_prices
+        """
+        if mode not in ('global', 'per_card'):
+            raise ValueError(f"Unknown prediction mode: {mode}")
+        days_ahead = max(30, min(days_ahead, 365))
+
+        cards = []
+        for card_key in dict.fromkeys(card_keys):
+            sales = self._resolve_sales(card_key, sales_lookup)
+            df = self._frame(card_key, sales) if sales else None
+            if df is None:
+                yield card_key, None
+            elif len(df) < MIN_HISTORY:
+                yield card_key, self.predictor._trend_based_prediction(sales, days_ahead)
+            else:
+                cards.append((card_key, sales, df))
+
+        if not cards:
+            return
+        if mode == 'global':
+            yield from self._iter_global(cards, days_ahead)
+        else:
+            yield from self._iter_per_card(cards, days_ahead)
+
+    def predict_many(self,
+                     card_keys: List[str],
+                     sales_lookup: Optional[SalesLookup] = None,
+                     days_ahead: int = 90,
+                     mode: str = 'global') -> Dict[str, Optional[Dict[str, Any]]]:
+        """Forecast many cards and collect the results by card key."""
+        return dict(self.iter_predictions(card_keys, sales_lookup, days_ahead, mode))
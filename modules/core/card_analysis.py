@@ -0,0 +1,248 @@
+"""
+Card analysis module for Sports Card Analyzer Pro.
+Builds the per-card bundle the trade analyzer needs (market value, volatility,
+liquidity and 30/90-day forecasts) from one scrape, market analysis and price
+prediction, and caches it by card key with a time-to-live so a card is only
+analyzed again once its bundle is stale.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
+
+from modules.core.lazy import lazy_import
+from modules.core.sales_archive import make_card_key
+
+ebay_interface = lazy_import('scrapers.ebay_interface')
+
+DEFAULT_CACHE_PATH = os.getenv('CARD_ANALYSIS_CACHE_PATH', os.path.join('data', 'card_analysis_cache.json'))
+
+DEFAULT_TTL_SECONDS = float(os.getenv('CARD_ANALYSIS_TTL_SECONDS', 6 * 60 * 60))
+
+
+def bundle_key(search_params: Dict[str, Any]) -> str:
+    """
+    Cache key for a search: the card key plus a short hash of the keywords it excludes.
+
+    Returns:
+        Key string, or "" when the search identifies no card
+    """
+    card_key = make_card_key(search_params)
+    if not card_key:
+        return ''
+    excluded = ' '.join(str(search_params.get('negative_keywords') or '').lower().split())
+    if not excluded:
+        return card_key
+    return f"{card_key}|-{hashlib.sha1(excluded.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _default_predictor():
+    from modules.core.price_predictor import PricePredictor
+    return PricePredictor()
+
+
+def _default_market_analyzer():
+    from modules.core.market_analysis import MarketAnalyzer
+    return MarketAnalyzer()
+
+
+def analyze_card(search_params: Dict[str, Any],
+                 scraper=None,
+                 market_analyzer=None,
+                 predictor=None) -> Optional[Dict[str, Any]]:
+    """
+    Search for a card and build its analysis bundle.
+
+    Args:
+        search_params: player_name, year, card_set, card_number, variation,
+            negative_keywords and scenario (the grade searched for)
+        scraper: Market data source (a new EbayInterface by default)
+        market_analyzer: MarketAnalyzer (a new one by default)
+        predictor: PricePredictor (a new one by default; predictors keep per-card state, so don't share one across threads)
+
+    Returns:
+        Bundle dictionary, or None if no matching sales were found
+    """
+    scraper = scraper if scraper is not None else ebay_interface.EbayInterface()
+    results = scraper.search_cards(**search_params)
+    if not results:
+        return None
+
+    # Filter results for exact variation if specified
+    variation = (search_params.get('variation') or '').lower()
+    if variation:
+        results = [card for card in results if variation in card['title'].lower()]
+    if not results:
+        return None
+
+    # Get the first card as representative
+    card = results[0]
+    market_analyzer = market_analyzer if market_analyzer is not None else _default_market_analyzer()
+    predictor = predictor if predictor is not None else _default_predictor()
+    market_data = market_analyzer.analyze_market_data(results)
+    predictions = predictor.predict_future_prices(results, card_key=bundle_key(search_params) or None)
+
+    return {
+        'title': card['title'],
+        'market_value': market_data['median_price'],
+        'price_volatility': predictions['price_volatility'],
+        'liquidity_score': market_data['liquidity_score'],
+        'market_trend': predictions['price_trend'],
+        'condition': search_params.get('scenario', 'Raw'),
+        'trend_direction': 'hot' if predictions['price_trend'] > 10 else 'cooling' if predictions['price_trend'] < -10 else 'stable',
+        'trend_score': predictions['price_trend'],
+        'volatility_score': predictions['price_volatility'],
+        '30_day_forecast': predictions['metrics']['30_day_forecast'],
+        '90_day_forecast': predictions['metrics']['90_day_forecast'],
+        'image_url': card.get('image_url')
+    }
+
+
+class CardAnalysisCache:
+    """Analysis bundles by card key, expiring after a TTL and computed concurrently on misses."""
+
+    def __init__(self,
+                 cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_workers: int = 4,
+                 analyze: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]] = analyze_card):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_path: JSON file bundles are loaded from and saved to, or None to keep them in memory
+            ttl_seconds: Age after which a bundle is recomputed
+            max_workers: Cards analyzed at once when several are missing
+            analyze: Function building a bundle from search parameters
+        """
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        self.analyze = analyze
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # One lock per key, so concurrent requests for the same card share one analysis
+        self._key_locks: Dict[str, threading.Lock] = {}
+        if cache_path and os.path.exists(cache_path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> None:
+        """Load bundles from the cache file, ignoring a missing or corrupt file."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                self._entries = {key: entry for key, entry in json.load(f).items()
+                                 if isinstance(entry, dict) and 'bundle' in entry}
+        except (OSError, ValueError) as e:
+            print(f"Could not load card analysis cache: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Write the bundles to the cache file."""
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            payload = json.dumps(self._entries, default=str)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(payload)
+        os.replace(temp_path, self.cache_path)
+
+    def _fresh(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.time() - entry['computed_at'] < self.ttl_seconds:
+            return entry['bundle']
+        return None
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _compute(self, key: str, search_params: Dict[str, Any], refresh: bool) -> Optional[Dict[str, Any]]:
+        with self._key_lock(key):
+            # Another caller may have finished this card while we waited
+            bundle = None if refresh else self._fresh(key)
+            if bundle is not None:
+                return bundle
+            try:
+                bundle = self.analyze(search_params)
+            except Exception as e:
+                print(f"Error analyzing card {key}: {str(e)}")
+                return None
+            if bundle is not None:
+                with self._lock:
+                    self._entries[key] = {'computed_at': time.time(), 'bundle': bundle}
+            return bundle
+
+    def get(self, search_params: Dict[str, Any], refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Analysis bundle for a search, computed only if missing, stale or refresh is set.
+
+        Returns:
+            A copy of the bundle, or None if the card wasn't found
+        """
+        return self.get_many([search_params], refresh=refresh)[0]
+
+    def get_many(self, searches: List[Dict[str, Any]], refresh: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analysis bundles for several searches; missing cards are analyzed concurrently.
+
+        Returns:
+            Bundle copies (or None for cards not found) in the order of searches
+        """
+        keys = [bundle_key(params) for params in searches]
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, params in zip(keys, searches):
+            if not key or key in results or key in pending:
+                continue
+            bundle = None if refresh else self._fresh(key)
+            if bundle is not None:
+                results[key] = bundle
+            else:
+                pending[key] = params
+
+        if pending:
+            workers = min(self.max_workers, len(pending))
+            if workers <= 1:
+                computed = [self._compute(key, params, refresh) for key, params in pending.items()]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    computed = list(executor.map(lambda item: self._compute(item[0], item[1], refresh),
+                                                 pending.items()))
+            results.update(zip(pending.keys(), computed))
+            try:
+                self.save()
+            except OSError as e:
+                print(f"Could not save card analysis cache: {e}")
+
+        return [dict(results[key]) if key and results.get(key) is not None else None for key in keys]
+
+    def invalidate(self, search_params: Optional[Dict[str, Any]] = None) -> None:
+        """Drop one card's bundle, or every bundle when no search is given."""
+        with self._lock:
+            if search_params is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(bundle_key(search_params), None)
+
+
+_default_cache: Optional[CardAnalysisCache] = None
+
+
+def get_card_analysis_cache() -> CardAnalysisCache:
+    """Get the process-wide card analysis cache, shared by every session."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CardAnalysisCache()
+    return _default_cache
@@ -0,0 +1,276 @@
+"""
+Collection index module for Sports Card Analyzer Pro.
+Columnar snapshot of a card collection with hash indexes on id and card key
+and inverted indexes on tag, player, set and year, so filtering, sorting and
+totals don't rescan every card dictionary on each page rerun.
+"""
+
+from typing import Dict, Iterable, List, Any, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+
+NUMERIC_FIELDS = ('purchase_price', 'current_value', 'roi', 'year')
+
+TEXT_FIELDS = ('id', 'player_name', 'year', 'card_set', 'card_number', 'variation', 'condition',
+               'purchase_date', 'notes')
+
+# Fields the free-text search looks in
+SEARCH_FIELDS = ('player_name', 'card_set', 'year', 'card_number', 'notes')
+
+FACETS = ('tag', 'player', 'set', 'year')
+
+
+def _as_dict(card: Any) -> Dict[str, Any]:
+    if hasattr(card, 'to_dict'):
+        return card.to_dict()
+    return card if isinstance(card, dict) else {}
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _text(value: Any) -> str:
+    return '' if _is_missing(value) else str(value)
+
+
+def _normalize(value: Any) -> str:
+    return ' '.join(_text(value).lower().split())
+
+
+def _facet_key(value: Any) -> str:
+    """Normalized player, set or year as stored in the inverted indexes."""
+    return _normalize(_text(value).replace('#', ''))
+
+
+def _number(value: Any) -> float:
+    """Float from numbers and currency strings such as "$1,200.00"; 0.0 when missing or unparseable."""
+    if _is_missing(value):
+        return 0.0
+    if isinstance(value, str):
+        value = value.replace('$', '').replace(',', '').strip()
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _tag_list(tags: Any) -> List[str]:
+    if isinstance(tags, str):
+        return [tag.strip() for tag in tags.split(',') if tag.strip()]
+    if isinstance(tags, (list, tuple, set)):
+        return [str(tag).strip() for tag in tags if tag and str(tag).strip()]
+    return []
+
+
+def card_tags(card: Dict[str, Any]) -> List[str]:
+    """A card's tags, whether stored as a list or a comma-separated string."""
+    return _tag_list(card.get('tags', []))
+
+
+def _map_unique(values: pd.Series, fn) -> pd.Series:
+    """Apply fn once per distinct value; collections repeat the same players, sets and years."""
+    try:
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    except TypeError:
+        return values.map(fn)
+    mapped = np.array([fn(value) for value in uniques] or [''], dtype=object)
+    return pd.Series(mapped[codes], index=values.index, dtype=object)
+
+
+def _number_series(values: pd.Series) -> np.ndarray:
+    """Vectorized _number."""
+    numbers = pd.to_numeric(values, errors='coerce')
+    unparsed = numbers.isna() & values.notna()
+    if unparsed.any():
+        cleaned = values[unparsed].astype(str).str.replace(r'[$,\s]', '', regex=True)
+        numbers[unparsed] = pd.to_numeric(cleaned, errors='coerce')
+    return numbers.fillna(0).to_numpy(dtype=float)
+
+
+def _postings(values: pd.Series) -> Dict[str, np.ndarray]:
+    """Value to sorted positions, from a Series indexed by position."""
+    if values.empty:
+        return {}
+    codes, uniques = pd.factorize(values.to_numpy())
+    order = np.argsort(codes, kind='stable')
+    positions = values.index.to_numpy(dtype=np.int64)[order]
+    groups = np.split(positions, np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1])
+    return dict(zip(uniques, groups))
+
+
+def identity_key(player_name: Any, year: Any, card_set: Any, card_number: Any) -> str:
+    """Key used to detect the same card added twice (variation is ignored)."""
+    return '|'.join(_facet_key(value) for value in (player_name, year, card_set, card_number))
+
+
+class CollectionIndex:
+    """Immutable columnar view of a collection; rebuild it when the collection changes."""
+
+    def __init__(self, cards: Iterable[Any]):
+        """
+        Build the columns and indexes.
+
+        Args:
+            cards: Card dictionaries or Card objects; they're kept as-is and
+                returned by records()
+        """
+        self.cards = list(cards)
+        records = [_as_dict(card) for card in self.cards]
+        raw = pd.DataFrame.from_records(records, columns=list(dict.fromkeys(TEXT_FIELDS + NUMERIC_FIELDS + ('tags',))),
+                                        index=pd.RangeIndex(len(records)))
+
+        text = {field: _map_unique(raw[field], _text) for field in TEXT_FIELDS}
+
+        self.frame = pd.DataFrame({
+            **text,
+            **{field: _number_series(raw[field]) for field in NUMERIC_FIELDS if field != 'year'},
+            'year_number': pd.to_numeric(raw['year'], errors='coerce').fillna(0).astype(float)
+        })
+        self.frame['purchase_date'] = pd.to_datetime(self.frame['purchase_date'], errors='coerce', format='mixed')
+        self._search = text[SEARCH_FIELDS[0]].str.lower()
+        for field in SEARCH_FIELDS[1:]:
+            self._search = self._search + '\n' + text[field].str.lower()
+
+        ids = text['id'][text['id'] != '']
+        ids = ids[~ids.duplicated()]
+        self._by_id: Dict[str, int] = dict(zip(ids.to_numpy(), ids.index.to_numpy()))
+
+        # Card key as sales_archive.make_card_key builds it, without a scenario
+        key_parts = [_map_unique(raw[field], _facet_key)
+                     for field in ('year', 'player_name', 'card_set', 'card_number', 'variation')]
+        card_keys = key_parts[0].str.cat(key_parts[1:], sep='|')
+        card_keys = card_keys.where(card_keys.str.strip('|') != '', '')
+        self._by_key: Dict[str, np.ndarray] = _postings(card_keys[card_keys != ''])
+        identities = key_parts[1].str.cat([key_parts[0], key_parts[2], key_parts[3]], sep='|')
+        self._by_identity: Dict[str, np.ndarray] = _postings(identities)
+
+        tags = raw['tags'].map(_tag_list).explode().dropna()
+        tags = tags[~pd.Series(list(zip(tags.index, tags)), index=tags.index).duplicated()]
+        self._inverted: Dict[str, Dict[str, np.ndarray]] = {
+            'tag': _postings(tags),
+            'player': _postings(key_parts[1]),
+            'set': _postings(key_parts[2]),
+            'year': _postings(key_parts[0])
+        }
+        self._ranks: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def records(self, positions: Optional[Sequence[int]] = None) -> List[Any]:
+        """The original cards at the given positions (all of them by default), in that order."""
+        if positions is None:
+            return list(self.cards)
+        return [self.cards[i] for i in positions]
+
+    def position_of(self, card_id: Any) -> Optional[int]:
+        """Position of the card with this id, or None."""
+        return self._by_id.get(_text(card_id))
+
+    def positions_for_key(self, card_key: str) -> List[int]:
+        """Positions of cards with this card key (see sales_archive.make_card_key)."""
+        return list(self._by_key.get(card_key, []))
+
+    def find_duplicates(self, player_name: Any, year: Any, card_set: Any, card_number: Any) -> List[int]:
+        """Positions of cards with the same player, year, set and number."""
+        return list(self._by_identity.get(identity_key(player_name, year, card_set, card_number), []))
+
+    def values(self, facet: str) -> List[str]:
+        """Distinct indexed values of a facet ('tag', 'player', 'set' or 'year'), sorted."""
+        return sorted(value for value in self._inverted[facet] if value)
+
+    def unique_tags(self) -> List[str]:
+        return self.values('tag')
+
+    def counts(self, facet: str) -> Dict[str, int]:
+        """Number of cards per value of a facet."""
+        return {value: len(positions) for value, positions in self._inverted[facet].items() if value}
+
+    def _matching(self, facet: str, values: Iterable[Any]) -> np.ndarray:
+        index = self._inverted[facet]
+        keys = [str(value).strip() if facet == 'tag' else _facet_key(value) for value in values]
+        arrays = [index[key] for key in keys if key in index]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays)) if len(arrays) > 1 else arrays[0]
+
+    def filter(self,
+               search: Optional[str] = None,
+               tags: Optional[Iterable[str]] = None,
+               players: Optional[Iterable[str]] = None,
+               sets: Optional[Iterable[str]] = None,
+               years: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Positions of cards matching every given criterion, in collection order.
+
+        Args:
+            search: Case-insensitive substring of player, set, year, number or notes
+            tags: Cards with any of these tags
+            players: Cards of any of these players (case-insensitive)
+            sets: Cards from any of these sets (case-insensitive)
+            years: Cards from any of these years
+
+        Returns:
+            Sorted array of positions
+        """
+        positions: Optional[np.ndarray] = None
+        for facet, values in (('tag', tags), ('player', players), ('set', sets), ('year', years)):
+            if values:
+                matched = self._matching(facet, values)
+                positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+
+        term = (search or '').strip().lower()
+        if term:
+            candidates = self._search if positions is None else self._search.iloc[positions]
+            mask = candidates.str.contains(term, regex=False).to_numpy(dtype=bool)
+            positions = (np.flatnonzero(mask) if positions is None else positions[mask])
+
+        if positions is None:
+            return np.arange(len(self), dtype=np.int64)
+        return positions
+
+    def _rank(self, field: str) -> np.ndarray:
+        """Sort rank of every card for a field (numbers numerically, text case-insensitively)."""
+        if field not in self._ranks:
+            if field == 'year':
+                keys = self.frame['year_number'].to_numpy()
+            elif field in NUMERIC_FIELDS:
+                keys = self.frame[field].to_numpy()
+            elif field == 'purchase_date':
+                keys = self.frame[field].dt.strftime('%Y-%m-%d').fillna('').to_numpy(dtype=object)
+            elif field in self.frame:
+                keys = self.frame[field].str.lower().to_numpy(dtype=object)
+            else:
+                raise ValueError(f"Cannot sort by {field}")
+            ranks = np.empty(len(keys), dtype=np.int64)
+            ranks[np.argsort(keys, kind='stable')] = np.arange(len(keys))
+            self._ranks[field] = ranks
+        return self._ranks[field]
+
+    def sort(self, positions: Sequence[int], field: str, descending: bool = False) -> np.ndarray:
+        """Reorder positions by a field."""
+        positions = np.asarray(positions, dtype=np.int64)
+        ranks = self._rank(field)[positions]
+        order = np.argsort(-ranks if descending else ranks, kind='stable')
+        return positions[order]
+
+    def summary(self, positions: Optional[Sequence[int]] = None) -> Dict[str, float]:
+        """Card count, total cost, total value and overall ROI of the given cards (all by default)."""
+        frame = self.frame if positions is None else self.frame.iloc[np.asarray(positions, dtype=np.int64)]
+        total_cost = float(frame['purchase_price'].sum())
+        total_value = float(frame['current_value'].sum())
+        return {
+            'total_cards': len(frame),
+            'total_cost': total_cost,
+            'total_value': total_value,
+            'total_roi': ((total_value - total_cost) / total_cost * 100) if total_cost > 0 else 0
+        }
+
+    def totals_by(self, facet: str) -> pd.DataFrame:
+        """Card count, cost and value per player, set or year."""
+        column = {'player': 'player_name', 'set': 'card_set', 'year': 'year'}[facet]
+        return (self.frame.groupby(self.frame[column].str.strip(), sort=True)
+                .agg(cards=('current_value', 'size'), total_cost=('purchase_price', 'sum'),
+                     total_value=('current_value', 'sum')))
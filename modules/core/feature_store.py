@@ -0,0 +1,435 @@
+"""
+Feature store module for Sports Card Analyzer Pro.
+Keeps per-card rolling-window state so PricePredictor features can be
+appended in O(1) per new sale instead of being rebuilt from scratch.
+"""
+
+import math
+import threading
+from collections import Counter, deque
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Feature columns shared by training, inference and backtesting
+FEATURE_COLUMNS = [
+    'price_ma7', 'price_ma30', 'price_std7', 'price_std30',
+    'price_momentum', 'price_volatility', 'volume_ma7', 'volume_ma30',
+    'price_lag1', 'price_lag7', 'price_lag30',
+    'seasonal_factor', 'weekly_factor'
+]
+
+# Columns stored per row; seasonal/weekly factors are mapped from month and
+# day_of_week at read time so the store doesn't depend on the factor tables
+RAW_COLUMNS = [
+    'year', 'month', 'day_of_week', 'day_of_month', 'quarter',
+    'price_ma7', 'price_ma30', 'price_std7', 'price_std30',
+    'price_momentum', 'price_volatility', 'volume_ma7', 'volume_ma30',
+    'price_lag1', 'price_lag7', 'price_lag30',
+    'price_forward7', 'price_forward30'
+]
+
+_COL = {name: i for i, name in enumerate(RAW_COLUMNS)}
+_MAX_LAG = 30
+
+
+class RollingWindow:
+    """Fixed-size window with O(1) mean and sample standard deviation (sliding Welford)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        if len(self.values) == self.size:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(self.values)
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        # Called after the value has been popped, so n counts it back in
+        n = len(self.values) + 1
+        if n == 1:
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        old_mean = self.mean
+        self.mean = (old_mean * n - value) / (n - 1)
+        self._m2 -= (value - old_mean) * (value - self.mean)
+
+    def std(self) -> float:
+        """Sample standard deviation, NaN with fewer than two values (matches pandas rolling)."""
+        n = len(self.values)
+        if n < 2:
+            return float('nan')
+        return math.sqrt(max(self._m2, 0.0) / (n - 1))
+
+
+class CardFeatureState:
+    """Rolling-window state and raw feature rows for one card's sales history."""
+
+    def __init__(self):
+        self.dates: List[pd.Timestamp] = []
+        self.titles: List[str] = []
+        self._prices = np.empty(0)
+        self._volumes = np.empty(0)
+        self._raw = np.empty((0, len(RAW_COLUMNS)))
+        self._n = 0
+        self._signatures: Counter = Counter()
+        self._reset_windows()
+        self._frame_cache: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _reset_windows(self) -> None:
+        self._price7 = RollingWindow(7)
+        self._price30 = RollingWindow(30)
+        self._volume7 = RollingWindow(7)
+        self._volume30 = RollingWindow(30)
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._prices):
+            return
+        capacity = max(capacity, 2 * len(self._prices), 64)
+        prices = np.empty(capacity)
+        volumes = np.empty(capacity)
+        raw = np.full((capacity, len(RAW_COLUMNS)), np.nan)
+        prices[:self._n] = self._prices[:self._n]
+        volumes[:self._n] = self._volumes[:self._n]
+        raw[:self._n] = self._raw[:self._n]
+        self._prices, self._volumes, self._raw = prices, volumes, raw
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        return self.dates[-1] if self.dates else None
+
+    def append(self, date: pd.Timestamp, price: float, volume: float = 1.0, title: str = '') -> None:
+        """
+        Append one sale and compute its feature row in O(1).
+
+        Args:
+            date: Sale date; must not be earlier than the last appended sale
+            price: Sale price
+            volume: Units sold (defaults to 1 like prepare_data)
+            title: Listing title
+        """
+        if self.dates and date < self.dates[-1]:
+            raise ValueError("Sales must be appended in date order")
+
+        i = self._n
+        self._reserve(i + 1)
+        self._prices[i] = price
+        self._volumes[i] = volume
+        self._price7.add(price)
+        self._price30.add(price)
+        self._volume7.add(volume)
+        self._volume30.add(volume)
+
+        row = self._raw[i]
+        row[:] = np.nan
+        row[_COL['year']] = date.year
+        row[_COL['month']] = date.month
+        row[_COL['day_of_week']] = date.dayofweek
+        row[_COL['day_of_month']] = date.day
+        row[_COL['quarter']] = date.quarter
+        ma7 = self._price7.mean
+        std7 = self._price7.std()
+        row[_COL['price_ma7']] = ma7
+        row[_COL['price_ma30']] = self._price30.mean
+        row[_COL['price_std7']] = std7
+        row[_COL['price_std30']] = self._price30.std()
+        row[_COL['price_momentum']] = (price - ma7) / ma7 if ma7 else np.nan
+        row[_COL['price_volatility']] = std7 / ma7 if ma7 else np.nan
+        row[_COL['volume_ma7']] = self._volume7.mean
+        row[_COL['volume_ma30']] = self._volume30.mean
+        for lag in (1, 7, 30):
+            if i >= lag:
+                row[_COL[f'price_lag{lag}']] = self._prices[i - lag]
+
+        # This sale is the forward target of earlier rows
+        if i >= 7:
+            self._raw[i - 7, _COL['price_forward7']] = price
+        if i >= 30:
+            self._raw[i - 30, _COL['price_forward30']] = price
+
+        self.dates.append(date)
+        self.titles.append(title)
+        self._signatures[(date, price, title)] += 1
+        self._n += 1
+        self._frame_cache = None
+
+    def load(self, dates: List[pd.Timestamp], prices: np.ndarray, volumes: np.ndarray, titles: List[str]) -> None:
+        """
+        Replace the state with a full, date-sorted history using vectorized pandas.
+
+        The rolling windows are re-seeded from the tail so later appends stay O(1).
+        """
+        n = len(prices)
+        price = pd.Series(prices, dtype=float)
+        volume = pd.Series(volumes, dtype=float)
+        date_index = pd.DatetimeIndex(dates)
+        ma7 = price.rolling(window=7, min_periods=1).mean()
+        std7 = price.rolling(window=7, min_periods=1).std()
+        columns = {
+            'year': date_index.year,
+            'month': date_index.month,
+            'day_of_week': date_index.dayofweek,
+            'day_of_month': date_index.day,
+            'quarter': date_index.quarter,
+            'price_ma7': ma7,
+            'price_ma30': price.rolling(window=30, min_periods=1).mean(),
+            'price_std7': std7,
+            'price_std30': price.rolling(window=30, min_periods=1).std(),
+            'price_momentum': (price - ma7) / ma7,
+            'price_volatility': std7 / ma7,
+            'volume_ma7': volume.rolling(window=7, min_periods=1).mean(),
+            'volume_ma30': volume.rolling(window=30, min_periods=1).mean(),
+            'price_lag1': price.shift(1),
+            'price_lag7': price.shift(7),
+            'price_lag30': price.shift(30),
+            'price_forward7': price.shift(-7),
+            'price_forward30': price.shift(-30)
+        }
+
+        self._prices = np.empty(0)
+        self._n = 0
+        self._reserve(n)
+        self._prices[:n] = prices
+        self._volumes[:n] = volumes
+        if n:
+            self._raw[:n] = np.column_stack([np.asarray(columns[c], dtype=float) for c in RAW_COLUMNS])
+        self._n = n
+        self.dates = list(date_index)
+        self.titles = list(titles)
+        self._signatures = Counter(zip(self.dates, (float(p) for p in prices), self.titles))
+
+        self._reset_windows()
+        for p, v in zip(prices[-_MAX_LAG:], volumes[-_MAX_LAG:]):
+            self._price7.add(float(p))
+            self._price30.add(float(p))
+            self._volume7.add(float(v))
+            self._volume30.add(float(v))
+        self._frame_cache = None
+
+    def history(self) -> List[Tuple[pd.Timestamp, float, float, str]]:
+        """Return the ingested sales as (date, price, volume, title) tuples."""
+        return list(zip(self.dates, self._prices[:self._n].tolist(), self._volumes[:self._n].tolist(), self.titles))
+
+    def missing(self, sales: List[Tuple[pd.Timestamp, float, float, str]]) -> List[Tuple[pd.Timestamp, float, float, str]]:
+        """Return the sales not yet ingested, respecting duplicate counts."""
+        remaining = Counter(self._signatures)
+        new_sales = []
+        for sale in sales:
+            signature = (sale[0], sale[1], sale[3])
+            if remaining[signature] > 0:
+                remaining[signature] -= 1
+            else:
+                new_sales.append(sale)
+        return new_sales
+
+    def frame(self, seasonal_factors: Dict[int, float], weekly_factors: Dict[int, float]) -> pd.DataFrame:
+        """
+        Build the feature frame in the layout prepare_data has always returned.
+
+        Undefined windows, lags and forward targets are forward- then back-filled.
+        """
+        if self._frame_cache is None:
+            raw = pd.DataFrame(self._raw[:self._n], columns=RAW_COLUMNS)
+            for column in ('year', 'month', 'day_of_week', 'day_of_month', 'quarter'):
+                raw[column] = raw[column].astype(int)
+            base = pd.DataFrame({
+                'title': self.titles,
+                'price': self._prices[:self._n],
+                'date': pd.DatetimeIndex(self.dates),
+                'volume': self._volumes[:self._n]
+            })
+            self._frame_cache = pd.concat([base, raw], axis=1).ffill().bfill()
+
+        df = self._frame_cache.copy()
+        df['seasonal_factor'] = df['month'].map(seasonal_factors)
+        df['weekly_factor'] = df['day_of_week'].map(weekly_factors)
+        return df
+
+
+def _normalize_sales(sales: List[Dict[str, Any]]) -> List[Tuple[pd.Timestamp, float, float, str]]:
+    """Coerce raw sale dicts into sorted (date, price, volume, title) tuples, dropping unusable ones."""
+    normalized = []
+    for sale in sales:
+        try:
+            price = float(sale['price'])
+            date = pd.Timestamp(sale['date'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if math.isnan(price) or pd.isna(date):
+            continue
+        volume = sale.get('volume', 1)
+        try:
+            volume = float(volume)
+        except (TypeError, ValueError):
+            volume = 1.0
+        normalized.append((date, price, volume, sale.get('title', '')))
+    normalized.sort(key=lambda s: s[0])
+    return normalized
+
+
+class FeatureStore:
+    """Per-card feature states, shared across predictions in the same process."""
+
+    def __init__(self, max_cards: int = 1000):
+        """
+        Initialize the store.
+
+        Args:
+            max_cards: Cards kept in memory; the least recently used is evicted beyond this
+        """
+        self.max_cards = max_cards
+        self._states: Dict[str, CardFeatureState] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, card_key: str) -> bool:
+        return card_key in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _state(self, card_key: str) -> CardFeatureState:
+        state = self._states.pop(card_key, None)
+        if state is None:
+            state = CardFeatureState()
+            if len(self._states) >= self.max_cards:
+                self._states.pop(next(iter(self._states)))
+        self._states[card_key] = state
+        return state
+
+    def sync(self, card_key: str, sales: List[Dict[str, Any]]) -> int:
+        """
+        Ingest any sales of a card not seen before.
+
+        New sales dated on or after the last stored sale are appended in O(1)
+        each; an out-of-order sale triggers a vectorized rebuild of that card.
+
+        Args:
+            card_key: Key identifying the card (see make_card_key)
+            sales: Sales dictionaries with price, date and optional title/volume
+
+        Returns:
+            Number of sales added
+        """
+        normalized = _normalize_sales(sales)
+        with self._lock:
+            state = self._state(card_key)
+            new_sales = state.missing(normalized)
+            self._ingest(state, new_sales)
+            return len(new_sales)
+
+    def mirror(self, card_key: str, sales: List[Dict[str, Any]]) -> int:
+        """
+        Make a card's state hold exactly the given sales.
+
+        Sales not seen before are appended as in sync. If the state also holds
+        sales the input doesn't (from a search with other filters, or sales that
+        dropped out of the results) it is rebuilt from the input instead, so the
+        features always reflect the sales passed in.
+
+        Returns:
+            Number of sales added (all of them after a rebuild)
+        """
+        normalized = _normalize_sales(sales)
+        with self._lock:
+            state = self._state(card_key)
+            new_sales = state.missing(normalized)
+            if len(state) + len(new_sales) != len(normalized):
+                state.load(
+                    [s[0] for s in normalized],
+                    np.array([s[1] for s in normalized], dtype=float),
+                    np.array([s[2] for s in normalized], dtype=float),
+                    [s[3] for s in normalized]
+                )
+                return len(normalized)
+            self._ingest(state, new_sales)
+            return len(new_sales)
+
+    @staticmethod
+    def _ingest(state: CardFeatureState, new_sales: List[Tuple[pd.Timestamp, float, float, str]]) -> None:
+        if not new_sales:
+            return
+        if len(state) == 0 or new_sales[0][0] < state.last_date:
+            history = sorted(state.history() + new_sales, key=lambda s: s[0])
+            state.load(
+                [s[0] for s in history],
+                np.array([s[1] for s in history], dtype=float),
+                np.array([s[2] for s in history], dtype=float),
+                [s[3] for s in history]
+            )
+        else:
+            for date, price, volume, title in new_sales:
+                state.append(date, price, volume, title)
+
+    def append(self, card_key: str, sale: Dict[str, Any]) -> None:
+        """Append a single new sale to a card."""
+        self.sync(card_key, [sale])
+
+    def frame(self, card_key: str, seasonal_factors: Dict[int, float], weekly_factors: Dict[int, float]) -> Optional[pd.DataFrame]:
+        """Get the full feature frame for a card, or None if it has no sales."""
+        with self._lock:
+            state = self._states.get(card_key)
+            if state is None or len(state) == 0:
+                return None
+            return state.frame(seasonal_factors, weekly_factors)
+
+    def matrix(self, card_key: str, seasonal_factors: Dict[int, float], weekly_factors: Dict[int, float],
+               columns: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """Get the precomputed feature matrix (FEATURE_COLUMNS by default) for a card."""
+        df = self.frame(card_key, seasonal_factors, weekly_factors)
+        if df is None:
+            return None
+        return df[columns or FEATURE_COLUMNS].to_numpy(dtype=float)
+
+    def sales(self, card_key: str) -> List[Dict[str, Any]]:
+        """Get the sales ingested for a card as dictionaries, oldest first."""
+        with self._lock:
+            state = self._states.get(card_key)
+            if state is None:
+                return []
+            return [
+                {'title': title, 'price': price, 'date': date, 'volume': volume}
+                for date, price, volume, title in state.history()
+            ]
+
+    def drop(self, card_key: str) -> None:
+        """Forget a card's state."""
+        with self._lock:
+            self._states.pop(card_key, None)
+
+
+def build_feature_frame(sales: List[Dict[str, Any]],
+                        seasonal_factors: Dict[int, float],
+                        weekly_factors: Dict[int, float]) -> Optional[pd.DataFrame]:
+    """One-shot feature frame for sales that aren't tracked in a store."""
+    normalized = _normalize_sales(sales)
+    if not normalized:
+        return None
+    state = CardFeatureState()
+    state.load(
+        [s[0] for s in normalized],
+        np.array([s[1] for s in normalized], dtype=float),
+        np.array([s[2] for s in normalized], dtype=float),
+        [s[3] for s in normalized]
+    )
+    return state.frame(seasonal_factors, weekly_factors)
+
+
+_default_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """Get the process-wide feature store."""
+    global _default_store
+    if _default_store is None:
+        _default_store = FeatureStore()
+    return _default_store
@@ -3,6 +3,7 @@ from firebase_admin import credentials, firestore
 from typing import Dict, Any, Optional, List
 import json
 import os
+from modules.services.firestore_executor import run_blocking
 
 class FirebaseService:
     def __init__(self, credentials_path: str):
@@ -14,23 +15,23 @@ class FirebaseService:
     async def create_document(self, collection: str, data: Dict[str, Any]) -> Any:
         """Create a new document in the specified collection"""
         doc_ref = self.db.collection(collection).document()
-        doc_ref.set(data)
+        await run_blocking(doc_ref.set, data)
         return doc_ref
 
     async def get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a document by ID from the specified collection"""
-        doc = self.db.collection(collection).document(doc_id).get()
+        doc = await run_blocking(self.db.collection(collection).document(doc_id).get)
         return doc.to_dict() if doc.exists else None
 
     async def update_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
         """Update a document in the specified collection"""
-        self.db.collection(collection).document(doc_id).update(data)
+        await run_blocking(self.db.collection(collection).document(doc_id).update, data)
 
     async def delete_document(self, collection: str, doc_id: str) -> bool:
         """Delete a document from the specified collection"""
         doc = self.db.collection(collection).document(doc_id)
-        if doc.get().exists:
-            doc.delete()
+        if (await run_blocking(doc.get)).exists:
+            await run_blocking(doc.delete)
             return True
         return False
 
@@ -42,7 +43,7 @@ class FirebaseService:
             for field, value in filters.items():
                 query = query.where(field, '==', value)
         
-        docs = query.stream()
+        docs = await run_blocking(lambda: list(query.stream()))
         return {doc.id: doc.to_dict() for doc in docs}
 
     async def batch_create(self, collection: str, items: List[Dict[str, Any]]) -> List[Any]:
@@ -55,7 +56,7 @@ class FirebaseService:
             batch.set(doc_ref, item)
             doc_refs.append(doc_ref)
         
-        batch.commit()
+        await run_blocking(batch.commit)
         return doc_refs
 
     async def batch_update(self, collection: str, updates: Dict[str, Dict[str, Any]]) -> None:
@@ -66,7 +67,7 @@ class FirebaseService:
             doc_ref = self.db.collection(collection).document(doc_id)
             batch.update(doc_ref, data)
         
-        batch.commit()
+        await run_blocking(batch.commit)
 
     async def batch_delete(self, collection: str, doc_ids: List[str]) -> None:
         """Delete multiple documents in a batch"""
@@ -76,4 +77,4 @@ class FirebaseService:
             doc_ref = self.db.collection(collection).document(doc_id)
             batch.delete(doc_ref)
         
-        batch.commit() 
\ No newline at end of file
+        await run_blocking(batch.commit) 
\ No newline at end of file
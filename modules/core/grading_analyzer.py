@@ -1,6 +1,11 @@
 from typing import Dict, List, Any
 import streamlit as st
 from modules.ui.indicators import RecommendationIndicator
+from modules.core.market_tables import card_era, get_market_tables
+from modules.core.grading_simulator import DEFAULT_SHIPPING_COST, GRADING_SERVICES, GradingSimulator
+
+# Premiums over raw until the market tables have learned them
+DEFAULT_GRADED_MULTIPLIERS = {'PSA 9': 1.5, 'PSA 10': 3.0}
 
 class GradingAnalyzer:
     @staticmethod
@@ -18,13 +23,15 @@ class GradingAnalyzer:
         # Get current market value
         current_value = market_data['metrics']['avg_price']
         
-        # Default multipliers if no graded sales found
-        psa9_multiplier = 1.5
-        psa10_multiplier = 3.0
+        # Grade premiums for the card's sport, set and era if no graded sales found
+        tables = get_market_tables()
+        segment = (card_data.get('sport', ''), card_data.get('card_set', ''), card_era(card_data.get('year')))
+        psa9_multiplier = tables.grade_premium('PSA 9', *segment, defaults=DEFAULT_GRADED_MULTIPLIERS)
+        psa10_multiplier = tables.grade_premium('PSA 10', *segment, defaults=DEFAULT_GRADED_MULTIPLIERS)
         
         # Initialize price sources
-        psa9_source = f"Estimated ({psa9_multiplier}x raw value)"
-        psa10_source = f"Estimated ({psa10_multiplier}x raw value)"
+        psa9_source = f"Estimated ({psa9_multiplier:.1f}x raw value)"
+        psa10_source = f"Estimated ({psa10_multiplier:.1f}x raw value)"
         
         # Search for actual PSA 9 and PSA 10 sales
         psa9_price = None
@@ -46,9 +53,10 @@ class GradingAnalyzer:
             else:
                 psa10_price = current_value * psa10_multiplier
         
-        # Calculate grading costs
-        grading_fee = 25.0  # PSA grading fee
-        shipping_cost = 10.0  # Estimated shipping cost
+        # Calculate grading costs for the chosen tier (PSA value tier by default)
+        grading_service = card_data.get('grading_service', 'value')
+        grading_fee = GRADING_SERVICES[grading_service]['fee']
+        shipping_cost = float(card_data.get('shipping_cost', DEFAULT_SHIPPING_COST))
         total_grading_cost = grading_fee + shipping_cost
         
         # Calculate break-even prices and profits
@@ -60,6 +68,16 @@ class GradingAnalyzer:
         psa9_roi = (psa9_profit / break_even * 100) if psa9_profit and break_even > 0 else None
         psa10_roi = (psa10_profit / break_even * 100) if psa10_profit and break_even > 0 else None
         
+        # Simulate grade outcomes and price moves for expected profit and its odds
+        simulation = GradingSimulator(seed=0).simulate(
+            [dict(card_data, raw_value=current_value, condition=card_data.get('condition', 'Raw'))],
+            service=grading_service,
+            shipping_cost=shipping_cost,
+            seller_fee_percentage=0.0
+        )
+        expected_profit = float(simulation['expected_value'].iloc[0]) if not simulation.empty else None
+        profit_probability = float(simulation['probability_of_profit'].iloc[0]) * 100 if not simulation.empty else None
+        
         # Generate recommendation
         recommendation = RecommendationIndicator.get_grading_recommendation(
             psa10_profit,
@@ -81,6 +99,8 @@ class GradingAnalyzer:
             'psa10_profit': psa10_profit,
             'psa9_roi': psa9_roi,
             'psa10_roi': psa10_roi,
+            'expected_profit': expected_profit,
+            'profit_probability': profit_probability,
             'recommendation': recommendation['recommendation'],
             'recommendation_color': recommendation['color'],
             'recommendation_icon': recommendation['icon']
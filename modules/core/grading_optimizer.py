@@ -0,0 +1,190 @@
+"""
+Grading optimizer module for Sports Card Analyzer Pro.
+Chooses which raw cards to send for grading, and at which service tier, to
+maximize expected profit within a budget and a turnaround deadline.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Union
+import numpy as np
+import pandas as pd
+
+from modules.core.grading_simulator import DEFAULT_SHIPPING_COST, GRADING_SERVICES, GradingSimulator
+from modules.core.market_tables import MarketTables, get_market_tables
+
+# Budget cells above this make the DP coarsen its cost resolution
+MAX_BUDGET_CELLS = 200_000
+
+# Cells of the DP's choice table (cards x budget cells, one byte each) above
+# this coarsen the cost resolution too, so large collections stay in memory
+MAX_CHOICE_CELLS = 20_000_000
+
+PLAN_COLUMNS = ['card_index', 'id', 'service', 'cost', 'expected_value', 'downside',
+                'probability_of_profit', 'expected_days']
+
+
+@dataclass
+class SubmissionPlan:
+    """Cards chosen for a grading submission."""
+    selections: pd.DataFrame
+    budget: float
+    deadline_days: Optional[int]
+    total_cost: float = 0.0
+    expected_profit: float = 0.0
+    candidates: int = 0
+    services: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'budget': self.budget,
+            'deadline_days': self.deadline_days,
+            'total_cost': self.total_cost,
+            'expected_profit': self.expected_profit,
+            'candidates': self.candidates,
+            'services': self.services,
+            'selections': self.selections.to_dict('records')
+        }
+
+
+class GradingOptimizer:
+    """Multiple-choice knapsack over per-card, per-tier grading EV."""
+
+    def __init__(self,
+                 n_simulations: int = 1000,
+                 seed: int = 0,
+                 market_tables: Optional[MarketTables] = None,
+                 shipping_cost: float = DEFAULT_SHIPPING_COST,
+                 seller_fee_percentage: float = 12.9):
+        """
+        Initialize the optimizer.
+
+        Args:
+            n_simulations: Monte Carlo draws per card and tier
+            seed: Seed shared by every tier so tiers are compared on the same draws
+            market_tables: Grade premium tables (the process-wide tables by default)
+            shipping_cost: Shipping and insurance per card
+            seller_fee_percentage: Marketplace fee on the eventual sale
+        """
+        self.n_simulations = n_simulations
+        self.seed = seed
+        self.market_tables = market_tables if market_tables is not None else get_market_tables()
+        self.shipping_cost = shipping_cost
+        self.seller_fee_percentage = seller_fee_percentage
+
+    def options(self,
+                cards: Union[List[Dict[str, Any]], pd.DataFrame],
+                services: Optional[List[str]] = None,
+                deadline_days: Optional[int] = None) -> pd.DataFrame:
+        """
+        Simulate every raw card at every eligible tier.
+
+        Tiers whose mean turnaround exceeds the deadline are left out, as are
+        options that don't have positive expected profit.
+
+        Returns:
+            One row per (card, tier) option with its cost and simulated profit stats
+        """
+        services = services or list(GRADING_SERVICES)
+        frames = []
+        for service in services:
+            if service not in GRADING_SERVICES:
+                raise ValueError(f"Unknown grading service: {service}")
+            if deadline_days is not None and GRADING_SERVICES[service]['turnaround_days'] > deadline_days:
+                continue
+            simulator = GradingSimulator(self.n_simulations, seed=self.seed, market_tables=self.market_tables)
+            result = simulator.simulate(cards, service=service, shipping_cost=self.shipping_cost,
+                                        seller_fee_percentage=self.seller_fee_percentage)
+            result['service'] = service
+            result['cost'] = GRADING_SERVICES[service]['fee'] + self.shipping_cost
+            frames.append(result)
+        if not frames:
+            return pd.DataFrame(columns=PLAN_COLUMNS)
+        options = pd.concat(frames, ignore_index=True)
+        return options[options['expected_value'] > 0].reset_index(drop=True)
+
+    def optimize(self,
+                 cards: Union[List[Dict[str, Any]], pd.DataFrame],
+                 budget: float,
+                 deadline_days: Optional[int] = None,
+                 services: Optional[List[str]] = None) -> SubmissionPlan:
+        """
+        Pick at most one tier per card to maximize total expected profit.
+
+        Args:
+            cards: Collection cards (see GradingSimulator.simulate for fields)
+            budget: Most that can be spent on grading fees and shipping
+            deadline_days: Latest acceptable mean turnaround, or None for no deadline
+            services: Tiers allowed (all of GRADING_SERVICES by default)
+
+        Returns:
+            SubmissionPlan with the chosen cards sorted by expected profit
+        """
+        options = self.options(cards, services, deadline_days)
+        plan = SubmissionPlan(selections=pd.DataFrame(columns=PLAN_COLUMNS), budget=budget,
+                              deadline_days=deadline_days, services=services or list(GRADING_SERVICES),
+                              candidates=int(options['card_index'].nunique()) if not options.empty else 0)
+        if options.empty or budget <= 0:
+            return plan
+
+        chosen = self._solve(options, budget)
+        selections = options.loc[chosen, PLAN_COLUMNS].sort_values('expected_value', ascending=False)
+        plan.selections = selections.reset_index(drop=True)
+        plan.total_cost = float(selections['cost'].sum())
+        plan.expected_profit = float(selections['expected_value'].sum())
+        return plan
+
+    def _solve(self, options: pd.DataFrame, budget: float) -> List[int]:
+        """Row labels of the chosen options."""
+        # Best tier per card is optimal whenever all of them fit
+        best = options.loc[options.groupby('card_index')['expected_value'].idxmax()]
+        if best['cost'].sum() <= budget:
+            return list(best.index)
+
+        groups = options.groupby('card_index').indices
+        # Costs are rounded up to the resolution so a plan never exceeds the budget
+        resolution = _budget_resolution(budget, len(groups))
+        capacity = int(budget // resolution)
+        weights = np.ceil(options['cost'].to_numpy() / resolution).astype(int)
+        values = options['expected_value'].to_numpy()
+
+        # dp[c]: best value with total weight <= c
+        # choice[g, c]: position within card g's options taken at capacity c (-1 for none)
+        group_rows = list(groups.values())
+        dp = np.zeros(capacity + 1)
+        choice = np.full((len(group_rows), capacity + 1), -1, dtype=np.int8)
+        for g, rows in enumerate(group_rows):
+            previous = dp.copy()
+            for position, row in enumerate(rows):
+                w = weights[row]
+                if w > capacity:
+                    continue
+                candidate = np.full(capacity + 1, -np.inf)
+                candidate[w:] = previous[:capacity + 1 - w] + values[row]
+                better = candidate > dp
+                dp = np.where(better, candidate, dp)
+                choice[g, better] = position
+
+        chosen = []
+        c = capacity
+        for g in range(len(group_rows) - 1, -1, -1):
+            position = choice[g, c]
+            if position >= 0:
+                row = group_rows[g][position]
+                chosen.append(options.index[row])
+                c -= weights[row]
+        return chosen
+
+
+def _budget_resolution(budget: float, n_cards: int) -> float:
+    """Dollars per budget cell, coarse enough for MAX_BUDGET_CELLS and MAX_CHOICE_CELLS."""
+    cells = max(1, min(MAX_BUDGET_CELLS, MAX_CHOICE_CELLS // max(1, n_cards) - 1))
+    return max(1.0, budget / cells)
+
+
+def optimize_submission(cards: Union[List[Dict[str, Any]], pd.DataFrame],
+                        budget: float,
+                        deadline_days: Optional[int] = None,
+                        services: Optional[List[str]] = None,
+                        **optimizer_options) -> SubmissionPlan:
+    """Plan a grading submission for a collection; see GradingOptimizer.optimize."""
+    return GradingOptimizer(**optimizer_options).optimize(cards, budget, deadline_days, services)
@@ -0,0 +1,195 @@
+"""
+Grading simulator module for Sports Card Analyzer Pro.
+Monte Carlo estimate of what grading each raw card is worth, run for a whole
+collection at once as NumPy arrays (cards x simulations).
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Union
+import numpy as np
+import pandas as pd
+
+from modules.core.market_tables import MarketTables, card_era, get_market_tables
+
+# Grading tiers: fee per card and mean turnaround in days
+GRADING_SERVICES = {
+    'value': {'fee': 25.0, 'turnaround_days': 65},
+    'economy': {'fee': 50.0, 'turnaround_days': 30},
+    'regular': {'fee': 100.0, 'turnaround_days': 15},
+    'express': {'fee': 200.0, 'turnaround_days': 5}
+}
+
+DEFAULT_SHIPPING_COST = 10.0
+
+# Chance of each outcome for a card in average condition
+GRADE_PROBABILITIES = {
+    'psa10': 0.20,
+    'psa9': 0.50,
+    'lower': 0.30
+}
+
+# Scales the PSA 9/10 chances by the card's raw condition
+CONDITION_MULTIPLIERS = {
+    'near mint-mint': 1.4,
+    'near mint': 1.2,
+    'excellent-mint': 0.9,
+    'excellent': 0.7,
+    'very good-excellent': 0.5,
+    'very good': 0.3,
+    'good': 0.2,
+    'fair': 0.1,
+    'poor': 0.05
+}
+
+# Outcomes simulated, in order; grades below PSA 8 are assumed to sell at raw value
+OUTCOMES = ('PSA 10', 'PSA 9', 'PSA 8', 'Raw')
+
+_GRADED = re.compile(r'\b(psa|bgs|sgc|cgc)\s*\d', re.IGNORECASE)
+
+
+def is_raw_card(card: Dict[str, Any]) -> bool:
+    """Whether a card is ungraded, judged from its condition."""
+    return not _GRADED.search(str(card.get('condition', '') or ''))
+
+
+def _raw_value(card: Dict[str, Any]) -> float:
+    for field in ('raw_value', 'current_value', 'market_value', 'price', 'purchase_price'):
+        value = card.get(field)
+        if isinstance(value, str):
+            value = value.replace('$', '').replace(',', '').strip()
+        try:
+            value = float(value or 0)
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            return value
+    return 0.0
+
+
+def _price_volatility(card: Dict[str, Any], default: float) -> float:
+    """Log-price sigma of a card from its price_volatility, a percent as in price predictions."""
+    try:
+        percent = float(card.get('price_volatility') or 0)
+    except (TypeError, ValueError):
+        return default
+    return percent / 100 if np.isfinite(percent) and percent > 0 else default
+
+
+class GradingSimulator:
+    """Vectorized Monte Carlo of grade outcomes, fees, turnaround and price moves."""
+
+    def __init__(self,
+                 n_simulations: int = 1000,
+                 seed: Optional[int] = None,
+                 market_tables: Optional[MarketTables] = None,
+                 price_volatility: float = 0.25,
+                 daily_volatility: float = 0.01):
+        """
+        Initialize the simulator.
+
+        Args:
+            n_simulations: Draws per card
+            seed: Random seed for reproducible runs
+            market_tables: Grade premium tables (the process-wide tables by default)
+            price_volatility: Log-price uncertainty (a fraction) of a graded sale when a card has no volatility of its own
+            daily_volatility: Log-price drift per day while the card is at the grader
+        """
+        self.n_simulations = n_simulations
+        self.rng = np.random.default_rng(seed)
+        self.market_tables = market_tables if market_tables is not None else get_market_tables()
+        self.price_volatility = price_volatility
+        self.daily_volatility = daily_volatility
+
+    def _outcome_probabilities(self, conditions: List[str], raw_values: np.ndarray) -> np.ndarray:
+        """Per-card probabilities of OUTCOMES (rows sum to 1)."""
+        multipliers = np.array([CONDITION_MULTIPLIERS.get(str(c or '').lower(), 1.0) for c in conditions])
+        # Valuable cards tend to be better protected and pre-screened
+        multipliers = np.where(raw_values >= 200, multipliers * 1.2, multipliers)
+
+        psa10 = np.minimum(0.90, GRADE_PROBABILITIES['psa10'] * multipliers)
+        psa9 = np.minimum(1 - psa10, GRADE_PROBABILITIES['psa9'] * multipliers)
+        rest = 1 - psa10 - psa9
+        return np.column_stack([psa10, psa9, rest * 2 / 3, rest / 3])
+
+    def _premiums(self, cards: List[Dict[str, Any]]) -> np.ndarray:
+        """Per-card price multiple over raw for each of OUTCOMES."""
+        cache: Dict[tuple, List[float]] = {}
+        rows = []
+        for card in cards:
+            segment = (card.get('sport', '') or '', card.get('card_set', '') or '', card_era(card.get('year')))
+            if segment not in cache:
+                cache[segment] = [self.market_tables.grade_premium(grade, *segment) for grade in OUTCOMES]
+            rows.append(cache[segment])
+        return np.array(rows, dtype=float).reshape(len(cards), len(OUTCOMES))
+
+    def simulate(self,
+                 cards: Union[List[Dict[str, Any]], pd.DataFrame],
+                 service: str = 'economy',
+                 shipping_cost: float = DEFAULT_SHIPPING_COST,
+                 seller_fee_percentage: float = 12.9,
+                 downside_quantile: float = 0.05) -> pd.DataFrame:
+        """
+        Simulate grading every raw card and summarize the profit distribution.
+
+        Profit is measured against selling the card raw today: graded sale price
+        net of seller fees, minus grading fee and shipping, minus the raw sale.
+
+        Args:
+            cards: Card dictionaries (or a DataFrame) with current_value/raw_value/market_value,
+                condition and optionally id, card_set, year, sport and price_volatility (percent)
+            service: Grading tier from GRADING_SERVICES
+            shipping_cost: Shipping and insurance per card
+            seller_fee_percentage: Marketplace fee on the eventual sale
+            downside_quantile: Quantile of profit reported as the downside
+
+        Returns:
+            DataFrame with one row per raw card: expected_value, downside,
+            probability_of_profit, expected_days and the outcome probabilities,
+            sorted by expected value
+        """
+        if service not in GRADING_SERVICES:
+            raise ValueError(f"Unknown grading service: {service}")
+        records = cards.to_dict('records') if isinstance(cards, pd.DataFrame) else list(cards)
+        indexed = [(i, card) for i, card in enumerate(records) if is_raw_card(card) and _raw_value(card) > 0]
+        columns = ['card_index', 'id', 'raw_value', 'expected_value', 'downside', 'probability_of_profit',
+                   'expected_days', 'p_psa10', 'p_psa9', 'p_psa8', 'p_lower']
+        if not indexed:
+            return pd.DataFrame(columns=columns)
+
+        raw_cards = [card for _, card in indexed]
+        n_cards, n_sims = len(raw_cards), self.n_simulations
+        raw_values = np.array([_raw_value(card) for card in raw_cards])
+        volatility = np.array([_price_volatility(card, self.price_volatility) for card in raw_cards])
+        probabilities = self._outcome_probabilities([card.get('condition') for card in raw_cards], raw_values)
+        premiums = self._premiums(raw_cards)
+        tier = GRADING_SERVICES[service]
+        fee_rate = seller_fee_percentage / 100
+
+        # Grade outcome per draw by inverse CDF on the per-card cumulative probabilities
+        cumulative = np.cumsum(probabilities, axis=1)[:, :-1]
+        draws = self.rng.random((n_cards, n_sims))
+        outcome = (draws[:, :, None] > cumulative[:, None, :]).sum(axis=2)
+        multiple = np.take_along_axis(premiums, outcome, axis=1)
+
+        # Turnaround varies around the tier's mean; prices drift while the card is away
+        days = self.rng.gamma(4.0, tier['turnaround_days'] / 4.0, (n_cards, n_sims))
+        sigma = np.sqrt(volatility[:, None] ** 2 + self.daily_volatility ** 2 * days)
+        price_noise = np.exp(self.rng.standard_normal((n_cards, n_sims)) * sigma - sigma ** 2 / 2)
+
+        sale_price = raw_values[:, None] * multiple * price_noise
+        profit = sale_price * (1 - fee_rate) - tier['fee'] - shipping_cost - raw_values[:, None] * (1 - fee_rate)
+
+        result = pd.DataFrame({
+            'card_index': [i for i, _ in indexed],
+            'id': [card.get('id') for card in raw_cards],
+            'raw_value': raw_values,
+            'expected_value': profit.mean(axis=1),
+            'downside': np.quantile(profit, downside_quantile, axis=1),
+            'probability_of_profit': (profit > 0).mean(axis=1),
+            'expected_days': days.mean(axis=1),
+            'p_psa10': probabilities[:, 0],
+            'p_psa9': probabilities[:, 1],
+            'p_psa8': probabilities[:, 2],
+            'p_lower': probabilities[:, 3]
+        }, columns=columns)
+        return result.sort_values('expected_value', ascending=False).reset_index(drop=True)
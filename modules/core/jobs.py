@@ -0,0 +1,287 @@
+"""
+Background job module for Sports Card Analyzer Pro.
+Runs training and analysis in worker processes so Streamlit pages can submit
+work, poll its progress across reruns and cancel it when it goes stale.
+"""
+
+import multiprocessing
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Any, Optional
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job when it has been cancelled.
+
+    Derives from BaseException, like asyncio.CancelledError, so the broad
+    `except Exception` fallbacks in analysis code don't swallow it.
+    """
+
+
+class JobContext:
+    """Handle a running job uses to report progress and notice cancellation."""
+
+    def __init__(self, job_id: str, shared: Any):
+        self.job_id = job_id
+        self._shared = shared
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._shared.get(f"{self.job_id}:cancel", False))
+
+    def report(self, progress: float, message: str = '') -> None:
+        """
+        Record progress (0 to 1) and a status message.
+
+        Raises:
+            JobCancelled: If the job was cancelled since the last report
+        """
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+        self._shared[self.job_id] = (max(0.0, min(float(progress), 1.0)), message)
+
+
+@dataclass
+class JobInfo:
+    """Snapshot of a job's state."""
+    job_id: str
+    name: str
+    status: str
+    progress: float = 0.0
+    message: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    group: Optional[str] = None
+    submitted_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+def _run_job(job_id: str, shared: Any, fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """Worker-side wrapper. Module-level so it can be sent to worker processes."""
+    context = JobContext(job_id, shared)
+    context.report(0.0, 'Started')
+    result = fn(context, *args, **kwargs)
+    context.report(1.0, 'Done')
+    return result
+
+
+class JobManager:
+    """Process pool running jobs, with per-job status, progress and cancellation."""
+
+    def __init__(self, max_workers: Optional[int] = 2, keep_finished: int = 200):
+        """
+        Initialize the manager. Worker processes start on the first submit.
+
+        Args:
+            max_workers: Worker processes
+            keep_finished: Finished jobs kept for status lookups before the oldest are forgotten
+        """
+        self.max_workers = max_workers
+        self.keep_finished = keep_finished
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._sync_manager = None
+        self._shared = None
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        if self._executor is None:
+            self._sync_manager = multiprocessing.Manager()
+            self._shared = self._sync_manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job['future'].done()]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            self._jobs.pop(job_id)
+            self._shared.pop(job_id, None)
+            self._shared.pop(f"{job_id}:cancel", None)
+
+    def submit(self, fn: Callable, *args, name: Optional[str] = None, group: Optional[str] = None, **kwargs) -> str:
+        """
+        Queue a job.
+
+        Args:
+            fn: Module-level function called as fn(context, *args, **kwargs) in a worker
+            name: Label shown in status (defaults to the function name)
+            group: Tag used to cancel related jobs together, e.g. a session id
+
+        Returns:
+            Job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._start()
+            self._prune()
+            self._shared[job_id] = (0.0, 'Queued')
+            future = self._executor.submit(_run_job, job_id, self._shared, fn, args, kwargs)
+            self._jobs[job_id] = {
+                'future': future,
+                'name': name or getattr(fn, '__name__', 'job'),
+                'group': group,
+                'submitted_at': datetime.now(),
+                'finished_at': None
+            }
+        future.add_done_callback(lambda _: self._mark_finished(job_id))
+        return job_id
+
+    def _mark_finished(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job['finished_at'] = datetime.now()
+
+    def status(self, job_id: str) -> JobInfo:
+        """
+        Get a job's current state.
+
+        Raises:
+            KeyError: If the job id is unknown or has been pruned
+        """
+        job = self._jobs[job_id]
+        future: Future = job['future']
+        progress, message = self._shared.get(job_id, (0.0, ''))
+        info = JobInfo(job_id=job_id, name=job['name'], status=PENDING, progress=progress, message=message,
+                       group=job['group'], submitted_at=job['submitted_at'], finished_at=job['finished_at'])
+
+        if future.cancelled() or (not future.done() and self._shared.get(f"{job_id}:cancel", False)):
+            # A job picked up by a worker stops at its next report; it is already stale
+            info.status = CANCELLED
+        elif future.done():
+            try:
+                info.result = future.result()
+                info.status = SUCCEEDED
+            except (JobCancelled, CancelledError):
+                info.status = CANCELLED
+            except Exception as e:
+                info.status = FAILED
+                info.error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        elif future.running() and message != 'Queued':
+            info.status = RUNNING
+        if info.status == CANCELLED:
+            info.message = 'Cancelled'
+        return info
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for a job and return its result.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+            Exception: Whatever the job raised
+        """
+        try:
+            return self._jobs[job_id]['future'].result(timeout=timeout)
+        except CancelledError:
+            raise JobCancelled(job_id)
+
+    def watch(self, job_id: str, interval: float = 0.25, timeout: Optional[float] = None) -> Iterator[JobInfo]:
+        """
+        Yield a job's state whenever its progress changes, ending with its final state.
+
+        Args:
+            job_id: Job to watch
+            interval: Seconds between polls
+            timeout: Stop watching (without cancelling) after this many seconds
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        last = None
+        while True:
+            info = self.status(job_id)
+            snapshot = (info.status, info.progress, info.message)
+            if snapshot != last:
+                last = snapshot
+                yield info
+            if info.done or (deadline is not None and time.monotonic() >= deadline):
+                return
+            time.sleep(interval)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs never start; running jobs stop at their next progress report.
+
+        Returns:
+            True if the job had not finished yet
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job['future'].done():
+            return False
+        self._shared[f"{job_id}:cancel"] = True
+        job['future'].cancel()
+        return True
+
+    def cancel_group(self, group: str) -> List[str]:
+        """Cancel every unfinished job in a group and return their ids."""
+        return [job_id for job_id, job in list(self._jobs.items())
+                if job['group'] == group and self.cancel(job_id)]
+
+    def jobs(self, group: Optional[str] = None) -> List[JobInfo]:
+        """List known jobs, optionally only those in a group."""
+        return [self.status(job_id) for job_id, job in list(self._jobs.items())
+                if group is None or job['group'] == group]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued jobs and stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+            if self._sync_manager is not None:
+                self._sync_manager.shutdown()
+                self._sync_manager = None
+                self._shared = None
+            self._jobs.clear()
+
+
+def predict_prices_job(context: JobContext, card_data: List[Dict[str, Any]], days_ahead: int = 90,
+                       card_key: Optional[str] = None) -> Dict[str, Any]:
+    """Job running PricePredictor.predict_future_prices with progress reporting."""
+    from modules.core.price_predictor import PricePredictor
+    return PricePredictor().predict_future_prices(card_data, days_ahead=days_ahead, card_key=card_key,
+                                                  progress=context.report)
+
+
+def market_analysis_job(context: JobContext, card_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Job running MarketAnalyzer.analyze_market_data."""
+    from modules.core.market_analysis import MarketAnalyzer
+    context.report(0.1, 'Analyzing market data')
+    return MarketAnalyzer().analyze_market_data(card_data)
+
+
+def profit_analysis_job(context: JobContext, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Job running ProfitCalculator.analyze for each card."""
+    from modules.core.profit_calculator import ProfitCalculator
+    calculator = ProfitCalculator()
+    results = []
+    for i, card in enumerate(cards):
+        context.report(i / max(len(cards), 1), f"Analyzing card {i + 1} of {len(cards)}")
+        results.append(calculator.analyze(card).to_dict())
+    return results
+
+
+_default_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get the process-wide job manager."""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = JobManager()
+    return _default_manager
@@ -0,0 +1,104 @@
+"""
+Lazy import module for Sports Card Analyzer Pro.
+Defers heavy backends (sklearn, xgboost, scipy, textblob) until first use so
+pages that never reach a model don't pay for importing them.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Dict, List, Optional
+
+_lock = threading.RLock()
+_registry: Dict[str, 'LazyModule'] = {}
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_module: Optional[ModuleType] = None
+        self._lazy_lock = threading.Lock()
+
+    # Proxy helpers are underscored so they never shadow attributes of the real
+    # module (joblib.load, for instance)
+    @property
+    def _lazy_loaded(self) -> bool:
+        return self._lazy_module is not None
+
+    def _lazy_load(self) -> ModuleType:
+        """Import the real module (once, thread-safely) and return it."""
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self.__name__)
+                module = self._lazy_module
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes not set on the proxy itself
+        if attr.startswith('__') and attr.endswith('__'):
+            raise AttributeError(attr)
+        return getattr(self._lazy_load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._lazy_load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._lazy_loaded else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a lazy handle on a module.
+
+    Args:
+        name: Dotted module name, e.g. "sklearn.ensemble"
+
+    Returns:
+        Shared LazyModule for the name; the import happens on first attribute access
+    """
+    with _lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+        return module
+
+
+def is_loaded(module: ModuleType) -> bool:
+    """Whether a lazy module has been imported (always True for regular modules)."""
+    return not isinstance(module, LazyModule) or module._lazy_loaded
+
+
+def warm_up(*names: str, background: bool = True) -> Optional[threading.Thread]:
+    """
+    Import lazy modules ahead of first use.
+
+    Args:
+        names: Module names to load (every registered lazy module when omitted)
+        background: Load in a daemon thread instead of blocking the caller
+
+    Returns:
+        The warm-up thread when loading in the background, None if there was nothing to load
+    """
+    modules = [lazy_import(name) for name in names] if names else list(_registry.values())
+    pending = [module for module in modules if not module._lazy_loaded]
+    if not pending:
+        return None
+
+    def _load_all():
+        for module in pending:
+            try:
+                module._lazy_load()
+            except ImportError as e:
+                print(f"Could not preload {module.__name__}: {e}")
+
+    if not background:
+        _load_all()
+        return None
+    thread = threading.Thread(target=_load_all, name='lazy-import-warm-up', daemon=True)
+    thread.start()
+    return thread
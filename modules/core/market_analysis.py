@@ -2,9 +2,12 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from sklearn import metrics
-from sklearn.linear_model import LinearRegression
-from scipy import stats
+
+from modules.core.lazy import lazy_import
+
+# sklearn and scipy load on first analysis rather than at page import
+linear_model = lazy_import('sklearn.linear_model')
+stats = lazy_import('scipy.stats')
 
 class MarketAnalyzer:
     def __init__(self):
@@ -261,7 +264,7 @@ class MarketAnalyzer:
         y = df['price'].values
 
         # Fit linear regression
-        model = LinearRegression()
+        model = linear_model.LinearRegression()
         model.fit(X, y)
 
         # Calculate prediction interval
@@ -0,0 +1,366 @@
+"""
+Market tables module for Sports Card Analyzer Pro.
+Derives monthly and weekday seasonality and grade premiums from archived
+sales, per sport, set and era, and serves them as lookup tables that load
+once per process.
+
+Build the tables from an archive with:
+    python -m modules.core.market_tables --archive data/sales_archive.json
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from modules.core.sales_archive import DEFAULT_ARCHIVE_PATH, SalesArchive
+
+DEFAULT_TABLES_PATH = os.getenv('MARKET_TABLES_PATH', os.path.join('data', 'market_tables.json'))
+
+# Fallbacks used until an archive has enough sales to replace them
+DEFAULT_SEASONAL_FACTORS = {
+    1: 1.02,  # January (post-holiday boost)
+    2: 0.98,  # February
+    3: 1.05,  # March (start of season)
+    4: 1.08,  # April (early season)
+    5: 1.02,  # May
+    6: 0.98,  # June
+    7: 0.95,  # July
+    8: 0.92,  # August
+    9: 1.10,  # September (NFL season start)
+    10: 1.08, # October
+    11: 1.05, # November
+    12: 1.12  # December (holiday season)
+}
+
+DEFAULT_WEEKLY_FACTORS = {
+    0: 1.05,  # Monday
+    1: 1.02,  # Tuesday
+    2: 1.00,  # Wednesday
+    3: 0.98,  # Thursday
+    4: 0.95,  # Friday
+    5: 1.10,  # Saturday
+    6: 1.15   # Sunday
+}
+
+# Price of each grade relative to the raw card
+DEFAULT_GRADE_PREMIUMS = {
+    'PSA 10': 2.5,
+    'PSA 9': 1.8,
+    'PSA 8': 1.4,
+    'Raw': 1.0
+}
+
+GRADES = tuple(DEFAULT_GRADE_PREMIUMS)
+
+ERAS = ((1980, 'vintage'), (1994, 'junk_wax'), (2010, 'modern'))
+
+
+def card_era(year: Any) -> str:
+    """Bucket a card year into vintage, junk_wax, modern or ultra_modern ('' if unknown)."""
+    try:
+        year = int(str(year).strip()[:4])
+    except (TypeError, ValueError):
+        return ''
+    for end, era in ERAS:
+        if year < end:
+            return era
+    return 'ultra_modern'
+
+
+def normalize_grade(grade: Any) -> Optional[str]:
+    """Map a condition or scenario string ('psa 10', 'Raw', 'PSA10') onto GRADES, or None."""
+    text = ' '.join(str(grade or '').upper().replace('PSA', 'PSA ').split())
+    if not text or text == 'RAW':
+        return 'Raw'
+    return text if text in GRADES else None
+
+
+def segment_key(sport: str = '', card_set: str = '', era: str = '') -> str:
+    return '|'.join(' '.join(str(part or '').lower().split()) for part in (sport, card_set, era))
+
+
+def _segment_chain(sport: str, card_set: str, era: str) -> List[str]:
+    """Segments to try, most specific first, ending with the all-cards segment."""
+    chain = [
+        segment_key(sport, card_set, era),
+        segment_key(sport, card_set),
+        segment_key(sport, '', era),
+        segment_key(sport),
+        segment_key('', '', era),
+        segment_key()
+    ]
+    return list(dict.fromkeys(chain))
+
+
+@dataclass
+class MarketTables:
+    """Seasonality and grade premium lookups keyed by sport|set|era segment."""
+    seasonal: Dict[str, Dict[int, float]] = field(default_factory=dict)
+    weekly: Dict[str, Dict[int, float]] = field(default_factory=dict)
+    grade_premiums: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    generated_at: Optional[str] = None
+    sales_count: int = 0
+
+    def _lookup(self, table: Dict[str, Any], sport: str, card_set: str, era: str) -> Optional[Any]:
+        for key in _segment_chain(sport, card_set, era):
+            if key in table:
+                return table[key]
+        return None
+
+    def seasonal_factors(self, sport: str = '', card_set: str = '', era: str = '') -> Dict[int, float]:
+        """Month (1-12) to price factor for the most specific segment with data."""
+        return self._lookup(self.seasonal, sport, card_set, era) or DEFAULT_SEASONAL_FACTORS
+
+    def weekly_factors(self, sport: str = '', card_set: str = '', era: str = '') -> Dict[int, float]:
+        """Weekday (0 = Monday) to price factor for the most specific segment with data."""
+        return self._lookup(self.weekly, sport, card_set, era) or DEFAULT_WEEKLY_FACTORS
+
+    def grade_premium_table(self, sport: str = '', card_set: str = '', era: str = '',
+                            defaults: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Every grade's premium over raw, each from the most specific segment that has it."""
+        return {grade: self.grade_premium(grade, sport, card_set, era, defaults) for grade in GRADES}
+
+    def grade_premium(self, grade: Any, sport: str = '', card_set: str = '', era: str = '',
+                      defaults: Optional[Dict[str, float]] = None) -> float:
+        """
+        Price of a grade relative to the raw card (1.0 for unknown grades).
+
+        Args:
+            defaults: Premiums used when no segment has the grade (DEFAULT_GRADE_PREMIUMS by default)
+        """
+        premium = self.learned_grade_premium(grade, sport, card_set, era)
+        if premium is not None:
+            return premium
+        grade = normalize_grade(grade)
+        if grade is None:
+            return 1.0
+        return (defaults if defaults is not None else DEFAULT_GRADE_PREMIUMS).get(grade, 1.0)
+
+    def learned_grade_premium(self, grade: Any, sport: str = '', card_set: str = '', era: str = '') -> Optional[float]:
+        """Premium of a grade from the most specific segment that has it, or None if no sales covered it."""
+        grade = normalize_grade(grade)
+        if grade is None:
+            return None
+        for key in _segment_chain(sport, card_set, era):
+            premiums = self.grade_premiums.get(key)
+            if premiums and grade in premiums:
+                return premiums[grade]
+        return None
+
+    def for_card_key(self, card_key: Optional[str], sport: str = '') -> Tuple[str, str, str]:
+        """Segment (sport, card_set, era) of a make_card_key key."""
+        parts = (card_key or '').split('|')
+        if len(parts) < 3:
+            return sport, '', ''
+        return sport, parts[2], card_era(parts[0])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'generated_at': self.generated_at,
+            'sales_count': self.sales_count,
+            'seasonal': {key: {str(k): v for k, v in table.items()} for key, table in self.seasonal.items()},
+            'weekly': {key: {str(k): v for k, v in table.items()} for key, table in self.weekly.items()},
+            'grade_premiums': self.grade_premiums
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MarketTables':
+        return cls(
+            seasonal={key: {int(k): float(v) for k, v in table.items()} for key, table in data.get('seasonal', {}).items()},
+            weekly={key: {int(k): float(v) for k, v in table.items()} for key, table in data.get('weekly', {}).items()},
+            grade_premiums={key: {g: float(v) for g, v in table.items()} for key, table in data.get('grade_premiums', {}).items()},
+            generated_at=data.get('generated_at'),
+            sales_count=int(data.get('sales_count', 0))
+        )
+
+    def save(self, path: str = DEFAULT_TABLES_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLES_PATH) -> 'MarketTables':
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def _sales_frame(archive: SalesArchive, sports: Optional[Dict[str, str]]) -> pd.DataFrame:
+    rows = []
+    for card_key, history in archive.items():
+        parts = card_key.split('|')
+        if len(parts) < 5:
+            continue
+        grade = normalize_grade(parts[5]) if len(parts) > 5 else 'Raw'
+        for sale in history:
+            rows.append((card_key, '|'.join(parts[:5]), grade, (sports or {}).get(card_key, ''),
+                         parts[2], card_era(parts[0]), sale['date'], sale['price']))
+    df = pd.DataFrame(rows, columns=['card_key', 'base_key', 'grade', 'sport', 'card_set', 'era', 'date', 'price'])
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['price'] = pd.to_numeric(df['price'], errors='coerce')
+    return df.dropna(subset=['date', 'price', 'grade'])[lambda d: d['price'] > 0]
+
+
+def _segment_groups(df: pd.DataFrame) -> List[Tuple[str, pd.Index]]:
+    """(segment key, row mask) for every segment level present in the frame."""
+    groups = {}
+    levels = [
+        ('sport', 'card_set', 'era'), ('sport', 'card_set'), ('sport', 'era'),
+        ('sport',), ('era',), ()
+    ]
+    for level in levels:
+        if not level:
+            groups.setdefault(segment_key(), df.index)
+            continue
+        for values, index in df.groupby(list(level)).groups.items():
+            values = values if isinstance(values, tuple) else (values,)
+            parts = dict(zip(level, values))
+            # Cards without a sport collapse sport levels onto set/era ones; keep the first
+            groups.setdefault(segment_key(parts.get('sport', ''), parts.get('card_set', ''), parts.get('era', '')), index)
+    return list(groups.items())
+
+
+def _calendar_factors(log_ratio: pd.Series, periods: pd.Series, expected: int, min_samples: int) -> Optional[Dict[int, float]]:
+    """Geometric-mean factor per period, normalized to average 1; None if any period is thin."""
+    stats = log_ratio.groupby(periods).agg(['mean', 'count'])
+    if len(stats) < expected or stats['count'].min() < min_samples:
+        return None
+    centered = stats['mean'] - stats['mean'].mean()
+    return {int(period): round(float(np.exp(value)), 4) for period, value in centered.items()}
+
+
+def build_market_tables(archive: SalesArchive,
+                        sports: Optional[Dict[str, str]] = None,
+                        min_samples: int = 20,
+                        min_cards: int = 3,
+                        window: int = 15,
+                        premium_days: int = 90) -> MarketTables:
+    """
+    Precompute seasonality and grade premium tables from archived sales.
+
+    Seasonality compares each sale with its card's centered rolling median
+    price, so trends and price levels cancel out; grade premiums are the
+    median ratio of graded to raw prices, over each card's recent sales,
+    across cards with both.
+
+    Args:
+        archive: Sales histories keyed by make_card_key (graded keys end with the scenario)
+        sports: Optional card key to sport mapping; cards without one only feed set/era segments
+        min_samples: Sales needed in every month/weekday before a segment gets its own table
+        min_cards: Cards with both raw and graded sales needed for a segment's grade premium
+        window: Sales in the rolling median used to detrend prices
+        premium_days: Days before a card's latest sale that count toward its grade premium
+
+    Returns:
+        MarketTables with a table for every segment that has enough data
+    """
+    tables = MarketTables(generated_at=datetime.now().isoformat(timespec='seconds'))
+    df = _sales_frame(archive, sports)
+    tables.sales_count = len(df)
+    if df.empty:
+        return tables
+
+    df = df.sort_values(['card_key', 'date'], kind='stable').reset_index(drop=True)
+    trend = df.groupby('card_key')['price'].transform(
+        lambda prices: prices.rolling(window, center=True, min_periods=1).median()
+    )
+    df['log_ratio'] = np.log(df['price'] / trend)
+    months = df['date'].dt.month
+    weekdays = df['date'].dt.dayofweek
+
+    # Premiums compare contemporaneous prices: each card's recent sales only
+    latest = df.groupby('base_key')['date'].transform('max')
+    recent = df[df['date'] >= latest - pd.Timedelta(days=premium_days)]
+    card_medians = recent.groupby(['base_key', 'grade'])['price'].median().unstack()
+    premium_rows = pd.DataFrame()
+    if 'Raw' in card_medians.columns:
+        ratios = card_medians.div(card_medians['Raw'], axis=0).drop(columns='Raw').dropna(how='all')
+        segments = df.drop_duplicates('base_key').set_index('base_key')[['sport', 'card_set', 'era']]
+        premium_rows = ratios.join(segments).reset_index()
+
+    for key, index in _segment_groups(df):
+        rows = df.loc[index]
+        seasonal = _calendar_factors(rows['log_ratio'], months.loc[rows.index], 12, min_samples)
+        if seasonal:
+            tables.seasonal[key] = seasonal
+        weekly = _calendar_factors(rows['log_ratio'], weekdays.loc[rows.index], 7, min_samples)
+        if weekly:
+            tables.weekly[key] = weekly
+
+    if not premium_rows.empty:
+        for key, index in _segment_groups(premium_rows):
+            rows = premium_rows.loc[index]
+            premiums = {'Raw': 1.0}
+            for grade in GRADES:
+                if grade in rows.columns and rows[grade].count() >= min_cards:
+                    premiums[grade] = round(float(rows[grade].median()), 4)
+            if len(premiums) > 1:
+                tables.grade_premiums[key] = premiums
+
+    return tables
+
+
+_default_tables: Optional[MarketTables] = None
+
+
+def get_market_tables() -> MarketTables:
+    """Get the process-wide tables, loaded once from MARKET_TABLES_PATH (defaults if missing)."""
+    global _default_tables
+    if _default_tables is None:
+        tables = MarketTables()
+        if os.path.exists(DEFAULT_TABLES_PATH):
+            try:
+                tables = MarketTables.load(DEFAULT_TABLES_PATH)
+            except (OSError, ValueError) as e:
+                print(f"Could not load market tables: {e}")
+        _default_tables = tables
+    return _default_tables
+
+
+def set_market_tables(tables: Optional[MarketTables]) -> None:
+    """Replace the process-wide tables (None reloads them from disk on next use)."""
+    global _default_tables
+    _default_tables = tables
+
+
+def build_tables_job(context, archive_path: str = DEFAULT_ARCHIVE_PATH,
+                     output_path: str = DEFAULT_TABLES_PATH) -> Dict[str, int]:
+    """Background job (see modules.core.jobs) rebuilding the tables file from an archive."""
+    context.report(0.1, 'Loading sales archive')
+    archive = SalesArchive(archive_path)
+    context.report(0.3, 'Computing market tables')
+    tables = build_market_tables(archive)
+    tables.save(output_path)
+    return {'sales': tables.sales_count, 'seasonal': len(tables.seasonal),
+            'weekly': len(tables.weekly), 'grade_premiums': len(tables.grade_premiums)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build seasonality and grade premium tables from a sales archive")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_PATH, help="Sales archive JSON file")
+    parser.add_argument('--out', default=DEFAULT_TABLES_PATH, help="Where to write the tables")
+    parser.add_argument('--sports', help="Optional JSON file mapping card keys to sports")
+    parser.add_argument('--min-samples', type=int, default=20, help="Sales needed per month/weekday bucket")
+    parser.add_argument('--min-cards', type=int, default=3, help="Cards needed per grade premium")
+    args = parser.parse_args(argv)
+
+    sports = None
+    if args.sports:
+        with open(args.sports, 'r') as f:
+            sports = json.load(f)
+    tables = build_market_tables(SalesArchive(args.archive), sports=sports,
+                                 min_samples=args.min_samples, min_cards=args.min_cards)
+    tables.save(args.out)
+    print(f"Built tables from {tables.sales_count} sales: {len(tables.seasonal)} seasonal, "
+          f"{len(tables.weekly)} weekly, {len(tables.grade_premiums)} grade premium segments -> {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,62 +1,74 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-import requests
-from bs4 import BeautifulSoup
-import xgboost as xgb
-from textblob import TextBlob
 import re
 
-from scrapers.ebay_interface import EbayInterface
+from modules.core.lazy import lazy_import, warm_up
+from modules.core.feature_store import FEATURE_COLUMNS, build_feature_frame, get_feature_store
+from modules.core.sentiment import get_sentiment_scorer
+from modules.core.market_tables import GRADES, get_market_tables
+
+# Heavy backends load on first use so importing this module stays cheap
+ensemble = lazy_import('sklearn.ensemble')
+preprocessing = lazy_import('sklearn.preprocessing')
+metrics = lazy_import('sklearn.metrics')
+xgb = lazy_import('xgboost')
+joblib = lazy_import('joblib')
+ebay_interface = lazy_import('scrapers.ebay_interface')
+
+MODEL_BACKENDS = ('sklearn.ensemble', 'sklearn.preprocessing', 'sklearn.metrics', 'xgboost', 'textblob')
+
+# Condition multipliers of analyze_card_condition until the market tables have learned premiums
+DEFAULT_CONDITION_MULTIPLIERS = {
+    'PSA 10': 1.8,  # More realistic multiplier
+    'PSA 9': 1.3,   # More realistic multiplier
+    'PSA 8': 1.1,
+    'Raw': 1.0
+}
+
+
+def warm_up_backends(background=True):
+    """Start importing the model backends so the first prediction doesn't wait on them"""
+    return warm_up(*MODEL_BACKENDS, background=background)
 
 class PricePredictor:
-    def __init__(self):
-        # Initialize multiple models for ensemble prediction
-        self.rf_model = RandomForestRegressor(n_estimators=200, random_state=42)
-        self.gb_model = GradientBoostingRegressor(n_estimators=200, random_state=42)
-        self.xgb_model = xgb.XGBRegressor(n_estimators=200, random_state=42)
-        self.scaler = StandardScaler()
-        
-        # Enhanced seasonal factors with more granular data
-        self.seasonal_factors = {
-            # Monthly seasonal factors based on historical card market data
-            1: 1.02,  # January (post-holiday boost)
-            2: 0.98,  # February
-            3: 1.05,  # March (start of season)
-            4: 1.08,  # April (early season)
-            5: 1.02,  # May
-            6: 0.98,  # June
-            7: 0.95,  # July
-            8: 0.92,  # August
-            9: 1.10,  # September (NFL season start)
-            10: 1.08, # October
-            11: 1.05, # November
-            12: 1.12  # December (holiday season)
-        }
+    def __init__(self, n_estimators=500, feature_store=None, sentiment_scorer=None, market_tables=None):
+        # Number of trees used by each ensemble member in train_models
+        self.n_estimators = n_estimators
         
-        # Weekly seasonal factors
-        self.weekly_factors = {
-            0: 1.05,  # Monday
-            1: 1.02,  # Tuesday
-            2: 1.00,  # Wednesday
-            3: 0.98,  # Thursday
-            4: 0.95,  # Friday
-            5: 1.10,  # Saturday
-            6: 1.15   # Sunday
-        }
+        # Per-card rolling feature state; the process-wide store is used when None
+        self.feature_store = feature_store
         
-        # Grade multipliers based on market data
-        self.grade_multipliers = {
-            'PSA 10': 2.5,  # Updated based on market data
-            'PSA 9': 1.8,   # Updated based on market data
-            'PSA 8': 1.4,
-            'Raw': 1.0
-        }
+        # Memoized title sentiment; the process-wide scorer is used when None
+        self.sentiment_scorer = sentiment_scorer
+        
+        # Ensemble members and scaler are created by train_models or load_models,
+        # so constructing a predictor doesn't import the model backends
+        self.rf_model = None
+        self.gb_model = None
+        self.xgb_model = None
+        self.scaler = None
         
+        # Set by train_models or load_models; None until a model is available
+        self.model_weights = None
+        
+        # Seasonality and grade premiums derived from archived sales (see market_tables)
+        self.market_tables = market_tables if market_tables is not None else get_market_tables()
+        self.use_segment()
+
+    def use_segment(self, card_key=None, sport=''):
+        """Switch seasonal, weekly and grade tables to a card's sport/set/era segment
+        
+        Without a card key the all-cards tables are used.
+        """
+        segment = self.market_tables.for_card_key(card_key, sport)
+        # Copies, so adjusting one predictor never changes the shared tables
+        self.seasonal_factors = dict(self.market_tables.seasonal_factors(*segment))
+        self.weekly_factors = dict(self.market_tables.weekly_factors(*segment))
+        self.grade_multipliers = self.market_tables.grade_premium_table(*segment)
+        self.condition_multipliers = self.market_tables.grade_premium_table(*segment,
+                                                                            defaults=DEFAULT_CONDITION_MULTIPLIERS)
+
     def get_player_stats(self, player_name):
         """Fetch current player statistics and performance metrics"""
         try:
@@ -101,21 +113,14 @@ class PricePredictor:
 
     def analyze_card_condition(self, card_data):
         """Analyze card condition and its impact on price"""
-        condition_multipliers = {
-            'PSA 10': 1.8,  # More realistic multiplier
-            'PSA 9': 1.3,   # More realistic multiplier
-            'PSA 8': 1.1,
-            'Raw': 1.0
-        }
-        
         # Extract condition from title or use default
         condition = 'Raw'
-        for grade in condition_multipliers.keys():
+        for grade in GRADES:
             if any(grade.lower() in card['title'].lower() for card in card_data):
                 condition = grade
                 break
                 
-        return condition, condition_multipliers[condition]
+        return condition, self.condition_multipliers[condition]
 
     def calculate_market_factors(self, player_stats):
         """Calculate market influence factors with more conservative scaling"""
@@ -138,28 +143,22 @@ class PricePredictor:
             # Extract text from card titles
             titles = [card.get('title', '') for card in card_data]
             
-            # Calculate sentiment scores
-            sentiment_scores = []
-            for title in titles:
-                # Clean the title
-                clean_title = re.sub(r'[^\w\s]', ' ', title.lower())
-                # Calculate sentiment
-                sentiment = TextBlob(clean_title).sentiment.polarity
-                sentiment_scores.append(sentiment)
-            
-            # Calculate average sentiment
-            avg_sentiment = np.mean(sentiment_scores) if sentiment_scores else 0
+            # Cached titles are looked up; unseen ones are scored in one batch
+            scorer = self.sentiment_scorer if self.sentiment_scorer is not None else get_sentiment_scorer()
             
-            # Normalize sentiment to 0-1 range
-            normalized_sentiment = (avg_sentiment + 1) / 2
-            
-            return normalized_sentiment
+            # Average sentiment normalized to 0-1 range
+            return scorer.market_sentiment(titles)
         except Exception as e:
             print(f"Error analyzing market sentiment: {e}")
             return 0.5  # Neutral sentiment as fallback
 
-    def prepare_data(self, card_data):
-        """Prepare the data for prediction by creating comprehensive features"""
+    def prepare_data(self, card_data, card_key=None):
+        """Prepare the data for prediction by creating comprehensive features
+        
+        When card_key is given, the card's feature store state is matched to
+        these sales: only sales not seen before are appended, and the state is
+        rebuilt if it holds sales that aren't in card_data.
+        """
         try:
             print(f"Preparing data for {len(card_data)} cards")
             
@@ -192,49 +191,18 @@ class PricePredictor:
             
             print(f"Number of valid data points after cleaning: {len(df)}")
             
-            # Sort by date
-            df = df.sort_values('date')
-            
-            # Add volume column if not present (default to 1)
-            if 'volume' not in df.columns:
-                df['volume'] = 1
-            
-            # Time-based features
-            df['year'] = df['date'].dt.year
-            df['month'] = df['date'].dt.month
-            df['day_of_week'] = df['date'].dt.dayofweek
-            df['day_of_month'] = df['date'].dt.day
-            df['quarter'] = df['date'].dt.quarter
-            
-            # Seasonal features
-            df['seasonal_factor'] = df['month'].map(self.seasonal_factors)
-            df['weekly_factor'] = df['day_of_week'].map(self.weekly_factors)
-            
-            # Rolling statistics
-            df['price_ma7'] = df['price'].rolling(window=7, min_periods=1).mean()
-            df['price_ma30'] = df['price'].rolling(window=30, min_periods=1).mean()
-            df['price_std7'] = df['price'].rolling(window=7, min_periods=1).std()
-            df['price_std30'] = df['price'].rolling(window=30, min_periods=1).std()
-            
-            # Price momentum
-            df['price_momentum'] = (df['price'] - df['price_ma7']) / df['price_ma7']
-            df['price_volatility'] = df['price_std7'] / df['price_ma7']
-            
-            # Volume features
-            df['volume_ma7'] = df['volume'].rolling(window=7, min_periods=1).mean()
-            df['volume_ma30'] = df['volume'].rolling(window=30, min_periods=1).mean()
-            
-            # Lag features
-            df['price_lag1'] = df['price'].shift(1)
-            df['price_lag7'] = df['price'].shift(7)
-            df['price_lag30'] = df['price'].shift(30)
-            
-            # Forward features (for training)
-            df['price_forward7'] = df['price'].shift(-7)
-            df['price_forward30'] = df['price'].shift(-30)
+            # Build features from the per-card store (incremental) or in one shot
+            sales = df[['title', 'price', 'date'] + (['volume'] if 'volume' in df.columns else [])].to_dict('records')
+            if card_key:
+                store = self.feature_store if self.feature_store is not None else get_feature_store()
+                store.mirror(card_key, sales)
+                df = store.frame(card_key, self.seasonal_factors, self.weekly_factors)
+            else:
+                df = build_feature_frame(sales, self.seasonal_factors, self.weekly_factors)
             
-            # Fill NaN values
-            df = df.fillna(method='ffill').fillna(method='bfill')
+            if df is None:
+                print("Warning: No usable sales after cleaning")
+                return None
             
             # Verify we have enough data
             if len(df) < 7:
@@ -278,7 +246,7 @@ class PricePredictor:
                     query = f"{year} {player_name} {card_set} #{card_number} {grade}"
                 
                 # Search for sales
-                scraper = EbayInterface()
+                scraper = ebay_interface.EbayInterface()
                 results = scraper.search_cards(
                     player_name=player_name,
                     year=year,
@@ -304,48 +272,35 @@ class PricePredictor:
             print(f"Error fetching graded sales data: {e}")
             return None
 
-    def prepare_features(self, df):
-        """Prepare features for prediction"""
-        # Ensure all required columns exist
-        required_columns = [
-            'price_ma7', 'price_ma30', 'price_std7', 'price_std30',
-            'price_momentum', 'price_volatility', 'volume_ma7', 'volume_ma30',
-            'price_lag1', 'price_lag7', 'price_lag30',
-            'seasonal_factor', 'weekly_factor'
-        ]
-        
-        # If any required columns are missing, create them
-        for col in required_columns:
-            if col not in df.columns:
-                if col == 'price_ma7':
-                    df['price_ma7'] = df['price'].rolling(window=7, min_periods=1).mean()
-                elif col == 'price_ma30':
-                    df['price_ma30'] = df['price'].rolling(window=30, min_periods=1).mean()
-                elif col == 'price_std7':
-                    df['price_std7'] = df['price'].rolling(window=7, min_periods=1).std()
-                elif col == 'price_std30':
-                    df['price_std30'] = df['price'].rolling(window=30, min_periods=1).std()
-                elif col == 'price_momentum':
-                    df['price_momentum'] = (df['price'] - df['price_ma7']) / df['price_ma7']
-                elif col == 'price_volatility':
-                    df['price_volatility'] = df['price_std7'] / df['price_ma7']
-                elif col == 'volume_ma7':
-                    df['volume_ma7'] = df['volume'].rolling(window=7, min_periods=1).mean()
-                elif col == 'volume_ma30':
-                    df['volume_ma30'] = df['volume'].rolling(window=30, min_periods=1).mean()
-                elif col == 'price_lag1':
-                    df['price_lag1'] = df['price'].shift(1)
-                elif col == 'price_lag7':
-                    df['price_lag7'] = df['price'].shift(7)
-                elif col == 'price_lag30':
-                    df['price_lag30'] = df['price'].shift(30)
-                elif col == 'seasonal_factor':
-                    df['seasonal_factor'] = df['month'].map(self.seasonal_factors)
-                elif col == 'weekly_factor':
-                    df['weekly_factor'] = df['day_of_week'].map(self.weekly_factors)
+    def prepare_features(self, df, history=None):
+        """Prepare features for prediction
+        
+        Frames without prices (future dates) take their rolling, lag and volume
+        features from the last row of the prepared history, with seasonal and
+        weekly factors mapped from their own dates.
+        """
+        df = df.copy()
+        if 'month' not in df.columns:
+            df['month'] = df['date'].dt.month
+        if 'day_of_week' not in df.columns:
+            df['day_of_week'] = df['date'].dt.dayofweek
+        
+        if 'price' not in df.columns and history is not None:
+            last_row = history.iloc[-1]
+            for col in FEATURE_COLUMNS:
+                if col not in df.columns:
+                    df[col] = last_row[col]
+        elif not all(col in df.columns for col in FEATURE_COLUMNS):
+            # Rebuild the full feature set from the frame's own sales
+            rebuilt = build_feature_frame(df.to_dict('records'), self.seasonal_factors, self.weekly_factors)
+            if rebuilt is not None:
+                df = rebuilt
+        
+        df['seasonal_factor'] = df['month'].map(self.seasonal_factors)
+        df['weekly_factor'] = df['day_of_week'].map(self.weekly_factors)
         
         # Fill any remaining NaN values
-        df = df.fillna(method='ffill').fillna(method='bfill')
+        df = df.ffill().bfill()
         
         return df
 
@@ -353,14 +308,7 @@ class PricePredictor:
         """Train multiple models for ensemble prediction"""
         try:
             # Prepare features
-            feature_cols = [
-                'price_ma7', 'price_ma30', 'price_std7', 'price_std30',
-                'price_momentum', 'price_volatility', 'volume_ma7', 'volume_ma30',
-                'price_lag1', 'price_lag7', 'price_lag30',
-                'seasonal_factor', 'weekly_factor'
-            ]
-            
-            X = df[feature_cols]
+            X = df[FEATURE_COLUMNS]
             y = df['price']
             
             # Split data with more recent data in test set
@@ -371,20 +319,21 @@ class PricePredictor:
             y_test = y.iloc[split_idx:]
             
             # Scale features
+            self.scaler = preprocessing.StandardScaler()
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
             
             # Train models with more trees and better parameters
-            self.rf_model = RandomForestRegressor(
-                n_estimators=500,
+            self.rf_model = ensemble.RandomForestRegressor(
+                n_estimators=self.n_estimators,
                 max_depth=10,
                 min_samples_split=5,
                 min_samples_leaf=2,
                 random_state=42
             )
             
-            self.gb_model = GradientBoostingRegressor(
-                n_estimators=500,
+            self.gb_model = ensemble.GradientBoostingRegressor(
+                n_estimators=self.n_estimators,
                 learning_rate=0.01,
                 max_depth=5,
                 min_samples_split=5,
@@ -393,7 +342,7 @@ class PricePredictor:
             )
             
             self.xgb_model = xgb.XGBRegressor(
-                n_estimators=500,
+                n_estimators=self.n_estimators,
                 learning_rate=0.01,
                 max_depth=5,
                 min_child_weight=2,
@@ -411,9 +360,9 @@ class PricePredictor:
             xgb_pred = self.xgb_model.predict(X_test_scaled)
             
             # Calculate model weights based on performance
-            rf_score = r2_score(y_test, rf_pred)
-            gb_score = r2_score(y_test, gb_pred)
-            xgb_score = r2_score(y_test, xgb_pred)
+            rf_score = metrics.r2_score(y_test, rf_pred)
+            gb_score = metrics.r2_score(y_test, gb_pred)
+            xgb_score = metrics.r2_score(y_test, xgb_pred)
             
             # Add small epsilon to avoid division by zero
             epsilon = 1e-10
@@ -433,70 +382,27 @@ class PricePredictor:
             traceback.print_exc()
             return {'rf': 0.33, 'gb': 0.33, 'xgb': 0.34}  # Default weights
 
-    def predict_future_prices(self, card_data, days_ahead=90):
-        """Predict future prices using ensemble of models"""
+    def predict_future_prices(self, card_data, days_ahead=90, card_key=None, progress=None):
+        """Predict future prices using ensemble of models
+        
+        progress, if given, is called as progress(fraction, message) between
+        stages; background jobs use it to report status and to stop early.
+        """
+        report = progress or (lambda fraction, message: None)
         try:
             # Limit days_ahead to 365 (12 months)
             days_ahead = min(days_ahead, 365)
             
+            # Use the seasonality of the card's segment when it is known
+            self.use_segment(card_key)
+            
             # Prepare data
-            df = self.prepare_data(card_data)
+            report(0.1, "Preparing features")
+            df = self.prepare_data(card_data, card_key=card_key)
             
-            # Get current price and basic metrics
-            current_price = float(card_data[-1]['price']) if card_data else 0
             if df is None:
                 # If we can't prepare data, use simple trend-based prediction
-                df = pd.DataFrame(card_data)
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                df = df.sort_values('date')
-                
-                # Calculate basic trend
-                if len(df) > 1:
-                    price_trend = (df['price'].iloc[-1] - df['price'].iloc[0]) / df['price'].iloc[0]
-                else:
-                    price_trend = 0
-                
-                # Generate simple predictions
-                future_dates = [df['date'].max() + timedelta(days=i+1) for i in range(days_ahead)]
-                predicted_prices = []
-                
-                for i in range(days_ahead):
-                    # Simple linear projection with reduced confidence
-                    price = current_price * (1 + price_trend * (i + 1) / 365)
-                    # Apply conservative bounds
-                    price = max(min(price, current_price * 1.3), current_price * 0.7)
-                    predicted_prices.append(price)
-                
-                # Calculate confidence based on data quality
-                data_confidence = min((len(card_data) / 30), 1) * 4  # Up to 4 points for data quantity
-                trend_confidence = min(abs(price_trend) * 2, 1) * 3  # Up to 3 points for trend strength
-                market_confidence = 3  # Base market confidence
-                
-                # Combine confidence scores
-                prediction_confidence = min(
-                    data_confidence + trend_confidence + market_confidence,
-                    10
-                )
-                
-                return {
-                    'current_price': current_price,
-                    'predicted_prices': list(zip(future_dates, predicted_prices)),
-                    'confidence_score': prediction_confidence,
-                    'price_volatility': 0,
-                    'price_trend': price_trend * 100,
-                    'market_factor': 1.0,
-                    'sentiment_factor': 0.5,
-                    'recommendations': {
-                        'short_term': self._generate_recommendation(current_price, predicted_prices[29], 1.0),
-                        'long_term': self._generate_recommendation(current_price, predicted_prices[-1], 1.0)
-                    },
-                    'metrics': {
-                        '30_day_forecast': predicted_prices[29],
-                        '90_day_forecast': predicted_prices[-1],
-                        'potential_30_day_return': ((predicted_prices[29] - current_price) / current_price) * 100,
-                        'potential_90_day_return': ((predicted_prices[-1] - current_price) / current_price) * 100
-                    }
-                }
+                return self._trend_based_prediction(card_data, days_ahead)
             
             # Get player name and stats
             player_name = card_data[0]['title'].split()[0:2]
@@ -504,114 +410,28 @@ class PricePredictor:
             player_stats = self.get_player_stats(player_name)
             
             # Analyze market sentiment
+            report(0.2, "Scoring market sentiment")
             market_sentiment = self.analyze_market_sentiment(card_data)
             
             # Train models
+            report(0.3, "Training models")
             model_weights = self.train_models(df)
             
             # Generate future dates
+            report(0.9, "Forecasting prices")
             future_dates = [df['date'].max() + timedelta(days=i+1) for i in range(days_ahead)]
             
             # Prepare future features
             future_df = pd.DataFrame({'date': future_dates})
-            future_df = self.prepare_features(future_df)
-            
-            # Get feature columns
-            feature_cols = [
-                'price_ma7', 'price_ma30', 'price_std7', 'price_std30',
-                'price_momentum', 'price_volatility', 'volume_ma7', 'volume_ma30',
-                'price_lag1', 'price_lag7', 'price_lag30',
-                'seasonal_factor', 'weekly_factor'
-            ]
-            
-            # Scale features
-            future_features = self.scaler.transform(future_df[feature_cols])
-            
-            # Get predictions from each model
-            rf_pred = self.rf_model.predict(future_features)
-            gb_pred = self.gb_model.predict(future_features)
-            xgb_pred = self.xgb_model.predict(future_features)
-            
-            # Combine predictions using model weights
-            ensemble_pred = (
-                rf_pred * model_weights['rf'] +
-                gb_pred * model_weights['gb'] +
-                xgb_pred * model_weights['xgb']
-            )
+            future_df = self.prepare_features(future_df, history=df)
             
-            # Apply market factors
-            market_factor = self.calculate_market_factors(player_stats)
-            sentiment_factor = 1 + (market_sentiment - 0.5) * 0.2  # ±10% impact from sentiment
+            ensemble_pred = self.predict_ensemble(future_df, model_weights)
             
-            # Calculate final predictions with all factors
-            predicted_prices = []
-            for i, pred in enumerate(ensemble_pred):
-                # Base prediction
-                price = pred
-                
-                # Apply market and sentiment factors
-                price *= market_factor * sentiment_factor
-                
-                # Apply seasonal factors
-                seasonal_factor = self.seasonal_factors[future_dates[i].month]
-                weekly_factor = self.weekly_factors[future_dates[i].weekday()]
-                price *= seasonal_factor * weekly_factor
-                
-                # Add reduced volatility
-                volatility = np.random.normal(0, df['price_std30'].iloc[-1] * 0.05)
-                price += volatility
-                
-                # Apply conservative bounds
-                current_price = df['price'].iloc[-1]
-                price = max(min(price, current_price * 1.5), current_price * 0.7)
-                
-                predicted_prices.append(price)
-            
-            # Calculate confidence metrics
-            data_confidence = min((len(card_data) / 30), 1) * 4  # Up to 4 points for data quantity
-            market_confidence = min(market_factor, 1) * 3  # Up to 3 points for market strength
-            sentiment_confidence = min(market_sentiment * 2, 1) * 3  # Up to 3 points for sentiment
-            
-            # Model confidence based on R² scores
-            model_confidence = sum(model_weights.values()) * 3  # Up to 3 points for model performance
-            
-            # Combine confidence scores
-            prediction_confidence = min(
-                data_confidence + market_confidence + sentiment_confidence + model_confidence,
-                10
+            return self._finalize_prediction(
+                df, card_data, future_dates, ensemble_pred, model_weights,
+                market_sentiment, player_stats
             )
             
-            # Calculate market indicators
-            price_volatility = (df['price_std30'].iloc[-1] / df['price_ma30'].iloc[-1]) * 100
-            price_trend = ((df['price'].iloc[-1] - df['price'].iloc[0]) / df['price'].iloc[0]) * 100
-            
-            # Generate recommendations
-            future_price_30d = predicted_prices[29]
-            future_price_90d = predicted_prices[-1]
-            current_price = df['price'].iloc[-1]
-            
-            recommendations = {
-                'short_term': self._generate_recommendation(current_price, future_price_30d, market_factor),
-                'long_term': self._generate_recommendation(current_price, future_price_90d, market_factor)
-            }
-            
-            return {
-                'current_price': current_price,
-                'predicted_prices': list(zip(future_dates, predicted_prices)),
-                'confidence_score': prediction_confidence,
-                'price_volatility': price_volatility,
-                'price_trend': price_trend,
-                'market_factor': market_factor,
-                'sentiment_factor': sentiment_factor,
-                'recommendations': recommendations,
-                'metrics': {
-                    '30_day_forecast': future_price_30d,
-                    '90_day_forecast': future_price_90d,
-                    'potential_30_day_return': ((future_price_30d - current_price) / current_price) * 100,
-                    'potential_90_day_return': ((future_price_90d - current_price) / current_price) * 100
-                }
-            }
-            
         except Exception as e:
             print(f"Error in predict_future_prices: {e}")
             # Return a basic prediction even in case of error
@@ -639,6 +459,184 @@ class PricePredictor:
                 }
             }
     
+    def _trend_based_prediction(self, card_data, days_ahead):
+        """Simple trend projection used when there isn't enough data to train the ensemble"""
+        current_price = float(card_data[-1]['price']) if card_data else 0
+        df = pd.DataFrame(card_data)
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df = df.sort_values('date')
+        
+        # Calculate basic trend
+        if len(df) > 1:
+            price_trend = (df['price'].iloc[-1] - df['price'].iloc[0]) / df['price'].iloc[0]
+        else:
+            price_trend = 0
+        
+        # Generate simple predictions
+        future_dates = [df['date'].max() + timedelta(days=i+1) for i in range(days_ahead)]
+        predicted_prices = []
+        
+        for i in range(days_ahead):
+            # Simple linear projection with reduced confidence
+            price = current_price * (1 + price_trend * (i + 1) / 365)
+            # Apply conservative bounds
+            price = max(min(price, current_price * 1.3), current_price * 0.7)
+            predicted_prices.append(price)
+        
+        # Calculate confidence based on data quality
+        data_confidence = min((len(card_data) / 30), 1) * 4  # Up to 4 points for data quantity
+        trend_confidence = min(abs(price_trend) * 2, 1) * 3  # Up to 3 points for trend strength
+        market_confidence = 3  # Base market confidence
+        
+        # Combine confidence scores
+        prediction_confidence = min(
+            data_confidence + trend_confidence + market_confidence,
+            10
+        )
+        
+        return {
+            'current_price': current_price,
+            'predicted_prices': list(zip(future_dates, predicted_prices)),
+            'confidence_score': prediction_confidence,
+            'price_volatility': 0,
+            'price_trend': price_trend * 100,
+            'market_factor': 1.0,
+            'sentiment_factor': 0.5,
+            'recommendations': {
+                'short_term': self._generate_recommendation(current_price, predicted_prices[29], 1.0),
+                'long_term': self._generate_recommendation(current_price, predicted_prices[-1], 1.0)
+            },
+            'metrics': {
+                '30_day_forecast': predicted_prices[29],
+                '90_day_forecast': predicted_prices[-1],
+                'potential_30_day_return': ((predicted_prices[29] - current_price) / current_price) * 100,
+                'potential_90_day_return': ((predicted_prices[-1] - current_price) / current_price) * 100
+            }
+        }
+
+    def predict_ensemble(self, future_df, model_weights=None):
+        """Weighted RF/GB/XGB prediction for a frame of prepared features"""
+        model_weights = model_weights or self.model_weights
+        if model_weights is None:
+            raise ValueError("Models have not been trained or loaded")
+        
+        # Scale features
+        future_features = self.scaler.transform(future_df[FEATURE_COLUMNS])
+        
+        # Get predictions from each model
+        rf_pred = self.rf_model.predict(future_features)
+        gb_pred = self.gb_model.predict(future_features)
+        xgb_pred = self.xgb_model.predict(future_features)
+        
+        # Combine predictions using model weights
+        ensemble_pred = (
+            rf_pred * model_weights['rf'] +
+            gb_pred * model_weights['gb'] +
+            xgb_pred * model_weights['xgb']
+        )
+        
+        return ensemble_pred
+
+    def save_models(self, path):
+        """Persist the trained ensemble, scaler and weights so batches can reuse them"""
+        if self.model_weights is None:
+            raise ValueError("Models have not been trained")
+        joblib.dump({
+            'rf': self.rf_model,
+            'gb': self.gb_model,
+            'xgb': self.xgb_model,
+            'scaler': self.scaler,
+            'model_weights': self.model_weights,
+            'n_estimators': self.n_estimators
+        }, path)
+
+    def load_models(self, path):
+        """Load an ensemble saved with save_models"""
+        bundle = joblib.load(path)
+        self.rf_model = bundle['rf']
+        self.gb_model = bundle['gb']
+        self.xgb_model = bundle['xgb']
+        self.scaler = bundle['scaler']
+        self.model_weights = bundle['model_weights']
+        self.n_estimators = bundle.get('n_estimators', self.n_estimators)
+        return self.model_weights
+
+    def _finalize_prediction(self, df, card_data, future_dates, ensemble_pred, model_weights,
+                             market_sentiment, player_stats):
+        """Apply market, sentiment and seasonal factors to ensemble output and build the result"""
+        # Apply market factors
+        market_factor = self.calculate_market_factors(player_stats)
+        sentiment_factor = 1 + (market_sentiment - 0.5) * 0.2  # ±10% impact from sentiment
+        
+        # Calculate final predictions with all factors
+        predicted_prices = []
+        for i, pred in enumerate(ensemble_pred):
+            # Base prediction
+            price = pred
+            
+            # Apply market and sentiment factors
+            price *= market_factor * sentiment_factor
+            
+            # Apply seasonal factors
+            seasonal_factor = self.seasonal_factors[future_dates[i].month]
+            weekly_factor = self.weekly_factors[future_dates[i].weekday()]
+            price *= seasonal_factor * weekly_factor
+            
+            # Add reduced volatility
+            volatility = np.random.normal(0, df['price_std30'].iloc[-1] * 0.05)
+            price += volatility
+            
+            # Apply conservative bounds
+            current_price = df['price'].iloc[-1]
+            price = max(min(price, current_price * 1.5), current_price * 0.7)
+            
+            predicted_prices.append(price)
+        
+        # Calculate confidence metrics
+        data_confidence = min((len(card_data) / 30), 1) * 4  # Up to 4 points for data quantity
+        market_confidence = min(market_factor, 1) * 3  # Up to 3 points for market strength
+        sentiment_confidence = min(market_sentiment * 2, 1) * 3  # Up to 3 points for sentiment
+        
+        # Model confidence based on R² scores
+        model_confidence = sum(model_weights.values()) * 3  # Up to 3 points for model performance
+        
+        # Combine confidence scores
+        prediction_confidence = min(
+            data_confidence + market_confidence + sentiment_confidence + model_confidence,
+            10
+        )
+        
+        # Calculate market indicators
+        price_volatility = (df['price_std30'].iloc[-1] / df['price_ma30'].iloc[-1]) * 100
+        price_trend = ((df['price'].iloc[-1] - df['price'].iloc[0]) / df['price'].iloc[0]) * 100
+        
+        # Generate recommendations
+        future_price_30d = predicted_prices[29]
+        future_price_90d = predicted_prices[-1]
+        current_price = df['price'].iloc[-1]
+        
+        recommendations = {
+            'short_term': self._generate_recommendation(current_price, future_price_30d, market_factor),
+            'long_term': self._generate_recommendation(current_price, future_price_90d, market_factor)
+        }
+        
+        return {
+            'current_price': current_price,
+            'predicted_prices': list(zip(future_dates, predicted_prices)),
+            'confidence_score': prediction_confidence,
+            'price_volatility': price_volatility,
+            'price_trend': price_trend,
+            'market_factor': market_factor,
+            'sentiment_factor': sentiment_factor,
+            'recommendations': recommendations,
+            'metrics': {
+                '30_day_forecast': future_price_30d,
+                '90_day_forecast': future_price_90d,
+                'potential_30_day_return': ((future_price_30d - current_price) / current_price) * 100,
+                'potential_90_day_return': ((future_price_90d - current_price) / current_price) * 100
+            }
+        }
+
     def _generate_recommendation(self, current_price, future_price, market_factor):
         """Generate buy/sell recommendations based on comprehensive analysis"""
         price_change_pct = ((future_price - current_price) / current_price) * 100
@@ -1,45 +1,96 @@
 """
 Profit Calculator module for Sports Card Analyzer Pro.
 Handles all profit-related calculations and scenarios for sports cards.
+Results are plain data; rendering lives in modules.ui.profit_display.
 """
 
-from typing import Dict, Any, List
-import streamlit as st
-from scrapers.ebay_interface import EbayInterface
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import threading
 import numpy as np
 from datetime import datetime, timedelta
-from modules.core.recommendation_engine import RecommendationEngine
+from modules.core.lazy import lazy_import
+from modules.core.recommendation_engine import Recommendation, RecommendationEngine
+from modules.core.grading_simulator import GRADE_PROBABILITIES, GRADING_SERVICES
+
+ebay_interface = lazy_import('scrapers.ebay_interface')
+
+SCENARIOS = ("Raw", "PSA 9", "PSA 10")
+
+# Card fields the scenarios read; anything else doesn't change the result
+_INPUT_FIELDS = ('title', 'price', 'shipping_cost', 'seller_fee_percentage', 'grading_service',
+                 'condition', 'search_params', 'market_data')
+
+
+@dataclass
+class ProfitAnalysis:
+    """Every profit scenario for one card plus the resulting recommendation."""
+    scenarios: Dict[str, Dict[str, Any]]
+    recommendation: Optional[Recommendation] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'scenarios': self.scenarios,
+            'recommendation': self.recommendation.to_dict() if self.recommendation else None,
+            'errors': self.errors
+        }
+
+
+def analysis_key(card_data: Dict[str, Any]) -> str:
+    """Stable hash of the inputs a ProfitAnalysis depends on."""
+    inputs = {name: card_data.get(name) for name in _INPUT_FIELDS}
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
 
 class ProfitCalculator:
-    def __init__(self):
-        self.scraper = EbayInterface()
-        self.recommendation_engine = RecommendationEngine()
+    def __init__(self, scraper=None, recommendation_engine: Optional[RecommendationEngine] = None,
+                 cache_size: int = 1024):
+        """
+        Initialize the calculator.
+
+        Args:
+            scraper: Market data source (an EbayInterface, created on first use by default)
+            recommendation_engine: Engine used for recommendations
+            cache_size: Most profit analyses memoized by their inputs
+        """
+        self._scraper = scraper
+        self.recommendation_engine = recommendation_engine if recommendation_engine is not None else RecommendationEngine()
+        self.cache_size = cache_size
+        self._cache: Dict[str, ProfitAnalysis] = {}
+        self._lock = threading.Lock()
         self.scenarios = {
             "Raw": self._calculate_raw_scenario,
             "PSA 9": self._calculate_psa9_scenario,
             "PSA 10": self._calculate_psa10_scenario
         }
-        # Define grading service parameters
+        # Define grading service parameters (tiers shared with the grading simulator)
         self.grading_params = {
             'turnaround_time_days': {
                 'n/a': 0,
-                'economy': 30,
-                'regular': 15,
-                'express': 5,
+                **{name: tier['turnaround_days'] for name, tier in GRADING_SERVICES.items()},
                 'other': 0
             },
             'grading_costs': {
                 'n/a': 0,
-                'economy': 50,
-                'regular': 100,
-                'express': 200,
+                **{name: tier['fee'] for name, tier in GRADING_SERVICES.items()},
                 'other': 0
             },
-            'psa9_probability': 0.50,    # 50% chance of PSA 9
-            'psa10_probability': 0.20,   # 20% chance of PSA 10
-            'lower_grade_probability': 0.30  # 30% chance of PSA 8 or lower
+            'psa9_probability': GRADE_PROBABILITIES['psa9'],    # 50% chance of PSA 9
+            'psa10_probability': GRADE_PROBABILITIES['psa10'],  # 20% chance of PSA 10
+            'lower_grade_probability': GRADE_PROBABILITIES['lower']  # 30% chance of PSA 8 or lower
         }
 
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            self._scraper = ebay_interface.EbayInterface()
+        return self._scraper
+
     def calculate_profits(self, card_data: Dict[str, Any], scenario: str) -> Dict[str, Any]:
         """Calculate profits for a given card and scenario."""
         if scenario not in self.scenarios:
@@ -209,7 +260,7 @@ class ProfitCalculator:
                             ]
                             sales_count = len(cleaned_prices)
             except Exception as e:
-                st.warning(f"Could not fetch {target_grade} sales data: {str(e)}")
+                print(f"Could not fetch {target_grade} sales data: {str(e)}")
         
         # If no graded sales data found, estimate from raw market price
         if market_price == 0:
@@ -323,171 +374,71 @@ class ProfitCalculator:
         """Calculate PSA 10 grading scenario."""
         return self._calculate_graded_scenario(card_data, "PSA 10")
 
-    def display_profit_analysis(self, card_data: Dict[str, Any]) -> None:
-        """Display profit analysis in Streamlit UI."""
-        st.subheader("Profit Calculator")
-        
-        # Get market data from session state if available
-        if 'market_data' in st.session_state:
-            card_data['market_data'] = st.session_state.market_data
-        
-        # Break-even analysis section
-        st.markdown("#### Break-Even Analysis")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            grading_cost = st.number_input(
-                "Grading Cost ($)",
-                min_value=0.0,
-                value=25.0,
-                step=1.0,
-                key="grading_cost",
-                help="Cost to grade the card"
-            )
-        
-        with col2:
-            shipping_cost = st.number_input(
-                "Shipping Cost ($)",
-                min_value=0.0,
-                value=10.0,
-                step=1.0,
-                key="shipping_cost",
-                help="Cost to ship the card"
-            )
-        
-        with col3:
-            seller_fee_percentage = st.number_input(
-                "Seller Fee (%)",
-                min_value=0.0,
-                max_value=100.0,
-                value=12.9,
-                step=0.1,
-                key="seller_fee",
-                help="Platform selling fees (e.g., eBay typically charges 12.9% for cards)"
-            )
-        
-        # Update card data with user inputs
-        card_data.update({
-            'grading_cost': grading_cost,
-            'shipping_cost': shipping_cost,
-            'seller_fee_percentage': seller_fee_percentage
-        })
-        
-        # Create tabs for different scenarios
-        tab1, tab2, tab3 = st.tabs(["Raw Card", "PSA 9", "PSA 10"])
-        
-        with tab1:
-            self._display_scenario_metrics("Raw", card_data)
-        
-        with tab2:
-            self._display_scenario_metrics("PSA 9", card_data)
-        
-        with tab3:
-            self._display_scenario_metrics("PSA 10", card_data)
-            
-        # Add recommendations section after all tabs
-        st.markdown("---")  # Visual separator
-        
-        # Debug information
-        st.write("Debug: Checking market data availability")
-        if card_data is None:
-            st.warning("Debug: card_data is None")
-        else:
-            st.write(f"Debug: card_data keys: {list(card_data.keys())}")
-            
-        if card_data and 'market_data' in card_data:
-            st.write("Debug: Market data found, generating recommendations...")
-            current_scenario = "Raw"  # Default to Raw scenario
-            current_profit_data = self.calculate_profits(card_data, current_scenario)
-            
+    def analyze(self, card_data: Dict[str, Any], scenarios: Optional[List[str]] = None,
+                use_cache: bool = True) -> ProfitAnalysis:
+        """
+        Calculate the profit scenarios and recommendation for a card.
+
+        Results are memoized by analysis_key, so re-rendering a page with the
+        same inputs doesn't repeat the scraping and math.
+
+        Args:
+            card_data: Card with price, costs, condition, search_params and optionally market_data
+            scenarios: Scenarios to calculate (all of SCENARIOS by default)
+            use_cache: Whether to reuse and store memoized results
+
+        Returns:
+            ProfitAnalysis; a scenario that fails is reported in errors instead of raising
+        """
+        scenarios = list(scenarios or SCENARIOS)
+        key = f"{analysis_key(card_data)}:{','.join(scenarios)}"
+        if use_cache:
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        analysis = ProfitAnalysis(scenarios={})
+        for scenario in scenarios:
             try:
-                self.recommendation_engine.display_recommendations(
-                    card_data=card_data,
-                    market_data=card_data['market_data'],
-                    profit_data=current_profit_data
-                )
+                analysis.scenarios[scenario] = self.calculate_profits(card_data, scenario)
             except Exception as e:
-                st.error(f"Debug: Error in recommendations: {str(e)}")
-        else:
-            st.info("Debug: Market data not available yet. Please complete a card search to see recommendations.")
+                print(f"Error calculating {scenario} scenario: {str(e)}")
+                analysis.errors[scenario] = str(e)
+
+        if card_data.get('market_data'):
+            analysis.recommendation = self.recommendation_engine.recommend(
+                card_data, card_data['market_data'], analysis.scenarios.get("Raw"))
+
+        if use_cache and not analysis.errors:
+            with self._lock:
+                if len(self._cache) >= self.cache_size:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = analysis
+        return analysis
+
+    def analyze_many(self, cards: List[Dict[str, Any]], scenarios: Optional[List[str]] = None,
+                     max_workers: int = 4) -> List[ProfitAnalysis]:
+        """
+        Analyze several cards concurrently; scenario lookups are I/O bound.
+
+        Returns:
+            One ProfitAnalysis per card, in order
+        """
+        if max_workers <= 1 or len(cards) <= 1:
+            return [self.analyze(card, scenarios) for card in cards]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda card: self.analyze(card, scenarios), cards))
+
+    def display_profit_analysis(self, card_data: Dict[str, Any]) -> None:
+        """Display profit analysis in Streamlit UI."""
+        from modules.ui.profit_display import render_profit_analysis
+        render_profit_analysis(self, card_data)
 
     def _display_scenario_metrics(self, scenario: str, card_data: Dict[str, Any]) -> None:
         """Display metrics for a specific scenario."""
-        results = self.calculate_profits(card_data, scenario)
-        
-        # Display market value and costs
-        st.markdown("#### Market Value")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.metric(
-                "Market Price",
-                f"${results['market_price']:.2f}",
-                help=f"Based on {results['price_source']} data from {results['sales_count']} sales"
-            )
-            st.metric(
-                "Break-Even Price",
-                f"${results['break_even_price']:.2f}",
-                help="Minimum selling price needed to recover all costs"
-            )
-        
-        with col2:
-            st.metric(
-                "Base Costs",
-                f"${results['base_costs']:.2f}",
-                help="Sum of purchase price, shipping, and grading costs"
-            )
-            st.metric(
-                "Seller Fees",
-                f"${results['seller_fee_amount']:.2f}",
-                help=f"Platform fees ({results['seller_fee']}% of sale price)"
-            )
-        
-        # Display profit metrics
-        st.markdown("#### Profit Analysis")
-        col3, col4 = st.columns(2)
-        
-        with col3:
-            st.metric(
-                "Net Profit",
-                f"${results['net_profit']:.2f}",
-                help="Expected profit after all costs and fees"
-            )
-            if scenario != "Raw":
-                st.metric(
-                    "Success Probability",
-                    f"{results['success_probability']:.1f}%",
-                    help=f"Chance of achieving {scenario} grade"
-                )
-        
-        with col4:
-            st.metric(
-                "ROI",
-                f"{results['roi']:.1f}%",
-                help="Return on Investment percentage"
-            )
-            if scenario != "Raw":
-                st.metric(
-                    "Lower Grade Risk",
-                    f"{results['lower_grade_probability']:.1f}%",
-                    help="Probability of receiving a lower grade"
-                )
-        
-        # Display timeline and risk
-        st.markdown("#### Timeline & Risk")
-        st.info(
-            f"⏱️ **Timeline:** {results['timeline']}\n\n"
-            f"⚠️ **Risk Level:** {results['risk_level']}"
-        )
-        
-        # Show recent sales if available
-        if results.get('recent_sales'):
-            with st.expander("Recent Sales History"):
-                for sale in results['recent_sales'][:5]:  # Show last 5 sales
-                    st.write(
-                        f"${sale['price']:.2f} - "
-                        f"Sold on {sale.get('date', 'N/A')}"
-                    )
+        from modules.ui.profit_display import render_scenario_metrics
+        render_scenario_metrics(scenario, self.calculate_profits(card_data, scenario))
 
     def calculate_return(self, purchase_price: float, current_price: float, holding_period: int,
                         shipping_cost: float, seller_fee: float, market_trend: float = 0.5) -> float:
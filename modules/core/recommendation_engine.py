@@ -1,16 +1,46 @@
 """
 Recommendation Engine module for Sports Card Analyzer Pro.
 Provides comprehensive analysis and recommendations for sports cards.
+Recommendations are plain result objects; rendering lives in modules.ui.profit_display.
 """
 
-from typing import Dict, Any
-import streamlit as st
-from datetime import datetime
+from dataclasses import asdict, dataclass
+from typing import Dict, Any, List, Optional, Tuple
 import re
+import threading
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    """Market read and buyer/seller advice for one card."""
+    player_name: str
+    health: str
+    trend: str
+    liquidity: str
+    price_insights: str
+    buyer: str
+    seller: str
+
+    @property
+    def overview(self) -> str:
+        return (f"The market for this card is currently {self.health}, with prices showing a {self.trend} trend. "
+                f"Trading activity indicates the market is {self.liquidity}. {self.price_insights}").strip()
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(asdict(self), overview=self.overview)
+
 
 class RecommendationEngine:
-    def __init__(self):
-        pass
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the engine.
+
+        Args:
+            cache_size: Most recommendations memoized by their inputs
+        """
+        self.cache_size = cache_size
+        self._cache: Dict[Tuple, Recommendation] = {}
+        self._lock = threading.Lock()
 
     def _extract_player_name(self, card_title: str) -> str:
         """Extract player name from card title."""
@@ -124,55 +154,59 @@ class RecommendationEngine:
 
         return f"Seller's Recommendation: {timing} The market is {health} and {liquidity}. {price_insights}"
 
-    def display_recommendations(self, card_data: Dict[str, Any], market_data: Dict[str, Any], profit_data: Dict[str, Any]) -> None:
-        """Display comprehensive recommendations in the Streamlit UI."""
-        st.markdown("---")  # Visual separator
-        st.subheader("📊 Final Recommendation")
-        
-        # Market Analysis
+    @staticmethod
+    def _cache_key(card_data: Dict[str, Any], market_data: Dict[str, Any], profit_data: Optional[Dict[str, Any]]) -> Tuple:
+        """The inputs a recommendation actually depends on."""
+        metrics = (market_data or {}).get('metrics', {})
+        return (
+            (card_data or {}).get('title', ''),
+            tuple(float(metrics.get(name, 0)) for name in
+                  ('market_health_score', 'trend_score', 'liquidity_score', 'average_price', 'median_price')),
+            float(profit_data.get('roi', 0)) if profit_data else None
+        )
+
+    def recommend(self, card_data: Dict[str, Any], market_data: Dict[str, Any],
+                  profit_data: Optional[Dict[str, Any]] = None) -> Recommendation:
+        """
+        Build the recommendation for a card, reusing it when the inputs haven't changed.
+
+        Args:
+            card_data: Card with at least a title
+            market_data: Market analysis with a 'metrics' dictionary
+            profit_data: Profit scenario (e.g. from ProfitCalculator) providing 'roi'
+
+        Returns:
+            Recommendation
+        """
+        key = self._cache_key(card_data, market_data, profit_data)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
         market_analysis = self._analyze_market_metrics(market_data)
         price_insights = self._generate_price_insights(market_data, profit_data)
-        
-        # Overall Market Summary
-        st.markdown("#### Market Overview")
-        st.write(f"""
-        The market for this card is currently {market_analysis['health']}, with prices showing a {market_analysis['trend']} trend. 
-        Trading activity indicates the market is {market_analysis['liquidity']}. {price_insights}
-        """)
-        
-        # Player Name
-        player_name = self._extract_player_name(card_data.get('title', ''))
-        
-        # Player News and Context
-        st.markdown("#### Recent Context")
-        st.info(f"""
-        💡 **Player:** {player_name}
-        
-        To make a fully informed decision, consider:
-        - Check recent player performance and news
-        - Monitor upcoming games or events that could impact value
-        - Research any recent sales of similar cards
-        - Consider the overall market conditions for this sport/player
-        """)
-        
-        # Recommendations
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### For Buyers")
-            st.write(self._generate_buyer_recommendation(market_analysis, price_insights))
-            
-        with col2:
-            st.markdown("#### For Sellers")
-            st.write(self._generate_seller_recommendation(market_analysis, price_insights))
-        
-        # Risk Factors
-        st.markdown("#### Risk Factors to Consider")
-        st.warning("""
-        ⚠️ **Key Risk Factors:**
-        - Market volatility and trading volume
-        - Player performance and team dynamics
-        - Overall sports card market conditions
-        - Grading population changes
-        - Seasonal market fluctuations
-        """) 
\ No newline at end of file
+        recommendation = Recommendation(
+            player_name=self._extract_player_name((card_data or {}).get('title', '')),
+            health=market_analysis['health'],
+            trend=market_analysis['trend'],
+            liquidity=market_analysis['liquidity'],
+            price_insights=price_insights,
+            buyer=self._generate_buyer_recommendation(market_analysis, price_insights),
+            seller=self._generate_seller_recommendation(market_analysis, price_insights)
+        )
+
+        with self._lock:
+            if len(self._cache) >= self.cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = recommendation
+        return recommendation
+
+    def recommend_many(self, items: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]]) -> List[Recommendation]:
+        """Recommendations for (card_data, market_data, profit_data) triples, in order."""
+        return [self.recommend(card_data, market_data, profit_data) for card_data, market_data, profit_data in items]
+
+    def display_recommendations(self, card_data: Dict[str, Any], market_data: Dict[str, Any], profit_data: Dict[str, Any]) -> None:
+        """Display comprehensive recommendations in the Streamlit UI."""
+        from modules.ui.profit_display import render_recommendation
+        render_recommendation(self.recommend(card_data, market_data, profit_data))
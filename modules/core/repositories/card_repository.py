@@ -1,10 +1,35 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from modules.core.models import Card
 from modules.core.firebase_manager import FirebaseManager
+from modules.services.firestore_executor import run_blocking
 from ..service_container import ServiceContainer
 import logging
 
+# Cards valued at the same time by batch_update_values
+VALUE_UPDATE_CONCURRENCY = int(os.getenv('CARD_VALUE_CONCURRENCY', 8))
+
+# Most writes Firestore accepts in one batch
+MAX_BATCH_WRITES = 500
+
+
+@dataclass
+class BatchValueResult:
+    """Outcome of a batch value update: the updated cards and the ones that failed, with why."""
+    updated: List[Card] = field(default_factory=list)
+    failed: List[Tuple[Card, str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'updated': len(self.updated),
+            'failed': [{'id': card.id, 'player_name': card.player_name, 'error': error}
+                       for card, error in self.failed]
+        }
+
+
 class CardRepository:
     """Repository for managing Card documents"""
     
@@ -37,7 +62,7 @@ class CardRepository:
         try:
             doc_ref = self.db.collection('cards').document()
             card.id = doc_ref.id
-            doc_ref.set(card.to_dict())
+            await run_blocking(doc_ref.set, card.to_dict())
             self._add_to_cache(card)
             return card
         except Exception as e:
@@ -52,7 +77,7 @@ class CardRepository:
             if cached_card:
                 return cached_card
 
-            doc = self.db.collection('cards').document(card_id).get()
+            doc = await run_blocking(self.db.collection('cards').document(card_id).get)
             if not doc.exists:
                 return None
             
@@ -70,7 +95,7 @@ class CardRepository:
             if not card.id:
                 raise ValueError("Card must have an ID to update")
             
-            self.db.collection('cards').document(card.id).update(card.to_dict())
+            await run_blocking(self.db.collection('cards').document(card.id).update, card.to_dict())
             self._add_to_cache(card)
             return card
         except Exception as e:
@@ -80,7 +105,7 @@ class CardRepository:
     async def delete(self, card_id: str) -> bool:
         """Delete a card"""
         try:
-            self.db.collection('cards').document(card_id).delete()
+            await run_blocking(self.db.collection('cards').document(card_id).delete)
             if card_id in self._cache:
                 del self._cache[card_id]
                 del self._cache_expiry[card_id]
@@ -92,7 +117,7 @@ class CardRepository:
     async def list_all(self) -> List[Card]:
         """List all cards"""
         try:
-            docs = self.db.collection('cards').get()
+            docs = await run_blocking(self.db.collection('cards').get)
             cards = []
             for doc in docs:
                 card_data = doc.to_dict()
@@ -174,18 +199,26 @@ class CardRepository:
             self.logger.error(f"Error getting cards with tag {tag}: {str(e)}")
             raise
     
+    async def _revalue(self, card: Card) -> Card:
+        """Set a card's current value, ROI and last_updated from the value analyzer, without saving it"""
+        if not card.id:
+            raise ValueError("Cannot update value for card without ID")
+
+        if asyncio.iscoroutinefunction(self.value_analyzer.analyze_card):
+            current_value = await self.value_analyzer.analyze_card(card)
+        else:
+            # A synchronous analyzer would block the event loop and every other valuation
+            current_value = await run_blocking(self.value_analyzer.analyze_card, card)
+        card.current_value = current_value
+        if card.purchase_price > 0:
+            card.roi = ((current_value - card.purchase_price) / card.purchase_price) * 100
+        card.last_updated = datetime.now()
+        return card
+
     async def update_value(self, card: Card) -> Card:
         """Update a card's current value and ROI"""
         try:
-            if not card.id:
-                raise ValueError("Cannot update value for card without ID")
-            
-            current_value = await self.value_analyzer.analyze_card(card)
-            card.current_value = current_value
-            if card.purchase_price > 0:
-                card.roi = ((current_value - card.purchase_price) / card.purchase_price) * 100
-            card.last_updated = datetime.now()
-            
+            await self._revalue(card)
             updated = await self.update(card)
             self._add_to_cache(updated)
             return updated
@@ -193,23 +226,60 @@ class CardRepository:
             self.logger.error(f"Error updating value for card {card.id}: {str(e)}")
             raise
     
-    async def batch_update_values(self, cards: List[Card]) -> List[Card]:
-        """Update values for multiple cards"""
+    async def batch_update_values(self, cards: List[Card], concurrency: Optional[int] = None) -> List[Card]:
+        """Update values for multiple cards; cards that fail are logged and left out (see update_values)"""
         try:
-            if not cards:
-                return []
-            
-            updated_cards = []
-            for card in cards:
-                try:
-                    updated = await self.update_value(card)
-                    updated_cards.append(updated)
-                except Exception as e:
-                    self.logger.error(f"Error updating value for card {card.id}: {str(e)}")
-                    # Continue with other cards even if one fails
-                    continue
-            
-            return updated_cards
+            return (await self.update_values(cards, concurrency)).updated
         except Exception as e:
             self.logger.error(f"Error in batch update values: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def update_values(self, cards: List[Card], concurrency: Optional[int] = None) -> BatchValueResult:
+        """
+        Value cards concurrently and save them in batched writes.
+
+        Args:
+            cards: Cards to revalue
+            concurrency: Most valuations running at once (VALUE_UPDATE_CONCURRENCY by default)
+
+        Returns:
+            BatchValueResult: The saved cards, and each card that failed with its error
+        """
+        result = BatchValueResult()
+        if not cards:
+            return result
+
+        semaphore = asyncio.Semaphore(max(1, concurrency or VALUE_UPDATE_CONCURRENCY))
+
+        async def revalue(card: Card) -> Card:
+            async with semaphore:
+                return await self._revalue(card)
+
+        outcomes = await asyncio.gather(*(revalue(card) for card in cards), return_exceptions=True)
+        valued = []
+        for card, outcome in zip(cards, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Error updating value for card {card.id}: {str(outcome)}")
+                # Continue with other cards even if one fails
+                result.failed.append((card, str(outcome)))
+            else:
+                valued.append(card)
+
+        chunks = [valued[start:start + MAX_BATCH_WRITES] for start in range(0, len(valued), MAX_BATCH_WRITES)]
+        commits = await asyncio.gather(*(self._commit_updates(chunk) for chunk in chunks), return_exceptions=True)
+        for chunk, outcome in zip(chunks, commits):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Error saving values for {len(chunk)} cards: {str(outcome)}")
+                result.failed.extend((card, str(outcome)) for card in chunk)
+                continue
+            for card in chunk:
+                self._add_to_cache(card)
+            result.updated.extend(chunk)
+        return result
+
+    async def _commit_updates(self, cards: List[Card]) -> None:
+        """Write cards in one batch"""
+        batch = self.db.batch()
+        for card in cards:
+            batch.update(self.db.collection('cards').document(card.id), card.to_dict())
+        await run_blocking(batch.commit)
@@ -114,12 +114,8 @@ class CollectionRepository:
             if not collection:
                 raise DocumentNotFoundError(f"Collection {collection_id} not found")
 
-            cards = []
-            for card_id in collection.cards:
-                card = await self._card_repository.get(card_id)
-                if card:
-                    cards.append(card)
-            return cards
+            # One multi-get per chunk of uncached cards instead of a read per card
+            return await self._card_repository.get_many(collection.cards)
         except Exception as e:
             self.logger.error(f"Error getting cards from collection: {str(e)}")
             raise RepositoryError(f"Failed to get cards from collection: {str(e)}")
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from modules.core.repository import Repository, RepositoryError, DocumentNotFoundError
@@ -103,16 +104,19 @@ class UserRepository:
             if not user:
                 raise DocumentNotFoundError(f"User {user_id} not found")
             
+            # Fetch the collections concurrently
+            results = await asyncio.gather(
+                *(self.collection_repository.get(collection_id) for collection_id in user.collections),
+                return_exceptions=True
+            )
             collections = []
-            for collection_id in user.collections:
-                try:
-                    collection = await self.collection_repository.get(collection_id)
-                    if collection:
-                        collections.append(collection)
-                except Exception as e:
-                    self.logger.error(f"Error getting collection {collection_id} for user {user_id}: {str(e)}")
+            for collection_id, collection in zip(user.collections, results):
+                if isinstance(collection, Exception):
+                    self.logger.error(f"Error getting collection {collection_id} for user {user_id}: {str(collection)}")
                     # Continue with other collections even if one fails
                     continue
+                if collection:
+                    collections.append(collection)
             
             return collections
         except Exception as e:
@@ -1,4 +1,5 @@
 from typing import TypeVar, Type, List, Optional, Dict, Any, Generic
+import asyncio
 import logging
 from datetime import datetime
 from .models import BaseModel
@@ -6,6 +7,9 @@ from modules.services.firebase import FirebaseService
 
 T = TypeVar('T', bound=BaseModel)
 
+# Documents requested per multi-get round trip
+GET_MANY_CHUNK_SIZE = 100
+
 class RepositoryError(Exception):
     """Base exception for repository errors"""
     pass
@@ -52,6 +56,29 @@ class Repository(Generic[T]):
             self.logger.error(f"Error getting document {doc_id} from {self.collection_name}: {str(e)}")
             return None
     
+    async def get_many(self, doc_ids: List[str]) -> List[T]:
+        """Get several documents by ID, in order, skipping missing ones and ones whose read failed"""
+        try:
+            # Read only what isn't cached, a chunk per request, the chunks concurrently
+            missing = list(dict.fromkeys(doc_id for doc_id in doc_ids if doc_id not in self._cache))
+            chunks = [missing[start:start + GET_MANY_CHUNK_SIZE] for start in range(0, len(missing), GET_MANY_CHUNK_SIZE)]
+            results = await asyncio.gather(*(self.firebase.get_documents(self.collection_name, chunk) for chunk in chunks),
+                                           return_exceptions=True)
+            for chunk, found in zip(chunks, results):
+                if isinstance(found, Exception):
+                    # Like get(), a failed read skips those documents instead of failing the rest
+                    self.logger.error(f"Error getting {len(chunk)} documents from {self.collection_name}: {str(found)}")
+                    continue
+                for doc_id, data in found.items():
+                    try:
+                        self._cache[doc_id] = self._create_model(data)
+                    except Exception as e:
+                        self.logger.error(f"Error creating model from document {doc_id}: {str(e)}")
+            return [self._cache[doc_id] for doc_id in doc_ids if doc_id in self._cache]
+        except Exception as e:
+            self.logger.error(f"Error getting documents from {self.collection_name}: {str(e)}")
+            raise RepositoryError(f"Failed to get documents: {str(e)}")
+
     async def update(self, model: T) -> T:
         """Update a document"""
         try:
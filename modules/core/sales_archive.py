@@ -0,0 +1,328 @@
+"""
+Sales archive module for Sports Card Analyzer Pro.
+Stores per-card sales histories locally so they can be replayed without
+hitting eBay (backtesting, precomputed tables, offline benchmarks).
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import numpy as np
+
+DEFAULT_ARCHIVE_PATH = os.getenv('SALES_ARCHIVE_PATH', os.path.join('data', 'sales_archive.json'))
+
+# Most recent sales kept per card; older ones are dropped as new ones arrive
+MAX_SALES_PER_CARD = int(os.getenv('SALES_ARCHIVE_MAX_SALES', 2000))
+
+# Seconds record_sales waits before saving, so several searches are written together
+SAVE_DELAY_SECONDS = 30.0
+
+CARD_KEY_FIELDS = ('year', 'player_name', 'card_set', 'card_number', 'variation')
+
+_GRADE_PATTERN = re.compile(r'^(psa|sgc|bgs|cgc)\s*(\d+(?:\.\d+)?)$', re.IGNORECASE)
+
+
+def make_card_key(card: Dict[str, Any]) -> str:
+    """
+    Build a stable key identifying a card across searches, collections and archives.
+
+    Args:
+        card: Dictionary with any of player_name, year, card_set, card_number, variation,
+            and optionally the search scenario (grade) it was priced under
+
+    Returns:
+        Lowercase key such as "2020|justin herbert|prizm|325|silver", with "|psa 10"
+        appended when a scenario is given, or "" when the card has no identifying fields
+    """
+    def _normalize(value: Any) -> str:
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return ''
+        return ' '.join(str(value).lower().replace('#', '').split())
+
+    parts = [_normalize(card.get(field)) for field in CARD_KEY_FIELDS]
+    if not any(parts):
+        return ''
+    scenario = _normalize(card.get('scenario'))
+    if scenario:
+        parts.append(scenario)
+    return '|'.join(parts)
+
+
+def card_scenario(card: Dict[str, Any]) -> str:
+    """
+    Search scenario a collection card is priced under: its grade when its
+    condition is one (e.g. "PSA 10"), "Raw" otherwise.
+    """
+    if card.get('scenario'):
+        return str(card['scenario'])
+    condition = card.get('condition')
+    if isinstance(condition, Enum):
+        condition = condition.value
+    match = _GRADE_PATTERN.match(' '.join(str(condition or '').split()))
+    if not match:
+        return 'Raw'
+    return f"{match.group(1).upper()} {match.group(2)}"
+
+
+def collection_card_key(card: Dict[str, Any]) -> str:
+    """make_card_key of a collection card, with the scenario its searches are archived under."""
+    return make_card_key(dict(card, scenario=card_scenario(card)))
+
+
+class SalesArchive:
+    """JSON-backed store of sales histories keyed by card key."""
+
+    def __init__(self, path: Optional[str] = DEFAULT_ARCHIVE_PATH, max_sales_per_card: int = MAX_SALES_PER_CARD):
+        """
+        Initialize the archive.
+
+        Args:
+            path: JSON file to load from and save to, or None for an in-memory archive
+            max_sales_per_card: Most recent sales kept per card
+        """
+        self.path = path
+        self.max_sales_per_card = max(1, max_sales_per_card)
+        self._histories: Dict[str, List[Dict[str, Any]]] = {}
+        # Searches of several sessions add sales while another one saves
+        self._lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        """Load histories from the archive file."""
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        with self._lock:
+            self._histories = {key: list(sales)[-self.max_sales_per_card:] for key, sales in data.items()}
+
+    def save(self) -> None:
+        """Write histories to the archive file, replacing it atomically."""
+        if not self.path:
+            raise ValueError("Cannot save an in-memory sales archive without a path")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            payload = json.dumps(self._histories, default=str)
+            self._dirty = False
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(payload)
+            os.replace(temp_path, self.path)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def save_soon(self, delay: float = SAVE_DELAY_SECONDS) -> None:
+        """Save after a delay, writing the sales added meanwhile in the same save."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(delay, self._save_from_timer)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _save_from_timer(self) -> None:
+        with self._lock:
+            self._save_timer = None
+        self.save_pending()
+
+    def save_pending(self) -> bool:
+        """
+        Save now if sales were added since the last save.
+
+        Returns:
+            bool: True if nothing was left unsaved
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+        try:
+            self.save()
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Could not save sales archive: {e}")
+            return False
+
+    def add_sales(self, card_key: str, sales: List[Dict[str, Any]]) -> int:
+        """
+        Merge sales into a card's history, skipping ones already archived.
+
+        Args:
+            card_key: Key from make_card_key
+            sales: Sales dictionaries with at least price and date
+
+        Returns:
+            Number of sales added
+        """
+        with self._lock:
+            return self._add_sales(card_key, sales)
+
+    def _add_sales(self, card_key: str, sales: List[Dict[str, Any]]) -> int:
+        history = self._histories.setdefault(card_key, [])
+        seen = {(str(s.get('date')), float(s.get('price', 0)), s.get('title', '')) for s in history}
+        added = 0
+        for sale in sales:
+            try:
+                record = {
+                    'title': sale.get('title', ''),
+                    'price': float(sale['price']),
+                    'date': str(sale['date'])[:10]
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+            signature = (record['date'], record['price'], record['title'])
+            if signature in seen:
+                continue
+            seen.add(signature)
+            history.append(record)
+            added += 1
+        history.sort(key=lambda s: s['date'])
+        del history[:-self.max_sales_per_card]
+        return added
+
+    def get_history(self, card_key: str) -> List[Dict[str, Any]]:
+        """Get the sales history for a card, oldest first."""
+        with self._lock:
+            return list(self._histories.get(card_key, []))
+
+    def card_keys(self) -> List[str]:
+        """List all archived card keys."""
+        with self._lock:
+            return list(self._histories.keys())
+
+    def items(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Iterate over (card_key, history) pairs."""
+        with self._lock:
+            items = [(key, list(history)) for key, history in self._histories.items()]
+        yield from items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._histories)
+
+
+_default_archive: Optional[SalesArchive] = None
+_default_archive_lock = threading.Lock()
+
+
+def get_sales_archive() -> SalesArchive:
+    """Get the process-wide archive at SALES_ARCHIVE_PATH."""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = SalesArchive()
+            atexit.register(_default_archive.save_pending)
+        return _default_archive
+
+
+def record_sales(card: Dict[str, Any], sales: List[Dict[str, Any]]) -> int:
+    """
+    Archive sales found for a card so market tables and backtests can use them.
+
+    The archive file is written shortly afterwards in the background (and at
+    exit), not on every call.
+
+    Args:
+        card: Card or search parameters passed to make_card_key
+        sales: Sales dictionaries with price, date and title
+
+    Returns:
+        Number of new sales archived
+    """
+    card_key = make_card_key(card)
+    if not card_key:
+        return 0
+    archive = get_sales_archive()
+    added = archive.add_sales(card_key, sales)
+    if added and archive.path:
+        archive.save_soon()
+    return added
+
+
+def generate_synthetic_history(n_points: int = 120,
+                               start_price: float = 100.0,
+                               drift: float = 0.0005,
+                               volatility: float = 0.03,
+                               title: str = "2020 Synthetic Player Prizm #1",
+                               end_date: Optional[datetime] = None,
+                               seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generate a daily sales history following a random walk with weekly seasonality.
+
+    Args:
+        n_points: Number of daily sales
+        start_price: Price of the first sale
+        drift: Mean daily log return
+        volatility: Standard deviation of daily log returns
+        title: Listing title used for every sale
+        end_date: Date of the last sale (defaults to today)
+        seed: Random seed for reproducible histories
+
+    Returns:
+        List of sales dictionaries sorted oldest first
+    """
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    dates = [end_date - timedelta(days=n_points - 1 - i) for i in range(n_points)]
+
+    log_returns = rng.normal(drift, volatility, n_points)
+    log_returns[0] = 0.0
+    prices = start_price * np.exp(np.cumsum(log_returns))
+    weekday_effect = np.array([1.0 + 0.03 * (d.weekday() >= 5) for d in dates])
+    prices = np.round(prices * weekday_effect, 2)
+
+    return [
+        {'title': title, 'price': float(price), 'date': date.strftime('%Y-%m-%d')}
+        for date, price in zip(dates, prices)
+    ]
+
+
+def generate_synthetic_archive(n_cards: int = 10,
+                               n_points: int = 120,
+                               seed: int = 42) -> SalesArchive:
+    """
+    Build an in-memory archive of synthetic card histories for offline benchmarks.
+
+    Args:
+        n_cards: Number of cards to generate
+        n_points: Number of daily sales per card
+        seed: Base random seed
+
+    Returns:
+        SalesArchive with one history per synthetic card
+    """
+    rng = np.random.default_rng(seed)
+    archive = SalesArchive(path=None)
+    for i in range(n_cards):
+        card = {
+            'player_name': f"Synthetic Player {i}",
+            'year': str(2015 + i % 10),
+            'card_set': 'Prizm',
+            'card_number': str(i + 1),
+            'variation': ''
+        }
+        history = generate_synthetic_history(
+            n_points=n_points,
+            start_price=float(rng.uniform(10, 500)),
+            drift=float(rng.normal(0, 0.002)),
+            volatility=float(rng.uniform(0.01, 0.06)),
+            title=f"{card['year']} {card['player_name']} {card['card_set']} #{card['card_number']}",
+            seed=seed + i
+        )
+        archive.add_sales(make_card_key(card), history)
+    return archive
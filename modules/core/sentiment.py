@@ -0,0 +1,178 @@
+"""
+Title sentiment module for Sports Card Analyzer Pro.
+Scores listing titles once and remembers them by normalized title hash, so
+recurring listings cost a dictionary lookup instead of a TextBlob parse.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.getenv('SENTIMENT_CACHE_PATH', os.path.join('data', 'sentiment_cache.json'))
+
+SCORING_METHODS = ('textblob', 'lexicon')
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title, replace punctuation with spaces and collapse whitespace."""
+    return ' '.join(_NON_WORD.sub(' ', str(title or '').lower()).split())
+
+
+def title_hash(normalized_title: str) -> str:
+    """Stable short hash of a normalized title, used as the cache key."""
+    return hashlib.sha1(normalized_title.encode('utf-8')).hexdigest()[:16]
+
+
+class LexiconScorer:
+    """Vectorized polarity scorer using TextBlob's word lexicon without per-title parsing."""
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        """
+        Initialize the scorer.
+
+        Args:
+            lexicon: Word to polarity mapping; defaults to TextBlob's English adjective lexicon
+        """
+        if lexicon is None:
+            from textblob.en import sentiment as textblob_lexicon
+            lexicon = {
+                word: float(tags[None][0])
+                for word, tags in textblob_lexicon.items()
+                if None in tags and ' ' not in word
+            }
+        from sklearn.feature_extraction.text import CountVectorizer
+        self.words = sorted(lexicon)
+        self.polarities = np.array([lexicon[word] for word in self.words])
+        self.vectorizer = CountVectorizer(vocabulary=self.words, token_pattern=r"(?u)\b\w+\b", lowercase=False)
+
+    def score(self, normalized_titles: List[str]) -> np.ndarray:
+        """Mean polarity of the lexicon words in each title (0 when none match)."""
+        if not normalized_titles:
+            return np.empty(0)
+        counts = self.vectorizer.transform(normalized_titles)
+        matched = np.asarray(counts.sum(axis=1)).ravel()
+        totals = counts @ self.polarities
+        return np.divide(totals, matched, out=np.zeros(len(normalized_titles)), where=matched > 0)
+
+
+class SentimentScorer:
+    """Memoized title sentiment with batch scoring of unseen titles."""
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH, method: str = 'textblob'):
+        """
+        Initialize the scorer.
+
+        Args:
+            cache_path: JSON file the memo is loaded from and saved to, or None to keep it in memory
+            method: 'textblob' for TextBlob polarity or 'lexicon' for the vectorized lexicon scorer
+        """
+        if method not in SCORING_METHODS:
+            raise ValueError(f"Unknown sentiment method: {method}")
+        self.cache_path = cache_path
+        self.method = method
+        self._cache: Dict[str, float] = {}
+        self._lexicon: Optional[LexiconScorer] = None
+        self._lock = threading.Lock()
+        if cache_path and os.path.exists(cache_path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def load(self) -> None:
+        """Load the memo from the cache file, ignoring a missing or corrupt file."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                self._cache = {key: float(value) for key, value in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            print(f"Could not load sentiment cache: {e}")
+            self._cache = {}
+
+    def save(self) -> None:
+        """
+        Write the memo to the cache file.
+
+        Entries other processes saved meanwhile are merged in first, and the file
+        is replaced atomically so a concurrent reader never sees a partial write.
+        """
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.cache_path, 'r') as f:
+                stored = {key: float(value) for key, value in json.load(f).items()}
+        except (OSError, ValueError):
+            stored = {}
+        stored.update(self._cache)
+        self._cache = stored
+        temp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(stored, f)
+        os.replace(temp_path, self.cache_path)
+
+    def _key(self, normalized_title: str) -> str:
+        # Methods disagree on scores, so each keeps its own entries
+        return f"{self.method}:{title_hash(normalized_title)}"
+
+    def _score_uncached(self, normalized_titles: List[str]) -> np.ndarray:
+        if self.method == 'lexicon':
+            if self._lexicon is None:
+                self._lexicon = LexiconScorer()
+            return self._lexicon.score(normalized_titles)
+        from textblob import TextBlob
+        return np.array([TextBlob(title).sentiment.polarity for title in normalized_titles], dtype=float)
+
+    def score_titles(self, titles: List[str]) -> np.ndarray:
+        """
+        Polarity (-1 to 1) of each title.
+
+        Titles are normalized and deduplicated; only ones never seen before are
+        scored, in a single batch, and the memo is saved if it grew.
+
+        Args:
+            titles: Listing titles
+
+        Returns:
+            Array of polarities in the same order as titles
+        """
+        normalized = [normalize_title(title) for title in titles]
+        keys = [self._key(title) for title in normalized]
+
+        with self._lock:
+            unseen = {}
+            for key, title in zip(keys, normalized):
+                if key not in self._cache and key not in unseen:
+                    unseen[key] = title
+            if unseen:
+                scores = self._score_uncached(list(unseen.values()))
+                self._cache.update(zip(unseen.keys(), (float(score) for score in scores)))
+                try:
+                    self.save()
+                except OSError as e:
+                    print(f"Could not save sentiment cache: {e}")
+            return np.array([self._cache[key] for key in keys], dtype=float)
+
+    def market_sentiment(self, titles: List[str]) -> float:
+        """Average title polarity normalized to the 0-1 range (0.5 is neutral)."""
+        if not titles:
+            return 0.5
+        return (float(np.mean(self.score_titles(titles))) + 1) / 2
+
+
+_default_scorer: Optional[SentimentScorer] = None
+
+
+def get_sentiment_scorer() -> SentimentScorer:
+    """Get the process-wide sentiment scorer (method from SENTIMENT_METHOD, TextBlob by default)."""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = SentimentScorer(method=os.getenv('SENTIMENT_METHOD', 'textblob'))
+    return _default_scorer
@@ -0,0 +1,243 @@
+"""
+Diff-based collection persistence.
+Keeps a snapshot of each user's stored cards (card id -> content hash) and, on
+save, writes only the cards that were inserted, changed or removed, in write
+batches committed in parallel, instead of deleting and rewriting the whole
+cards subcollection.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Most writes Firestore accepts in one batch
+MAX_BATCH_WRITES = 500
+
+DEFAULT_MAX_WORKERS = 4
+
+# How long a snapshot is trusted before the stored cards are read again, since
+# other pages also write to the cards subcollection directly
+DEFAULT_SNAPSHOT_TTL_SECONDS = 300.0
+
+
+def card_document_id(card: Any) -> str:
+    """ID of a card's document in the user's cards subcollection"""
+    if isinstance(card, dict):
+        player_name, year, card_set, card_number = (card.get('player_name', ''), card.get('year', ''),
+                                                    card.get('card_set', ''), card.get('card_number', ''))
+    else:
+        player_name, year, card_set, card_number = card.player_name, card.year, card.card_set, card.card_number
+    return f"{player_name}_{year}_{card_set}_{card_number}".replace(" ", "_").lower()
+
+
+def content_hash(data: Dict[str, Any], ignore: Iterable[str] = ()) -> str:
+    """Stable hash of a card document's content."""
+    ignored = set(ignore)
+    content = {key: value for key, value in data.items() if key not in ignored}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _document(card: Any) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    """A card's document data and the fields left out of its hash."""
+    if isinstance(card, dict):
+        return card, ()
+    # Card.to_dict stamps a missing created_at with the current time, which would
+    # make the card look changed on every save
+    return card.to_dict(), (('created_at',) if getattr(card, 'created_at', None) is None else ())
+
+
+@dataclass
+class SyncResult:
+    """What a save wrote."""
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    batches: int = 0
+
+    @property
+    def writes(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'deleted': self.deleted,
+            'unchanged': self.unchanged,
+            'batches': self.batches
+        }
+
+
+class CollectionSync:
+    """Saves collections by diffing them against a snapshot of what is stored."""
+
+    def __init__(self,
+                 db=None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 snapshot_ttl_seconds: float = DEFAULT_SNAPSHOT_TTL_SECONDS):
+        """
+        Initialize the sync engine.
+
+        Args:
+            db: Firestore client (FirebaseManager's by default)
+            max_workers: Most batches committed at the same time
+            snapshot_ttl_seconds: How long a user's snapshot is reused before the stored cards are read again
+        """
+        self._db = db
+        self.max_workers = max(1, max_workers)
+        self.snapshot_ttl_seconds = snapshot_ttl_seconds
+        # uid -> (taken at, card id -> content hash)
+        self._snapshots: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from modules.core.firebase_manager import FirebaseManager
+            db = FirebaseManager.get_instance().db
+            if not db:
+                raise RuntimeError("Firestore client not initialized")
+            self._db = db
+        return self._db
+
+    def _user_ref(self, uid: str):
+        return self.db.collection('users').document(uid)
+
+    def snapshot(self, uid: str) -> Dict[str, str]:
+        """Card id -> content hash of a user's stored cards, read once and then kept current by saves."""
+        with self._lock:
+            cached = self._snapshots.get(uid)
+        if cached and time.monotonic() - cached[0] < self.snapshot_ttl_seconds:
+            return dict(cached[1])
+        hashes = {doc.id: content_hash(doc.to_dict() or {})
+                  for doc in self._user_ref(uid).collection('cards').get()}
+        with self._lock:
+            self._snapshots[uid] = (time.monotonic(), hashes)
+        return dict(hashes)
+
+    def diff(self, uid: str, cards: Iterable[Any],
+             stored: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], List[str], int]:
+        """
+        Compare cards with the stored snapshot.
+
+        Args:
+            uid: User whose collection it is
+            cards: Card objects or card dictionaries
+            stored: Snapshot to compare with (the user's current one when None)
+
+        Returns:
+            (documents to write by id, their hashes, ids to delete, number of unchanged cards)
+        """
+        if stored is None:
+            stored = self.snapshot(uid)
+        documents: Dict[str, Dict[str, Any]] = {}
+        hashes: Dict[str, str] = {}
+        for card in cards:
+            data, ignore = _document(card)
+            card_id = card_document_id(card)
+            # A card listed twice is saved once, as its last copy
+            documents[card_id] = data
+            hashes[card_id] = content_hash(data, ignore)
+        writes = {card_id: data for card_id, data in documents.items() if stored.get(card_id) != hashes[card_id]}
+        deletes = sorted(card_id for card_id in stored if card_id not in documents)
+        return writes, {card_id: hashes[card_id] for card_id in writes}, deletes, len(documents) - len(writes)
+
+    def sync(self, uid: str, cards: Iterable[Any]) -> SyncResult:
+        """
+        Save a user's collection, writing only what changed.
+
+        The user's last_updated timestamp is written in the same batches. If any
+        batch fails the exception is raised and the snapshot is dropped, so the
+        next save reads the stored cards again.
+        """
+        stored = self.snapshot(uid)
+        writes, hashes, deletes, unchanged = self.diff(uid, cards, stored)
+        result = SyncResult(
+            inserted=sum(1 for card_id in writes if card_id not in stored),
+            updated=sum(1 for card_id in writes if card_id in stored),
+            deleted=len(deletes),
+            unchanged=unchanged
+        )
+        if not result.writes:
+            return result
+
+        user_ref = self._user_ref(uid)
+        cards_ref = user_ref.collection('cards')
+        operations = ([('set', cards_ref.document(card_id), data) for card_id, data in writes.items()]
+                      + [('delete', cards_ref.document(card_id), None) for card_id in deletes]
+                      + [('update', user_ref, {'last_updated': datetime.now().isoformat()})])
+        chunks = [operations[start:start + MAX_BATCH_WRITES] for start in range(0, len(operations), MAX_BATCH_WRITES)]
+        result.batches = len(chunks)
+
+        try:
+            if len(chunks) == 1:
+                self._commit(chunks[0])
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                    for future in [executor.submit(self._commit, chunk) for chunk in chunks]:
+                        future.result()
+        except Exception:
+            self.forget(uid)
+            raise
+
+        self.record(uid, hashes, deletes)
+        logger.info(f"Synced collection for {uid}: {result.to_dict()}")
+        return result
+
+    def _commit(self, operations: List[Tuple[str, Any, Optional[Dict[str, Any]]]]) -> None:
+        batch = self.db.batch()
+        for operation, ref, data in operations:
+            if operation == 'set':
+                batch.set(ref, data)
+            elif operation == 'delete':
+                batch.delete(ref)
+            else:
+                batch.update(ref, data)
+        batch.commit()
+
+    def record(self, uid: str, written: Dict[str, Any], deleted: Iterable[str] = ()) -> None:
+        """
+        Update a snapshot after cards were written outside sync.
+
+        Args:
+            uid: User whose cards were written
+            written: Card id -> content hash, or the document data that was written
+            deleted: Ids of deleted cards
+        """
+        with self._lock:
+            cached = self._snapshots.get(uid)
+            if cached is None:
+                return
+            hashes = cached[1]
+            for card_id, value in written.items():
+                hashes[card_id] = value if isinstance(value, str) else content_hash(value)
+            for card_id in deleted:
+                hashes.pop(card_id, None)
+
+    def forget(self, uid: Optional[str] = None) -> None:
+        """Drop one user's snapshot, or every snapshot."""
+        with self._lock:
+            if uid is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(uid, None)
+
+
+_default_sync: Optional[CollectionSync] = None
+
+
+def get_collection_sync() -> CollectionSync:
+    """Get the process-wide sync engine, so snapshots are shared across reruns and sessions."""
+    global _default_sync
+    if _default_sync is None:
+        _default_sync = CollectionSync()
+    return _default_sync
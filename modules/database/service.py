@@ -2,7 +2,10 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from firebase_admin import firestore
 from .models import Card, UserPreferences
+from .collection_sync import get_collection_sync
+from .write_buffer import discard_user_writes, dropped_writes, flush_user_writes, get_write_buffer
 from modules.core.firebase_manager import FirebaseManager
+from modules.display_case.card_refs import card_references
 import pandas as pd
 import base64
 import ast
@@ -100,6 +103,13 @@ class DatabaseService:
                 logger.error("Database connection not available")
                 return []
 
+            # Commit buffered card writes first so they are read back
+            try:
+                flush_user_writes(uid)
+            except Exception as e:
+                # Read what is stored; the failed writes stay buffered or are reported as dropped
+                logger.error(f"Error flushing buffered card writes before reading: {str(e)}")
+
             # Get the user's cards subcollection reference
             cards_ref = service.db.collection('users').document(uid).collection('cards')
             
@@ -133,27 +143,20 @@ class DatabaseService:
                 logger.error("Database connection not available")
                 return False
 
-            # Get the user's cards subcollection reference
-            cards_ref = service.db.collection('users').document(uid).collection('cards')
-            
-            # Delete all existing cards
-            existing_cards = cards_ref.get()
-            for card in existing_cards:
-                card.reference.delete()
-            
-            # Add all new cards
-            for card in cards:
-                # Generate a unique ID for the card based on its attributes
-                card_id = f"{card.player_name}_{card.year}_{card.card_set}_{card.card_number}".replace(" ", "_").lower()
-                
-                # Add the card to the subcollection
-                cards_ref.document(card_id).set(card.to_dict())
-            
-            # Update the user's last_updated timestamp
-            user_ref = service.db.collection('users').document(uid)
-            user_ref.update({'last_updated': datetime.now().isoformat()})
+            # Buffered card writes are older than this save; commit them before diffing
+            try:
+                flush_user_writes(uid)
+            except Exception as e:
+                # This save holds the current state of every card, so write it against
+                # what is stored instead of the snapshot and drop the older writes
+                logger.error(f"Error flushing buffered card writes before saving: {str(e)}")
+                discard_user_writes(uid)
+                get_collection_sync().forget(uid)
+
+            # Write only the cards that were added, changed or removed since the last save
+            result = get_collection_sync().sync(uid, cards)
             
-            logger.info(f"Successfully saved {len(cards)} cards to collection")
+            logger.info(f"Successfully saved {len(cards)} cards to collection ({result.writes} written)")
             return True
             
         except Exception as e:
@@ -169,9 +172,6 @@ class DatabaseService:
                 logger.error("Database connection not available")
                 return False
 
-            # Get the user's cards subcollection reference
-            cards_ref = service.db.collection('users').document(uid).collection('cards')
-            
             # Generate a unique ID for the card based on its attributes
             card_id = f"{card.player_name}_{card.year}_{card.card_set}_{card.card_number}".replace(" ", "_").lower()
             
@@ -180,12 +180,9 @@ class DatabaseService:
             logger.info(f"Attempting to save card with ID: {card_id}")
             logger.debug(f"Card data: {card_data}")
             
-            # Add the card to the subcollection
-            cards_ref.document(card_id).set(card_data)
-            
-            # Update the user's last_updated timestamp
-            user_ref = service.db.collection('users').document(uid)
-            user_ref.update({'last_updated': datetime.now().isoformat()})
+            # Buffer the write; it is committed with the user's other pending
+            # card writes and a single last_updated touch
+            get_write_buffer(uid, service.db).set(card_id, card_data)
             
             logger.info(f"Successfully added card to collection: {card_id}")
             return True
@@ -206,18 +203,11 @@ class DatabaseService:
                 logger.error("Database connection not available")
                 return False
 
-            # Get the user's cards subcollection reference
-            cards_ref = service.db.collection('users').document(uid).collection('cards')
-            
             # Generate the card ID
             card_id = f"{card.player_name}_{card.year}_{card.card_set}_{card.card_number}".replace(" ", "_").lower()
             
-            # Update the card document
-            cards_ref.document(card_id).set(card.to_dict())
-            
-            # Update the user's last_updated timestamp
-            user_ref = service.db.collection('users').document(uid)
-            user_ref.update({'last_updated': datetime.now().isoformat()})
+            # Buffer the card document write
+            get_write_buffer(uid, service.db).set(card_id, card.to_dict())
             
             logger.info(f"Successfully updated card: {card_id}")
             return True
@@ -235,18 +225,11 @@ class DatabaseService:
                 logger.error("Database connection not available")
                 return False
 
-            # Get the user's cards subcollection reference
-            cards_ref = service.db.collection('users').document(uid).collection('cards')
-            
             # Generate the card ID
             card_id = f"{card.player_name}_{card.year}_{card.card_set}_{card.card_number}".replace(" ", "_").lower()
             
-            # Delete the card document
-            cards_ref.document(card_id).delete()
-            
-            # Update the user's last_updated timestamp
-            user_ref = service.db.collection('users').document(uid)
-            user_ref.update({'last_updated': datetime.now().isoformat()})
+            # Buffer the card document delete
+            get_write_buffer(uid, service.db).delete(card_id)
             
             logger.info(f"Successfully deleted card: {card_id}")
             return True
@@ -255,6 +238,11 @@ class DatabaseService:
             logger.error(f"Error in delete_card: {str(e)}")
             return False
 
+    @staticmethod
+    def get_failed_card_writes(uid: str) -> List[Dict]:
+        """Card writes that were accepted but given up on after repeated failures, since the last call."""
+        return [write.to_dict() for write in dropped_writes(uid)]
+
     @staticmethod
     def save_user_display_cases(uid: str, display_cases: Dict) -> bool:
         """Save user's display cases to Firestore."""
@@ -278,23 +266,8 @@ class DatabaseService:
                     print(f"\nProcessing display case: {name}")
                     print(f"Original case data: {case}")
                     
-                    # Process cards to ensure they're serializable
-                    processed_cards = []
-                    for card in case.get('cards', []):
-                        try:
-                            # Create a new dict with only serializable data
-                            processed_card = {}
-                            for key, value in card.items():
-                                if isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                                    processed_card[key] = value
-                                else:
-                                    # Convert non-serializable types to string
-                                    processed_card[key] = str(value)
-                            processed_cards.append(processed_card)
-                        except Exception as card_error:
-                            print(f"Error processing card: {str(card_error)}")
-                            print(f"Card data: {card}")
-                            continue
+                    # Store card references; the full cards stay in the collection
+                    processed_cards = card_references(case.get('cards', []))
                     
                     # Create a serializable display case
                     serializable_case = {
@@ -405,15 +378,8 @@ class DatabaseService:
                     'cards': []
                 }
                 
-                # Process cards
-                for card in case.get('cards', []):
-                    processed_card = {}
-                    for key, value in card.items():
-                        if isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                            processed_card[key] = value
-                        else:
-                            processed_card[key] = str(value)
-                    processed_case['cards'].append(processed_card)
+                # Store card references; the full cards stay in the collection
+                processed_case['cards'] = card_references(case.get('cards', []))
                 
                 processed_cases[name] = processed_case
             
@@ -531,18 +497,16 @@ class DatabaseService:
     def remove_card_from_collection(uid: str, card: Card) -> bool:
         """Remove a card from the user's collection."""
         try:
-            # Get the user's cards subcollection reference
-            cards_ref = db.collection('users').document(uid).collection('cards')
-            
+            service = DatabaseService.get_instance()
+            if not service._ensure_db_connection():
+                print("Database connection not available")
+                return False
+
             # Generate the card ID
             card_id = f"{card.player_name}_{card.year}_{card.card_set}_{card.card_number}".replace(" ", "_").lower()
             
-            # Delete the card document
-            cards_ref.document(card_id).delete()
-            
-            # Update the user's last_updated timestamp
-            user_ref = db.collection('users').document(uid)
-            user_ref.update({'last_updated': datetime.now().isoformat()})
+            # Buffer the card document delete
+            get_write_buffer(uid, service.db).delete(card_id)
             
             print(f"Successfully removed card from collection: {card_id}")
             return True
@@ -0,0 +1,384 @@
+"""
+Write-behind buffer for per-card collection writes.
+Card sets and deletes are held per user and written together: repeated writes
+to the same card collapse into the last one, and the user's last_updated touch
+is written once per flush instead of once per card. A buffer flushes after a
+short delay, when it holds enough cards, before the user's collection is read
+or saved in full, when the user leaves a page, and when the process exits.
+
+When a batch fails while Firestore is reachable, its writes are retried one by
+one so a single bad card doesn't hold back the others, and a card write that
+fails MAX_WRITE_ATTEMPTS flushes in a row is dropped and kept for the caller to
+report. When Firestore can't be reached, writes wait for a later flush.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .collection_sync import MAX_BATCH_WRITES, get_collection_sync
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+
+DEFAULT_MAX_PENDING = 100
+
+# Flushes in a row a card write may fail, while others succeed, before it is dropped
+MAX_WRITE_ATTEMPTS = 3
+
+
+class FlushError(RuntimeError):
+    """Some card writes of a flush failed; they were requeued, or dropped after MAX_WRITE_ATTEMPTS."""
+
+    def __init__(self, uid: str, failed: Dict[str, str], dropped: List[str]):
+        self.uid = uid
+        self.failed = failed
+        self.dropped = dropped
+        message = f"{len(failed)} collection writes failed for {uid}"
+        if dropped:
+            message += f" ({len(dropped)} dropped after {MAX_WRITE_ATTEMPTS} attempts)"
+        super().__init__(f"{message}: {next(iter(failed.values()))}")
+
+
+@dataclass
+class DroppedWrite:
+    """A card write given up on after failing MAX_WRITE_ATTEMPTS flushes."""
+    card_id: str
+    data: Optional[Dict[str, Any]]
+    error: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'card_id': self.card_id,
+            'deleted': self.data is None,
+            'error': self.error
+        }
+
+
+@dataclass
+class FlushMetrics:
+    """Counters of what a buffer accepted and wrote."""
+    buffered: int = 0
+    coalesced: int = 0
+    written: int = 0
+    flushes: int = 0
+    failures: int = 0
+    dropped: int = 0
+    last_flush_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'buffered': self.buffered,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'flushes': self.flushes,
+            'failures': self.failures,
+            'dropped': self.dropped,
+            'last_flush_seconds': self.last_flush_seconds
+        }
+
+
+class CollectionWriteBuffer:
+    """Pending card writes of one user, flushed in write batches."""
+
+    def __init__(self,
+                 uid: str,
+                 db=None,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Initialize the buffer.
+
+        Args:
+            uid: User whose cards are buffered
+            db: Firestore client (FirebaseManager's by default)
+            flush_interval: Seconds after the first pending write before a flush; 0 flushes every write
+            max_pending: Pending cards that trigger an immediate flush
+        """
+        self.uid = uid
+        self._db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self.metrics = FlushMetrics()
+        # card id -> card data to set, or None to delete
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        # card id -> flushes in a row its pending write failed
+        self._attempts: Dict[str, int] = {}
+        self._dropped: List[DroppedWrite] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Held while a flush commits, so flushes of one user don't overlap
+        self._flush_lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from modules.core.firebase_manager import FirebaseManager
+            db = FirebaseManager.get_instance().db
+            if not db:
+                raise RuntimeError("Firestore client not initialized")
+            self._db = db
+        return self._db
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def set(self, card_id: str, data: Dict[str, Any]) -> None:
+        """Buffer a card document write."""
+        self._add(card_id, dict(data))
+
+    def delete(self, card_id: str) -> None:
+        """Buffer a card document delete."""
+        self._add(card_id, None)
+
+    def _add(self, card_id: str, data: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.metrics.buffered += 1
+            if card_id in self._pending:
+                self.metrics.coalesced += 1
+            self._pending[card_id] = data
+            self._attempts.pop(card_id, None)
+            full = len(self._pending) >= self.max_pending
+            if not full and self.flush_interval > 0 and self._timer is None:
+                self._start_timer()
+        if full or self.flush_interval <= 0:
+            self._try_flush()
+
+    def _start_timer(self) -> None:
+        # Called with self._lock held
+        self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        self._try_flush()
+
+    def _try_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            # Failed writes are back in the buffer to be retried, or dropped and kept for take_dropped
+            logger.error(f"Error flushing collection writes for {self.uid}: {str(e)}")
+
+    def flush(self) -> int:
+        """
+        Write every pending card, plus one last_updated touch, now.
+
+        If the batch fails but the user document can still be written, each
+        write is retried on its own so one bad card doesn't hold back the rest.
+        Writes that still fail go back into the buffer for the next flush,
+        unless a newer write of the card arrived meanwhile; after
+        MAX_WRITE_ATTEMPTS such flushes they are dropped instead and kept for
+        take_dropped. If Firestore can't be reached at all, every write goes
+        back into the buffer without counting an attempt.
+
+        Returns:
+            int: Number of card writes committed
+
+        Raises:
+            FlushError: If any write failed
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return 0
+
+            started = time.monotonic()
+            failed: Dict[str, str] = {}
+            isolated = False
+            try:
+                self._commit(pending)
+            except Exception as e:
+                isolated = self._touch()
+                if isolated:
+                    logger.warning(f"Batch of {len(pending)} collection writes failed for {self.uid}, "
+                                   f"retrying one by one: {str(e)}")
+                    failed = self._commit_each(pending)
+                else:
+                    failed = {card_id: str(e) for card_id in pending}
+            committed = {card_id: data for card_id, data in pending.items() if card_id not in failed}
+
+            if committed:
+                get_collection_sync().record(
+                    self.uid,
+                    {card_id: data for card_id, data in committed.items() if data is not None},
+                    [card_id for card_id, data in committed.items() if data is None]
+                )
+            dropped = self._requeue(pending, failed, count_attempts=isolated)
+            with self._lock:
+                for card_id in committed:
+                    self._attempts.pop(card_id, None)
+                self.metrics.written += len(committed)
+                self.metrics.last_flush_seconds = time.monotonic() - started
+                if committed:
+                    self.metrics.flushes += 1
+                if failed:
+                    self.metrics.failures += 1
+                    self.metrics.dropped += len(dropped)
+            if committed:
+                logger.info(f"Flushed {len(committed)} collection writes for {self.uid}")
+            if failed:
+                raise FlushError(self.uid, failed, dropped)
+            return len(committed)
+
+    def _requeue(self,
+                 pending: Dict[str, Optional[Dict[str, Any]]],
+                 failed: Dict[str, str],
+                 count_attempts: bool = True) -> List[str]:
+        """Put failed writes back for the next flush, dropping those out of attempts; returns the dropped ids."""
+        dropped = []
+        with self._lock:
+            for card_id, error in failed.items():
+                if card_id in self._pending:
+                    # Superseded by a newer write, which will be tried instead
+                    continue
+                attempts = self._attempts.get(card_id, 0) + (1 if count_attempts else 0)
+                if attempts >= MAX_WRITE_ATTEMPTS:
+                    self._attempts.pop(card_id, None)
+                    self._dropped.append(DroppedWrite(card_id, pending[card_id], error))
+                    dropped.append(card_id)
+                    logger.error(f"Dropped collection write of {card_id} for {self.uid} "
+                                 f"after {attempts} attempts: {error}")
+                    continue
+                self._attempts[card_id] = attempts
+                self._pending[card_id] = pending[card_id]
+            if self._pending and self.flush_interval > 0 and self._timer is None:
+                self._start_timer()
+        return dropped
+
+    def take_dropped(self) -> List[DroppedWrite]:
+        """Writes dropped since the last call, so a caller can report them."""
+        with self._lock:
+            dropped, self._dropped = self._dropped, []
+        return dropped
+
+    def discard(self) -> int:
+        """Drop every pending write without committing it, e.g. when a full save supersedes them."""
+        with self._lock:
+            discarded = len(self._pending)
+            self._pending.clear()
+            self._attempts.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return discarded
+
+    def _user_ref(self):
+        return self.db.collection('users').document(self.uid)
+
+    def _commit(self, pending: Dict[str, Optional[Dict[str, Any]]], touch: bool = True) -> None:
+        user_ref = self._user_ref()
+        cards_ref = user_ref.collection('cards')
+        items = list(pending.items())
+        # Room for the last_updated touch in the last batch
+        for start in range(0, len(items), MAX_BATCH_WRITES - 1):
+            batch = self.db.batch()
+            chunk = items[start:start + MAX_BATCH_WRITES - 1]
+            for card_id, data in chunk:
+                if data is None:
+                    batch.delete(cards_ref.document(card_id))
+                else:
+                    batch.set(cards_ref.document(card_id), data)
+            if touch and start + len(chunk) >= len(items):
+                batch.update(user_ref, {'last_updated': datetime.now().isoformat()})
+            batch.commit()
+
+    def _commit_each(self, pending: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, str]:
+        """Commit writes one at a time; returns the error of each write that failed."""
+        failed = {}
+        for card_id, data in pending.items():
+            try:
+                self._commit({card_id: data}, touch=False)
+            except Exception as e:
+                failed[card_id] = str(e)
+        return failed
+
+    def _touch(self) -> bool:
+        """Write the user's last_updated on its own; False if Firestore couldn't take it."""
+        try:
+            self._user_ref().update({'last_updated': datetime.now().isoformat()})
+            return True
+        except Exception as e:
+            logger.warning(f"Could not touch last_updated for {self.uid}: {str(e)}")
+            return False
+
+
+_buffers: Dict[str, CollectionWriteBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_write_buffer(uid: str, db=None) -> CollectionWriteBuffer:
+    """Get the write buffer of a user, shared by that user's sessions."""
+    with _buffers_lock:
+        buffer = _buffers.get(uid)
+        if buffer is None:
+            buffer = _buffers[uid] = CollectionWriteBuffer(uid, db)
+        return buffer
+
+
+def flush_user_writes(uid: Optional[str]) -> int:
+    """Flush a user's pending writes, if they have a buffer."""
+    if not uid:
+        return 0
+    with _buffers_lock:
+        buffer = _buffers.get(uid)
+    return buffer.flush() if buffer is not None else 0
+
+
+def discard_user_writes(uid: Optional[str]) -> int:
+    """Drop a user's pending writes without committing them."""
+    if not uid:
+        return 0
+    with _buffers_lock:
+        buffer = _buffers.get(uid)
+    return buffer.discard() if buffer is not None else 0
+
+
+def dropped_writes(uid: Optional[str]) -> List[DroppedWrite]:
+    """Take the writes a user's buffer gave up on since the last call."""
+    if not uid:
+        return []
+    with _buffers_lock:
+        buffer = _buffers.get(uid)
+    return buffer.take_dropped() if buffer is not None else []
+
+
+def flush_all() -> Tuple[int, int]:
+    """
+    Flush every user's pending writes.
+
+    Returns:
+        (card writes committed, buffers that failed to flush)
+    """
+    with _buffers_lock:
+        buffers = list(_buffers.values())
+    written, failed = 0, 0
+    for buffer in buffers:
+        try:
+            written += buffer.flush()
+        except Exception as e:
+            failed += 1
+            logger.error(f"Error flushing collection writes for {buffer.uid}: {str(e)}")
+    return written, failed
+
+
+def buffer_metrics() -> Dict[str, Dict[str, Any]]:
+    """Flush metrics of every user's buffer, with its pending count."""
+    with _buffers_lock:
+        buffers = list(_buffers.values())
+    return {buffer.uid: dict(buffer.metrics.to_dict(), pending=len(buffer)) for buffer in buffers}
+
+
+atexit.register(flush_all)
@@ -0,0 +1,86 @@
+"""
+Card references for display cases.
+Display case documents store each card as its id plus a few summary fields
+instead of a full copy (photo included); the full card is looked up in the
+collection when the case is read.
+"""
+
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Union
+
+import pandas as pd
+
+# Fields cached in a reference, enough to list a case when its card has left the collection
+SUMMARY_FIELDS = ('player_name', 'year', 'card_set', 'card_number', 'variation', 'condition',
+                  'current_value', 'value', 'tags')
+
+
+def display_card_id(card: Dict[str, Any]) -> str:
+    """Consistent ID for a card shown in a display case (the same as its collection document ID)"""
+    return f"{card.get('player_name', '')}_{card.get('year', '')}_{card.get('card_set', '')}_{card.get('card_number', '')}".replace(" ", "_").lower()
+
+
+def _serializable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_serializable(item) for item in value]
+    if isinstance(value, Enum):
+        return _serializable(value.value)
+    return str(value)
+
+
+def _as_dict(card: Any) -> Dict[str, Any]:
+    if hasattr(card, 'to_dict'):
+        return card.to_dict()
+    return card if isinstance(card, dict) else {}
+
+
+def card_reference(card: Any) -> Dict[str, Any]:
+    """The id and summary fields of a card, as stored in a display case document."""
+    card = _as_dict(card)
+    reference = {'id': card.get('id') or display_card_id(card)}
+    for field in SUMMARY_FIELDS:
+        if field in card:
+            reference[field] = _serializable(card[field])
+    return reference
+
+
+def card_references(cards: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [card_reference(card) for card in cards]
+
+
+def cards_by_id(collection: Union[pd.DataFrame, List[Any], None]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map from card id to card, built in one pass over the collection.
+
+    Cards are keyed by their own id when they have one and by display_card_id,
+    so references written either way resolve.
+    """
+    if collection is None:
+        return {}
+    records = collection.to_dict('records') if isinstance(collection, pd.DataFrame) else [_as_dict(card) for card in collection]
+    mapping: Dict[str, Dict[str, Any]] = {}
+    for card in records:
+        mapping.setdefault(display_card_id(card), card)
+        if isinstance(card.get('id'), str) and card['id']:
+            mapping.setdefault(card['id'], card)
+    return mapping
+
+
+def resolve_cards(references: Iterable[Dict[str, Any]], collection_cards: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Full cards for a display case's references.
+
+    A card found in the collection is returned with its current data (photo
+    included); one that isn't keeps what the reference holds, which for cases
+    saved before references were introduced is the whole card.
+    """
+    cards = []
+    for reference in references:
+        card_id = reference.get('id') or display_card_id(reference)
+        resolved = dict(reference)
+        resolved.update(collection_cards.get(str(card_id), {}))
+        resolved['id'] = card_id
+        cards.append(resolved)
+    return cards
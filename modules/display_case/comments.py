@@ -0,0 +1,161 @@
+"""
+Comment pages for display cases.
+Comments are read newest first, a page at a time, continuing after a cursor
+(the id of the last comment shown), and each page is cached in process until
+a comment is added or deleted on that case or the page gets old. If the
+cursor's comment is deleted, the next page continues from its timestamp.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+
+DEFAULT_TTL_SECONDS = 60.0
+
+
+@dataclass
+class CommentPage:
+    """One page of a case's comments, newest first."""
+    comments: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'comments': self.comments, 'next_cursor': self.next_cursor}
+
+
+def _comment(doc) -> Dict[str, Any]:
+    data = doc.to_dict() or {}
+    data['id'] = doc.id
+    # The comments section expects ISO timestamps
+    if isinstance(data.get('timestamp'), datetime):
+        data['timestamp'] = data['timestamp'].isoformat()
+    return data
+
+
+class CommentFeed:
+    """Cursor-paginated comment reads with a per-case page cache."""
+
+    def __init__(self, db=None, page_size: int = DEFAULT_PAGE_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the feed.
+
+        Args:
+            db: Firestore client (FirebaseManager's by default)
+            page_size: Comments per page when a caller doesn't ask for a size
+            ttl_seconds: How long a cached page is reused
+        """
+        self._db = db
+        self.page_size = page_size
+        self.ttl_seconds = ttl_seconds
+        # case id -> (cursor, page size) -> (read at, page)
+        self._pages: Dict[str, Dict[Tuple[Optional[str], int], Tuple[float, CommentPage]]] = {}
+        # case id -> comment id -> snapshot of the last comment of a page, to continue after it without a read
+        self._cursors: Dict[str, Dict[str, Any]] = {}
+        # case id -> comment id -> timestamp of a cursor, kept when pages are invalidated
+        self._cursor_times: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from modules.core.firebase_manager import FirebaseManager
+            db = FirebaseManager.get_instance().db
+            if not db:
+                raise RuntimeError("Firestore client not initialized")
+            self._db = db
+        return self._db
+
+    def _comments_ref(self, case_id: str):
+        return self.db.collection('display_cases').document(case_id).collection('comments')
+
+    def get_page(self, case_id: str, cursor: Optional[str] = None, page_size: Optional[int] = None) -> CommentPage:
+        """
+        A page of comments.
+
+        Args:
+            case_id: Display case ID
+            cursor: next_cursor of the previous page, or None for the newest comments
+            page_size: Comments per page (the feed's default when None)
+
+        Returns:
+            CommentPage: The comments and the cursor of the page after them (None on the last page)
+        """
+        page_size = page_size or self.page_size
+        key = (cursor, page_size)
+        with self._lock:
+            cached = self._pages.get(case_id, {}).get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+            return cached[1]
+
+        comments_ref = self._comments_ref(case_id)
+        query = comments_ref.order_by('timestamp', direction='DESCENDING')
+        if cursor:
+            with self._lock:
+                last = self._cursors.get(case_id, {}).get(cursor)
+                cursor_time = self._cursor_times.get(case_id, {}).get(cursor)
+            if last is None:
+                last = comments_ref.document(cursor).get()
+            if last.exists:
+                query = query.start_after(last)
+            elif cursor_time is not None:
+                # The comment the cursor points at was deleted; continue after its timestamp
+                query = query.start_after({'timestamp': cursor_time})
+            else:
+                # Deleted before this process saw it; start over
+                return self.get_page(case_id, None, page_size)
+        # One extra comment tells whether there's another page
+        docs = list(query.limit(page_size + 1).get())
+        shown = docs[:page_size]
+        page = CommentPage(comments=[_comment(doc) for doc in shown],
+                           next_cursor=shown[-1].id if len(docs) > page_size else None)
+
+        with self._lock:
+            self._pages.setdefault(case_id, {})[key] = (time.monotonic(), page)
+            if page.next_cursor:
+                self._cursors.setdefault(case_id, {})[page.next_cursor] = shown[-1]
+                self._cursor_times.setdefault(case_id, {})[page.next_cursor] = (shown[-1].to_dict() or {}).get('timestamp')
+        return page
+
+    def count(self, case_id: str) -> int:
+        """Number of comments on a case, from a count query (no comments are downloaded)."""
+        return int(self._comments_ref(case_id).count().get()[0][0].value)
+
+    def get_all(self, case_id: str) -> List[Dict[str, Any]]:
+        """Every comment of a case, newest first, read page by page."""
+        comments, cursor = [], None
+        while True:
+            page = self.get_page(case_id, cursor)
+            comments.extend(page.comments)
+            if not page.has_more:
+                return comments
+            cursor = page.next_cursor
+
+    def invalidate(self, case_id: Optional[str] = None) -> None:
+        """Drop the cached pages of one case, or of every case."""
+        with self._lock:
+            if case_id is None:
+                self._pages.clear()
+                self._cursors.clear()
+                self._cursor_times.clear()
+            else:
+                self._pages.pop(case_id, None)
+                self._cursors.pop(case_id, None)
+
+
+_default_feed: Optional[CommentFeed] = None
+
+
+def get_comment_feed() -> CommentFeed:
+    """Get the process-wide comment feed, so cached pages are shared across reruns and sessions."""
+    global _default_feed
+    if _default_feed is None:
+        _default_feed = CommentFeed()
+    return _default_feed
@@ -0,0 +1,251 @@
+"""
+Public display case discovery feed.
+Public cases are mirrored into one public_display_cases collection with their
+summary and a precomputed ranking score, kept current when a case is saved,
+liked or commented on. A case entering the index starts from the likes and
+comments it already has. Browsing reads the top of that index by score instead
+of scanning every user's display cases.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from firebase_admin import firestore
+
+from .comments import get_comment_feed
+from .likes import get_like_counter
+from .totals import card_value
+
+PUBLIC_CASES_COLLECTION = 'public_display_cases'
+
+DEFAULT_PAGE_SIZE = 20
+
+DEFAULT_TTL_SECONDS = 60.0
+
+# Score weights: a case gains one point per RECENCY_SECONDS of age it doesn't have,
+# and log-scaled points for likes, comments and value. Newer cases outrank older ones
+# with the same engagement without any score having to decay.
+RECENCY_SECONDS = 12 * 60 * 60
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 0.5
+VALUE_WEIGHT = 0.25
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def ranking_score(created_at: Any, likes: int = 0, comments: int = 0, total_value: float = 0.0) -> float:
+    """Feed ranking score from a case's creation time, likes, comments and value."""
+    return (_timestamp(created_at) / RECENCY_SECONDS
+            + LIKE_WEIGHT * math.log1p(max(likes, 0))
+            + COMMENT_WEIGHT * math.log1p(max(comments, 0))
+            + VALUE_WEIGHT * math.log1p(max(total_value, 0.0)))
+
+
+def public_entry(owner_uid: str, case_data: Dict[str, Any], likes: int = 0, comments: int = 0) -> Dict[str, Any]:
+    """The index document of a public case: its summary, counters and score."""
+    cards = case_data.get('cards', []) or []
+    try:
+        total_value = float(case_data.get('total_value') or 0)
+    except (TypeError, ValueError):
+        total_value = sum(card_value(card) for card in cards)
+    created_at = case_data.get('created_at') or datetime.now()
+    return {
+        'case_id': case_data.get('id'),
+        'owner_uid': owner_uid,
+        'name': case_data.get('name', ''),
+        'description': case_data.get('description') or '',
+        'tags': list(case_data.get('tags', []) or []),
+        'card_count': len(cards),
+        'total_value': total_value,
+        'likes': likes,
+        'comments': comments,
+        'created_at': created_at.isoformat() if isinstance(created_at, datetime) else str(created_at),
+        'updated_at': datetime.now().isoformat(),
+        'score': ranking_score(created_at, likes, comments, total_value)
+    }
+
+
+@dataclass
+class FeedPage:
+    """One page of public cases, best first."""
+    cases: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'cases': self.cases, 'next_cursor': self.next_cursor}
+
+
+class DiscoveryFeed:
+    """Maintains the public case index and serves it by ranking score."""
+
+    def __init__(self, db=None, page_size: int = DEFAULT_PAGE_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 like_counter=None, comment_feed=None):
+        """
+        Initialize the feed.
+
+        Args:
+            db: Firestore client (FirebaseManager's by default)
+            page_size: Cases per page when a caller doesn't ask for a size
+            ttl_seconds: How long the cached first page is reused
+            like_counter: LikeCounter that seeds a new entry's likes (the shared one by default)
+            comment_feed: CommentFeed that seeds a new entry's comments (the shared one by default)
+        """
+        self._db = db
+        self.like_counter = like_counter if like_counter is not None else get_like_counter()
+        self.comment_feed = comment_feed if comment_feed is not None else get_comment_feed()
+        self.page_size = page_size
+        self.ttl_seconds = ttl_seconds
+        # page size -> (read at, first page)
+        self._first_pages: Dict[int, Tuple[float, FeedPage]] = {}
+        # case id -> snapshot of the last case of a page, to continue after it without a read
+        self._cursors: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from modules.core.firebase_manager import FirebaseManager
+            db = FirebaseManager.get_instance().db
+            if not db:
+                raise RuntimeError("Firestore client not initialized")
+            self._db = db
+        return self._db
+
+    def _index(self):
+        return self.db.collection(PUBLIC_CASES_COLLECTION)
+
+    def invalidate(self) -> None:
+        """Drop the cached first pages and page cursors."""
+        with self._lock:
+            self._first_pages.clear()
+            self._cursors.clear()
+
+    def publish(self, owner_uid: str, case_data: Dict[str, Any]) -> None:
+        """Add or refresh a case in the index, or remove it if it isn't public."""
+        case_id = case_data.get('id')
+        if not case_id:
+            return
+        if not case_data.get('is_public'):
+            self.unpublish(case_id)
+            return
+        entry_ref = self._index().document(case_id)
+        existing = entry_ref.get()
+        if existing.exists:
+            counters = existing.to_dict() or {}
+            likes, comments = int(counters.get('likes', 0)), int(counters.get('comments', 0))
+        else:
+            likes, comments = self._current_counters(owner_uid, case_id)
+        entry_ref.set(public_entry(owner_uid, case_data, likes, comments))
+        self.invalidate()
+
+    def _current_counters(self, owner_uid: str, case_id: str) -> Tuple[int, int]:
+        """Likes and comments a case has before it enters the index."""
+        likes, _ = self.like_counter.get(case_id, owner_uid)
+        return likes, self.comment_feed.count(case_id)
+
+    def unpublish(self, case_id: str) -> None:
+        self._index().document(case_id).delete()
+        self.invalidate()
+
+    def _update_entry(self, case_id: str, change: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+        """Change fields of an indexed case and rescore it in one transaction; unindexed cases are skipped."""
+        entry_ref = self._index().document(case_id)
+
+        @firestore.transactional
+        def apply(transaction) -> None:
+            snapshot = entry_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return
+            entry = snapshot.to_dict() or {}
+            fields = change(entry)
+            entry.update(fields)
+            fields['score'] = ranking_score(entry.get('created_at'), int(entry.get('likes', 0)),
+                                            int(entry.get('comments', 0)), float(entry.get('total_value', 0)))
+            transaction.update(entry_ref, fields)
+
+        apply(self.db.transaction())
+        self.invalidate()
+
+    def _record(self, case_id: str, counter: str, delta: int) -> None:
+        """Adjust a counter of an indexed case and its score."""
+        self._update_entry(case_id, lambda entry: {counter: max(int(entry.get(counter, 0)) + delta, 0)})
+
+    def record_total(self, case_id: str, total_value: float) -> None:
+        """Refresh an indexed case's total_value and score after its cards were revalued."""
+        self._update_entry(case_id, lambda entry: {'total_value': float(total_value),
+                                                   'updated_at': datetime.now().isoformat()})
+
+    def record_like(self, case_id: str, delta: int) -> None:
+        self._record(case_id, 'likes', delta)
+
+    def record_comment(self, case_id: str, delta: int) -> None:
+        self._record(case_id, 'comments', delta)
+
+    def get_page(self, cursor: Optional[str] = None, page_size: Optional[int] = None) -> FeedPage:
+        """
+        A page of public cases by descending score.
+
+        Args:
+            cursor: next_cursor of the previous page, or None for the top cases
+            page_size: Cases per page (the feed's default when None)
+        """
+        page_size = page_size or self.page_size
+        if cursor is None:
+            with self._lock:
+                cached = self._first_pages.get(page_size)
+            if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+                return cached[1]
+
+        query = self._index().order_by('score', direction='DESCENDING')
+        if cursor:
+            with self._lock:
+                last = self._cursors.get(cursor)
+            if last is None:
+                last = self._index().document(cursor).get()
+                if not last.exists:
+                    return self.get_page(None, page_size)
+            query = query.start_after(last)
+        # One extra case tells whether there's another page
+        docs = list(query.limit(page_size + 1).get())
+        shown = docs[:page_size]
+        page = FeedPage(cases=[dict(doc.to_dict() or {}, case_id=doc.id) for doc in shown],
+                        next_cursor=shown[-1].id if len(docs) > page_size else None)
+
+        with self._lock:
+            if cursor is None:
+                self._first_pages[page_size] = (time.monotonic(), page)
+            if page.next_cursor:
+                self._cursors[page.next_cursor] = shown[-1]
+        return page
+
+    def top(self, n: int = 10) -> List[Dict[str, Any]]:
+        """The n best-ranked public cases."""
+        return self.get_page(None, n).cases
+
+
+_default_feed: Optional[DiscoveryFeed] = None
+
+
+def get_discovery_feed() -> DiscoveryFeed:
+    """Get the process-wide discovery feed, so its cached first page is shared across sessions."""
+    global _default_feed
+    if _default_feed is None:
+        _default_feed = DiscoveryFeed()
+    return _default_feed
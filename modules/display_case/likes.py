@@ -0,0 +1,241 @@
+"""
+Like counters for display cases.
+Each case keeps its like count in counter shards next to the per-user like
+documents, so showing a case's likes reads a handful of small documents in one
+call instead of downloading every like. Increments are spread over the shards
+to avoid write contention on a single document. A case's shard count is stored
+on the case when its counter starts, and the counter starts from the likes the
+case already has.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from firebase_admin import firestore
+
+# Counter shards of a case, fixed when its counter starts (stored on the case as like_shards)
+LIKE_SHARDS = int(os.getenv('DISPLAY_CASE_LIKE_SHARDS', 8))
+
+DEFAULT_TTL_SECONDS = 30.0
+
+
+def _shard_count(snapshot) -> Optional[int]:
+    """Shard count stored on a case document, or None if its counter hasn't started."""
+    if not snapshot.exists:
+        return None
+    shards = (snapshot.to_dict() or {}).get('like_shards')
+    return int(shards) if shards else None
+
+
+class FirestoreLikeStore:
+    """Likes in Firestore: display_cases/{case}/likes/{uid} plus display_cases/{case}/like_shards/{n}."""
+
+    def __init__(self, db, shards: int = LIKE_SHARDS):
+        """
+        Initialize the store.
+
+        Args:
+            db: Firestore client
+            shards: Counter shards given to a case when its counter starts
+        """
+        self.db = db
+        self.shards = max(1, shards)
+
+    def _case_ref(self, case_id: str):
+        return self.db.collection('display_cases').document(case_id)
+
+    def _shard_ref(self, case_ref, n: int):
+        return case_ref.collection('like_shards').document(str(n))
+
+    def _start_counter(self, transaction, case_ref, count: int) -> None:
+        """Write a new counter holding count, and its shard count on the case."""
+        transaction.set(case_ref, {'like_shards': self.shards}, merge=True)
+        for n in range(self.shards):
+            transaction.set(self._shard_ref(case_ref, n), {'count': count if n == 0 else 0})
+
+    def _count_likes(self, transaction, case_ref) -> int:
+        """Likes the case has, counted from its like documents (before its counter starts)."""
+        # Transaction.get takes a Query, not a collection; select no fields so only the ids come back
+        return sum(1 for _ in transaction.get(case_ref.collection('likes').select([])))
+
+    def set_like(self, case_id: str, uid: str, like: bool) -> bool:
+        """
+        Like or unlike a case in one transaction.
+
+        Returns:
+            bool: Whether anything changed (liking twice only counts once)
+        """
+        case_ref = self._case_ref(case_id)
+        like_ref = case_ref.collection('likes').document(uid)
+
+        @firestore.transactional
+        def apply(transaction) -> bool:
+            shards = _shard_count(case_ref.get(transaction=transaction))
+            liked = like_ref.get(transaction=transaction).exists
+            if liked == like:
+                return False
+            existing = self._count_likes(transaction, case_ref) if shards is None else None
+            if like:
+                transaction.set(like_ref, {'timestamp': datetime.now(), 'uid': uid})
+            else:
+                transaction.delete(like_ref)
+            delta = 1 if like else -1
+            if existing is not None:
+                self._start_counter(transaction, case_ref, existing + delta)
+            else:
+                shard_ref = self._shard_ref(case_ref, random.randrange(shards))
+                transaction.set(shard_ref, {'count': firestore.Increment(delta)}, merge=True)
+            return True
+
+        return apply(self.db.transaction())
+
+    def read(self, case_id: str, uid: str) -> Tuple[int, bool]:
+        """Like count and whether uid liked the case, fetched together."""
+        case_ref = self._case_ref(case_id)
+        like_ref = case_ref.collection('likes').document(uid)
+        shard_refs = [self._shard_ref(case_ref, n) for n in range(self.shards)]
+        snapshots = {snapshot.reference.path: snapshot for snapshot in self.db.get_all([case_ref, like_ref] + shard_refs)}
+        liked = like_ref.path in snapshots and snapshots[like_ref.path].exists
+
+        shards = _shard_count(snapshots[case_ref.path]) if case_ref.path in snapshots else None
+        if shards is None:
+            count = self._start_counter_from_likes(case_ref)
+            return (count, liked) if count is not None else self.read(case_id, uid)
+        if shards > self.shards:
+            # Started while more shards were configured
+            extra = [self._shard_ref(case_ref, n) for n in range(self.shards, shards)]
+            snapshots.update((snapshot.reference.path, snapshot) for snapshot in self.db.get_all(extra))
+            shard_refs += extra
+
+        count = 0
+        for ref in shard_refs[:shards]:
+            snapshot = snapshots.get(ref.path)
+            if snapshot is not None and snapshot.exists:
+                count += int((snapshot.to_dict() or {}).get('count', 0))
+        return max(count, 0), liked
+
+    def _start_counter_from_likes(self, case_ref) -> Optional[int]:
+        """Start a case's counter from its like documents; None if another session started it first."""
+
+        @firestore.transactional
+        def apply(transaction) -> Optional[int]:
+            if _shard_count(case_ref.get(transaction=transaction)) is not None:
+                return None
+            count = self._count_likes(transaction, case_ref)
+            self._start_counter(transaction, case_ref, count)
+            return count
+
+        return apply(self.db.transaction())
+
+
+class InMemoryLikeStore:
+    """Likes held in process, with the same interface as FirestoreLikeStore (for tests and local runs)."""
+
+    def __init__(self, shards: int = LIKE_SHARDS):
+        self.shards = max(1, shards)
+        self.likes: Dict[str, set] = {}
+        # case id -> shard -> count, for cases whose counter has started
+        self.counters: Dict[str, Dict[int, int]] = {}
+        self.reads = 0
+        self._lock = threading.Lock()
+
+    def _counter(self, case_id: str) -> Dict[int, int]:
+        # Called with self._lock held; starts from the likes the case already has
+        if case_id not in self.counters:
+            self.counters[case_id] = {0: len(self.likes.get(case_id, ()))}
+        return self.counters[case_id]
+
+    def set_like(self, case_id: str, uid: str, like: bool) -> bool:
+        with self._lock:
+            counter = self._counter(case_id)
+            likers = self.likes.setdefault(case_id, set())
+            if (uid in likers) == like:
+                return False
+            if like:
+                likers.add(uid)
+            else:
+                likers.discard(uid)
+            shard = random.randrange(self.shards)
+            counter[shard] = counter.get(shard, 0) + (1 if like else -1)
+            return True
+
+    def read(self, case_id: str, uid: str) -> Tuple[int, bool]:
+        with self._lock:
+            self.reads += 1
+            count = sum(self._counter(case_id).values())
+            return max(count, 0), uid in self.likes.get(case_id, set())
+
+
+class LikeCounter:
+    """Reads and updates like counts through a store, caching reads briefly."""
+
+    def __init__(self, store=None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the counter.
+
+        Args:
+            store: FirestoreLikeStore, InMemoryLikeStore or anything with set_like/read
+                (Firestore through FirebaseManager by default)
+            ttl_seconds: How long a read is reused
+        """
+        self._store = store
+        self.ttl_seconds = ttl_seconds
+        # case id -> uid -> (read at, count, liked)
+        self._cache: Dict[str, Dict[str, Tuple[float, int, bool]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            from modules.core.firebase_manager import FirebaseManager
+            db = FirebaseManager.get_instance().db
+            if not db:
+                raise RuntimeError("Firestore client not initialized")
+            self._store = FirestoreLikeStore(db)
+        return self._store
+
+    def set_like(self, case_id: str, uid: str, like: bool) -> bool:
+        """Like or unlike a case; returns whether the like state changed."""
+        changed = self.store.set_like(case_id, uid, like)
+        with self._lock:
+            cached = self._cache.get(case_id, {})
+            if changed:
+                # Other viewers' cached counts are now off by one
+                delta = 1 if like else -1
+                self._cache[case_id] = {viewer: (read_at, max(count + delta, 0), like if viewer == uid else liked)
+                                        for viewer, (read_at, count, liked) in cached.items()}
+        return changed
+
+    def get(self, case_id: str, uid: str) -> Tuple[int, bool]:
+        """Like count of a case and whether uid has liked it."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(case_id, {}).get(uid)
+        if cached and now - cached[0] < self.ttl_seconds:
+            return cached[1], cached[2]
+        count, liked = self.store.read(case_id, uid)
+        with self._lock:
+            self._cache.setdefault(case_id, {})[uid] = (now, count, liked)
+        return count, liked
+
+    def invalidate(self, case_id: Optional[str] = None) -> None:
+        with self._lock:
+            if case_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(case_id, None)
+
+
+_default_counter: Optional[LikeCounter] = None
+
+
+def get_like_counter() -> LikeCounter:
+    """Get the process-wide like counter, so its cache is shared across reruns and sessions."""
+    global _default_counter
+    if _default_counter is None:
+        _default_counter = LikeCounter()
+    return _default_counter
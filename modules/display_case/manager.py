@@ -1,5 +1,5 @@
 import traceback
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 from datetime import datetime
 import pandas as pd
 from ..database.service import DatabaseService
@@ -8,9 +8,19 @@ import json
 import base64
 from ..core.firebase_manager import FirebaseManager
 from ..core.models import DisplayCase, Card
+from .tag_index import TagIndex, normalize_tag
+from .card_refs import card_references, cards_by_id, display_card_id, resolve_cards
+from .totals import DisplayCaseTotals
+from .likes import get_like_counter
+from .comments import CommentPage, get_comment_feed
+from .discovery import get_discovery_feed
 import streamlit as st
 import logging
 import re
+import time
+
+# Stored cases are re-read for the totals map after this long, in case another session changed them
+CASE_TOTALS_TTL_SECONDS = 300
 
 class DisplayCaseManager:
     def __init__(self, uid: str, collection: Union[pd.DataFrame, List[Dict]]):
@@ -21,6 +31,14 @@ class DisplayCaseManager:
         self.db = DatabaseService.get_instance()  # Initialize the database service
         self.logger = logging.getLogger(__name__)
         self.firebase_manager = FirebaseManager.get_instance()  # Get FirebaseManager instance
+        self._tag_index = None
+        self._tag_index_source = None
+        self._tag_index_size = 0
+        self._case_totals = None
+        self._case_totals_loaded_at = 0.0
+        self.like_counter = get_like_counter()
+        self.comment_feed = get_comment_feed()
+        self.discovery_feed = get_discovery_feed()
         
     @staticmethod
     @st.cache_data(ttl=300)  # Cache for 5 minutes
@@ -55,6 +73,7 @@ class DisplayCaseManager:
             # Get the display cases subcollection
             display_cases = user_doc.collection('display_cases').get()
             cases = []
+            collection_cards = cards_by_id(collection)
             
             for case in display_cases:
                 case_data = case.to_dict()
@@ -65,19 +84,8 @@ class DisplayCaseManager:
                 if 'cards' not in case_data:
                     case_data['cards'] = []
                 
-                # Validate and ensure photo data is present for each card
-                for card in case_data['cards']:
-                    if not card.get('photo'):
-                        # Try to find the original card in the collection
-                        card_id = card.get('id')
-                        if card_id:
-                            # Find the card in the collection
-                            if isinstance(collection, pd.DataFrame):
-                                matching_card = collection[collection['id'] == card_id].iloc[0].to_dict() if not collection.empty else None
-                            else:
-                                matching_card = next((c for c in collection if c.get('id') == card_id), None)
-                            if matching_card:
-                                card['photo'] = matching_card.get('photo')
+                # Resolve card references against the collection
+                case_data['cards'] = resolve_cards(case_data['cards'], collection_cards)
                 
                 # Calculate total value if not present
                 if 'total_value' not in case_data:
@@ -95,6 +103,13 @@ class DisplayCaseManager:
             logger.error(traceback.format_exc())
             return []
 
+    def _sync_discovery(self, update: Callable[[], None]) -> None:
+        """Apply a change to the public discovery feed without failing the operation that caused it"""
+        try:
+            update()
+        except Exception as e:
+            print(f"Error updating discovery feed: {str(e)}")
+
     def _normalize_tags(self, tags: List[str]) -> List[str]:
         """Normalize tags to a consistent format"""
         print("\n=== Normalizing Tags ===")
@@ -208,12 +223,58 @@ class DisplayCaseManager:
             print(f"[DEBUG] Invalid value for card {card.get('player_name', 'Unknown')}")
             return 0.0
 
-    def _filter_cards_by_tags(self, tags: List[str]) -> List[Dict]:
+    def _collection_size(self) -> int:
+        return len(self.collection) if self.collection is not None else 0
+
+    @property
+    def tag_index(self) -> TagIndex:
+        """
+        Tag index of the current collection, rebuilt only when the collection is
+        replaced or changes size. Edits made through update_card keep it current;
+        call invalidate_tag_index after changing cards in place some other way.
+        """
+        if (self._tag_index is None or self._tag_index_source is not self.collection
+                or self._tag_index_size != self._collection_size()):
+            self._tag_index = TagIndex(self.collection)
+            self._tag_index_source = self.collection
+            self._tag_index_size = self._collection_size()
+        return self._tag_index
+
+    def invalidate_tag_index(self) -> None:
+        """Rebuild the tag index on next use"""
+        self._tag_index = None
+
+    def update_card(self, position: int, changes: Dict) -> None:
+        """
+        Update fields of the card at a position in the collection and re-index only its tags.
+        
+        Args:
+            position (int): Position of the card in the collection
+            changes (Dict): Fields to change
+        """
+        index = self.tag_index
+        if isinstance(self.collection, pd.DataFrame):
+            label = self.collection.index[position]
+            for column, value in changes.items():
+                if column not in self.collection.columns:
+                    self.collection[column] = None
+                if self.collection[column].dtype != object and isinstance(value, (list, dict)):
+                    self.collection[column] = self.collection[column].astype(object)
+                self.collection.at[label, column] = value
+            card = self.collection.loc[label].to_dict()
+        else:
+            current = self.collection[position]
+            card = dict(current.to_dict() if hasattr(current, 'to_dict') else current, **changes)
+            self.collection[position] = card
+        index.update_card(position, card)
+
+    def _filter_cards_by_tags(self, tags: List[str], match_all: bool = False) -> List[Dict]:
         """
         Filter collection cards by specified tags.
         
         Args:
             tags (List[str]): List of tags to filter by
+            match_all (bool): Whether cards need every tag rather than any of them
             
         Returns:
             List[Dict]: List of matching cards
@@ -226,15 +287,7 @@ class DisplayCaseManager:
             return []
         
         # Normalize filter tags
-        normalized_filter_tags = set()
-        for t in tags:
-            if t and not pd.isna(t):
-                normalized = str(t).lower().strip()
-                normalized = re.sub(r'[^a-z0-9\s]', '', normalized)
-                if normalized:
-                    normalized_filter_tags.add(normalized)
-                    print(f"Added normalized filter tag: '{normalized}'")
-        
+        normalized_filter_tags = {normalize_tag(t) for t in tags or []} - {''}
         print(f"Normalized filter tags: {normalized_filter_tags}")
         
         if not normalized_filter_tags:
@@ -242,110 +295,10 @@ class DisplayCaseManager:
             return []
         
         matching_cards = []
-        
-        if isinstance(self.collection, pd.DataFrame):
-            print("[DEBUG] Processing DataFrame collection")
-            for idx, row in self.collection.iterrows():
-                card = row.to_dict()
-                # Generate a consistent ID for the card
-                card_id = f"{card.get('player_name', '')}_{card.get('year', '')}_{card.get('card_set', '')}_{card.get('card_number', '')}".replace(" ", "_").lower()
-                card['id'] = card_id
-                
-                # Get and normalize card tags
-                raw_tags = card.get('tags', [])
-                print(f"\nCard {idx} raw tags: {raw_tags}")
-                print(f"Card {idx} raw tags type: {type(raw_tags)}")
-                
-                # Handle different tag formats
-                if isinstance(raw_tags, str):
-                    try:
-                        # Try to parse as JSON/list
-                        parsed = ast.literal_eval(raw_tags)
-                        if isinstance(parsed, list):
-                            raw_tags = parsed
-                        else:
-                            raw_tags = [t.strip() for t in raw_tags.split(',')]
-                        print(f"Card {idx} parsed tags: {raw_tags}")
-                    except:
-                        raw_tags = [t.strip() for t in raw_tags.split(',')]
-                        print(f"Card {idx} split tags: {raw_tags}")
-                elif not isinstance(raw_tags, list):
-                    print(f"Card {idx} invalid tags format: {raw_tags}")
-                    raw_tags = []
-                
-                # Normalize each tag
-                card_tags = set()
-                for tag in raw_tags:
-                    if tag and not pd.isna(tag):
-                        normalized = str(tag).lower().strip()
-                        normalized = re.sub(r'[^a-z0-9\s]', '', normalized)
-                        if normalized:
-                            card_tags.add(normalized)
-                            print(f"Card {idx} normalized tag: '{normalized}'")
-                
-                print(f"Card {idx} all normalized tags: {card_tags}")
-                
-                # Check for matches
-                matches = normalized_filter_tags.intersection(card_tags)
-                if matches:
-                    print(f"Card {idx} matches with tags: {matches}")
-                    if self._validate_card_photo(card):
-                        matching_cards.append(card)
-                        print(f"Added card {idx} to matches")
-                else:
-                    print(f"Card {idx} does not match any filter tags")
-        else:
-            print("[DEBUG] Processing list collection")
-            for idx, card in enumerate(self.collection):
-                if hasattr(card, 'to_dict'):
-                    card = card.to_dict()
-                # Generate a consistent ID for the card
-                card_id = f"{card.get('player_name', '')}_{card.get('year', '')}_{card.get('card_set', '')}_{card.get('card_number', '')}".replace(" ", "_").lower()
-                card['id'] = card_id
-                
-                # Get and normalize card tags
-                raw_tags = card.get('tags', [])
-                print(f"\nCard {idx} raw tags: {raw_tags}")
-                print(f"Card {idx} raw tags type: {type(raw_tags)}")
-                
-                # Handle different tag formats
-                if isinstance(raw_tags, str):
-                    try:
-                        # Try to parse as JSON/list
-                        parsed = ast.literal_eval(raw_tags)
-                        if isinstance(parsed, list):
-                            raw_tags = parsed
-                        else:
-                            raw_tags = [t.strip() for t in raw_tags.split(',')]
-                        print(f"Card {idx} parsed tags: {raw_tags}")
-                    except:
-                        raw_tags = [t.strip() for t in raw_tags.split(',')]
-                        print(f"Card {idx} split tags: {raw_tags}")
-                elif not isinstance(raw_tags, list):
-                    print(f"Card {idx} invalid tags format: {raw_tags}")
-                    raw_tags = []
-                
-                # Normalize each tag
-                card_tags = set()
-                for tag in raw_tags:
-                    if tag and not pd.isna(tag):
-                        normalized = str(tag).lower().strip()
-                        normalized = re.sub(r'[^a-z0-9\s]', '', normalized)
-                        if normalized:
-                            card_tags.add(normalized)
-                            print(f"Card {idx} normalized tag: '{normalized}'")
-                
-                print(f"Card {idx} all normalized tags: {card_tags}")
-                
-                # Check for matches
-                matches = normalized_filter_tags.intersection(card_tags)
-                if matches:
-                    print(f"Card {idx} matches with tags: {matches}")
-                    if self._validate_card_photo(card):
-                        matching_cards.append(card)
-                        print(f"Added card {idx} to matches")
-                else:
-                    print(f"Card {idx} does not match any filter tags")
+        for card in self.tag_index.cards(normalized_filter_tags, match_all=match_all):
+            card['id'] = display_card_id(card)
+            if self._validate_card_photo(card):
+                matching_cards.append(card)
         
         print(f"Found {len(matching_cards)} matching cards")
         return matching_cards
@@ -400,10 +353,15 @@ class DisplayCaseManager:
             # Add to display cases subcollection
             display_case_doc = user_doc.collection('display_cases').document()
             display_case.id = display_case_doc.id
-            display_case_doc.set(display_case.to_dict())
+            case_data = display_case.to_dict()
+            case_data['cards'] = card_references(filtered_cards)
+            display_case_doc.set(case_data)
+            if is_public:
+                self._sync_discovery(lambda: self.discovery_feed.publish(self.uid, case_data))
             
             # Clear the cache to ensure the display cases are reloaded
             st.cache_data.clear()
+            self._case_totals = None
             
             print(f"Successfully created display case with {len(filtered_cards)} cards")
             return display_case
@@ -441,7 +399,11 @@ class DisplayCaseManager:
             
             # Update display case
             display_case_doc = user_doc.collection('display_cases').document(display_case.id)
-            display_case_doc.set(display_case.to_dict())
+            case_data = display_case.to_dict()
+            case_data['cards'] = card_references(display_case.cards)
+            display_case_doc.set(case_data)
+            self._case_totals = None
+            self._sync_discovery(lambda: self.discovery_feed.publish(self.uid, case_data))
             
             return True
             
@@ -476,9 +438,11 @@ class DisplayCaseManager:
             # Delete display case
             display_case_doc = user_doc.collection('display_cases').document(case_id)
             display_case_doc.delete()
+            self._sync_discovery(lambda: self.discovery_feed.unpublish(case_id))
             
             # Clear the cache to ensure the display cases are reloaded
             st.cache_data.clear()
+            self._case_totals = None
             
             return True
         except Exception as e:
@@ -508,7 +472,8 @@ class DisplayCaseManager:
             for case_name, display_case in self.display_cases.items():
                 try:
                     # Convert the display case to a dictionary if it's not already
-                    case_data = dict(display_case) if not isinstance(display_case, dict) else display_case
+                    case_data = dict(display_case) if not isinstance(display_case, dict) else dict(display_case)
+                    case_data['cards'] = card_references(case_data.get('cards', []))
                     
                     # Save the display case document
                     display_cases_ref.document(case_name).set(case_data)
@@ -527,51 +492,58 @@ class DisplayCaseManager:
             print(f"Traceback: {traceback.format_exc()}")
             return False
             
+    def update_case_totals(self, cards: Optional[Union[pd.DataFrame, List[Dict]]] = None) -> Dict[str, float]:
+        """
+        Bring stored display case totals up to date after card values change.
+        
+        Only the cases containing a changed card are adjusted, by the change in
+        its value, and all of them are written back in one batch.
+        
+        Args:
+            cards: Cards with their current values (the manager's collection by default)
+            
+        Returns:
+            Dict[str, float]: New total_value of each case that changed
+        """
+        try:
+            db = self.firebase_manager.db
+            if not db:
+                print("[ERROR] Failed to get Firebase client")
+                return {}
+            
+            cases_ref = db.collection('users').document(self.uid).collection('display_cases')
+            if (self._case_totals is None
+                    or time.monotonic() - self._case_totals_loaded_at > CASE_TOTALS_TTL_SECONDS):
+                self._case_totals = DisplayCaseTotals(dict(doc.to_dict(), id=doc.id) for doc in cases_ref.get())
+                self._case_totals_loaded_at = time.monotonic()
+            
+            changed = self._case_totals.apply_collection(cards if cards is not None else self.collection)
+            if self._case_totals.commit(cases_ref, db.batch):
+                # Clear the cache to ensure the display cases are reloaded
+                st.cache_data.clear()
+            
+            # Public cases are ranked by value in the discovery feed too
+            for case_id, total in changed.items():
+                if case_id in self._case_totals.public_cases:
+                    self._sync_discovery(lambda: self.discovery_feed.record_total(case_id, total))
+            print(f"Updated totals of {len(changed)} display cases")
+            return changed
+            
+        except Exception as e:
+            print(f"Error updating display case totals: {str(e)}")
+            print(traceback.format_exc())
+            # Rebuild from the stored cases next time
+            self._case_totals = None
+            return {}
+
     def get_all_tags(self) -> List[str]:
         """Get all unique tags from the current collection"""
-        all_tags = set()
         try:
-            if isinstance(self.collection, pd.DataFrame):
-                if not self.collection.empty and 'tags' in self.collection.columns:
-                    # Get all non-null tags from the collection
-                    tags_series = self.collection['tags'].dropna()
-                    
-                    # Normalize and collect all unique tags
-                    for tags in tags_series:
-                        if isinstance(tags, str):
-                            # Handle comma-separated string
-                            tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
-                        elif isinstance(tags, list):
-                            # Handle list format
-                            tag_list = [str(tag).strip() for tag in tags if tag]
-                        else:
-                            continue
-                        all_tags.update(tag_list)
-            else:
-                # Handle list format
-                for card in self.collection:
-                    try:
-                        card_dict = card.to_dict() if hasattr(card, 'to_dict') else card
-                        if 'tags' in card_dict:
-                            tags = card_dict['tags']
-                            if isinstance(tags, str):
-                                # Handle comma-separated string
-                                tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
-                            elif isinstance(tags, list):
-                                # Handle list format
-                                tag_list = [str(tag).strip() for tag in tags if tag]
-                            else:
-                                continue
-                            all_tags.update(tag_list)
-                    except Exception as e:
-                        print(f"Error processing card tags: {str(e)}")
-                        continue
+            all_tags = self.tag_index.all_tags()
             
             # Debug print to help diagnose issues
-            print(f"All available tags: {sorted(list(all_tags))}")
-            
-            # Sort tags alphabetically for better display
-            return sorted(list(all_tags))
+            print(f"All available tags: {all_tags}")
+            return all_tags
         except Exception as e:
             print(f"Error in get_all_tags: {str(e)}")
             import traceback
@@ -634,15 +606,18 @@ class DisplayCaseManager:
             print(f"Found {len(filtered_cards)} matching cards after refresh")
             
             # Update the display case with current cards
-            case_data['cards'] = filtered_cards
+            case_data['cards'] = card_references(filtered_cards)
             case_data['total_value'] = sum(self._safe_get_card_value(card) for card in filtered_cards)
             case_data['updated_at'] = datetime.now().isoformat()
             
             # Save the updated display case
             display_case_doc.set(case_data)
+            if case_data.get('is_public'):
+                self._sync_discovery(lambda: self.discovery_feed.publish(self.uid, dict(case_data, id=case_id)))
             
             # Clear the cache to ensure the display cases are reloaded
             st.cache_data.clear()
+            self._case_totals = None
             
             print("Successfully refreshed display case")
             return True
@@ -808,53 +783,15 @@ class DisplayCaseManager:
             tag = tag.strip().lower()
             matching_cards = []
 
-            # Handle both collection types
-            if isinstance(self.collection, pd.DataFrame):
-                for idx, row in self.collection.iterrows():
-                    card = row.to_dict()
-                    raw_tags = card.get('tags', [])
-                    if isinstance(raw_tags, str):
-                        try:
-                            parsed = ast.literal_eval(raw_tags)
-                            raw_tags = parsed if isinstance(parsed, list) else [t.strip() for t in raw_tags.split(',')]
-                        except:
-                            raw_tags = [t.strip() for t in raw_tags.split(',')]
-                    elif not isinstance(raw_tags, list):
-                        raw_tags = []
-                    normalized_tags = [str(t).strip().lower() for t in raw_tags if t]
-                    if tag in normalized_tags:
-                        # Ensure photo is properly included and valid
-                        if 'photo' in card and card['photo']:
-                            # Convert photo to string if it's not already
-                            if not isinstance(card['photo'], str):
-                                card['photo'] = str(card['photo'])
-                            matching_cards.append(card)
-                        else:
-                            print(f"[DEBUG] Card {card.get('player_name', 'Unknown')} has no photo")
-
-            elif isinstance(self.collection, list):
-                for idx, card in enumerate(self.collection):
-                    if hasattr(card, 'to_dict'):
-                        card = card.to_dict()
-                    raw_tags = card.get('tags', [])
-                    if isinstance(raw_tags, str):
-                        try:
-                            parsed = ast.literal_eval(raw_tags)
-                            raw_tags = parsed if isinstance(parsed, list) else [t.strip() for t in raw_tags.split(',')]
-                        except:
-                            raw_tags = [t.strip() for t in raw_tags.split(',')]
-                    elif not isinstance(raw_tags, list):
-                        raw_tags = []
-                    normalized_tags = [str(t).strip().lower() for t in raw_tags if t]
-                    if tag in normalized_tags:
-                        # Ensure photo is properly included and valid
-                        if 'photo' in card and card['photo']:
-                            # Convert photo to string if it's not already
-                            if not isinstance(card['photo'], str):
-                                card['photo'] = str(card['photo'])
-                            matching_cards.append(card)
-                        else:
-                            print(f"[DEBUG] Card {card.get('player_name', 'Unknown')} has no photo")
+            for card in self.tag_index.cards([tag]):
+                # Ensure photo is properly included and valid
+                if 'photo' in card and card['photo']:
+                    # Convert photo to string if it's not already
+                    if not isinstance(card['photo'], str):
+                        card['photo'] = str(card['photo'])
+                    matching_cards.append(card)
+                else:
+                    print(f"[DEBUG] Card {card.get('player_name', 'Unknown')} has no photo")
 
             print(f"[DEBUG] Found {len(matching_cards)} cards matching tag '{tag}'")
 
@@ -890,31 +827,12 @@ class DisplayCaseManager:
     def preview_cards_by_tag(self, tag: str) -> List[Dict]:
         """Preview cards that have a specific tag"""
         try:
-            if not self.collection or not isinstance(self.collection, pd.DataFrame):
+            if self.collection is None or len(self.collection) == 0:
                 print("No valid collection available")
                 return []
             
-            if 'tags' not in self.collection.columns:
-                print("Collection does not have a 'tags' column")
-                return []
-            
             print(f"\n=== Previewing cards with tag: {tag} ===")
-            matching_cards = []
-            
-            for idx, card in self.collection.iterrows():
-                card_dict = card.to_dict()
-                card_tags = card_dict.get('tags', [])
-                
-                # Convert tags to list if it's a string
-                if isinstance(card_tags, str):
-                    card_tags = [t.strip() for t in card_tags.split(',')]
-                elif not isinstance(card_tags, list):
-                    card_tags = []
-                
-                # Check if the tag exists in the card's tags
-                if tag.lower() in [t.lower() for t in card_tags]:
-                    print(f"Found matching card: {card_dict.get('player_name', 'Unknown')}")
-                    matching_cards.append(card_dict)
+            matching_cards = self.tag_index.cards([tag])
             
             print(f"Found {len(matching_cards)} cards with tag '{tag}'")
             return matching_cards
@@ -934,28 +852,16 @@ class DisplayCaseManager:
                 print("Error: Firestore client not initialized")
                 return False
             
-            # Get current user's UID
-            uid = self.uid
-            
-            # Update likes in Firestore
-            likes_ref = db.collection('display_cases').document(case_id).collection('likes')
-            
-            if like:
-                # Add like
-                likes_ref.document(uid).set({
-                    'timestamp': datetime.now(),
-                    'uid': uid
-                })
-            else:
-                # Remove like
-                likes_ref.document(uid).delete()
+            # Record the like and update the counter in one transaction
+            changed = self.like_counter.set_like(case_id, self.uid, like)
+            if changed:
+                self._sync_discovery(lambda: self.discovery_feed.record_like(case_id, 1 if like else -1))
             
             # Update local display case
-            if case_id in self.display_cases:
+            if changed and case_id in self.display_cases:
                 case = self.display_cases[case_id]
                 likes = case.likes or 0
-                case.likes = likes + (1 if like else -1)
-                case.is_liked = like
+                case.likes = max(likes + (1 if like else -1), 0)
             
             return True
         except Exception as e:
@@ -971,15 +877,7 @@ class DisplayCaseManager:
                 print("Error: Firestore client not initialized")
                 return 0, False
             
-            # Get current user's UID
-            uid = self.uid
-            
-            # Get likes from Firestore
-            likes_ref = db.collection('display_cases').document(case_id).collection('likes')
-            likes = len(list(likes_ref.get()))
-            is_liked = likes_ref.document(uid).get().exists
-            
-            return likes, is_liked
+            return self.like_counter.get(case_id, self.uid)
         except Exception as e:
             print(f"Error getting case likes: {str(e)}")
             return 0, False
@@ -1004,6 +902,8 @@ class DisplayCaseManager:
                 'timestamp': datetime.now(),
                 'username': st.session_state.get('user', {}).get('displayName', 'Anonymous')
             })
+            self.comment_feed.invalidate(case_id)
+            self._sync_discovery(lambda: self.discovery_feed.record_comment(case_id, 1))
             
             return True
         except Exception as e:
@@ -1019,19 +919,35 @@ class DisplayCaseManager:
                 print("Error: Firestore client not initialized")
                 return []
             
-            # Get comments from Firestore
-            comments_ref = db.collection('display_cases').document(case_id).collection('comments')
-            comments = []
-            for doc in comments_ref.order_by('timestamp', direction='DESCENDING').get():
-                comment_data = doc.to_dict()
-                comment_data['id'] = doc.id
-                comments.append(comment_data)
-            
-            return comments
+            return self.comment_feed.get_all(case_id)
         except Exception as e:
             print(f"Error getting comments: {str(e)}")
             return []
 
+    def get_comments_page(self, case_id: str, cursor: Optional[str] = None, page_size: Optional[int] = None) -> CommentPage:
+        """
+        Get one page of comments for a display case, newest first.
+        
+        Args:
+            case_id (str): ID of the display case
+            cursor (Optional[str]): next_cursor of the previous page, None for the first page
+            page_size (Optional[int]): Number of comments per page
+            
+        Returns:
+            CommentPage: Comments and the cursor of the next page (None when there are no more)
+        """
+        try:
+            # Get Firestore client
+            db = self.firebase_manager.db
+            if not db:
+                print("Error: Firestore client not initialized")
+                return CommentPage()
+            
+            return self.comment_feed.get_page(case_id, cursor, page_size)
+        except Exception as e:
+            print(f"Error getting comments: {str(e)}")
+            return CommentPage()
+
     def delete_comment(self, case_id: str, comment_id: str) -> bool:
         """Delete a comment from a display case"""
         try:
@@ -1051,9 +967,25 @@ class DisplayCaseManager:
             # Check if comment exists and user is the owner
             if comment.exists and comment.get('uid') == uid:
                 comment_ref.delete()
+                self.comment_feed.invalidate(case_id)
+                self._sync_discovery(lambda: self.discovery_feed.record_comment(case_id, -1))
                 return True
             
             return False
         except Exception as e:
             print(f"Error deleting comment: {str(e)}")
-            return False 
\ No newline at end of file
+            return False 
+
+
+def get_display_case_manager(uid: str, collection: Union[pd.DataFrame, List[Dict]]) -> DisplayCaseManager:
+    """
+    Get the session's display case manager for a user, kept in st.session_state
+    so its tag index and case totals survive reruns and page switches.
+    """
+    manager = st.session_state.get('display_case_manager')
+    if manager is None or manager.uid != uid:
+        manager = DisplayCaseManager(uid, collection)
+        st.session_state.display_case_manager = manager
+    else:
+        manager.collection = collection
+    return manager
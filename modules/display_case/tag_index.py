@@ -0,0 +1,157 @@
+"""
+Tag index for display cases.
+Parses and normalizes every card's tags once per collection version and keeps
+normalized tag -> sorted card positions, so filtering a collection by tags is a
+union or intersection of posting lists instead of a pass over every card.
+"""
+
+import ast
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+import pandas as pd
+
+_NON_TAG_CHARACTERS = re.compile(r'[^a-z0-9\s]')
+
+
+def normalize_tag(tag: Any) -> str:
+    """Lowercase a tag and drop everything but letters, digits and spaces; "" for missing tags."""
+    if tag is None or (isinstance(tag, float) and pd.isna(tag)):
+        return ''
+    return _NON_TAG_CHARACTERS.sub('', str(tag).lower().strip())
+
+
+def parse_tags(raw_tags: Any) -> List[str]:
+    """
+    A card's tags as a list of stripped strings.
+
+    Tags are stored as a list, a stringified list ("['rookie', 'auto']") or a
+    comma-separated string; anything else has no tags.
+    """
+    if isinstance(raw_tags, str):
+        try:
+            parsed = ast.literal_eval(raw_tags)
+            raw_tags = parsed if isinstance(parsed, list) else raw_tags.split(',')
+        except (ValueError, SyntaxError, TypeError):
+            raw_tags = raw_tags.split(',')
+    elif not isinstance(raw_tags, (list, tuple, set)):
+        return []
+    return [str(tag).strip() for tag in raw_tags
+            if tag is not None and not (isinstance(tag, float) and pd.isna(tag)) and str(tag).strip()]
+
+
+def _as_dict(card: Any) -> Dict[str, Any]:
+    if hasattr(card, 'to_dict'):
+        return card.to_dict()
+    return dict(card) if isinstance(card, dict) else {}
+
+
+class TagIndex:
+    """Inverted index from normalized tag to the sorted positions of the cards carrying it."""
+
+    def __init__(self, collection: Union[pd.DataFrame, List[Any], None]):
+        """
+        Build the index.
+
+        Args:
+            collection: Collection DataFrame or list of card dictionaries / Card objects
+        """
+        if isinstance(collection, pd.DataFrame):
+            records = collection.to_dict('records')
+        else:
+            records = [_as_dict(card) for card in (collection or [])]
+        # Positions stay stable: removed cards leave a None behind
+        self.records: List[Optional[Dict[str, Any]]] = []
+        # Normalized tag -> spelling used, per card
+        self._card_tags: List[Dict[str, str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        # Spellings of each normalized tag with how many cards use them, first seen first
+        self._labels: Dict[str, Dict[str, int]] = {}
+        for card in records:
+            self.add_card(card)
+
+    def __len__(self) -> int:
+        return sum(record is not None for record in self.records)
+
+    def _index(self, position: int, card: Dict[str, Any]) -> None:
+        tags = {}
+        for label in parse_tags(card.get('tags', [])):
+            tag = normalize_tag(label)
+            if not tag or tag in tags:
+                continue
+            tags[tag] = label
+            postings = self._postings.setdefault(tag, [])
+            insort(postings, position)
+            labels = self._labels.setdefault(tag, {})
+            labels[label] = labels.get(label, 0) + 1
+        self._card_tags[position] = tags
+
+    def _unindex(self, position: int) -> None:
+        for tag, label in self._card_tags[position].items():
+            postings = self._postings[tag]
+            del postings[bisect_left(postings, position)]
+            labels = self._labels[tag]
+            labels[label] -= 1
+            if not labels[label]:
+                del labels[label]
+            if not postings:
+                del self._postings[tag]
+                del self._labels[tag]
+        self._card_tags[position] = {}
+
+    def add_card(self, card: Any) -> int:
+        """Index a new card and return its position."""
+        self.records.append(_as_dict(card))
+        self._card_tags.append({})
+        position = len(self.records) - 1
+        self._index(position, self.records[position])
+        return position
+
+    def update_card(self, position: int, card: Any) -> None:
+        """Re-index the card at a position after an edit."""
+        self._unindex(position)
+        self.records[position] = _as_dict(card)
+        self._index(position, self.records[position])
+
+    def remove_card(self, position: int) -> None:
+        """Drop the card at a position; other positions don't move."""
+        self._unindex(position)
+        self.records[position] = None
+
+    def tags_of(self, position: int) -> Set[str]:
+        """Normalized tags of the card at a position."""
+        return set(self._card_tags[position])
+
+    def positions(self, tags: Iterable[Any], match_all: bool = False) -> List[int]:
+        """
+        Sorted positions of cards carrying the given tags.
+
+        Args:
+            tags: Tags to look up; they're normalized first and blanks are ignored
+            match_all: Whether a card needs every tag (intersection) rather than any of them (union)
+        """
+        wanted = {normalize_tag(tag) for tag in tags or []} - {''}
+        if not wanted:
+            return []
+        postings = [self._postings.get(tag, []) for tag in wanted]
+        if match_all:
+            postings.sort(key=len)
+            matched = set(postings[0])
+            for other in postings[1:]:
+                matched.intersection_update(other)
+        else:
+            matched = set().union(*postings)
+        return sorted(matched)
+
+    def cards(self, tags: Iterable[Any], match_all: bool = False) -> List[Dict[str, Any]]:
+        """Copies of the cards carrying the given tags, in collection order."""
+        return [dict(self.records[position]) for position in self.positions(tags, match_all)]
+
+    def all_tags(self) -> List[str]:
+        """Every tag in the collection, one spelling per normalized tag (the earliest still in use), sorted."""
+        return [next(iter(self._labels[tag])) for tag in sorted(self._labels)]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of cards per normalized tag."""
+        return {tag: len(postings) for tag, postings in self._postings.items()}
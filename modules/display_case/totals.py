@@ -0,0 +1,160 @@
+"""
+Materialized display case totals.
+Keeps which cases contain each card and what each card contributes to each
+case's total_value, so a collection revaluation adjusts only the affected
+cases by the change in value instead of re-filtering every case.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Union
+
+import pandas as pd
+
+from .card_refs import cards_by_id, display_card_id
+
+# Most writes Firestore accepts in one batch
+MAX_BATCH_WRITES = 500
+
+
+def card_value(card: Dict[str, Any]) -> float:
+    """A card's current_value as a float, 0.0 when missing or invalid (as DisplayCaseManager totals it)."""
+    try:
+        value = float(card.get('current_value', 0))
+    except (ValueError, TypeError):
+        return 0.0
+    return 0.0 if pd.isna(value) else value
+
+
+def _case_data(case: Any) -> Dict[str, Any]:
+    if isinstance(case, dict):
+        return case
+    if hasattr(case, 'to_dict'):
+        return case.to_dict()
+    return dict(case)
+
+
+class DisplayCaseTotals:
+    """Dependency map from card id to the display cases containing it, with per-case totals."""
+
+    def __init__(self, cases: Iterable[Any] = ()):
+        """
+        Build the map.
+
+        Args:
+            cases: DisplayCase objects or case dictionaries with an id and their cards (references or full cards)
+        """
+        self.totals: Dict[str, float] = {}
+        # case id -> card id -> value counted in the case's total (and how many times the card is in it)
+        self._contributions: Dict[str, Dict[str, float]] = {}
+        self._copies: Dict[str, Dict[str, int]] = {}
+        self._cases_by_card: Dict[str, set] = {}
+        # case id -> stored card references, whose cached values are rewritten with the totals
+        self._references: Dict[str, List[Dict[str, Any]]] = {}
+        # Cases listed in the public discovery feed, whose entries follow their totals
+        self.public_cases: set = set()
+        self._dirty: set = set()
+        for case in cases:
+            self.add_case(case)
+
+    def add_case(self, case: Any) -> None:
+        """Track a case, replacing what was known about it."""
+        data = _case_data(case)
+        case_id = data.get('id')
+        if not case_id:
+            return
+        self.remove_case(case_id)
+        contributions: Dict[str, float] = {}
+        copies: Dict[str, int] = {}
+        for card in data.get('cards', []) or []:
+            card_id = card.get('id') or display_card_id(card)
+            contributions[card_id] = contributions.get(card_id, 0.0) + card_value(card)
+            copies[card_id] = copies.get(card_id, 0) + 1
+            self._cases_by_card.setdefault(card_id, set()).add(case_id)
+        self._contributions[case_id] = contributions
+        self._copies[case_id] = copies
+        self._references[case_id] = [dict(card) for card in data.get('cards', []) or []]
+        self.totals[case_id] = sum(contributions.values())
+        if data.get('is_public'):
+            self.public_cases.add(case_id)
+
+    def remove_case(self, case_id: str) -> None:
+        for card_id in self._contributions.pop(case_id, {}):
+            cases = self._cases_by_card.get(card_id)
+            if cases is not None:
+                cases.discard(case_id)
+                if not cases:
+                    del self._cases_by_card[card_id]
+        self._copies.pop(case_id, None)
+        self._references.pop(case_id, None)
+        self.totals.pop(case_id, None)
+        self.public_cases.discard(case_id)
+        self._dirty.discard(case_id)
+
+    def cases_containing(self, card_id: str) -> List[str]:
+        return sorted(self._cases_by_card.get(card_id, ()))
+
+    def apply_values(self, values: Dict[str, float]) -> Dict[str, float]:
+        """
+        Apply new card values to the totals of the cases containing them.
+
+        Args:
+            values: New value by card id; cards in no case are ignored
+
+        Returns:
+            New totals of the cases that changed
+        """
+        changed = set()
+        for card_id, value in values.items():
+            for case_id in self._cases_by_card.get(card_id, ()):
+                contributions = self._contributions[case_id]
+                contribution = value * self._copies[case_id][card_id]
+                delta = contribution - contributions[card_id]
+                if abs(delta) < 1e-9:
+                    continue
+                contributions[card_id] = contribution
+                self.totals[case_id] += delta
+                for card in self._references[case_id]:
+                    if (card.get('id') or display_card_id(card)) == card_id:
+                        card['current_value'] = value
+                changed.add(case_id)
+        self._dirty.update(changed)
+        return {case_id: self.totals[case_id] for case_id in changed}
+
+    def apply_collection(self, collection: Union[pd.DataFrame, List[Any]]) -> Dict[str, float]:
+        """Apply the current values of every tracked card found in a collection; see apply_values."""
+        lookup = cards_by_id(collection)
+        values = {card_id: card_value(lookup[card_id]) for card_id in self._cases_by_card if card_id in lookup}
+        return self.apply_values(values)
+
+    def pending(self) -> Dict[str, float]:
+        """Totals changed since the last commit."""
+        return {case_id: self.totals[case_id] for case_id in self._dirty}
+
+    def commit(self, cases_ref, batch_factory) -> int:
+        """
+        Write the changed totals, and the card values cached in those cases, back.
+
+        Args:
+            cases_ref: The user's display_cases collection reference
+            batch_factory: Callable returning a new write batch (e.g. db.batch)
+
+        Returns:
+            Number of cases written
+        """
+        pending = self.pending()
+        if not pending:
+            return 0
+        updated_at = datetime.now().isoformat()
+        items = sorted(pending.items())
+        # One batch unless more cases changed than a single batch can hold
+        for start in range(0, len(items), MAX_BATCH_WRITES):
+            batch = batch_factory()
+            for case_id, total in items[start:start + MAX_BATCH_WRITES]:
+                batch.update(cases_ref.document(case_id), {
+                    'total_value': round(total, 2),
+                    'cards': self._references[case_id],
+                    'updated_at': updated_at
+                })
+            batch.commit()
+        self._dirty.clear()
+        return len(items)
@@ -5,6 +5,7 @@ import json
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from .firestore_executor import run_blocking
 
 class FirebaseService:
     """Service for handling Firebase database operations"""
@@ -76,7 +77,7 @@ class FirebaseService:
         """
         try:
             doc_ref = self.db.collection(collection).document()
-            doc_ref.set(data)
+            await run_blocking(doc_ref.set, data)
             return doc_ref.id
             
         except Exception as e:
@@ -95,13 +96,33 @@ class FirebaseService:
             Optional[Dict[str, Any]]: Document data if found, None otherwise
         """
         try:
-            doc = self.db.collection(collection).document(doc_id).get()
+            doc = await run_blocking(self.db.collection(collection).document(doc_id).get)
             return doc.to_dict() if doc.exists else None
             
         except Exception as e:
             print(f"Error getting document: {str(e)}")
             raise
     
+    async def get_documents(self, collection: str, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several documents by ID from the specified collection in one request
+        
+        Args:
+            collection: Name of the collection
+            doc_ids: IDs of the documents
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Document data by ID, for the documents that exist
+        """
+        try:
+            refs = [self.db.collection(collection).document(doc_id) for doc_id in doc_ids]
+            docs = await run_blocking(lambda: list(self.db.get_all(refs)))
+            return {doc.id: doc.to_dict() for doc in docs if doc.exists}
+            
+        except Exception as e:
+            print(f"Error getting documents: {str(e)}")
+            raise
+    
     async def update_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
         """
         Update a document in the specified collection
@@ -112,7 +133,7 @@ class FirebaseService:
             data: Updated document data
         """
         try:
-            self.db.collection(collection).document(doc_id).update(data)
+            await run_blocking(self.db.collection(collection).document(doc_id).update, data)
             
         except Exception as e:
             print(f"Error updating document: {str(e)}")
@@ -131,8 +152,8 @@ class FirebaseService:
         """
         try:
             doc = self.db.collection(collection).document(doc_id)
-            if doc.get().exists:
-                doc.delete()
+            if (await run_blocking(doc.get)).exists:
+                await run_blocking(doc.delete)
                 return True
             return False
             
@@ -172,7 +193,8 @@ class FirebaseService:
             if limit:
                 query = query.limit(limit)
             
-            docs = query.stream()
+            # Consume the stream in the pool too; iterating it is what does the I/O
+            docs = await run_blocking(lambda: list(query.stream()))
             return [doc.to_dict() for doc in docs]
             
         except Exception as e:
@@ -199,7 +221,7 @@ class FirebaseService:
                 batch.set(doc_ref, item)
                 doc_refs.append(doc_ref)
             
-            batch.commit()
+            await run_blocking(batch.commit)
             return [ref.id for ref in doc_refs]
             
         except Exception as e:
@@ -221,7 +243,7 @@ class FirebaseService:
                 doc_ref = self.db.collection(collection).document(doc_id)
                 batch.update(doc_ref, data)
             
-            batch.commit()
+            await run_blocking(batch.commit)
             
         except Exception as e:
             print(f"Error batch updating documents: {str(e)}")
@@ -242,7 +264,7 @@ class FirebaseService:
                 doc_ref = self.db.collection(collection).document(doc_id)
                 batch.delete(doc_ref)
             
-            batch.commit()
+            await run_blocking(batch.commit)
             
         except Exception as e:
             print(f"Error batch deleting documents: {str(e)}")
@@ -0,0 +1,35 @@
+"""
+Thread pool for blocking Firestore calls made from async code.
+The Firestore client is synchronous, so async services and repositories run
+its calls here: awaiting them no longer blocks the event loop, and calls
+awaited together (e.g. with asyncio.gather) overlap. The pool is bounded so a
+burst of calls queues instead of opening a thread per call.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+FIRESTORE_IO_WORKERS = int(os.getenv('FIRESTORE_IO_WORKERS', 16))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_firestore_executor() -> ThreadPoolExecutor:
+    """Get the process-wide pool that runs blocking Firestore calls."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, FIRESTORE_IO_WORKERS),
+                                           thread_name_prefix='firestore-io')
+        return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call in the Firestore pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_firestore_executor(), functools.partial(func, *args, **kwargs))
@@ -4,6 +4,23 @@ import re
 from datetime import datetime
 from typing import Dict, Any, Optional
 from modules.database.service import DatabaseService
+from modules.database.write_buffer import flush_user_writes
+
+def flush_on_page_change(page: str) -> None:
+    """Commit the user's buffered card writes when they arrive from another page, and report any that were dropped."""
+    previous = st.session_state.get('current_page')
+    st.session_state.current_page = page
+    uid = st.session_state.get('uid')
+    if previous is not None and previous != page:
+        try:
+            flush_user_writes(uid)
+        except Exception as e:
+            print(f"Error flushing collection writes: {str(e)}")
+    
+    failed = DatabaseService.get_failed_card_writes(uid) if uid else []
+    if failed:
+        st.warning(f"{len(failed)} card change(s) could not be saved: "
+                   f"{', '.join(write['card_id'] for write in failed)}. Please make them again.")
 
 def save_card_to_collection(card_dict: Dict[str, Any]) -> bool:
     """Save a card to the user's collection in Firebase"""
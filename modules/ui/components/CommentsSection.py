@@ -1,5 +1,5 @@
 import streamlit as st
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Optional
 from datetime import datetime
 
 def render_comments_section(
@@ -7,7 +7,9 @@ def render_comments_section(
     comments: List[Dict],
     on_add_comment: Callable,
     on_delete_comment: Callable,
-    current_user_id: str
+    current_user_id: str,
+    on_load_more: Optional[Callable] = None,
+    has_more: bool = False
 ) -> None:
     """
     Renders a comments section with the ability to add and delete comments.
@@ -18,6 +20,8 @@ def render_comments_section(
         on_add_comment: Callback function when adding a comment
         on_delete_comment: Callback function when deleting a comment
         current_user_id: ID of the current user
+        on_load_more: Callback function to fetch the next page of comments
+        has_more: Whether there are older comments than the ones shown
     """
     st.subheader("Comments")
     
@@ -57,4 +61,58 @@ def render_comments_section(
                             st.success("Comment deleted successfully!")
                             st.rerun()
                         else:
-                            st.error("Failed to delete comment") 
\ No newline at end of file
+                            st.error("Failed to delete comment") 
+    
+    # Older comments are fetched a page at a time
+    if has_more and on_load_more:
+        if st.button("Load more comments", key=f"load_more_comments_{case_id}"):
+            on_load_more(case_id)
+            st.rerun()
+
+
+def render_paged_comments_section(manager, case_id: str, current_user_id: str, page_size: int = 20) -> None:
+    """
+    Renders the comments section for a display case, loading comments a page at a time.
+    
+    Pages loaded so far are kept in session state; adding or deleting a comment starts over from the newest.
+    
+    Args:
+        manager: DisplayCaseManager used to read, add and delete comments
+        case_id: ID of the display case
+        current_user_id: ID of the current user
+        page_size: Comments fetched per page
+    """
+    state_key = f"comment_pages_{case_id}"
+    if state_key not in st.session_state:
+        first_page = manager.get_comments_page(case_id, page_size=page_size)
+        st.session_state[state_key] = {'comments': first_page.comments, 'cursor': first_page.next_cursor}
+    loaded = st.session_state[state_key]
+    
+    def load_more(case_id: str) -> None:
+        page = manager.get_comments_page(case_id, loaded['cursor'], page_size)
+        # A page can repeat comments already shown when the cursor's comment was deleted
+        shown = {comment['id'] for comment in loaded['comments']}
+        loaded['comments'] = loaded['comments'] + [comment for comment in page.comments if comment['id'] not in shown]
+        loaded['cursor'] = page.next_cursor
+    
+    def add_comment(case_id: str, comment: str) -> bool:
+        if manager.add_comment(case_id, comment):
+            st.session_state.pop(state_key, None)
+            return True
+        return False
+    
+    def delete_comment(case_id: str, comment_id: str) -> bool:
+        if manager.delete_comment(case_id, comment_id):
+            st.session_state.pop(state_key, None)
+            return True
+        return False
+    
+    render_comments_section(
+        case_id,
+        loaded['comments'],
+        add_comment,
+        delete_comment,
+        current_user_id,
+        on_load_more=load_more,
+        has_more=loaded['cursor'] is not None
+    )
@@ -2,6 +2,6 @@
 
 from .CardGrid import render_card_grid
 from .CardDisplay import CardDisplay, render_card_display
-from .CommentsSection import render_comments_section
+from .CommentsSection import render_comments_section, render_paged_comments_section
 
-__all__ = ['render_card_grid', 'CardDisplay', 'render_card_display', 'render_comments_section'] 
\ No newline at end of file
+__all__ = ['render_card_grid', 'CardDisplay', 'render_card_display', 'render_comments_section', 'render_paged_comments_section'] 
\ No newline at end of file
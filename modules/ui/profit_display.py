@@ -0,0 +1,198 @@
+"""
+Streamlit rendering for profit scenarios and recommendations.
+The numbers come from ProfitCalculator.analyze and RecommendationEngine.recommend;
+these functions only lay them out.
+"""
+
+from typing import Dict, Any
+import streamlit as st
+
+from modules.core.recommendation_engine import Recommendation
+
+
+def render_recommendation(recommendation: Recommendation) -> None:
+    """Display comprehensive recommendations in the Streamlit UI."""
+    st.markdown("---")  # Visual separator
+    st.subheader("📊 Final Recommendation")
+
+    # Overall Market Summary
+    st.markdown("#### Market Overview")
+    st.write(recommendation.overview)
+
+    # Player News and Context
+    st.markdown("#### Recent Context")
+    st.info(f"""
+    💡 **Player:** {recommendation.player_name}
+
+    To make a fully informed decision, consider:
+    - Check recent player performance and news
+    - Monitor upcoming games or events that could impact value
+    - Research any recent sales of similar cards
+    - Consider the overall market conditions for this sport/player
+    """)
+
+    # Recommendations
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### For Buyers")
+        st.write(recommendation.buyer)
+
+    with col2:
+        st.markdown("#### For Sellers")
+        st.write(recommendation.seller)
+
+    # Risk Factors
+    st.markdown("#### Risk Factors to Consider")
+    st.warning("""
+    ⚠️ **Key Risk Factors:**
+    - Market volatility and trading volume
+    - Player performance and team dynamics
+    - Overall sports card market conditions
+    - Grading population changes
+    - Seasonal market fluctuations
+    """)
+
+
+def render_scenario_metrics(scenario: str, results: Dict[str, Any]) -> None:
+    """Display metrics for a specific scenario."""
+    # Display market value and costs
+    st.markdown("#### Market Value")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.metric(
+            "Market Price",
+            f"${results['market_price']:.2f}",
+            help=f"Based on {results['price_source']} data from {results['sales_count']} sales"
+        )
+        st.metric(
+            "Break-Even Price",
+            f"${results['break_even_price']:.2f}",
+            help="Minimum selling price needed to recover all costs"
+        )
+
+    with col2:
+        st.metric(
+            "Base Costs",
+            f"${results['base_costs']:.2f}",
+            help="Sum of purchase price, shipping, and grading costs"
+        )
+        st.metric(
+            "Seller Fees",
+            f"${results['seller_fee_amount']:.2f}",
+            help=f"Platform fees ({results['seller_fee']}% of sale price)"
+        )
+
+    # Display profit metrics
+    st.markdown("#### Profit Analysis")
+    col3, col4 = st.columns(2)
+
+    with col3:
+        st.metric(
+            "Net Profit",
+            f"${results['net_profit']:.2f}",
+            help="Expected profit after all costs and fees"
+        )
+        if scenario != "Raw":
+            st.metric(
+                "Success Probability",
+                f"{results['success_probability']:.1f}%",
+                help=f"Chance of achieving {scenario} grade"
+            )
+
+    with col4:
+        st.metric(
+            "ROI",
+            f"{results['roi']:.1f}%",
+            help="Return on Investment percentage"
+        )
+        if scenario != "Raw":
+            st.metric(
+                "Lower Grade Risk",
+                f"{results['lower_grade_probability']:.1f}%",
+                help="Probability of receiving a lower grade"
+            )
+
+    # Display timeline and risk
+    st.markdown("#### Timeline & Risk")
+    st.info(
+        f"⏱️ **Timeline:** {results['timeline']}\n\n"
+        f"⚠️ **Risk Level:** {results['risk_level']}"
+    )
+
+    # Show recent sales if available
+    if results.get('recent_sales'):
+        with st.expander("Recent Sales History"):
+            for sale in results['recent_sales'][:5]:  # Show last 5 sales
+                st.write(
+                    f"${sale['price']:.2f} - "
+                    f"Sold on {sale.get('date', 'N/A')}"
+                )
+
+
+def render_profit_analysis(calculator, card_data: Dict[str, Any]) -> None:
+    """Collect cost inputs, then display every scenario and the recommendation for a card."""
+    st.subheader("Profit Calculator")
+
+    # Get market data from session state if available
+    if 'market_data' in st.session_state:
+        card_data['market_data'] = st.session_state.market_data
+
+    # Break-even analysis section
+    st.markdown("#### Break-Even Analysis")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        grading_cost = st.number_input(
+            "Grading Cost ($)",
+            min_value=0.0,
+            value=25.0,
+            step=1.0,
+            key="grading_cost",
+            help="Cost to grade the card"
+        )
+
+    with col2:
+        shipping_cost = st.number_input(
+            "Shipping Cost ($)",
+            min_value=0.0,
+            value=10.0,
+            step=1.0,
+            key="shipping_cost",
+            help="Cost to ship the card"
+        )
+
+    with col3:
+        seller_fee_percentage = st.number_input(
+            "Seller Fee (%)",
+            min_value=0.0,
+            max_value=100.0,
+            value=12.9,
+            step=0.1,
+            key="seller_fee",
+            help="Platform selling fees (e.g., eBay typically charges 12.9% for cards)"
+        )
+
+    # Update card data with user inputs
+    card_data.update({
+        'grading_cost': grading_cost,
+        'shipping_cost': shipping_cost,
+        'seller_fee_percentage': seller_fee_percentage
+    })
+
+    analysis = calculator.analyze(card_data)
+
+    # Create tabs for different scenarios
+    tabs = st.tabs(["Raw Card", "PSA 9", "PSA 10"])
+    for tab, scenario in zip(tabs, ["Raw", "PSA 9", "PSA 10"]):
+        with tab:
+            if scenario in analysis.scenarios:
+                render_scenario_metrics(scenario, analysis.scenarios[scenario])
+            else:
+                st.error(f"Could not calculate {scenario} scenario: {analysis.errors.get(scenario, 'unknown error')}")
+
+    if analysis.recommendation is not None:
+        render_recommendation(analysis.recommendation)
+    else:
+        st.info("Market data not available yet. Please complete a card search to see recommendations.")
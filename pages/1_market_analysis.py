@@ -6,21 +6,28 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from modules.core.market_analysis import MarketAnalyzer
-from modules.core.price_predictor import PricePredictor
+from modules.core.price_predictor import PricePredictor, warm_up_backends
+from modules.core.sales_archive import record_sales
+from modules.core.card_analysis import bundle_key
+from modules.core.jobs import SUCCEEDED, FAILED, get_job_manager, predict_prices_job
 from modules.firebase.user_management import UserManager
-from modules.shared.collection_utils import save_card_to_collection
+from modules.shared.collection_utils import save_card_to_collection, flush_on_page_change
 from scrapers.ebay_interface import EbayInterface
 from modules.ui.components import CardDisplay
 import base64
 import requests
 import re
 import os
+import uuid
 from modules.database.service import DatabaseService
 from modules.database.models import Card, CardCondition
 from typing import List, Dict, Any, Union
 from modules.ui.theme.theme_manager import ThemeManager
 from modules.ui.branding import BrandingComponent
 
+# Start loading the model backends while the page renders
+warm_up_backends()
+
 def get_score_color(score):
     """Return color based on score value"""
     if score >= 8:
@@ -116,11 +123,76 @@ def init_session_state():
 
 def reset_session_state():
     """Reset all session state variables"""
+    # Work started for the previous search is stale now
+    get_job_manager().cancel_group(get_job_group())
+    st.session_state.prediction_job_id = None
+    st.session_state.prediction_job_key = None
     st.session_state.search_results = None
     st.session_state.selected_card = None
     st.session_state.market_data = None
     st.session_state.search_params = {}
 
+# Seconds between checks of a running prediction job
+PREDICTION_POLL_SECONDS = 0.5
+
+def get_job_group():
+    """Job group id for this browser session, used to cancel its stale background jobs."""
+    if 'job_group' not in st.session_state:
+        st.session_state.job_group = uuid.uuid4().hex
+    return st.session_state.job_group
+
+def run_prediction_job(card_data, card_key):
+    """Start the price prediction in a background worker, or pick up its result.
+    
+    The job id is kept in session state, so a rerun re-attaches to the running
+    job instead of starting the training again. While the job runs, its
+    progress is polled by a fragment and the rest of the page renders as usual;
+    the page reruns once the job is done. A failed job's id is dropped, so the
+    next run submits the prediction again.
+    """
+    jobs = get_job_manager()
+    job_id = st.session_state.get('prediction_job_id')
+    info = None
+    if job_id is not None and st.session_state.get('prediction_job_key') == card_key:
+        try:
+            info = jobs.status(job_id)
+        except KeyError:
+            job_id = None
+    else:
+        job_id = None
+    
+    if job_id is None:
+        jobs.cancel_group(get_job_group())
+        job_id = jobs.submit(predict_prices_job, card_data, card_key=card_key, group=get_job_group(),
+                             name="Price prediction")
+        st.session_state.prediction_job_id = job_id
+        st.session_state.prediction_job_key = card_key
+    
+    if info is None or not info.done:
+        show_prediction_progress(job_id)
+        return None
+    if info.status == SUCCEEDED:
+        return info.result
+    
+    st.session_state.prediction_job_id = None
+    st.session_state.prediction_job_key = None
+    if info.status == FAILED:
+        st.warning(f"Price prediction failed: {info.error}")
+    if st.button("Retry prediction", key="retry_prediction"):
+        st.rerun()
+    return None
+
+@st.fragment(run_every=PREDICTION_POLL_SECONDS)
+def show_prediction_progress(job_id):
+    """Show a running prediction job's progress, rerunning the page when it is done."""
+    try:
+        info = get_job_manager().status(job_id)
+    except KeyError:
+        info = None
+    if info is None or info.done:
+        st.rerun()
+    st.progress(info.progress, text=info.message or info.status.title())
+
 def get_variation_groups(results):
     """Group cards by their variations based on common keywords"""
     variation_keywords = [
@@ -671,8 +743,10 @@ def display_market_analysis(card_data, market_data):
     st.plotly_chart(fig, use_container_width=True)
     # Display price prediction
     st.markdown("### Price Prediction")
-    predictor = PricePredictor()
-    predictions = predictor.predict_future_prices(card_data)
+    predictions = run_prediction_job(
+        card_data,
+        bundle_key(st.session_state.get('search_params', {})) or None
+    )
     
     if predictions and predictions['predicted_prices']:
             # Calculate prediction ranges
@@ -1264,6 +1338,9 @@ def display_image(image_url):
         st.warning("No image available for this card")
 
 def main():
+    # Commit card writes buffered on the page the user came from
+    flush_on_page_change("market_analysis")
+
     # Initialize session state for user if not exists
     if 'user' not in st.session_state:
         st.session_state.user = None
@@ -1343,6 +1420,8 @@ def main():
                 if results:
                     # Store results in session state
                     st.session_state.search_results = results
+                    # Keep the sales for seasonality/grade tables and backtests
+                    record_sales(st.session_state.search_params, results)
                     # Group the results by variation
                     st.session_state.variation_groups = get_variation_groups(results)
                     st.success(f"Found {len(results)} cards in {len(st.session_state.variation_groups)} variations!")
@@ -3,10 +3,9 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from modules.analysis.trade_analyzer import TradeAnalyzer
-from modules.core.market_analysis import MarketAnalyzer
-from modules.core.price_predictor import PricePredictor
-from scrapers.ebay_interface import EbayInterface
-from modules.shared.collection_utils import add_to_collection
+from modules.core.card_analysis import get_card_analysis_cache
+from modules.core.price_predictor import warm_up_backends
+from modules.shared.collection_utils import add_to_collection, flush_on_page_change
 from modules.ui.components import CardDisplay
 from modules.ui.branding import BrandingComponent
 from modules.ui.theme.theme_manager import ThemeManager
@@ -15,6 +14,9 @@ import sys
 from pathlib import Path
 from modules.ui.indicators import TrendIndicator
 
+# Start loading the model backends while the page renders
+warm_up_backends()
+
 # Add the project root directory to Python path
 project_root = Path(__file__).parent.parent.absolute()
 sys.path.append(str(project_root))
@@ -101,52 +103,58 @@ def init_session_state():
     if 'trade_analysis' not in st.session_state:
         st.session_state.trade_analysis = None
 
-def search_card(scraper, analyzer, predictor, search_params):
-    """Search for a card and get its market data."""
-    results = scraper.search_cards(**search_params)
-    if not results:
-        return None
-    
-    # Filter results for exact variation if specified
-    variation = search_params.get('variation', '').lower()
-    if variation:
-        filtered_results = []
-        for card in results:
-            if variation in card['title'].lower():
-                filtered_results.append(card)
-        results = filtered_results
-    
-    if not results:
-        return None
-        
-    # Get the first card as representative
-    card = results[0]
-    
-    # Get market analysis
-    market_data = analyzer.analyze_market_data(results)
-    
-    # Get price predictions
-    predictions = predictor.predict_future_prices(results)
-    
-    # Combine all data
-    card_data = {
-        'title': card['title'],
-        'market_value': market_data['median_price'],
-        'price_volatility': predictions['price_volatility'],
-        'liquidity_score': market_data['liquidity_score'],
-        'market_trend': predictions['price_trend'],
-        'condition': search_params.get('scenario', 'Raw'),
-        'trend_direction': 'hot' if predictions['price_trend'] > 10 else 'cooling' if predictions['price_trend'] < -10 else 'stable',
-        'trend_score': predictions['price_trend'],
-        'volatility_score': predictions['price_volatility'],
-        '30_day_forecast': predictions['metrics']['30_day_forecast'],
-        '90_day_forecast': predictions['metrics']['90_day_forecast'],
-        'image_url': card.get('image_url')  # Add image URL to card data
-    }
-    
-    return card_data
+def search_card(search_params):
+    """Get a card's analysis bundle, reusing a cached one while it's fresh."""
+    return get_card_analysis_cache().get(search_params)
+
+def parse_card_lines(text, condition):
+    """Search parameters from lines of "player | year | set | number | variation"."""
+    searches = []
+    for line in text.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if not parts[0]:
+            continue
+        parts += [''] * (5 - len(parts))
+        searches.append({
+            'player_name': parts[0],
+            'year': parts[1],
+            'card_set': parts[2],
+            'card_number': parts[3],
+            'variation': parts[4],
+            'negative_keywords': '',
+            'scenario': condition
+        })
+    return searches
+
+def add_several_cards(side):
+    """Form adding several cards to one side of the trade, analyzed concurrently."""
+    with st.expander("Add several cards"):
+        with st.form(f"add_several_{side}"):
+            text = st.text_area(
+                "One card per line",
+                placeholder="Justin Herbert | 2020 | Prizm | 325 | Silver",
+                key=f"{side}_several"
+            )
+            condition = st.selectbox(
+                "Condition",
+                ["Raw", "PSA 10", "PSA 9", "SGC 10", "SGC 9.5", "SGC 9"],
+                key=f"{side}_several_condition"
+            )
+            if st.form_submit_button("Add Cards"):
+                searches = parse_card_lines(text, condition)
+                with st.spinner(f"Analyzing {len(searches)} cards..."):
+                    bundles = get_card_analysis_cache().get_many(searches)
+                for params, card_data in zip(searches, bundles):
+                    if card_data:
+                        st.session_state[f"{side}_cards"].append(card_data)
+                        st.success(f"Added {card_data['title']}")
+                    else:
+                        st.error(f"Card not found: {params['player_name']}")
 
 def main():
+    # Commit card writes buffered on the page the user came from
+    flush_on_page_change("trade_analyzer")
+
     # Initialize session state for user if not exists
     if 'user' not in st.session_state:
         st.session_state.user = None
@@ -163,9 +171,6 @@ def main():
     init_session_state()
     
     # Initialize analyzers
-    scraper = EbayInterface()
-    analyzer = MarketAnalyzer()
-    predictor = PricePredictor()
     trade_analyzer = TradeAnalyzer()
     
     # Create two columns for giving and receiving
@@ -204,13 +209,15 @@ def main():
                     'scenario': condition
                 }
                 
-                card_data = search_card(scraper, analyzer, predictor, search_params)
+                card_data = search_card(search_params)
                 if card_data:
                     st.session_state.giving_cards.append(card_data)
                     st.success(f"Added {card_data['title']}")
                 else:
                     st.error("Card not found")
         
+        add_several_cards("giving")
+        
         # Display giving cards
         for i, card in enumerate(st.session_state.giving_cards):
             with st.container():
@@ -296,13 +303,15 @@ def main():
                     'scenario': condition
                 }
                 
-                card_data = search_card(scraper, analyzer, predictor, search_params)
+                card_data = search_card(search_params)
                 if card_data:
                     st.session_state.receiving_cards.append(card_data)
                     st.success(f"Added {card_data['title']}")
                 else:
                     st.error("Card not found")
         
+        add_several_cards("receiving")
+        
         # Display receiving cards
         for i, card in enumerate(st.session_state.receiving_cards):
             with st.container():
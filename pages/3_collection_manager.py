@@ -54,8 +54,16 @@ from modules.core.firebase_manager import FirebaseManager
 from modules.core.card_value_analyzer import CardValueAnalyzer
 from modules.ui.components import CardDisplay
 from modules.core.market_analysis import MarketAnalyzer
+from modules.core.batch_predictor import BatchPricePredictor
+from modules.core.grading_optimizer import optimize_submission
+from modules.core.grading_simulator import GRADING_SERVICES
+from modules.core.collection_index import CollectionIndex
+from modules.shared.collection_utils import flush_on_page_change
+from modules.core.sales_archive import collection_card_key, get_sales_archive
 from modules.database.service import DatabaseService
 from modules.database.models import Card, CardCondition
+from modules.database.write_buffer import get_write_buffer
+from modules.display_case.manager import get_display_case_manager
 from modules.ui.theme.theme_manager import ThemeManager
 from modules.ui.branding import BrandingComponent
 from scrapers.ebay_interface import EbayInterface
@@ -486,12 +494,17 @@ def update_card_values(collection):
         # Hide progress bar when done
         progress_bar.empty()
         
-        # Update session state with modified collection
+        # Update session state with modified collection; the cards were revalued in place
         st.session_state.collection = updated_cards
+        invalidate_collection_index()
         
         # Save to Firebase
         save_collection_to_firebase()
         
+        # Adjust the totals of display cases holding revalued cards
+        if updated_count and st.session_state.uid:
+            get_display_case_manager(st.session_state.uid, updated_cards).update_case_totals()
+        
         st.success(f"Successfully updated values for {updated_count} cards")
         return updated_cards
         
@@ -645,22 +658,11 @@ def display_add_card_form():
                     if isinstance(st.session_state.collection, pd.DataFrame):
                         st.session_state.collection = st.session_state.collection.to_dict('records')
                     
-                    # Check for duplicates more efficiently
-                    is_duplicate = False
-                    for existing_card in st.session_state.collection:
-                        existing_player = safe_get(existing_card, 'player_name', '')
-                        existing_year = safe_get(existing_card, 'year', '')
-                        existing_set = safe_get(existing_card, 'card_set', '')
-                        existing_number = safe_get(existing_card, 'card_number', '')
-                        
-                        if (player_name == existing_player and 
-                            year == existing_year and 
-                            card_set == existing_set and 
-                            card_number == existing_number):
-                            is_duplicate = True
-                            status_message.warning(f"This card already exists in your collection: {player_name} {year} {card_set} #{card_number}")
-                            time.sleep(2)  # Give time to read the message
-                            break
+                    # Check for duplicates with the collection index
+                    is_duplicate = bool(get_collection_index().find_duplicates(player_name, year, card_set, card_number))
+                    if is_duplicate:
+                        status_message.warning(f"This card already exists in your collection: {player_name} {year} {card_set} #{card_number}")
+                        time.sleep(2)  # Give time to read the message
                     
                     if not is_duplicate:
                         # Add the new card
@@ -761,28 +763,20 @@ def load_shared_collection(share_param):
         st.error("Invalid share link")
         return None
 
-def display_collection_summary(filtered_collection):
+def display_collection_summary(filtered_collection, index=None):
     """Display collection summary with responsive metrics and enhanced styling"""
     if not has_cards(filtered_collection):
         st.info("No cards in collection")
         return
     
-    # Calculate summary metrics with proper type conversion
-    total_value = 0.0
-    total_cost = 0.0
-    total_cards = len(filtered_collection)
-    
-    for card in filtered_collection:
-        # Get purchase price and current value using safe_get
-        purchase_price = safe_get(card, 'purchase_price', 0)
-        current_value = safe_get(card, 'current_value', 0)
-        
-        # Add to totals (safe_get now handles float conversion)
-        total_cost += float(purchase_price or 0)  # Handle None values
-        total_value += float(current_value or 0)  # Handle None values
-    
-    # Calculate ROI
-    total_roi = ((total_value - total_cost) / total_cost * 100) if total_cost > 0 else 0
+    # Calculate summary metrics from the index's typed columns
+    if index is None:
+        index = CollectionIndex(filtered_collection)
+    summary = index.summary()
+    total_value = summary['total_value']
+    total_cost = summary['total_cost']
+    total_cards = summary['total_cards']
+    total_roi = summary['total_roi']
     
     # Custom CSS for enhanced metrics
     st.markdown("""
@@ -952,10 +946,7 @@ def edit_card_form(card_index, card_data):
                 # Find corresponding card in main collection
                 main_collection_index = None
                 if 'collection' in st.session_state:
-                    for i, main_card in enumerate(st.session_state.collection):
-                        if main_card.get('id') == card_id:
-                            main_collection_index = i
-                            break
+                    main_collection_index = get_collection_index().position_of(card_id)
                 
                 # Debug information
                 with st.expander("Debug Information", expanded=False):
@@ -1606,10 +1597,7 @@ def display_collection_grid(filtered_collection, show_filters=True):
                     # Find corresponding card in main collection
                     main_collection_index = None
                     if 'collection' in st.session_state:
-                        for i, main_card in enumerate(st.session_state.collection):
-                            if main_card.get('id') == card_id:
-                                main_collection_index = i
-                                break
+                        main_collection_index = get_collection_index().position_of(card_id)
                     
                     # Debug information
                     with st.expander("Debug Information", expanded=False):
@@ -1857,6 +1845,130 @@ def safe_get(card, key, default=None):
         print(f"Error in safe_get for key {key}: {str(e)}")
         return default
 
+def get_collection_index(collection=None):
+    """Columnar index of the collection, rebuilt only when its cards change."""
+    if collection is None:
+        collection = st.session_state.get('collection', [])
+    if isinstance(collection, pd.DataFrame):
+        collection = collection.to_dict('records')
+    # The cached index holds on to its cards, so their ids can't be reused while it's cached
+    fingerprint = (len(collection), hash(tuple(map(id, collection))))
+    cached = st.session_state.get('collection_index')
+    if cached is None or cached[0] != fingerprint:
+        st.session_state.collection_index = (fingerprint, CollectionIndex(collection))
+    return st.session_state.collection_index[1]
+
+def invalidate_collection_index():
+    """
+    Drop the cached index after changing the collection.
+    
+    The fingerprint only notices cards added, removed or replaced, so every path that
+    adds, edits, deletes, imports or revalues cards calls this.
+    """
+    st.session_state.pop('collection_index', None)
+
+def display_collection_forecast(collection_data):
+    """Forecast every card in the collection, streaming rows into a table as they finish"""
+    cards_by_key = {}
+    for card in collection_data:
+        card_dict = card.to_dict() if hasattr(card, 'to_dict') else card
+        # Keyed like the searches recorded in Market Analysis, scenario included
+        card_key = collection_card_key(card_dict)
+        if card_key:
+            cards_by_key.setdefault(card_key, card_dict)
+    
+    if not cards_by_key:
+        st.info("No cards with enough details to forecast")
+        return
+    
+    days_ahead = st.select_slider("Forecast horizon (days)", options=[30, 90, 180, 365], value=90,
+                                  key="collection_forecast_days")
+    if not st.button("📈 Forecast Collection", key="collection_forecast_button"):
+        return
+    
+    if 'batch_predictor' not in st.session_state:
+        st.session_state.batch_predictor = BatchPricePredictor(archive=get_sales_archive())
+    batch_predictor = st.session_state.batch_predictor
+    
+    progress = st.progress(0.0)
+    table = st.empty()
+    rows = []
+    skipped = 0
+    for done, (card_key, result) in enumerate(
+            batch_predictor.iter_predictions(list(cards_by_key), days_ahead=days_ahead), start=1):
+        progress.progress(done / len(cards_by_key))
+        if result is None:
+            skipped += 1
+            continue
+        card = cards_by_key[card_key]
+        rows.append({
+            'Card': f"{card.get('year', '')} {card.get('player_name', '')} {card.get('card_set', '')} #{card.get('card_number', '')}".strip(),
+            'Current Price': result['current_price'],
+            '30 Day Forecast': result['metrics']['30_day_forecast'],
+            f'{days_ahead} Day Forecast': result['predicted_prices'][-1][1],
+            'Confidence': result['confidence_score'],
+            'Short Term': result['recommendations']['short_term'],
+            'Long Term': result['recommendations']['long_term']
+        })
+        table.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    progress.empty()
+    if skipped:
+        st.caption(f"{skipped} cards have no sales history yet; search them in Market Analysis to add one.")
+
+def display_grading_planner(collection_data):
+    """Plan which raw cards to send for grading within a budget and deadline"""
+    cards = [card.to_dict() if hasattr(card, 'to_dict') else card for card in collection_data]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        budget = st.number_input("Grading budget ($)", min_value=0.0, value=500.0, step=50.0,
+                                 key="grading_plan_budget")
+    with col2:
+        deadline_days = st.number_input("Need them back within (days)", min_value=1, value=60, step=5,
+                                        key="grading_plan_deadline")
+    with col3:
+        services = st.multiselect(
+            "Service tiers",
+            options=list(GRADING_SERVICES),
+            default=list(GRADING_SERVICES),
+            format_func=lambda name: f"{name.title()} (${GRADING_SERVICES[name]['fee']:.0f}, ~{GRADING_SERVICES[name]['turnaround_days']}d)",
+            key="grading_plan_services"
+        )
+    
+    if not st.button("🎯 Plan Submission", key="grading_plan_button"):
+        return
+    if not services:
+        st.warning("Choose at least one service tier.")
+        return
+    
+    with st.spinner("Simulating grading outcomes..."):
+        plan = optimize_submission(cards, budget=budget, deadline_days=int(deadline_days), services=services)
+    
+    if plan.selections.empty:
+        st.info(f"None of the {plan.candidates} raw cards with a value is worth grading within these limits.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cards to Submit", len(plan.selections))
+    col2.metric("Total Cost", f"${plan.total_cost:,.2f}")
+    col3.metric("Expected Profit", f"${plan.expected_profit:,.2f}")
+    
+    rows = []
+    for selection in plan.selections.to_dict('records'):
+        card = cards[selection['card_index']]
+        rows.append({
+            'Card': f"{card.get('year', '')} {card.get('player_name', '')} {card.get('card_set', '')} #{card.get('card_number', '')}".strip(),
+            'Condition': card.get('condition', ''),
+            'Tier': selection['service'].title(),
+            'Cost': selection['cost'],
+            'Expected Profit': round(selection['expected_value'], 2),
+            'Downside (5%)': round(selection['downside'], 2),
+            'Chance of Profit': f"{selection['probability_of_profit']:.0%}",
+            'Days': round(selection['expected_days'])
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
 def display_collection(collection_data):
     """Display the user's collection with improved filtering and sorting options."""
     try:
@@ -1870,12 +1982,14 @@ def display_collection(collection_data):
         if 'sort_order' not in st.session_state:
             st.session_state.sort_order = 'Ascending'
             
+        index = get_collection_index(collection_data)
+        
         # Header and collection summary
         st.markdown("## Your Collection", unsafe_allow_html=True)
         
         # Display collection summary
         if collection_data and len(collection_data) > 0:
-            display_collection_summary(collection_data)
+            display_collection_summary(collection_data, index)
         
         # Add Update All Values button
         if collection_data and len(collection_data) > 0:
@@ -1903,17 +2017,8 @@ def display_collection(collection_data):
             search_term = st.text_input("Search Cards", key="search_cards")
             
         with col2:
-            # Get all unique tags from collection
-            all_tags = []
-            for card in collection_data:
-                tags = card.get('tags', [])
-                if tags and isinstance(tags, list):
-                    all_tags.extend(tags)
-                elif tags and isinstance(tags, str):
-                    all_tags.append(tags)
-            
-            # Remove duplicates and sort
-            unique_tags = sorted(list(set([tag for tag in all_tags if tag])))
+            # Get all unique tags from the collection's tag index
+            unique_tags = index.unique_tags()
             
             # Multi-select for tags
             selected_tags = st.multiselect(
@@ -1961,67 +2066,22 @@ def display_collection(collection_data):
             )
             
         # Apply filters based on search term and tags
-        filtered_data = collection_data
-        
-        # Filter by search term
-        if search_term:
-            filtered_data = [
-                card for card in filtered_data 
-                if search_term.lower() in str(card.get('player_name', '')).lower() or
-                search_term.lower() in str(card.get('card_set', '')).lower() or
-                search_term.lower() in str(card.get('year', '')).lower() or
-                search_term.lower() in str(card.get('card_number', '')).lower() or
-                (card.get('notes') and search_term.lower() in str(card.get('notes')).lower())
-            ]
-            
-        # Filter by selected tags
-        if selected_tags:
-            filtered_tags_data = []
-            for card in filtered_data:
-                card_tags = card.get('tags', [])
-                
-                # Handle different tag formats
-                if isinstance(card_tags, str):
-                    card_tags = [tag.strip() for tag in card_tags.split(',') if tag.strip()]
-                elif not isinstance(card_tags, list):
-                    card_tags = []
-                    
-                # Check if any selected tag is in this card's tags
-                if any(tag in card_tags for tag in selected_tags):
-                    filtered_tags_data.append(card)
-            
-            filtered_data = filtered_tags_data
-            
-        # Store filtered data in session state
-        st.session_state.filtered_collection = filtered_data
+        positions = index.filter(search=search_term, tags=selected_tags)
         
         # Store current sort selections in session state for next run
         st.session_state.sort_field = sort_field 
         st.session_state.sort_order = sort_order
                 
         # Sort the filtered data
-        if filtered_data:
-            try:
-                # For numeric fields, convert to float for proper sorting
-                numeric_fields = ['current_value', 'purchase_price', 'roi', 'year']
-                
-                if sort_field in numeric_fields:
-                    # Sort by numeric value
-                    filtered_data = sorted(
-                        filtered_data,
-                        key=lambda x: float(x.get(sort_field, 0) or 0),
-                        reverse=(sort_order == "Descending")
-                    )
-                else:
-                    # For text fields, use string comparison
-                    filtered_data = sorted(
-                        filtered_data,
-                        key=lambda x: str(x.get(sort_field, '')).lower(),
-                        reverse=(sort_order == "Descending")
-                    )
-            except Exception as e:
-                st.error(f"Error sorting collection: {str(e)}")
-                print(f"Error sorting collection: {str(e)}")
+        try:
+            positions = index.sort(positions, sort_field, descending=(sort_order == "Descending"))
+        except Exception as e:
+            st.error(f"Error sorting collection: {str(e)}")
+            print(f"Error sorting collection: {str(e)}")
+        filtered_data = index.records(positions)
+        
+        # Store filtered data in session state
+        st.session_state.filtered_collection = filtered_data
         
         # Display empty state message if no cards
         if not filtered_data:
@@ -2152,12 +2212,11 @@ def delete_card(card_id, card_index=None):
             print(f"Using provided card_id: {card_unique_id}")
             
             # Try to find the card in the collection to get complete data
-            for i, card in enumerate(st.session_state.collection):
-                if card.get('id') == card_unique_id:
-                    card_to_delete = card
-                    card_index = i
-                    print(f"Found card by ID in collection at index {i}")
-                    break
+            position = get_collection_index().position_of(card_unique_id)
+            if position is not None:
+                card_to_delete = st.session_state.collection[position]
+                card_index = position
+                print(f"Found card by ID in collection at index {position}")
         
         # If we still don't have a card to delete, return error
         if not card_to_delete:
@@ -2188,16 +2247,20 @@ def delete_card(card_id, card_index=None):
                     'collection_version': firestore.Increment(1)
                 })
                 
-                # Also try to delete from the cards subcollection if it exists
+                # Also try to delete from the cards subcollection if it exists, through the
+                # write buffer so a pending write can't bring the card back and the sync
+                # snapshot sees the delete
                 try:
-                    card_ref = user_ref.collection('cards').document(card_unique_id)
-                    card_ref.delete()
+                    buffer = get_write_buffer(user_id, db)
+                    buffer.delete(card_unique_id)
+                    buffer.flush()
                 except Exception as e:
                     print(f"Note: Could not delete from cards subcollection: {str(e)}")
             
             # STEP 3: Update local collection
             if card_index is not None:
                 st.session_state.collection.pop(card_index)
+                invalidate_collection_index()
             
             # Force a refresh of the collection data
             if 'last_refresh' in st.session_state:
@@ -2259,6 +2322,7 @@ def update_card(card_index, updated_data):
         
         # Update the card in the local collection
         st.session_state.collection[card_index] = updated_data
+        invalidate_collection_index()
         
         st.success("Card updated successfully!")
         return True
@@ -2284,9 +2348,10 @@ def add_card(card_data):
         card_id = f"{card_data['player_name']}_{card_data['year']}_{card_data['card_set']}_{card_data['card_number']}".replace(" ", "_").lower()
         card_data['id'] = card_id
         
-        # Add the card to the subcollection
-        cards_ref = db.collection('users').document(st.session_state.uid).collection('cards')
-        cards_ref.document(card_id).set(card_data)
+        # Add the card to the subcollection through the write buffer, so the sync snapshot records it
+        buffer = get_write_buffer(st.session_state.uid, db)
+        buffer.set(card_id, card_data)
+        buffer.flush()
         
         # Add the card to the local collection
         if 'collection' not in st.session_state:
@@ -2294,6 +2359,7 @@ def add_card(card_data):
         
         # Make a copy of the card data to avoid reference issues
         st.session_state.collection.append(card_data.copy())
+        invalidate_collection_index()
         
         # Update the user document's last_updated timestamp
         db.collection('users').document(st.session_state.uid).update({
@@ -2349,6 +2415,9 @@ def import_collection(file):
             
         # Keep track of imported cards
         imported_count = 0
+        
+        # Cards are written together when the loop is done, and recorded in the sync snapshot
+        buffer = get_write_buffer(st.session_state.uid, db)
             
         # Process each card
         for card in cards:
@@ -2374,8 +2443,7 @@ def import_collection(file):
             card['id'] = card_id
             
             try:
-                cards_ref = db.collection('users').document(st.session_state.uid).collection('cards')
-                cards_ref.document(card_id).set(card)
+                buffer.set(card_id, card)
                 
                 # Make a copy of the card to avoid reference issues
                 st.session_state.collection.append(card.copy())
@@ -2384,6 +2452,8 @@ def import_collection(file):
                 logger.error(f"Error importing card {card_id}: {str(import_error)}")
                 # Continue with the next card
                 continue
+        buffer.flush()
+        invalidate_collection_index()
         
         # Update the user document's last_updated timestamp
         db.collection('users').document(st.session_state.uid).update({
@@ -2773,6 +2843,7 @@ def inspect_card_dates():
                         st.error(f"Error fixing date for {issue['card']}: {str(e)}")
                 
                 if fixed_count > 0:
+                    invalidate_collection_index()
                     st.success(f"Fixed {fixed_count} date issues!")
                     st.rerun()
                 else:
@@ -3041,6 +3112,9 @@ def download_all_firebase_cards():
 def main():
     """Main function to run the collection manager."""
     
+    # Commit card writes buffered on the page the user came from
+    flush_on_page_change("collection_manager")
+    
     try:
         # Check if user is authenticated
         if not st.session_state.get('user') or not st.session_state.get('uid'):
@@ -3274,6 +3348,12 @@ def main():
             if 'collection' in st.session_state and st.session_state.collection:
                 # Force using the collection from session state
                 display_collection(st.session_state.collection)
+                
+                with st.expander("Collection Price Forecast"):
+                    display_collection_forecast(st.session_state.collection)
+                
+                with st.expander("Grading Submission Planner"):
+                    display_grading_planner(st.session_state.collection)
             else:
                 # Show a more helpful message and options when no cards
                 st.warning("No cards in collection. You can add cards manually or import a collection.")
@@ -11,12 +11,13 @@ from datetime import datetime
 import os
 import zipfile
 from pathlib import Path
-from modules.display_case.manager import DisplayCaseManager
-import ast
+from modules.display_case.manager import DisplayCaseManager, get_display_case_manager
 from modules.database.service import DatabaseService
+from modules.shared.collection_utils import flush_on_page_change
 import requests
 from modules.core.firebase_manager import FirebaseManager
 from modules.ui.components.CardDisplay import CardDisplay
+from modules.ui.components.CommentsSection import render_paged_comments_section
 from modules.ui.branding import BrandingComponent
 from modules.ui.theme.theme_manager import ThemeManager
 import sys
@@ -187,50 +188,55 @@ def display_case_grid(cards):
                 </div>
             """, unsafe_allow_html=True)
 
+def display_public_feed(display_case_manager, page_size=12):
+    """Browse public display cases, best ranked first"""
+    st.subheader("Discover Public Display Cases")
+    
+    feed = display_case_manager.discovery_feed
+    if 'discover_cases' not in st.session_state:
+        try:
+            first_page = feed.get_page(page_size=page_size)
+        except Exception as e:
+            st.error(f"Failed to load public display cases: {str(e)}")
+            return
+        st.session_state.discover_cases = {'cases': first_page.cases, 'cursor': first_page.next_cursor}
+    loaded = st.session_state.discover_cases
+    
+    if not loaded['cases']:
+        st.info("No public display cases yet")
+        return
+    
+    for case in loaded['cases']:
+        with st.container():
+            st.markdown(f"**{case.get('name', 'Untitled')}**")
+            if case.get('description'):
+                st.write(case['description'])
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Cards", case.get('card_count', 0))
+            with col2:
+                st.metric("Total Value", f"${case.get('total_value', 0):,.2f}")
+            with col3:
+                st.metric("Likes", case.get('likes', 0))
+    
+    if loaded['cursor'] and st.button("Load more", key="discover_load_more"):
+        page = feed.get_page(loaded['cursor'], page_size)
+        loaded['cases'] = loaded['cases'] + page.cases
+        loaded['cursor'] = page.next_cursor
+        st.rerun()
+
 def create_new_display_case(display_case_manager, collection):
     """Create a new display case"""
     st.subheader("Create New Display Case")
     
     # Get all unique tags from the collection
-    all_tags = set()
-    if isinstance(collection, pd.DataFrame):
-        # Handle DataFrame collection
-        if 'tags' in collection.columns:
-            for tags in collection['tags'].dropna():
-                if isinstance(tags, str):
-                    try:
-                        parsed = ast.literal_eval(tags)
-                        if isinstance(parsed, list):
-                            all_tags.update(str(tag).strip().lower() for tag in parsed if tag)
-                        else:
-                            all_tags.update(tag.strip().lower() for tag in tags.split(',') if tag.strip())
-                    except:
-                        all_tags.update(tag.strip().lower() for tag in tags.split(',') if tag.strip())
-    else:
-        # Handle list collection
-        for card in collection:
-            if isinstance(card, dict):
-                tags = card.get('tags', [])
-            else:
-                tags = card.tags if hasattr(card, 'tags') else []
-            
-            if isinstance(tags, str):
-                try:
-                    parsed = ast.literal_eval(tags)
-                    if isinstance(parsed, list):
-                        all_tags.update(str(tag).strip().lower() for tag in parsed if tag)
-                    else:
-                        all_tags.update(tag.strip().lower() for tag in tags.split(',') if tag.strip())
-                except:
-                    all_tags.update(tag.strip().lower() for tag in tags.split(',') if tag.strip())
-            elif isinstance(tags, list):
-                all_tags.update(str(tag).strip().lower() for tag in tags if tag)
+    all_tags = display_case_manager.get_all_tags()
     
     # Create form for new display case
     with st.form("new_display_case"):
         name = st.text_input("Display Case Name")
         description = st.text_area("Description")
-        selected_tags = st.multiselect("Select Tags", sorted(list(all_tags)))
+        selected_tags = st.multiselect("Select Tags", all_tags)
         
         submitted = st.form_submit_button("Create Display Case")
         
@@ -252,6 +258,9 @@ def create_new_display_case(display_case_manager, collection):
                 st.error("Failed to create display case")
 
 def main():
+    # Commit card writes buffered on the page the user came from
+    flush_on_page_change("display_case")
+
     # Initialize session state for user if not exists
     if 'user' not in st.session_state:
         st.session_state.user = None
@@ -277,10 +286,10 @@ def main():
         return
 
     # Initialize display case manager
-    display_case_manager = DisplayCaseManager(uid, collection)
+    display_case_manager = get_display_case_manager(uid, collection)
 
     # Create tabs for different sections
-    tab1, tab2 = st.tabs(["View Display Cases", "Create New Display Case"])
+    tab1, tab2, tab3 = st.tabs(["View Display Cases", "Create New Display Case", "Discover"])
     
     with tab1:
         # Add refresh button
@@ -303,8 +312,7 @@ def main():
             if selected_case:
                 # Add refresh button for the selected case
                 if st.button("🔄 Refresh Selected Case", key=f"refresh_{selected_case.id}"):
-                    manager = DisplayCaseManager(uid, collection)
-                    if manager.refresh_display_case(selected_case.id):
+                    if display_case_manager.refresh_display_case(selected_case.id):
                         st.success("Display case refreshed successfully!")
                         st.cache_data.clear()
                         st.rerun()
@@ -326,6 +334,9 @@ def main():
                 # Display cards in a grid
                 display_case_grid(selected_case.cards)
                 
+                # Comments, newest first, a page at a time
+                render_paged_comments_section(display_case_manager, selected_case.id, uid)
+                
                 # Add delete button
                 if st.button("Delete Display Case", key=f"delete_{selected_case.name}"):
                     if display_case_manager.delete_display_case(selected_case.id):
@@ -337,6 +348,9 @@ def main():
     
     with tab2:
         create_new_display_case(display_case_manager, collection)
+    
+    with tab3:
+        display_public_feed(display_case_manager)
 
 if __name__ == "__main__":
     main()
@@ -11,6 +11,9 @@ import time
 from pathlib import Path
 from firebase_admin import auth as admin_auth
 from modules.firebase.user_management import UserManager, delete_user_data
+from modules.shared.collection_utils import flush_on_page_change
+from modules.database.collection_sync import get_collection_sync
+from modules.database.write_buffer import flush_user_writes
 from modules.core.firebase_manager import FirebaseManager
 from modules.ui.components import CardDisplay
 from modules.ui.theme.theme_manager import ThemeManager
@@ -200,7 +203,9 @@ def delete_user_account(uid):
             if not firebase_manager.initialize():
                 return False, "Failed to initialize Firebase connection"
         
-        # First, delete user's card collection
+        # First, delete user's card collection (after any buffered card writes, so none
+        # lands afterwards) and drop its sync snapshot
+        flush_user_writes(uid)
         cards_ref = firebase_manager.db.collection('users').document(uid).collection('cards')
         if cards_ref:
             batch = firebase_manager.db.batch()
@@ -208,6 +213,7 @@ def delete_user_account(uid):
             for card in cards:
                 batch.delete(card.reference)
             batch.commit()
+        get_collection_sync().forget(uid)
         
         # Delete user data from Firestore
         if not delete_user_data(uid):
@@ -224,6 +230,9 @@ def delete_user_account(uid):
         return False, f"Error deleting user account: {str(e)}"
 
 def main():
+    # Commit card writes buffered on the page the user came from
+    flush_on_page_change("profile_management")
+
     # Initialize session state for user if not exists
     if 'user' not in st.session_state:
         st.session_state.user = None
@@ -7,4 +7,11 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     """Create an instance of the default event loop for each test case."""
     loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
-    loop.close() 
\ No newline at end of file
+    loop.close() 
+
+@pytest.fixture(autouse=True)
+def sentiment_cache(tmp_path, monkeypatch):
+    """Keep the process-wide sentiment memo out of the repository's data directory."""
+    from modules.core import sentiment
+    monkeypatch.setattr(sentiment, '_default_scorer',
+                        sentiment.SentimentScorer(cache_path=str(tmp_path / 'sentiment_cache.json')))
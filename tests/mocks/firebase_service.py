@@ -22,6 +22,11 @@ class MockFirebaseService:
             return None
         return self.data[collection][doc_id].copy()
     
+    async def get_documents(self, collection: str, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several documents by ID from the specified collection"""
+        docs = self.data.get(collection, {})
+        return {doc_id: docs[doc_id].copy() for doc_id in doc_ids if doc_id in docs}
+    
     async def update_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
         """Update a document in the specified collection"""
         if collection not in self.data:
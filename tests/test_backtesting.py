@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from modules.core.backtesting import (
+    WalkForwardBacktester,
+    walk_forward_splits,
+    mean_absolute_percentage_error,
+    interval_coverage,
+    main
+)
+from modules.core import sales_archive
+from modules.core.sales_archive import SalesArchive, generate_synthetic_archive, generate_synthetic_history, make_card_key
+
+
+def test_walk_forward_splits_expand_and_never_overlap_test_windows():
+    splits = walk_forward_splits(50, min_train=30, horizon=7, step=7)
+    assert splits == [(30, 37), (37, 44)]
+    assert walk_forward_splits(50, min_train=30, horizon=7, step=7, max_folds=1) == [(37, 44)]
+    assert walk_forward_splits(20, min_train=30) == []
+
+
+def test_metrics():
+    actuals = np.array([100.0, 200.0])
+    assert mean_absolute_percentage_error(actuals, np.array([110.0, 180.0])) == pytest.approx(10.0)
+    assert interval_coverage(actuals, np.array([90.0, 210.0]), np.array([110.0, 220.0])) == pytest.approx(50.0)
+
+
+def test_naive_backtest_runs_inline():
+    history = generate_synthetic_history(n_points=60, seed=1)
+    backtester = WalkForwardBacktester(engines=['naive'], min_train=30, horizon=5, step=10, max_workers=1)
+    report = backtester.run({'card': history})
+
+    summary = report.summary()
+    assert set(summary) == {'naive/last_price'}
+    assert summary['naive/last_price']['folds'] == 3
+    assert summary['naive/last_price']['points'] == 15
+    assert summary['naive/last_price']['mape'] >= 0
+
+
+def test_ensemble_backtest_reports_each_model():
+    archive = generate_synthetic_archive(n_cards=1, n_points=50, seed=3)
+    backtester = WalkForwardBacktester(min_train=35, horizon=5, step=10, n_estimators=5, max_workers=1)
+    report = backtester.run_archive(archive)
+
+    by_model = report.summary(by='model')
+    assert {'naive/last_price', 'ensemble/rf', 'ensemble/gb', 'ensemble/xgb', 'ensemble/ensemble'} <= set(by_model)
+    assert set(report.summary(by='engine')) == {'naive', 'ensemble'}
+    assert all(row['failed_folds'] == 0 for row in by_model.values())
+    assert len(report.to_frame()) == 5 * 5 * 2
+
+
+def test_sales_archive_round_trip(tmp_path):
+    path = tmp_path / 'archive.json'
+    archive = SalesArchive(str(path))
+    key = make_card_key({'player_name': 'Justin  Herbert', 'year': 2020, 'card_set': 'Prizm', 'card_number': '#325'})
+    assert key == '2020|justin herbert|prizm|325|'
+
+    sales = [{'title': 't', 'price': '10.5', 'date': '2024-01-02'}, {'title': 't', 'price': 9, 'date': '2024-01-01'}]
+    assert archive.add_sales(key, sales) == 2
+    assert archive.add_sales(key, sales) == 0
+    archive.save()
+
+    reloaded = SalesArchive(str(path))
+    assert [s['date'] for s in reloaded.get_history(key)] == ['2024-01-01', '2024-01-02']
+
+
+def test_record_sales_saves_later_and_caps_histories(tmp_path, monkeypatch):
+    path = tmp_path / 'archive.json'
+    archive = SalesArchive(str(path), max_sales_per_card=3)
+    monkeypatch.setattr(sales_archive, '_default_archive', archive)
+    card = {'player_name': 'Justin Herbert', 'year': 2020}
+
+    sales = [{'title': 't', 'price': 10 + day, 'date': f"2024-01-0{day}"} for day in range(1, 6)]
+    assert sales_archive.record_sales(card, sales) == 5
+    assert not path.exists()
+    assert [s['date'] for s in archive.get_history(make_card_key(card))] == ['2024-01-03', '2024-01-04', '2024-01-05']
+
+    assert archive.save_pending()
+    assert len(SalesArchive(str(path)).get_history(make_card_key(card))) == 3
+    assert [p.name for p in tmp_path.iterdir()] == ['archive.json']
+
+
+def test_cli_runs_offline(tmp_path, capsys):
+    out = tmp_path / 'summary.json'
+    assert main(['--synthetic', '1', '--points', '45', '--engines', 'naive', '--workers', '1',
+                 '--json', str(out)]) == 0
+    assert 'naive/last_price' in capsys.readouterr().out
+    assert out.exists()
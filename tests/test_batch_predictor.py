@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modules.core.batch_predictor import BatchPricePredictor
+from modules.core.feature_store import FEATURE_COLUMNS, FeatureStore
+from modules.core.price_predictor import PricePredictor
+from modules.core.sales_archive import generate_synthetic_archive, generate_synthetic_history
+
+
+@pytest.fixture
+def archive():
+    return generate_synthetic_archive(n_cards=3, n_points=60, seed=5)
+
+
+def make_batch(archive=None, **kwargs):
+    return BatchPricePredictor(feature_store=FeatureStore(), archive=archive, n_estimators=5, **kwargs)
+
+
+def test_global_mode_trains_once_and_predicts_every_card(archive):
+    batch = make_batch(archive, batch_size=2)
+    keys = archive.card_keys()
+    results = batch.predict_many(keys + ['unknown|card'], days_ahead=30)
+
+    assert batch.is_fitted
+    assert results['unknown|card'] is None
+    for key in keys:
+        result = results[key]
+        assert len(result['predicted_prices']) == 30
+        assert result['current_price'] == pytest.approx(archive.get_history(key)[-1]['price'])
+        assert np.isfinite(result['metrics']['30_day_forecast'])
+
+
+def test_vectorized_future_block_matches_prepare_features(archive):
+    key = archive.card_keys()[0]
+    batch = make_batch(archive)
+    batch.fit_global({key: archive.get_history(key)})
+    df = batch.feature_store.frame(key, batch.predictor.seasonal_factors, batch.predictor.weekly_factors)
+
+    future_dates, block = batch._future_block(df, 30)
+    future = batch.predictor.prepare_features(pd.DataFrame({'date': future_dates}), history=df)
+    np.testing.assert_allclose(block, future[FEATURE_COLUMNS].to_numpy(dtype=float))
+    np.testing.assert_allclose(
+        batch.predictor.predict_ensemble(pd.DataFrame(block, columns=FEATURE_COLUMNS)),
+        batch.predictor.predict_ensemble(future)
+    )
+
+
+def test_short_histories_use_trend_projection():
+    sales = generate_synthetic_history(n_points=4, seed=2)
+    results = make_batch().predict_many(['short'], sales_lookup={'short': sales})
+    assert len(results['short']['predicted_prices']) == 90
+    assert results['short']['price_volatility'] == 0
+
+
+def test_per_card_mode_runs_inline(archive):
+    keys = archive.card_keys()[:2]
+    batch = make_batch(archive, max_workers=1)
+    results = dict(batch.iter_predictions(keys, days_ahead=30, mode='per_card'))
+    assert set(results) == set(keys)
+    assert not batch.is_fitted
+    with pytest.raises(ValueError):
+        batch.predict_many(keys, mode='bogus')
+
+
+def test_loaded_model_is_reused(archive, tmp_path):
+    trained = make_batch(archive)
+    trained.fit_global(dict(archive.items()))
+    path = tmp_path / 'models.joblib'
+    trained.predictor.save_models(path)
+
+    predictor = PricePredictor(n_estimators=5)
+    with pytest.raises(ValueError):
+        predictor.predict_ensemble(None)
+    predictor.load_models(path)
+    batch = BatchPricePredictor(predictor=predictor, feature_store=FeatureStore(), archive=archive)
+    results = batch.predict_many(archive.card_keys(), days_ahead=30)
+    assert predictor.model_weights == trained.predictor.model_weights
+    assert all(result is not None for result in results.values())
+
+
+def test_collection_forecast_finds_recorded_search():
+    from modules.core.sales_archive import SalesArchive, collection_card_key, make_card_key
+
+    archive = SalesArchive(path=None)
+    search_params = {'player_name': 'Justin Herbert', 'year': '2020', 'card_set': 'Prizm',
+                     'card_number': '325', 'variation': '', 'scenario': 'Raw', 'negative_keywords': ''}
+    archive.add_sales(make_card_key(search_params), generate_synthetic_history(n_points=30, seed=2))
+    collection_card = {'player_name': 'Justin Herbert', 'year': 2020, 'card_set': 'Prizm',
+                       'card_number': '#325', 'variation': '', 'condition': 'Near Mint'}
+
+    key = collection_card_key(collection_card)
+    assert key == make_card_key(search_params)
+    assert len(make_batch(archive)._resolve_sales(key, None)) == 30
+
+    graded = dict(collection_card, condition='psa  10')
+    assert collection_card_key(graded).endswith('|psa 10')
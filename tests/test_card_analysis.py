@@ -0,0 +1,78 @@
+import threading
+import time
+from modules.core.card_analysis import CardAnalysisCache, analyze_card, bundle_key
+
+
+def search(player, scenario='Raw', **extra):
+    return dict({'player_name': player, 'year': '2020', 'card_set': 'Prizm', 'card_number': '1',
+                 'variation': '', 'negative_keywords': '', 'scenario': scenario}, **extra)
+
+
+class CountingAnalyzer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, params):
+        with self.lock:
+            self.calls.append(params['player_name'])
+        time.sleep(self.delay)
+        if params['player_name'] == 'Nobody':
+            return None
+        return {'title': params['player_name'], 'market_value': 100.0}
+
+
+def test_bundles_are_cached_by_card_key_with_ttl(tmp_path):
+    analyze = CountingAnalyzer()
+    cache = CardAnalysisCache(cache_path=str(tmp_path / 'cache.json'), ttl_seconds=60, analyze=analyze)
+    first = cache.get(search('Justin Herbert'))
+    first['market_value'] = 0
+    assert cache.get(search('justin  herbert'))['market_value'] == 100.0
+    assert cache.get(search('Justin Herbert', 'PSA 10')) is not None
+    assert cache.get(search('Nobody')) is None and cache.get(search('Nobody')) is None
+    assert analyze.calls == ['Justin Herbert', 'Justin Herbert', 'Nobody', 'Nobody']
+
+    # Another session reads the saved bundles; an expired bundle is recomputed
+    reloaded = CardAnalysisCache(cache_path=str(tmp_path / 'cache.json'), ttl_seconds=60, analyze=analyze)
+    assert len(reloaded) == 2
+    reloaded.get(search('Justin Herbert'))
+    assert len(analyze.calls) == 4
+    reloaded.ttl_seconds = 0
+    reloaded.get(search('Justin Herbert'))
+    assert len(analyze.calls) == 5
+
+    assert bundle_key(search('A', negative_keywords='lot')) != bundle_key(search('A'))
+    assert bundle_key({}) == ''
+
+
+def test_several_cards_are_analyzed_concurrently():
+    analyze = CountingAnalyzer(delay=0.2)
+    cache = CardAnalysisCache(cache_path=None, max_workers=6, analyze=analyze)
+    searches = [search(f"Player {i}") for i in range(6)] + [search('Player 0')]
+    start = time.perf_counter()
+    bundles = cache.get_many(searches)
+    assert time.perf_counter() - start < 0.6
+    assert [b['title'] for b in bundles] == [f"Player {i}" for i in range(6)] + ['Player 0']
+    assert len(analyze.calls) == 6
+
+
+def test_analyze_card_builds_bundle():
+    class Scraper:
+        def search_cards(self, **params):
+            return [{'title': '2020 Prizm Silver', 'price': 10.0, 'image_url': 'x'},
+                    {'title': '2020 Prizm Base', 'price': 5.0}]
+
+    class Market:
+        def analyze_market_data(self, results):
+            assert len(results) == 1
+            return {'median_price': 10.0, 'liquidity_score': 7}
+
+    class Predictor:
+        def predict_future_prices(self, results, card_key=None):
+            return {'price_volatility': 3, 'price_trend': 12,
+                    'metrics': {'30_day_forecast': 11, '90_day_forecast': 12}}
+
+    bundle = analyze_card(search('A', variation='Silver'), Scraper(), Market(), Predictor())
+    assert bundle['market_value'] == 10.0 and bundle['trend_direction'] == 'hot'
+    assert bundle['90_day_forecast'] == 12 and bundle['image_url'] == 'x'
@@ -0,0 +1,51 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from modules.core.models import DisplayCase
+from modules.database.models import CardCondition
+from modules.display_case.card_refs import card_reference, card_references, cards_by_id, resolve_cards
+from modules.display_case.manager import DisplayCaseManager
+
+
+def _card(player, value, photo='data:image/jpeg;base64,abc'):
+    return {'player_name': player, 'year': '2020', 'card_set': 'Prizm', 'card_number': '1',
+            'condition': CardCondition.PSA_10, 'current_value': value, 'photo': photo,
+            'purchase_date': datetime(2024, 1, 1), 'tags': ['rookie']}
+
+
+def test_reference_keeps_id_and_summary_only():
+    reference = card_reference(_card('Joe Burrow', 50.0))
+    assert reference == {'id': 'joe_burrow_2020_prizm_1', 'player_name': 'Joe Burrow', 'year': '2020',
+                         'card_set': 'Prizm', 'card_number': '1', 'condition': 'PSA 10',
+                         'current_value': 50.0, 'tags': ['rookie']}
+    assert card_reference(dict(_card('Joe Burrow', 50.0), id='abc'))['id'] == 'abc'
+
+
+def test_resolve_uses_current_collection_data():
+    collection = pd.DataFrame([_card('Joe Burrow', 75.0, photo='new'), dict(_card('Ja Morant', 20.0), id='jm')])
+    lookup = cards_by_id(collection)
+    references = card_references([_card('Joe Burrow', 50.0), dict(_card('Ja Morant', 10.0), id='jm'),
+                                  _card('Gone Player', 5.0)])
+    legacy = dict(_card('Old Player', 1.0, photo='embedded'), id='old')
+
+    cards = resolve_cards(references + [legacy], lookup)
+    assert [card['id'] for card in cards] == ['joe_burrow_2020_prizm_1', 'jm', 'gone_player_2020_prizm_1', 'old']
+    assert cards[0]['photo'] == 'new' and cards[0]['current_value'] == 75.0
+    assert cards[1]['current_value'] == 20.0
+    assert 'photo' not in cards[2] and cards[2]['current_value'] == 5.0
+    assert cards[3]['photo'] == 'embedded'
+
+
+def test_update_display_case_writes_references():
+    manager = DisplayCaseManager('test_uid', [_card('Joe Burrow', 50.0)])
+    manager.firebase_manager = MagicMock()
+    case = DisplayCase(name='Rookies', user_id='test_uid', cards=[_card('Joe Burrow', 50.0)])
+    case.id = 'case1'
+
+    assert manager.update_display_case(case)
+    document = manager.firebase_manager.db.collection().document().collection().document()
+    saved = document.set.call_args[0][0]
+    assert saved['cards'] == [card_reference(_card('Joe Burrow', 50.0))]
+    assert 'photo' not in saved['cards'][0]
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.core.repositories import card_repository
+from modules.core.repositories.card_repository import CardRepository
+
+
+class FakeCard:
+    def __init__(self, card_id, purchase_price=10.0):
+        self.id = card_id
+        self.player_name = f"Player {card_id}"
+        self.purchase_price = purchase_price
+        self.current_value = 0.0
+
+    def to_dict(self):
+        return {'id': self.id, 'current_value': self.current_value}
+
+
+class SlowAnalyzer:
+    def __init__(self, delay=0.05, fail=()):
+        self.delay, self.fail = delay, set(fail)
+        self.running = self.peak = 0
+
+    async def analyze_card(self, card):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if card.id in self.fail:
+                raise RuntimeError("no sales found")
+            return 20.0
+        finally:
+            self.running -= 1
+
+
+def _repository(analyzer, db=None):
+    repository = object.__new__(CardRepository)
+    repository.db = db or MagicMock()
+    repository.logger = logging.getLogger(__name__)
+    repository.value_analyzer = analyzer
+    repository._cache, repository._cache_expiry = {}, {}
+    repository._cache_duration = timedelta(minutes=5)
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_valuations_run_concurrently_up_to_the_limit():
+    analyzer = SlowAnalyzer(delay=0.05)
+    repository = _repository(analyzer)
+    cards = [FakeCard(str(n)) for n in range(12)]
+
+    started = time.monotonic()
+    updated = await repository.batch_update_values(cards, concurrency=4)
+
+    assert len(updated) == 12 and analyzer.peak == 4
+    # Three rounds of four instead of twelve in a row
+    assert time.monotonic() - started < 0.4
+    assert updated[0].roi == 100.0
+    assert repository.db.batch.return_value.commit.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_reported_per_card():
+    repository = _repository(SlowAnalyzer(delay=0, fail={'b'}))
+    cards = [FakeCard('a'), FakeCard('b'), FakeCard(None)]
+
+    result = await repository.update_values(cards)
+
+    assert [card.id for card in result.updated] == ['a']
+    assert [(card.player_name, error) for card, error in result.failed] == [
+        ('Player b', 'no sales found'), ('Player None', 'Cannot update value for card without ID')]
+    assert result.to_dict()['updated'] == 1
+    assert 'a' in repository._cache
+
+
+@pytest.mark.asyncio
+async def test_writes_are_chunked_and_failed_chunks_reported(monkeypatch):
+    monkeypatch.setattr(card_repository, 'MAX_BATCH_WRITES', 5)
+    db = MagicMock()
+    batches = [MagicMock() for _ in range(3)]
+    batches[1].commit.side_effect = RuntimeError("deadline exceeded")
+    db.batch.side_effect = batches
+    repository = _repository(SlowAnalyzer(delay=0), db)
+
+    result = await repository.update_values([FakeCard(str(n)) for n in range(12)])
+
+    assert [batch.update.call_count for batch in batches] == [5, 5, 2]
+    assert len(result.updated) == 7 and len(result.failed) == 5
+    assert {error for _, error in result.failed} == {'deadline exceeded'}
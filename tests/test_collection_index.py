@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from modules.core.card import Card, CardCondition
+from modules.core import collection_index
+from modules.core.collection_index import CollectionIndex, card_tags
+from modules.core.sales_archive import make_card_key
+
+
+def make_collection(n, seed=0):
+    rng = np.random.default_rng(seed)
+    sets = ['Prizm', 'Optic', 'Chrome', 'Select']
+    tags = ['rookie', 'auto', 'pc', 'invest']
+    return [{
+        'id': f"card-{i}",
+        'player_name': f"Player {rng.integers(n // 10 + 1)}",
+        'year': str(rng.integers(1990, 2024)),
+        'card_set': sets[rng.integers(len(sets))],
+        'card_number': str(rng.integers(1, 300)),
+        'purchase_price': f"${rng.uniform(1, 2000):,.2f}",
+        'current_value': float(rng.uniform(1, 3000)),
+        'roi': float(rng.normal()),
+        'tags': list(rng.choice(tags, size=rng.integers(0, 3), replace=False)) if i % 2 else ', '.join(tags[:i % 3]),
+        'notes': 'centered' if i % 5 == 0 else None
+    } for i in range(n)]
+
+
+@pytest.fixture
+def cards():
+    return make_collection(500)
+
+
+def test_filters_match_a_linear_scan(cards):
+    index = CollectionIndex(cards)
+    expected = [i for i, card in enumerate(cards)
+                if ('player 1' in card['player_name'].lower() or 'player 1' in str(card['notes'] or '').lower())
+                and any(tag in card_tags(card) for tag in ['auto', 'pc'])]
+    assert list(index.filter(search='Player 1', tags=['auto', 'pc'])) == expected
+
+    expected = [i for i, card in enumerate(cards) if card['card_set'] == 'Prizm' and card['year'] in ('2020', '2021')]
+    assert list(index.filter(sets=['prizm'], years=[2020, '2021'])) == expected
+    assert list(index.filter(search='centered')) == [i for i in range(500) if i % 5 == 0]
+    assert len(index.filter()) == 500
+    assert len(index.filter(tags=['missing'])) == 0
+    assert index.unique_tags() == ['auto', 'invest', 'pc', 'rookie']
+
+
+def test_sort_and_summary(cards):
+    index = CollectionIndex(cards)
+    positions = index.filter(sets=['Optic'])
+    by_value = index.records(index.sort(positions, 'current_value', descending=True))
+    assert [c['current_value'] for c in by_value] == sorted((c['current_value'] for c in by_value), reverse=True)
+    by_price = index.records(index.sort(positions, 'purchase_price'))
+    prices = [float(c['purchase_price'].replace('$', '').replace(',', '')) for c in by_price]
+    assert prices == sorted(prices)
+    by_player = index.records(index.sort(index.filter(), 'player_name'))
+    assert [c['player_name'].lower() for c in by_player] == sorted(c['player_name'].lower() for c in cards)
+
+    summary = index.summary(positions)
+    optic = [c for c in cards if c['card_set'] == 'Optic']
+    assert summary['total_cards'] == len(optic)
+    assert summary['total_value'] == pytest.approx(sum(c['current_value'] for c in optic))
+    assert index.totals_by('set').loc['Optic', 'cards'] == len(optic)
+    with pytest.raises(ValueError):
+        index.sort(positions, 'unknown_field')
+
+
+def test_hash_indexes():
+    cards = [
+        {'id': 'a', 'player_name': 'Justin Herbert', 'year': 2020, 'card_set': 'Prizm', 'card_number': '#325',
+         'variation': 'Silver', 'current_value': '$1,000'},
+        Card(player_name='Joe Burrow', year='2020', card_set='Optic', card_number='1', variation='',
+             condition=CardCondition.RAW, purchase_price=10, purchase_date=datetime(2023, 1, 1), current_value=15,
+             last_updated=datetime(2023, 1, 1), notes='', photo=None, roi=50, tags=['rookie'])
+    ]
+    index = CollectionIndex(cards)
+    assert index.position_of('a') == 0 and index.position_of('zzz') is None
+    assert index.find_duplicates('justin  herbert', '2020', 'prizm', '325') == [0]
+    assert index.find_duplicates('Joe Burrow', '2020', 'Optic', '1') == [1]
+    key = make_card_key({'player_name': 'Justin Herbert', 'year': 2020, 'card_set': 'Prizm',
+                         'card_number': '#325', 'variation': 'Silver'})
+    assert index.positions_for_key(key) == [0]
+    assert index.records([1])[0] is cards[1]
+    assert index.summary()['total_value'] == 1015.0
+    assert index.filter(tags=['rookie']).tolist() == [1]
+
+
+def test_queries_do_not_loop_over_cards(monkeypatch):
+    cards = make_collection(20000, seed=1)
+    index = CollectionIndex(cards)
+    calls = []
+    for name in ('_as_dict', '_text', '_normalize', '_facet_key', '_number', '_tag_list'):
+        helper = getattr(collection_index, name)
+        monkeypatch.setattr(collection_index, name,
+                            lambda *args, _helper=helper, _name=name: calls.append(_name) or _helper(*args))
+
+    index.filter(search='player 12')
+    index.filter(tags=['auto'], sets=['prizm'])
+    index.sort(index.filter(tags=['rookie']), 'current_value', descending=True)
+    index.summary(index.filter(years=['2020', '2021']))
+
+    # Only the query values go through the per-value helpers, never the 20,000 cards
+    assert len(calls) < 50
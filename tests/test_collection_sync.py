@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.database import collection_sync
+from modules.database.collection_sync import CollectionSync, card_document_id
+
+
+class FakeBatch:
+    def __init__(self, db, fail=False):
+        self.db, self.fail, self.operations = db, fail, []
+
+    def set(self, ref, data):
+        self.operations.append(('set', ref.path, data))
+
+    def delete(self, ref):
+        self.operations.append(('delete', ref.path, None))
+
+    def update(self, ref, data):
+        self.operations.append(('update', ref.path, data))
+
+    def commit(self):
+        if self.fail or any(path in self.db.bad_paths for _, path, _ in self.operations):
+            raise RuntimeError("commit failed")
+        for operation, path, data in self.operations:
+            if operation == 'set':
+                self.db.docs[path] = dict(data)
+            elif operation == 'delete':
+                self.db.docs.pop(path, None)
+        self.db.commits.append(len(self.operations))
+
+
+class FakeRef:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def collection(self, name):
+        return FakeRef(self.db, f"{self.path}/{name}")
+
+    def document(self, doc_id):
+        return FakeRef(self.db, f"{self.path}/{doc_id}")
+
+    def update(self, data):
+        if self.db.fail:
+            raise RuntimeError("update failed")
+        self.db.docs.setdefault(self.path, {}).update(data)
+
+    def get(self):
+        self.db.reads += 1
+        prefix = self.path + '/'
+        return [SimpleNamespace(id=path[len(prefix):], to_dict=lambda data=data: dict(data))
+                for path, data in self.db.docs.items()
+                if path.startswith(prefix) and '/' not in path[len(prefix):]]
+
+
+class FakeDb:
+    def __init__(self):
+        self.docs, self.commits, self.reads, self.fail = {}, [], 0, False
+        # Documents whose writes are rejected, failing any batch that includes them
+        self.bad_paths = set()
+
+    def collection(self, name):
+        return FakeRef(self, name)
+
+    def batch(self):
+        return FakeBatch(self, self.fail)
+
+
+def _card(name, value=1.0):
+    return {'player_name': name, 'year': '2020', 'card_set': 'Prizm', 'card_number': '1', 'current_value': value}
+
+
+@pytest.fixture
+def db():
+    return FakeDb()
+
+
+def test_only_changed_cards_are_written(db):
+    sync = CollectionSync(db)
+    first = sync.sync('u1', [_card('A'), _card('B'), _card('C')])
+    assert (first.inserted, first.batches) == (3, 1)
+    assert db.reads == 1
+
+    second = sync.sync('u1', [_card('A'), _card('B', 2.0), _card('D')])
+    assert second.to_dict() == {'inserted': 1, 'updated': 1, 'deleted': 1, 'unchanged': 1, 'batches': 1}
+    # The snapshot is reused, so the second save reads nothing
+    assert db.reads == 1
+    stored = {path.rsplit('/', 1)[1] for path in db.docs if '/cards/' in path}
+    assert stored == {card_document_id(_card(name)) for name in 'ABD'}
+
+    assert sync.sync('u1', [_card('A'), _card('B', 2.0), _card('D')]).writes == 0
+    assert len(db.commits) == 2
+
+
+def test_large_saves_are_split_into_batches(db, monkeypatch):
+    monkeypatch.setattr(collection_sync, 'MAX_BATCH_WRITES', 10)
+    sync = CollectionSync(db, max_workers=3)
+    result = sync.sync('u1', [_card(f"Player {n}") for n in range(25)])
+
+    assert result.inserted == 25 and result.batches == 3
+    # 25 cards plus the last_updated touch
+    assert sorted(db.commits) == [6, 10, 10]
+    assert len([path for path in db.docs if '/cards/' in path]) == 25
+
+
+def test_failed_commit_drops_the_snapshot(db):
+    sync = CollectionSync(db)
+    sync.sync('u1', [_card('A')])
+    db.fail = True
+    with pytest.raises(RuntimeError):
+        sync.sync('u1', [_card('A', 5.0)])
+    db.fail = False
+
+    assert sync.sync('u1', [_card('A', 5.0)]).updated == 1
+    assert db.reads == 2
+
+
+def test_service_save_uses_the_sync_engine(monkeypatch):
+    from modules.database.service import DatabaseService
+
+    service = MagicMock()
+    service._ensure_db_connection.return_value = True
+    engine = MagicMock()
+    monkeypatch.setattr(DatabaseService, 'get_instance', classmethod(lambda cls: service))
+    monkeypatch.setattr('modules.database.service.get_collection_sync', lambda: engine)
+
+    assert DatabaseService.save_user_collection('u1', []) is True
+    engine.sync.assert_called_once_with('u1', [])
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from modules.display_case.comments import CommentFeed
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeQuery:
+    def __init__(self, store, after=None, limit=None):
+        # after: a document id, or field values such as {'timestamp': ...}
+        self.store, self.after, self._limit = store, after, limit
+
+    def start_after(self, snapshot):
+        return FakeQuery(self.store, snapshot if isinstance(snapshot, dict) else snapshot.id, self._limit)
+
+    def limit(self, count):
+        return FakeQuery(self.store, self.after, count)
+
+    def get(self):
+        self.store.queries += 1
+        docs = sorted(self.store.docs, key=lambda doc: doc._data['timestamp'], reverse=True)
+        if isinstance(self.after, dict):
+            docs = [doc for doc in docs if doc._data['timestamp'] < self.after['timestamp']]
+        elif self.after is not None:
+            docs = docs[[doc.id for doc in docs].index(self.after) + 1:]
+        return docs[:self._limit]
+
+
+class FakeComments:
+    def __init__(self, count):
+        start = datetime(2025, 1, 1)
+        self.docs = [FakeDoc(f"c{i}", {'comment': f"comment {i}", 'timestamp': start + timedelta(minutes=i)})
+                     for i in range(count)]
+        self.queries = 0
+
+    def order_by(self, field, direction=None):
+        return FakeQuery(self)
+
+    def count(self):
+        return MagicMock(get=lambda: [[MagicMock(value=len(self.docs))]])
+
+    def document(self, doc_id):
+        doc = next((doc for doc in self.docs if doc.id == doc_id), FakeDoc(doc_id, None))
+        return MagicMock(get=lambda: doc)
+
+
+def _feed(comments, **options):
+    db = MagicMock()
+    db.collection.return_value.document.return_value.collection.return_value = comments
+    return CommentFeed(db, **options)
+
+
+def test_pages_follow_the_cursor_newest_first():
+    comments = FakeComments(5)
+    feed = _feed(comments, page_size=2)
+
+    first = feed.get_page('case')
+    assert [c['id'] for c in first.comments] == ['c4', 'c3'] and first.has_more
+    assert first.comments[0]['timestamp'] == '2025-01-01T00:04:00'
+    second = feed.get_page('case', first.next_cursor)
+    assert [c['id'] for c in second.comments] == ['c2', 'c1']
+    last = feed.get_page('case', second.next_cursor)
+    assert [c['id'] for c in last.comments] == ['c0'] and last.next_cursor is None
+    assert [c['id'] for c in feed.get_all('case')] == ['c4', 'c3', 'c2', 'c1', 'c0']
+    assert feed.count('case') == 5
+
+
+def test_pages_are_cached_until_invalidated():
+    comments = FakeComments(3)
+    feed = _feed(comments, page_size=10)
+    feed.get_page('case')
+    feed.get_page('case')
+    assert comments.queries == 1
+
+    comments.docs.append(FakeDoc('new', {'comment': 'new', 'timestamp': datetime(2026, 1, 1)}))
+    feed.invalidate('case')
+    assert feed.get_page('case').comments[0]['id'] == 'new'
+    assert comments.queries == 2
+
+
+def test_cursor_to_a_deleted_comment_restarts_from_newest():
+    comments = FakeComments(3)
+    feed = _feed(comments, page_size=1, ttl_seconds=0)
+    assert [c['id'] for c in feed.get_page('case', 'missing').comments] == ['c2']
+
+
+def test_cursor_to_a_comment_deleted_later_continues_after_it():
+    comments = FakeComments(5)
+    feed = _feed(comments, page_size=2)
+    first = feed.get_page('case')
+    assert first.next_cursor == 'c3'
+
+    comments.docs = [doc for doc in comments.docs if doc.id != 'c3']
+    feed.invalidate('case')
+    assert [c['id'] for c in feed.get_page('case', first.next_cursor).comments] == ['c2', 'c1']
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from modules.display_case import discovery
+from modules.display_case.discovery import DiscoveryFeed, public_entry, ranking_score
+from modules.display_case.likes import InMemoryLikeStore, LikeCounter
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeIndex:
+    """public_display_cases collection: ordered by score, with start_after and limit."""
+
+    def __init__(self):
+        self.entries = {}
+        self.queries = 0
+        self.after = None
+        self._limit = None
+
+    def document(self, doc_id):
+        index = self
+        ref = MagicMock()
+        ref.get.side_effect = lambda **kwargs: FakeDoc(doc_id, index.entries.get(doc_id))
+        ref.set.side_effect = lambda data: index.entries.__setitem__(doc_id, data)
+        ref.delete.side_effect = lambda: index.entries.pop(doc_id, None)
+        return ref
+
+    def order_by(self, field, direction=None):
+        query = FakeIndex.__new__(FakeIndex)
+        query.__dict__.update(self.__dict__)
+        query.source = self
+        return query
+
+    def start_after(self, snapshot):
+        self.after = snapshot.id
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def get(self):
+        self.source.queries += 1
+        docs = sorted((FakeDoc(key, value) for key, value in self.entries.items()),
+                      key=lambda doc: doc._data['score'], reverse=True)
+        if self.after is not None:
+            docs = docs[[doc.id for doc in docs].index(self.after) + 1:]
+        return docs[:self._limit]
+
+
+def _feed(store=None, comment_counts=None):
+    index = FakeIndex()
+    db = MagicMock()
+    db.collection.return_value = index
+    comment_feed = MagicMock()
+    comment_feed.count.side_effect = lambda case_id: (comment_counts or {}).get(case_id, 0)
+    like_counter = LikeCounter(store or InMemoryLikeStore(), ttl_seconds=0)
+    return DiscoveryFeed(db, page_size=2, like_counter=like_counter, comment_feed=comment_feed), index
+
+
+def test_ranking_prefers_engagement_and_recency():
+    now = datetime(2025, 6, 1)
+    assert ranking_score(now, likes=10) > ranking_score(now, likes=1)
+    assert ranking_score(now, total_value=1000) > ranking_score(now, total_value=10)
+    assert ranking_score(now) > ranking_score(now - timedelta(days=7), likes=5)
+
+    entry = public_entry('owner', {'id': 'c1', 'name': 'Rookies', 'cards': [{}, {}], 'total_value': '50',
+                                   'created_at': now, 'is_public': True}, likes=3)
+    assert entry['card_count'] == 2 and entry['total_value'] == 50.0 and entry['likes'] == 3
+    assert entry['score'] == ranking_score(now, 3, 0, 50.0)
+
+
+def test_publish_and_page_through_public_cases():
+    feed, index = _feed()
+    start = datetime(2025, 1, 1)
+    for i in range(5):
+        feed.publish('owner', {'id': f"c{i}", 'name': f"Case {i}", 'is_public': True,
+                               'created_at': start + timedelta(days=i)})
+    feed.publish('owner', {'id': 'private', 'name': 'Private', 'is_public': False})
+    assert 'private' not in index.entries
+
+    first = feed.get_page()
+    assert [case['case_id'] for case in first.cases] == ['c4', 'c3'] and first.has_more
+    second = feed.get_page(first.next_cursor)
+    third = feed.get_page(second.next_cursor)
+    assert [case['case_id'] for case in second.cases + third.cases] == ['c2', 'c1', 'c0']
+    assert not third.has_more
+
+    feed.unpublish('c4')
+    assert [case['case_id'] for case in feed.top(2)] == ['c3', 'c2']
+
+
+def test_new_entries_start_from_existing_likes_and_comments():
+    store = InMemoryLikeStore()
+    store.likes['c1'] = {'u1', 'u2', 'u3'}
+    feed, index = _feed(store, {'c1': 4})
+    created = datetime(2025, 1, 1)
+    feed.publish('owner', {'id': 'c1', 'name': 'Case', 'is_public': True, 'created_at': created})
+    assert (index.entries['c1']['likes'], index.entries['c1']['comments']) == (3, 4)
+    assert index.entries['c1']['score'] == ranking_score(created, 3, 4, 0.0)
+
+    # Once indexed, the entry's own counters are kept
+    index.entries['c1']['likes'] = 5
+    feed.publish('owner', {'id': 'c1', 'name': 'Renamed', 'is_public': True, 'created_at': created})
+    assert index.entries['c1']['likes'] == 5 and feed.comment_feed.count.call_count == 1
+
+
+def test_first_page_is_cached_until_the_index_changes():
+    feed, index = _feed()
+    feed.publish('owner', {'id': 'c1', 'name': 'Case', 'is_public': True})
+    feed.get_page()
+    feed.get_page()
+    assert index.queries == 1
+    feed.publish('owner', {'id': 'c2', 'name': 'Other', 'is_public': True})
+    assert len(feed.get_page().cases) == 2
+    assert index.queries == 2
+
+
+def test_record_total_rescores_indexed_cases(monkeypatch):
+    monkeypatch.setattr(discovery.firestore, 'transactional', lambda apply: apply)
+    feed, index = _feed()
+    created = datetime(2025, 1, 1)
+    feed.publish('owner', {'id': 'c1', 'name': 'Case', 'is_public': True, 'created_at': created, 'total_value': 10})
+    transaction = feed.db.transaction.return_value
+
+    feed.record_total('c1', 250.0)
+    fields = transaction.update.call_args.args[1]
+    assert fields['total_value'] == 250.0
+    assert fields['score'] == ranking_score(created, 0, 0, 250.0)
+
+    feed.record_total('unindexed', 5.0)
+    assert transaction.update.call_count == 1
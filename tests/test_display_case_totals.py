@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.display_case.totals import DisplayCaseTotals
+
+
+def _ref(card_id, value):
+    return {'id': card_id, 'player_name': card_id, 'current_value': value}
+
+
+@pytest.fixture
+def totals():
+    return DisplayCaseTotals([
+        {'id': 'rookies', 'cards': [_ref('a', 10.0), _ref('b', 20.0)]},
+        {'id': 'autos', 'cards': [_ref('b', 20.0), _ref('c', 5.0)], 'is_public': True},
+        {'id': 'other', 'cards': [_ref('d', 1.0)]}
+    ])
+
+
+def test_value_changes_adjust_only_cases_containing_the_card(totals):
+    assert totals.cases_containing('b') == ['autos', 'rookies']
+    assert totals.apply_values({'b': 25.0, 'z': 99.0}) == {'rookies': 35.0, 'autos': 30.0}
+    assert totals.apply_values({'b': 25.0}) == {}
+    assert totals.totals['other'] == 1.0
+
+    changed = totals.apply_collection([{'id': 'a', 'current_value': '12.5'}, {'id': 'd', 'current_value': 'n/a'}])
+    assert changed == {'rookies': 37.5, 'other': 0.0}
+
+
+def test_commit_writes_changed_cases_in_one_batch(totals):
+    totals.apply_values({'a': 11.0, 'c': 6.0})
+    batch = MagicMock()
+    cases_ref = MagicMock()
+
+    assert totals.commit(cases_ref, lambda: batch) == 2
+    assert batch.update.call_count == 2 and batch.commit.call_count == 1
+    written = {call.args[1]['total_value'] for call in batch.update.call_args_list}
+    assert written == {31.0, 26.0}
+    rookies = [call.args[1] for call in batch.update.call_args_list if call.args[1]['total_value'] == 31.0][0]
+    assert rookies['cards'][0]['current_value'] == 11.0
+    assert totals.commit(cases_ref, lambda: batch) == 0
+
+
+def test_removed_case_is_no_longer_tracked(totals):
+    assert totals.public_cases == {'autos'}
+    totals.remove_case('autos')
+    assert totals.public_cases == set()
+    totals.add_case({'id': 'autos', 'cards': [_ref('b', 20.0), _ref('c', 5.0)]})
+    totals.remove_case('rookies')
+    assert totals.cases_containing('a') == []
+    assert totals.apply_values({'a': 50.0, 'b': 30.0}) == {'autos': 35.0}
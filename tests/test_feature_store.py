@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modules.core.feature_store import FeatureStore, FEATURE_COLUMNS, RollingWindow, build_feature_frame
+from modules.core.price_predictor import PricePredictor
+from modules.core.sales_archive import generate_synthetic_history
+
+
+def reference_frame(sales, predictor):
+    """Features computed the way prepare_data used to, straight from pandas."""
+    df = pd.DataFrame(sales)
+    df['price'] = pd.to_numeric(df['price'])
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values('date', kind='stable').reset_index(drop=True)
+    df['volume'] = 1
+    df['month'] = df['date'].dt.month
+    df['day_of_week'] = df['date'].dt.dayofweek
+    df['seasonal_factor'] = df['month'].map(predictor.seasonal_factors)
+    df['weekly_factor'] = df['day_of_week'].map(predictor.weekly_factors)
+    df['price_ma7'] = df['price'].rolling(window=7, min_periods=1).mean()
+    df['price_ma30'] = df['price'].rolling(window=30, min_periods=1).mean()
+    df['price_std7'] = df['price'].rolling(window=7, min_periods=1).std()
+    df['price_std30'] = df['price'].rolling(window=30, min_periods=1).std()
+    df['price_momentum'] = (df['price'] - df['price_ma7']) / df['price_ma7']
+    df['price_volatility'] = df['price_std7'] / df['price_ma7']
+    df['volume_ma7'] = df['volume'].rolling(window=7, min_periods=1).mean()
+    df['volume_ma30'] = df['volume'].rolling(window=30, min_periods=1).mean()
+    df['price_lag1'] = df['price'].shift(1)
+    df['price_lag7'] = df['price'].shift(7)
+    df['price_lag30'] = df['price'].shift(30)
+    df['price_forward7'] = df['price'].shift(-7)
+    df['price_forward30'] = df['price'].shift(-30)
+    return df.ffill().bfill()
+
+
+@pytest.fixture
+def predictor():
+    return PricePredictor(n_estimators=5)
+
+
+@pytest.fixture
+def sales():
+    return generate_synthetic_history(n_points=80, seed=7)
+
+
+def test_rolling_window_matches_pandas():
+    values = np.random.default_rng(0).uniform(10, 1000, 50)
+    window = RollingWindow(7)
+    means, stds = [], []
+    for v in values:
+        window.add(float(v))
+        means.append(window.mean)
+        stds.append(window.std())
+    series = pd.Series(values)
+    np.testing.assert_allclose(means, series.rolling(7, min_periods=1).mean(), rtol=1e-9)
+    np.testing.assert_allclose(stds[1:], series.rolling(7, min_periods=1).std()[1:], rtol=1e-7)
+    assert np.isnan(stds[0])
+
+
+def test_incremental_appends_match_bulk_and_reference(predictor, sales):
+    store = FeatureStore()
+    store.sync('card', sales[:40])
+    for sale in sales[40:]:
+        assert store.sync('card', sales[:sales.index(sale) + 1]) == 1
+
+    incremental = store.frame('card', predictor.seasonal_factors, predictor.weekly_factors)
+    bulk = build_feature_frame(sales, predictor.seasonal_factors, predictor.weekly_factors)
+    reference = reference_frame(sales, predictor)
+
+    columns = FEATURE_COLUMNS + ['price_forward7', 'price_forward30']
+    np.testing.assert_allclose(incremental[columns], bulk[columns], rtol=1e-7)
+    np.testing.assert_allclose(incremental[columns], reference[columns], rtol=1e-7)
+
+
+def test_sync_skips_known_sales_and_rebuilds_out_of_order(predictor, sales):
+    store = FeatureStore()
+    assert store.sync('card', sales[10:]) == 70
+    assert store.sync('card', sales[10:]) == 0
+    assert store.sync('card', sales[:10]) == 10
+
+    frame = store.frame('card', predictor.seasonal_factors, predictor.weekly_factors)
+    reference = reference_frame(sales, predictor)
+    np.testing.assert_allclose(frame[FEATURE_COLUMNS], reference[FEATURE_COLUMNS], rtol=1e-7)
+    assert store.matrix('card', predictor.seasonal_factors, predictor.weekly_factors).shape == (80, len(FEATURE_COLUMNS))
+
+
+def test_store_evicts_least_recently_used():
+    store = FeatureStore(max_cards=2)
+    sale = [{'title': 't', 'price': 1.0, 'date': '2024-01-01'}]
+    store.sync('a', sale)
+    store.sync('b', sale)
+    store.sync('a', sale)
+    store.sync('c', sale)
+    assert 'a' in store and 'c' in store and 'b' not in store
+
+
+def test_prepare_data_uses_store_and_future_features(predictor, sales):
+    store = FeatureStore()
+    predictor.feature_store = store
+    df = predictor.prepare_data(sales, card_key='card')
+    assert 'card' in store
+    assert len(df) == 80
+
+    future = pd.DataFrame({'date': pd.date_range(df['date'].max() + pd.Timedelta(days=1), periods=3)})
+    future = predictor.prepare_features(future, history=df)
+    assert not future[FEATURE_COLUMNS].isna().any().any()
+    assert future['price_ma7'].iloc[0] == pytest.approx(df['price_ma7'].iloc[-1])
+
+
+def test_mirror_rebuilds_when_the_input_drops_sales(predictor, sales):
+    store = FeatureStore()
+    # A broad search fills the state, then a filtered search on the same key runs
+    assert store.mirror('card', sales) == 80
+    filtered = sales[::2]
+    assert store.mirror('card', filtered) == 40
+
+    frame = store.frame('card', predictor.seasonal_factors, predictor.weekly_factors)
+    reference = reference_frame(filtered, predictor)
+    assert len(frame) == 40
+    np.testing.assert_allclose(frame[FEATURE_COLUMNS], reference[FEATURE_COLUMNS], rtol=1e-7)
+
+    # New sales on top of the same input still append
+    assert store.mirror('card', filtered + sales[1:2]) == 1
+    assert store.mirror('card', filtered + sales[1:2]) == 0
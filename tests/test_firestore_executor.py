@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.services.firebase import FirebaseService
+from modules.services.firestore_executor import run_blocking
+
+
+class SlowDb:
+    """Firestore stand-in whose document reads block for a while."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.threads = set()
+
+    def collection(self, name):
+        collection = MagicMock()
+        collection.document.side_effect = lambda doc_id: SimpleNamespace(get=lambda: self._get(doc_id))
+        return collection
+
+    def _get(self, doc_id):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return SimpleNamespace(exists=True, to_dict=lambda: {'id': doc_id})
+
+
+def _service(db):
+    # Skip the singleton's credential loading
+    service = object.__new__(FirebaseService)
+    service.db = db
+    return service
+
+
+@pytest.mark.asyncio
+async def test_gathered_reads_overlap():
+    db = SlowDb(0.2)
+    service = _service(db)
+
+    started = time.monotonic()
+    docs = await asyncio.gather(*(service.get_document('cards', str(n)) for n in range(5)))
+
+    assert [doc['id'] for doc in docs] == ['0', '1', '2', '3', '4']
+    assert time.monotonic() - started < 0.6
+    assert all(name.startswith('firestore-io') for name in db.threads)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_during_a_read():
+    service = _service(SlowDb(0.2))
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.ensure_future(tick())
+    await service.get_document('cards', 'a')
+    ticker.cancel()
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_propagates_errors():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await run_blocking(fail)
+    assert await run_blocking(lambda a, b=0: a + b, 1, b=2) == 3
@@ -0,0 +1,67 @@
+import itertools
+import numpy as np
+import pytest
+from modules.core import grading_optimizer
+from modules.core.grading_optimizer import GradingOptimizer, optimize_submission
+from modules.core.market_tables import MarketTables
+
+
+def make_cards(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{'id': str(i), 'current_value': float(rng.uniform(20, 400)),
+             'condition': rng.choice(['Near Mint', 'Near Mint-Mint', 'Excellent'])} for i in range(n)]
+
+
+@pytest.fixture
+def optimizer():
+    return GradingOptimizer(n_simulations=500, seed=3, market_tables=MarketTables())
+
+
+def brute_force(options, budget):
+    best = 0.0
+    groups = [list(rows) for rows in options.groupby('card_index').indices.values()]
+    for picks in itertools.product(*[[None] + rows for rows in groups]):
+        rows = [row for row in picks if row is not None]
+        cost = options['cost'].to_numpy()[rows].sum()
+        if cost <= budget:
+            best = max(best, options['expected_value'].to_numpy()[rows].sum())
+    return best
+
+
+def test_knapsack_matches_brute_force(optimizer):
+    cards = make_cards(6)
+    for budget in (100, 180, 300):
+        plan = optimizer.optimize(cards, budget=budget)
+        assert plan.total_cost <= budget
+        assert plan.selections['card_index'].is_unique
+        options = optimizer.options(cards)
+        assert plan.expected_profit == pytest.approx(brute_force(options, budget))
+
+
+def test_deadline_and_services_limit_tiers(optimizer):
+    cards = make_cards(20)
+    plan = optimizer.optimize(cards, budget=10_000, deadline_days=20)
+    assert set(plan.selections['service']) <= {'regular', 'express'}
+    assert (plan.selections['expected_days'] < 40).all()
+
+    plan = optimizer.optimize(cards, budget=10_000, services=['value'])
+    assert set(plan.selections['service']) == {'value'}
+    assert len(plan.selections) == plan.candidates
+    assert optimizer.optimize(cards, budget=10_000, deadline_days=1).selections.empty
+
+
+def test_thousands_of_cards(optimizer):
+    plan = optimize_submission(make_cards(3000, seed=1), budget=2_500, deadline_days=40,
+                               n_simulations=200, market_tables=MarketTables())
+    assert 0 < plan.total_cost <= 2_500
+    assert plan.to_dict()['selections'][0]['expected_value'] == plan.selections['expected_value'].max()
+
+
+def test_choice_table_is_capped_across_cards(optimizer, monkeypatch):
+    monkeypatch.setattr(grading_optimizer, 'MAX_CHOICE_CELLS', 2_000)
+    # 50 cards leave 39 budget cells, so each cell covers about $64
+    assert grading_optimizer._budget_resolution(2_500, 50) == pytest.approx(2_500 / 39)
+    assert grading_optimizer._budget_resolution(100, 5) == 1.0
+
+    plan = optimizer.optimize(make_cards(50, seed=2), budget=2_500)
+    assert 0 < plan.total_cost <= 2_500
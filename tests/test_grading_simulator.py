@@ -0,0 +1,77 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from modules.core.grading_simulator import GRADING_SERVICES, GradingSimulator, is_raw_card
+from modules.core.market_tables import MarketTables
+
+
+@pytest.fixture
+def simulator():
+    return GradingSimulator(n_simulations=2000, seed=1, market_tables=MarketTables())
+
+
+def test_only_raw_cards_with_values_are_simulated(simulator):
+    cards = [
+        {'id': 'a', 'current_value': 100, 'condition': 'Near Mint'},
+        {'id': 'b', 'current_value': 100, 'condition': 'PSA 9'},
+        {'id': 'c', 'current_value': 0, 'condition': 'Raw'},
+        {'id': 'd', 'current_value': '40', 'condition': 'Poor'},
+    ]
+    assert not is_raw_card(cards[1])
+    result = simulator.simulate(cards)
+    assert list(result['id']) == ['a', 'd']
+    assert list(result['card_index']) == [0, 3]
+    np.testing.assert_allclose(result[['p_psa10', 'p_psa9', 'p_psa8', 'p_lower']].sum(axis=1), 1.0)
+
+
+def test_expected_value_matches_closed_form_without_noise():
+    simulator = GradingSimulator(n_simulations=20000, seed=2, market_tables=MarketTables(),
+                                 price_volatility=1e-9, daily_volatility=0.0)
+    result = simulator.simulate([{'current_value': 100.0, 'condition': 'Raw'}], service='express',
+                                shipping_cost=10.0, seller_fee_percentage=0.0)
+    row = result.iloc[0]
+    # Default premiums: PSA 10 2.5x, PSA 9 1.8x, PSA 8 1.4x, lower grades sell raw
+    expected_sale = 100.0 * (0.2 * 2.5 + 0.5 * 1.8 + 0.2 * 1.4 + 0.1 * 1.0)
+    assert row['expected_value'] == pytest.approx(expected_sale - 200 - 10 - 100, abs=1.0)
+    assert row['probability_of_profit'] == 0.0
+    assert row['expected_days'] == pytest.approx(GRADING_SERVICES['express']['turnaround_days'], rel=0.05)
+
+
+def test_condition_and_fees_move_the_results(simulator):
+    cards = pd.DataFrame([
+        {'id': 'mint', 'current_value': 80.0, 'condition': 'Near Mint-Mint'},
+        {'id': 'worn', 'current_value': 80.0, 'condition': 'Good'},
+    ])
+    result = simulator.simulate(cards).set_index('id')
+    assert result.loc['mint', 'expected_value'] > result.loc['worn', 'expected_value']
+    assert result.loc['mint', 'downside'] < result.loc['mint', 'expected_value']
+
+    pricier = simulator.simulate(cards, service='express').set_index('id')
+    assert (pricier['expected_value'] < result['expected_value']).all()
+    with pytest.raises(ValueError):
+        simulator.simulate(cards, service='overnight')
+
+
+def test_bundle_volatility_is_read_as_a_percent():
+    # Shaped like a card_analysis bundle: market_value and price_volatility in percent
+    bundle = {'title': '2020 Prizm Justin Herbert', 'market_value': 100.0, 'price_volatility': 20.0,
+              'condition': 'Raw'}
+    result = GradingSimulator(n_simulations=5000, seed=4, market_tables=MarketTables()).simulate([bundle])
+    same_as_fraction = GradingSimulator(n_simulations=5000, seed=4, market_tables=MarketTables(),
+                                        price_volatility=0.20).simulate([dict(bundle, price_volatility=None)])
+
+    assert result.iloc[0]['expected_value'] == pytest.approx(same_as_fraction.iloc[0]['expected_value'])
+    assert result.iloc[0]['downside'] > -200
+
+
+def test_two_thousand_cards_in_under_a_second():
+    rng = np.random.default_rng(0)
+    cards = [{'id': str(i), 'current_value': float(rng.uniform(5, 500)), 'condition': 'Near Mint',
+              'card_set': f"Set {i % 20}", 'year': 1990 + i % 30} for i in range(2000)]
+    simulator = GradingSimulator(n_simulations=1000, seed=0, market_tables=MarketTables())
+    start = time.perf_counter()
+    result = simulator.simulate(cards)
+    assert time.perf_counter() - start < 1.0
+    assert len(result) == 2000
+    assert result['expected_value'].is_monotonic_decreasing
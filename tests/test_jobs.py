@@ -0,0 +1,75 @@
+import time
+import pytest
+from modules.core.jobs import (
+    CANCELLED,
+    FAILED,
+    SUCCEEDED,
+    JobCancelled,
+    JobManager,
+    predict_prices_job
+)
+from modules.core.sales_archive import generate_synthetic_history
+
+
+def add_job(context, a, b):
+    context.report(0.5, 'Adding')
+    return a + b
+
+
+def failing_job(context):
+    raise ValueError("bad input")
+
+
+def slow_job(context, steps):
+    for step in range(steps):
+        context.report(step / steps, f"Step {step}")
+        time.sleep(0.05)
+    return 'finished'
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1)
+    yield manager
+    manager.shutdown(wait=False)
+
+
+def test_job_results_and_errors(manager):
+    job_id = manager.submit(add_job, 2, 3)
+    assert manager.result(job_id, timeout=30) == 5
+    info = manager.status(job_id)
+    assert info.status == SUCCEEDED and info.progress == 1.0 and info.result == 5
+    assert info.name == 'add_job'
+
+    failed = manager.submit(failing_job)
+    final = list(manager.watch(failed, interval=0.01, timeout=30))[-1]
+    assert final.status == FAILED
+    assert 'bad input' in final.error
+
+
+def test_cancel_running_and_queued_jobs(manager):
+    running = manager.submit(slow_job, 200, group='session')
+    queued = manager.submit(slow_job, 200, group='session')
+    other = manager.submit(add_job, 1, 1, group='other')
+
+    for info in manager.watch(running, interval=0.01, timeout=30):
+        if info.progress > 0:
+            break
+    assert set(manager.cancel_group('session')) == {running, queued}
+
+    with pytest.raises(JobCancelled):
+        manager.result(running, timeout=30)
+    assert manager.status(running).status == CANCELLED
+    assert manager.status(queued).status == CANCELLED
+    assert manager.result(other, timeout=30) == 2
+    assert not manager.cancel(other)
+
+
+def test_prediction_job_reports_progress(manager):
+    sales = generate_synthetic_history(n_points=40, seed=4)
+    job_id = manager.submit(predict_prices_job, sales, days_ahead=30)
+    messages = [info.message for info in manager.watch(job_id, interval=0.01, timeout=120)]
+    result = manager.result(job_id)
+    assert len(result['predicted_prices']) == 30
+    assert manager.status(job_id).status == SUCCEEDED
+    assert messages[-1] == 'Done'
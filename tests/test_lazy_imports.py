@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from modules.core.lazy import LazyModule, is_loaded, lazy_import, warm_up
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['sklearn', 'xgboost', 'scipy', 'textblob', 'bs4']
+
+LIGHT_MODULES = [
+    'modules.core.price_predictor',
+    'modules.core.market_analysis',
+    'modules.core.batch_predictor',
+    'modules.core.backtesting',
+    'modules.core.sentiment',
+]
+
+
+def import_in_subprocess(modules):
+    """Import modules in a fresh interpreter; report seconds taken and which heavy packages loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {modules!r}: __import__(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    module = LazyModule('colorsys')
+    assert not is_loaded(module)
+    assert module.rgb_to_hsv(1, 0, 0)[0] == 0
+    assert is_loaded(module)
+    assert lazy_import('colorsys') is lazy_import('colorsys')
+    with pytest.raises(AttributeError):
+        module.__wrapped__
+
+
+def test_warm_up_loads_in_background():
+    module = lazy_import('wave')
+    thread = warm_up('wave')
+    if thread is not None:
+        thread.join(timeout=10)
+    assert is_loaded(module)
+    assert warm_up('wave') is None
+    assert warm_up('json', background=False) is None
+    assert is_loaded(lazy_import('json'))
+
+
+def test_core_modules_import_without_model_backends():
+    """Import-time benchmark: core modules must stay cheaper than the backends they defer."""
+    lazy = import_in_subprocess(LIGHT_MODULES)
+    assert lazy['loaded'] == []
+
+    eager = import_in_subprocess(LIGHT_MODULES + ['sklearn.ensemble', 'xgboost', 'scipy.stats', 'textblob'])
+    assert set(eager['loaded']) >= {'sklearn', 'xgboost', 'scipy', 'textblob'}
+    assert lazy['seconds'] < eager['seconds']
@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock
+
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.firestore_v1 import Client
+from google.cloud.firestore_v1.query import Query
+from google.cloud.firestore_v1.transaction import Transaction
+
+from modules.display_case import likes
+from modules.display_case.likes import FirestoreLikeStore, InMemoryLikeStore, LikeCounter
+
+
+def test_likes_count_once_per_user_across_shards():
+    store = InMemoryLikeStore(shards=4)
+    counter = LikeCounter(store, ttl_seconds=0)
+    for uid in ('u1', 'u2', 'u3'):
+        assert counter.set_like('case', uid, True)
+    assert not counter.set_like('case', 'u1', True)
+    assert counter.get('case', 'u1') == (3, True)
+
+    assert counter.set_like('case', 'u2', False)
+    assert not counter.set_like('case', 'u2', False)
+    assert counter.get('case', 'u2') == (2, False)
+    assert counter.get('other', 'u1') == (0, False)
+
+
+def test_counter_starts_from_likes_made_before_it():
+    store = InMemoryLikeStore(shards=4)
+    store.likes['case'] = {'u1', 'u2'}
+    counter = LikeCounter(store, ttl_seconds=0)
+    assert counter.get('case', 'u1') == (2, True)
+    assert counter.set_like('case', 'u3', True)
+    assert counter.get('case', 'u3') == (3, True)
+
+    store.likes['liked_before_read'] = {'u1'}
+    assert counter.set_like('liked_before_read', 'u2', True)
+    assert counter.get('liked_before_read', 'u2') == (2, True)
+
+
+def test_reads_are_cached_and_adjusted_by_likes():
+    store = InMemoryLikeStore()
+    counter = LikeCounter(store, ttl_seconds=60)
+    counter.set_like('case', 'u1', True)
+    assert counter.get('case', 'viewer') == (1, False)
+    assert counter.get('case', 'viewer') == (1, False)
+    assert store.reads == 1
+
+    counter.set_like('case', 'viewer', True)
+    assert counter.get('case', 'viewer') == (2, True)
+    assert store.reads == 1
+
+    counter.invalidate('case')
+    assert counter.get('case', 'viewer') == (2, True)
+    assert store.reads == 2
+
+
+def _snapshot(path, data):
+    return MagicMock(exists=data is not None, reference=MagicMock(path=path), to_dict=lambda: data)
+
+
+def _fake_db():
+    """Firestore stand-in whose document refs know their path; documents read on their own don't exist."""
+    db = MagicMock()
+
+    def document(path):
+        ref = MagicMock()
+        ref.path = path
+        ref.get.side_effect = lambda **kwargs: _snapshot(path, None)
+        ref.collection.side_effect = lambda name: MagicMock(document=lambda key: document(f"{path}/{name}/{key}"))
+        return ref
+
+    db.collection.side_effect = lambda name: MagicMock(document=lambda key: document(f"{name}/{key}"))
+    return db
+
+
+def test_firestore_read_fetches_like_and_shards_in_one_call():
+    db = _fake_db()
+    db.get_all.return_value = [
+        _snapshot('display_cases/c1', {'like_shards': 3}),
+        _snapshot('display_cases/c1/likes/u1', {'uid': 'u1'}),
+        _snapshot('display_cases/c1/like_shards/0', {'count': 4}),
+        _snapshot('display_cases/c1/like_shards/1', None),
+        _snapshot('display_cases/c1/like_shards/2', {'count': 3})
+    ]
+
+    assert FirestoreLikeStore(db, shards=3).read('c1', 'u1') == (7, True)
+    db.get_all.assert_called_once()
+    assert [ref.path for ref in db.get_all.call_args[0][0]] == [
+        'display_cases/c1', 'display_cases/c1/likes/u1', 'display_cases/c1/like_shards/0',
+        'display_cases/c1/like_shards/1', 'display_cases/c1/like_shards/2']
+
+
+def test_firestore_counter_starts_from_existing_likes(monkeypatch):
+    monkeypatch.setattr(likes.firestore, 'transactional', lambda apply: apply)
+    db = _fake_db()
+    db.get_all.return_value = [_snapshot('display_cases/c1', None), _snapshot('display_cases/c1/likes/u1', None)]
+    transaction = db.transaction.return_value
+    # Two likes written before the case had a counter
+    transaction.get.return_value = [MagicMock(), MagicMock()]
+
+    assert FirestoreLikeStore(db, shards=2).read('c1', 'u1') == (2, False)
+
+    written = {call.args[0].path: call.args[1] for call in transaction.set.call_args_list}
+    assert written == {'display_cases/c1': {'like_shards': 2},
+                       'display_cases/c1/like_shards/0': {'count': 2},
+                       'display_cases/c1/like_shards/1': {'count': 0}}
+
+
+def test_existing_likes_are_counted_through_a_query(monkeypatch):
+    # A real client and transaction, so Transaction.get checks what it is given
+    client = Client(project='test', credentials=AnonymousCredentials())
+    monkeypatch.setattr(Query, 'stream', lambda query, **kwargs: iter([MagicMock(), MagicMock(), MagicMock()]))
+    case_ref = client.collection('display_cases').document('c1')
+
+    assert FirestoreLikeStore(client)._count_likes(Transaction(client), case_ref) == 3
@@ -0,0 +1,103 @@
+import pytest
+from modules.analysis.trade_analyzer import TradeAnalyzer
+from modules.core.market_tables import (
+    DEFAULT_SEASONAL_FACTORS,
+    MarketTables,
+    build_market_tables,
+    card_era,
+    main,
+    normalize_grade,
+    set_market_tables
+)
+from modules.core.grading_analyzer import GradingAnalyzer
+from modules.core.price_predictor import PricePredictor
+from modules.core.sales_archive import SalesArchive, generate_synthetic_history, make_card_key
+
+
+@pytest.fixture
+def archive():
+    archive = SalesArchive(path=None)
+    for i in range(4):
+        card = {'player_name': f"Player {i}", 'year': '2020', 'card_set': 'Prizm', 'card_number': str(i)}
+        raw = generate_synthetic_history(n_points=400, start_price=50 + 10 * i, volatility=0.01, seed=i)
+        archive.add_sales(make_card_key(card), raw)
+        graded = [dict(sale, price=round(sale['price'] * 3.0, 2)) for sale in raw[-90:]]
+        archive.add_sales(make_card_key(dict(card, scenario='PSA 10')), graded)
+    return archive
+
+
+def test_helpers():
+    assert card_era(1975) == 'vintage'
+    assert card_era('1989') == 'junk_wax'
+    assert card_era(2020) == 'ultra_modern'
+    assert card_era(None) == ''
+    assert normalize_grade('psa10') == 'PSA 10'
+    assert normalize_grade('Raw') == 'Raw'
+    assert normalize_grade('BGS 9.5') is None
+
+
+def test_build_tables_from_archive(archive, tmp_path):
+    tables = build_market_tables(archive, min_samples=10, min_cards=3)
+    assert tables.sales_count == 4 * 490
+
+    weekly = tables.weekly_factors(card_set='prizm', era='ultra_modern')
+    assert weekly[5] > weekly[2] and weekly[6] > weekly[2]
+    assert set(tables.seasonal_factors()) == set(range(1, 13))
+    assert tables.grade_premium('PSA 10', card_set='prizm') == pytest.approx(3.0, rel=0.01)
+    # Grades without data fall back to the defaults
+    assert tables.grade_premium('PSA 9') == 1.8
+    assert tables.grade_premium('Mint') == 1.0
+
+    path = tmp_path / 'tables.json'
+    tables.save(str(path))
+    assert MarketTables.load(str(path)).to_dict() == tables.to_dict()
+
+
+def test_empty_tables_use_defaults():
+    tables = MarketTables()
+    assert tables.seasonal_factors('football', 'prizm', 'modern') == DEFAULT_SEASONAL_FACTORS
+    assert tables.grade_premium_table()['PSA 10'] == 2.5
+
+
+def test_consumers_use_tables(archive):
+    tables = build_market_tables(archive, min_samples=10, min_cards=3)
+    predictor = PricePredictor(n_estimators=5, market_tables=tables)
+    assert predictor.grade_multipliers['PSA 10'] == pytest.approx(3.0, rel=0.01)
+    assert predictor.analyze_card_condition([{'title': '2020 Prizm PSA 10'}])[0] == 'PSA 10'
+
+    predictor.use_segment(archive.card_keys()[0])
+    assert predictor.weekly_factors == tables.weekly_factors(card_set='prizm', era='ultra_modern')
+
+    analyzer = TradeAnalyzer(market_tables=tables)
+    assert analyzer.condition_multipliers['PSA 10'] == 1.0
+    assert analyzer._condition_multiplier({'condition': 'Raw', 'card_set': 'Prizm', 'year': 2020}) == pytest.approx(1 / 3, rel=0.01)
+    assert analyzer._condition_multiplier({'condition': 'Mint'}) == 1.0
+
+
+def test_consumers_keep_their_fallbacks_without_learned_premiums():
+    tables = MarketTables()
+    predictor = PricePredictor(n_estimators=5, market_tables=tables)
+    assert predictor.analyze_card_condition([{'title': '2020 Prizm PSA 9'}]) == ('PSA 9', 1.3)
+    assert predictor.grade_multipliers['PSA 10'] == 2.5
+
+    analyzer = TradeAnalyzer(market_tables=tables)
+    assert analyzer.condition_multipliers == {'PSA 10': 1.0, 'PSA 9': 0.5, 'PSA 8': 1.0, 'Raw': 0.3}
+
+    set_market_tables(tables)
+    try:
+        analysis = GradingAnalyzer.analyze_grading_potential(
+            {'player_name': 'Player', 'year': '2020'}, {'metrics': {'avg_price': 100.0}, 'sales': []})
+    finally:
+        set_market_tables(None)
+    assert (analysis['psa9_price'], analysis['psa10_price']) == (150.0, 300.0)
+    assert analysis['psa10_source'] == "Estimated (3.0x raw value)"
+
+
+def test_cli_writes_tables(archive, tmp_path, capsys):
+    archive_path = tmp_path / 'archive.json'
+    archive.path = str(archive_path)
+    archive.save()
+    out = tmp_path / 'tables.json'
+    assert main(['--archive', str(archive_path), '--out', str(out), '--min-samples', '10']) == 0
+    assert out.exists()
+    assert 'Built tables from 1960 sales' in capsys.readouterr().out
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+import pytest
+from modules.core.profit_calculator import ProfitCalculator, analysis_key
+from modules.core.recommendation_engine import Recommendation, RecommendationEngine
+from tests.test_lazy_imports import PROJECT_ROOT
+
+
+class FakeScraper:
+    def __init__(self):
+        self.searches = 0
+
+    def get_graded_card_data(self, card_data):
+        return {}
+
+    def search_cards(self, **params):
+        self.searches += 1
+        price = 150.0 if params['scenario'] == 'PSA 9' else 400.0
+        return [{'price': price, 'date': '2024-01-01', 'title': f"Card {params['scenario']}"}]
+
+
+def make_card(price=50.0):
+    return {
+        'title': '2020 Prizm Justin Herbert #325 RC',
+        'price': price,
+        'shipping_cost': 5.0,
+        'seller_fee_percentage': 12.9,
+        'condition': 'near mint',
+        'search_params': {'player_name': 'Justin Herbert', 'year': '2020', 'card_set': 'Prizm'},
+        'market_data': {'median_price': 80.0, 'metrics': {'market_health_score': 7, 'trend_score': 8,
+                                                          'liquidity_score': 9, 'average_price': 85,
+                                                          'median_price': 80}}
+    }
+
+
+def test_compute_modules_do_not_import_streamlit():
+    code = ("import sys\n"
+            "import modules.core.profit_calculator, modules.core.recommendation_engine\n"
+            "print('streamlit' in sys.modules)")
+    output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == 'False'
+
+
+def test_analyze_returns_structured_results_and_memoizes():
+    scraper = FakeScraper()
+    calculator = ProfitCalculator(scraper=scraper)
+    analysis = calculator.analyze(make_card())
+
+    assert set(analysis.scenarios) == {'Raw', 'PSA 9', 'PSA 10'}
+    assert analysis.scenarios['PSA 10']['market_price'] == 400.0
+    assert isinstance(analysis.recommendation, Recommendation)
+    assert analysis.recommendation.player_name.startswith('Justin Herbert')
+    assert 'Consider buying soon' in analysis.recommendation.buyer
+    assert analysis.to_dict()['recommendation']['overview'].startswith('The market for this card is currently healthy')
+
+    searches = scraper.searches
+    assert calculator.analyze(make_card()) is analysis
+    assert scraper.searches == searches
+    assert calculator.analyze(make_card(price=60.0)) is not analysis
+    assert analysis_key(make_card()) == analysis_key(dict(make_card(), graded_data={'ignored': True}))
+
+
+def test_analyze_many_keeps_order_and_reports_errors():
+    class BrokenScraper(FakeScraper):
+        def get_graded_card_data(self, card_data):
+            raise RuntimeError('offline')
+
+    calculator = ProfitCalculator(scraper=FakeScraper())
+    results = calculator.analyze_many([make_card(price) for price in (10.0, 20.0, 30.0)], max_workers=3)
+    assert [r.scenarios['Raw']['purchase_price'] for r in results] == [10.0, 20.0, 30.0]
+
+    broken = ProfitCalculator(scraper=BrokenScraper()).analyze(make_card())
+    assert broken.scenarios == {} and set(broken.errors) == {'Raw', 'PSA 9', 'PSA 10'}
+
+
+def test_recommendations_are_cached_by_inputs():
+    engine = RecommendationEngine(cache_size=2)
+    card, market = make_card(), make_card()['market_data']
+    first = engine.recommend(card, market, {'roi': 25})
+    assert engine.recommend(card, market, {'roi': 25}) is first
+    assert 'notably strong' in first.price_insights
+    assert engine.recommend(card, market, {'roi': 5}).price_insights != first.price_insights
+    engine.recommend(card, market, None)
+    assert len(engine._cache) == 2
@@ -0,0 +1,95 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from modules.core import repository as repository_module
+from modules.core.repository import Repository
+from modules.core.repositories.collection_repository import CollectionRepository
+from tests.mocks.firebase_service import MockFirebaseService
+
+
+class CountingFirebase(MockFirebaseService):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def get_documents(self, collection, doc_ids):
+        self.requests.append(list(doc_ids))
+        return await super().get_documents(collection, doc_ids)
+
+
+def _repository(firebase):
+    repository = object.__new__(Repository)
+    repository.collection_name = 'cards'
+    repository.firebase = firebase
+    repository.logger = logging.getLogger(__name__)
+    repository._cache = {}
+    repository._create_model = lambda data: SimpleNamespace(**data)
+    return repository
+
+
+@pytest.fixture
+def firebase():
+    firebase = CountingFirebase()
+    firebase.data['cards'] = {str(n): {'name': f"card {n}"} for n in range(25)}
+    return firebase
+
+
+@pytest.mark.asyncio
+async def test_get_many_reads_in_chunks_and_keeps_order(firebase, monkeypatch):
+    monkeypatch.setattr(repository_module, 'GET_MANY_CHUNK_SIZE', 10)
+    repository = _repository(firebase)
+    ids = [str(n) for n in reversed(range(25))] + ['missing', '3']
+
+    cards = await repository.get_many(ids)
+
+    assert [card.name for card in cards[:3]] == ['card 24', 'card 23', 'card 22']
+    assert len(cards) == 26 and cards[-1].name == 'card 3'
+    assert sorted(len(request) for request in firebase.requests) == [6, 10, 10]
+
+
+@pytest.mark.asyncio
+async def test_get_many_only_fetches_cache_misses(firebase):
+    repository = _repository(firebase)
+    await repository.get_many(['1', '2'])
+    firebase.requests.clear()
+
+    cards = await repository.get_many(['1', '2', '3'])
+
+    assert [card.name for card in cards] == ['card 1', 'card 2', 'card 3']
+    assert firebase.requests == [['3']]
+    assert await repository.get_many(['1', '3']) and firebase.requests == [['3']]
+
+
+@pytest.mark.asyncio
+async def test_get_many_skips_a_chunk_that_fails(firebase, monkeypatch):
+    monkeypatch.setattr(repository_module, 'GET_MANY_CHUNK_SIZE', 2)
+    repository = _repository(firebase)
+    read = firebase.get_documents
+
+    async def get_documents(collection, doc_ids):
+        if '3' in doc_ids:
+            raise RuntimeError("deadline exceeded")
+        return await read(collection, doc_ids)
+    firebase.get_documents = get_documents
+
+    cards = await repository.get_many(['1', '2', '3', '4', '5'])
+
+    assert [card.name for card in cards] == ['card 1', 'card 2', 'card 5']
+
+
+@pytest.mark.asyncio
+async def test_collection_get_cards_uses_one_multi_get(firebase):
+    collections = CollectionRepository.__new__(CollectionRepository)
+    collections.logger = logging.getLogger(__name__)
+    collections._card_repository = _repository(firebase)
+
+    async def get(collection_id):
+        return SimpleNamespace(id=collection_id, cards=['4', '5', 'gone'])
+    collections.get = get
+
+    cards = await collections.get_cards('c1')
+
+    assert [card.name for card in cards] == ['card 4', 'card 5']
+    assert firebase.requests == [['4', '5', 'gone']]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from textblob import TextBlob
+from modules.core.price_predictor import PricePredictor
+from modules.core.sentiment import LexiconScorer, SentimentScorer, normalize_title, title_hash
+
+TITLES = [
+    "2020 Prizm Justin Herbert #325 PSA 10 GEM MINT!!",
+    "Amazing beautiful Herbert rookie",
+    "damaged, poor creased Herbert card",
+    "2020 prizm justin herbert 325 psa 10 gem mint",
+]
+
+
+def test_normalized_titles_share_a_cache_key():
+    assert normalize_title(TITLES[0]) == normalize_title(TITLES[3])
+    assert title_hash(normalize_title(TITLES[0])) == title_hash(normalize_title(TITLES[3]))
+
+
+def test_scores_match_textblob_and_persist(tmp_path, monkeypatch):
+    path = tmp_path / 'sentiment.json'
+    scorer = SentimentScorer(cache_path=str(path))
+    scores = scorer.score_titles(TITLES)
+    expected = [TextBlob(normalize_title(title)).sentiment.polarity for title in TITLES]
+    np.testing.assert_allclose(scores, expected)
+    assert len(scorer) == 3
+
+    reloaded = SentimentScorer(cache_path=str(path))
+    monkeypatch.setattr(reloaded, '_score_uncached', lambda titles: pytest.fail("cached titles were rescored"))
+    np.testing.assert_allclose(reloaded.score_titles(TITLES * 60), expected * 60)
+
+
+def test_lexicon_scorer_is_vectorized_and_signed():
+    scores = LexiconScorer().score([normalize_title(title) for title in TITLES])
+    assert scores[1] > 0 > scores[2]
+    assert scores[0] == scores[3]
+    custom = LexiconScorer({'gem': 0.5, 'poor': -1.0}).score(['gem gem poor', 'nothing here'])
+    np.testing.assert_allclose(custom, [0.0, 0.0])
+
+
+def test_predictor_uses_injected_scorer():
+    scorer = SentimentScorer(cache_path=None, method='lexicon')
+    predictor = PricePredictor(n_estimators=5, sentiment_scorer=scorer)
+    sentiment = predictor.analyze_market_sentiment([{'title': title} for title in TITLES])
+    assert 0 <= sentiment <= 1
+    assert len(scorer) == 3
+    assert predictor.analyze_market_sentiment([]) == 0.5
+    with pytest.raises(ValueError):
+        SentimentScorer(cache_path=None, method='vader')
+
+
+def test_save_merges_entries_from_other_processes(tmp_path, monkeypatch):
+    path = tmp_path / 'sentiment.json'
+    first = SentimentScorer(cache_path=str(path), method='lexicon')
+    second = SentimentScorer(cache_path=str(path), method='lexicon')
+    first.score_titles(TITLES[:2])
+    second.score_titles(TITLES[2:3])
+
+    reloaded = SentimentScorer(cache_path=str(path), method='lexicon')
+    assert len(reloaded) == 3
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,68 @@
+import pandas as pd
+
+from modules.display_case.manager import DisplayCaseManager
+from modules.display_case.tag_index import TagIndex, normalize_tag, parse_tags
+
+
+def _collection():
+    return pd.DataFrame({
+        'player_name': ['Player 1', 'Player 2', 'Player 3', 'Player 4'],
+        'year': ['2020', '2021', '2022', '2023'],
+        'card_set': ['Set A', 'Set B', 'Set C', 'Set D'],
+        'card_number': ['1', '2', '3', '4'],
+        'current_value': [10.0, 20.0, 30.0, 40.0],
+        'tags': [['Rookie', 'baseball'], "['auto', 'Baseball!']", 'rookie, auto', None],
+        'photo': ['p1', 'p2', 'p3', 'p4']
+    })
+
+
+def test_parse_and_normalize_tags():
+    assert parse_tags("['rookie', 'auto']") == ['rookie', 'auto']
+    assert parse_tags('rookie, auto ,') == ['rookie', 'auto']
+    assert parse_tags(['', None, 'valid_tag']) == ['valid_tag']
+    assert parse_tags(None) == []
+    assert normalize_tag(' Baseball! ') == 'baseball'
+    assert normalize_tag(float('nan')) == ''
+
+
+def test_union_intersection_and_all_tags():
+    index = TagIndex(_collection())
+    assert index.positions(['rookie']) == [0, 2]
+    assert index.positions(['rookie', 'auto']) == [0, 1, 2]
+    assert index.positions(['rookie', 'auto'], match_all=True) == [2]
+    assert index.positions(['', None]) == []
+    assert index.all_tags() == ['auto', 'baseball', 'Rookie']
+    assert index.counts() == {'rookie': 2, 'baseball': 2, 'auto': 2}
+
+
+def test_incremental_updates():
+    index = TagIndex(_collection())
+    index.update_card(3, {'player_name': 'Player 4', 'tags': ['rookie', 'football']})
+    assert index.positions(['rookie']) == [0, 2, 3]
+    assert index.positions(['football']) == [3]
+
+    index.remove_card(0)
+    assert index.positions(['rookie']) == [2, 3]
+    assert 'Rookie' not in index.all_tags() and 'rookie' in index.all_tags()
+    assert index.add_card({'tags': 'auto'}) == 4
+    assert index.positions(['auto']) == [1, 2, 4]
+
+
+def test_manager_reuses_index_until_collection_changes():
+    manager = DisplayCaseManager('test_uid', _collection())
+    index = manager.tag_index
+    cards = manager._filter_cards_by_tags(['rookie'])
+    assert [card['player_name'] for card in cards] == ['Player 1', 'Player 3']
+    assert cards[0]['id'] == 'player_1_2020_set_a_1'
+    assert manager._filter_cards_by_tags(['rookie', 'auto'], match_all=True)[0]['player_name'] == 'Player 3'
+    assert [card['player_name'] for card in manager.preview_cards_by_tag('baseball')] == ['Player 1', 'Player 2']
+    assert manager.tag_index is index
+
+    manager.update_card(3, {'tags': ['rookie']})
+    assert manager.tag_index is index
+    assert manager.collection.at[3, 'tags'] == ['rookie']
+    assert len(manager._filter_cards_by_tags(['rookie'])) == 3
+
+    manager.collection = _collection().iloc[:2]
+    assert manager.tag_index is not index
+    assert manager.get_all_tags() == ['auto', 'baseball', 'Rookie']
@@ -0,0 +1,82 @@
+import time
+import numpy as np
+import pytest
+from modules.analysis.trade_analyzer import TradeAnalyzer, trade_matrices
+from modules.core.market_tables import MarketTables
+
+
+def make_pool(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pool = []
+    for i in range(n):
+        value = float(rng.lognormal(4, 1))
+        pool.append({
+            'id': str(i),
+            'market_value': value,
+            'condition': rng.choice(['PSA 10', 'PSA 9', 'Raw']),
+            'market_trend': rng.choice(['hot', 'stable', 'cooling']),
+            '30_day_forecast': value * rng.uniform(0.8, 1.2),
+            '90_day_forecast': value * rng.uniform(0.7, 1.3),
+            'price_volatility': float(rng.uniform(0, 10)),
+            'volatility_score': float(rng.uniform(0, 10)),
+            'liquidity_score': float(rng.uniform(0, 10))
+        })
+    pool[0].pop('90_day_forecast')
+    pool[1]['liquidity_score'] = 'n/a'
+    return pool
+
+
+def random_trades(n_trades, n_cards, seed=0):
+    rng = np.random.default_rng(seed)
+    trades = []
+    for _ in range(n_trades):
+        picks = rng.choice(n_cards, size=rng.integers(2, 8), replace=False)
+        split = rng.integers(1, len(picks))
+        trades.append((list(picks[:split]), list(picks[split:])))
+    return trades
+
+
+@pytest.fixture
+def analyzer():
+    return TradeAnalyzer(market_tables=MarketTables())
+
+
+def test_batch_matches_single_trade_analysis(analyzer):
+    pool = make_pool(40)
+    trades = random_trades(50, 40)
+    batch = analyzer.evaluate_trades(pool, trades)
+    assert len(batch) == 50
+
+    clean = [dict(card, liquidity_score=5.0) if card['liquidity_score'] == 'n/a' else card for card in pool]
+    for row, (giving, receiving) in zip(batch.itertuples(), trades):
+        single = analyzer.analyze_trade([clean[i] for i in giving], [clean[i] for i in receiving])
+        assert row.giving_value == pytest.approx(single['giving_value'])
+        assert row.receiving_value == pytest.approx(single['receiving_value'])
+        assert row.percentage_difference == pytest.approx(single['percentage_difference'])
+        assert row.fairness_score == single['fairness_score']
+        assert row.giving_risk == single['giving_risk'] and row.receiving_risk == single['receiving_risk']
+        assert row.giving_avg_trend == single['giving_metrics']['avg_trend']
+        assert row.liquidity_difference == pytest.approx(single['metric_differences']['liquidity_difference'])
+        assert row.recommendation == single['recommendation']
+
+
+def test_matrices_and_empty_sides(analyzer):
+    pool = make_pool(5)
+    packed = analyzer.pack_cards(pool)
+    trades = [([0, 1], [2]), ([], [3]), ([4], [])]
+    giving, receiving = trade_matrices(trades, len(packed))
+    assert giving.shape == (3, 5) and giving.nnz == 3
+    result = analyzer.evaluate_trades(packed, (giving, receiving))
+    assert list(result['giving_cards']) == [2, 0, 1]
+    assert result.loc[1, 'fairness_score'] == 0 and result.loc[1, 'giving_risk'] == 0
+    assert result.loc[2, 'recommendation'] == 'Decline'
+
+
+def test_thousands_of_trades_in_one_call(analyzer):
+    pool = make_pool(500, seed=1)
+    trades = random_trades(20000, 500, seed=2)
+    start = time.perf_counter()
+    result = analyzer.evaluate_trades(pool, trades)
+    assert time.perf_counter() - start < 2.0
+    assert len(result) == 20000
+    assert set(result['recommendation']) <= {'Strong Accept', 'Accept', 'Consider', 'Decline'}
@@ -0,0 +1,74 @@
+import itertools
+import time
+import numpy as np
+import pytest
+from modules.analysis.trade_analyzer import TradeAnalyzer
+from modules.analysis.trade_finder import TradeFinder, combinations_array
+from modules.core.market_tables import MarketTables
+
+
+def make_collection(n, seed):
+    rng = np.random.default_rng(seed)
+    return [{'id': f"{seed}-{i}", 'current_value': float(rng.lognormal(4, 1)), 'condition': 'Raw',
+             'liquidity_score': float(rng.uniform(0, 10)), 'price_volatility': float(rng.uniform(0, 10))}
+            for i in range(n)]
+
+
+@pytest.fixture
+def finder():
+    return TradeFinder(TradeAnalyzer(market_tables=MarketTables()))
+
+
+def test_combinations_array_matches_itertools():
+    for n, k in [(1, 1), (5, 2), (7, 3), (6, 6)]:
+        expected = np.array(list(itertools.combinations(range(n), k)))
+        np.testing.assert_array_equal(combinations_array(n, k), expected)
+    assert combinations_array(3, 4).shape == (0, 4)
+
+
+def test_best_trade_matches_brute_force(finder):
+    mine, theirs = make_collection(8, 1), make_collection(8, 2)
+    trades = finder.find_trades(mine, theirs, value_tolerance=0.2, max_cards_per_side=2, top_n=5)
+
+    values = {card['id']: card['current_value'] for card in mine + theirs}
+    best = 0.0
+    for give_size, get_size in itertools.product([1, 2], repeat=2):
+        for give in itertools.combinations(mine, give_size):
+            for get in itertools.combinations(theirs, get_size):
+                g, r = sum(values[c['id']] for c in give), sum(values[c['id']] for c in get)
+                best = max(best, min(g, r) / max(g, r))
+    assert trades[0].fairness_score == round(best * 10, 1)
+    assert [t.fairness_score for t in trades] == sorted((t.fairness_score for t in trades), reverse=True)
+    assert trades[0].analysis['giving_value'] == pytest.approx(trades[0].giving_value)
+
+
+def test_constraints_are_respected(finder):
+    mine = make_collection(30, 3)
+    display_case = {'name': 'Rookies', 'cards': make_collection(30, 4)}
+    trades = finder.find_trades(mine, display_case, value_tolerance=0.05, max_cards_per_side=2,
+                                risk_ceiling=4.5, top_n=20, min_value=100, analyze=False)
+    assert trades
+    for trade in trades:
+        assert 1 <= len(trade.giving) <= 2 and 1 <= len(trade.receiving) <= 2
+        assert trade.fairness_score >= 9.5
+        assert trade.receiving_risk <= 4.5
+        assert trade.giving_value >= 100
+        assert trade.analysis == {}
+    assert finder.find_trades(mine, [], top_n=5) == []
+    with pytest.raises(ValueError):
+        finder.find_trades(mine, display_case, value_tolerance=1.5)
+
+
+def test_cards_without_a_value_count_as_zero(finder):
+    mine = make_collection(4, 5) + [{'id': 'unvalued', 'market_value': None, 'current_value': None, 'condition': 'Raw'}]
+    theirs = make_collection(4, 6) + [{'id': 'unparsed', 'market_value': 'n/a', 'condition': 'Raw'}]
+    assert finder.find_trades(mine, theirs, max_cards_per_side=2, top_n=5, analyze=False)
+    np.testing.assert_array_equal(finder.analyzer.card_values([mine[-1], theirs[-1]]), [0.0, 0.0])
+
+
+def test_two_hundred_by_two_hundred_search(finder):
+    start = time.perf_counter()
+    trades = finder.find_trades(make_collection(200, 5), make_collection(200, 6), risk_ceiling=6, top_n=10)
+    assert time.perf_counter() - start < 5.0
+    assert len(trades) == 10
+    assert all(len(trade.giving) <= 3 and len(trade.receiving) <= 3 for trade in trades)
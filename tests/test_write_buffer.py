@@ -0,0 +1,127 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.database import service as service_module
+from modules.database import write_buffer
+from modules.database.service import DatabaseService
+from modules.database.write_buffer import MAX_WRITE_ATTEMPTS, CollectionWriteBuffer, FlushError
+from tests.test_collection_sync import FakeDb
+
+
+@pytest.fixture
+def db():
+    return FakeDb()
+
+
+def _cards(db):
+    return {path.rsplit('/', 1)[1]: data for path, data in db.docs.items() if '/cards/' in path}
+
+
+def test_repeated_writes_coalesce_into_one_batch(db):
+    buffer = CollectionWriteBuffer('u1', db, flush_interval=60)
+    buffer.set('a', {'current_value': 1})
+    buffer.set('a', {'current_value': 2})
+    buffer.set('b', {'current_value': 3})
+    buffer.delete('b')
+    assert db.commits == [] and len(buffer) == 2
+
+    assert buffer.flush() == 2
+    # Two card writes plus one last_updated touch, in a single commit
+    assert db.commits == [3]
+    assert _cards(db) == {'a': {'current_value': 2}}
+    assert buffer.metrics.to_dict()['coalesced'] == 2
+    assert buffer.flush() == 0
+
+
+def test_size_threshold_and_timer_flush(db):
+    buffer = CollectionWriteBuffer('u1', db, flush_interval=60, max_pending=3)
+    for card_id in 'abc':
+        buffer.set(card_id, {'id': card_id})
+    assert db.commits == [4] and len(buffer) == 0
+
+    timed = CollectionWriteBuffer('u2', db, flush_interval=0.05)
+    timed.set('d', {'id': 'd'})
+    deadline = time.time() + 2
+    while len(timed) and time.time() < deadline:
+        time.sleep(0.01)
+    assert 'd' in _cards(db) and timed.metrics.flushes == 1
+
+
+def test_failed_flush_keeps_writes_for_retry(db):
+    buffer = CollectionWriteBuffer('u1', db, flush_interval=60)
+    buffer.set('a', {'v': 1})
+    db.fail = True
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    # A newer write made while the flush failed wins over the retried one
+    buffer.set('a', {'v': 2})
+    db.fail = False
+
+    assert buffer.flush() == 1
+    assert _cards(db) == {'a': {'v': 2}}
+    assert buffer.metrics.failures == 1 and buffer.metrics.flushes == 1
+
+
+def test_bad_card_is_isolated_then_dropped_and_reported(db):
+    buffer = CollectionWriteBuffer('u1', db, flush_interval=60)
+    db.bad_paths.add('users/u1/cards/bad')
+    buffer.set('good', {'v': 1})
+    buffer.set('bad', {'v': 2})
+
+    with pytest.raises(FlushError) as error:
+        buffer.flush()
+    assert set(error.value.failed) == {'bad'} and error.value.dropped == []
+    assert _cards(db) == {'good': {'v': 1}} and len(buffer) == 1
+
+    for _ in range(MAX_WRITE_ATTEMPTS - 1):
+        with pytest.raises(FlushError):
+            buffer.flush()
+    assert len(buffer) == 0
+    assert [write.card_id for write in buffer.take_dropped()] == ['bad']
+    assert buffer.take_dropped() == []
+    assert buffer.metrics.to_dict()['dropped'] == 1
+
+
+def test_outage_keeps_writes_without_counting_attempts(db):
+    buffer = CollectionWriteBuffer('u1', db, flush_interval=60)
+    buffer.set('a', {'v': 1})
+    db.fail = True
+    for _ in range(MAX_WRITE_ATTEMPTS + 1):
+        with pytest.raises(FlushError):
+            buffer.flush()
+    assert len(buffer) == 1 and buffer.take_dropped() == []
+
+    db.fail = False
+    assert buffer.flush() == 1
+
+
+def test_service_reads_and_saves_when_the_flush_fails(monkeypatch):
+    service = MagicMock()
+    service._ensure_db_connection.return_value = True
+    service.db.collection.return_value.document.return_value.collection.return_value.get.return_value = []
+    engine = MagicMock()
+    monkeypatch.setattr(DatabaseService, 'get_instance', classmethod(lambda cls: service))
+    monkeypatch.setattr(service_module, 'get_collection_sync', lambda: engine)
+    monkeypatch.setattr(service_module, 'flush_user_writes', MagicMock(side_effect=FlushError('u1', {'a': 'boom'}, [])))
+    discard = MagicMock()
+    monkeypatch.setattr(service_module, 'discard_user_writes', discard)
+
+    assert DatabaseService.get_user_collection('u1') == []
+    service.db.collection.return_value.document.return_value.collection.return_value.get.assert_called_once()
+
+    assert DatabaseService.save_user_collection('u1', []) is True
+    discard.assert_called_once_with('u1')
+    engine.forget.assert_called_once_with('u1')
+    engine.sync.assert_called_once_with('u1', [])
+
+
+def test_flush_all_commits_every_buffer(db, monkeypatch):
+    monkeypatch.setattr(write_buffer, '_buffers', {})
+    write_buffer.get_write_buffer('u1', db).set('a', {'v': 1})
+    write_buffer.get_write_buffer('u2', db).delete('b')
+
+    assert write_buffer.flush_all() == (2, 0)
+    assert set(write_buffer.buffer_metrics()) == {'u1', 'u2'}
+    assert write_buffer.buffer_metrics()['u1']['pending'] == 0